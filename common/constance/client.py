@@ -2,16 +2,29 @@
 import pickle  # noqa: S403
 from typing import Any
 
+import orjson
 from fastapi import Depends
 from loguru import logger
 from redis.asyncio import ConnectionPool, Redis
 from redis.exceptions import RedisError
 
 from common.constance.dependencies import get_constance_pool
+from common.constance.near_cache import constance_near_cache
+from common.utils.ttl_cache import MISSING
+
+from configuration.settings import settings
+
+# Первый байт pickle протокола 2 и выше, JSON с него не начинается
+PICKLE_PROTO = b"\x80"
 
 
 class Constance:
-    """Базовый клиент redis."""
+    """
+    Базовый клиент redis.
+
+    Значения констант хранятся в JSON (orjson). Значения в pickle, записанные
+    до перехода на JSON, читаются, пока включен settings.constance.pickle_fallback.
+    """
 
     _PREFIX: str = "SOME_DB://"
 
@@ -27,35 +40,117 @@ class Constance:
         """
         Получения константы из кэша.
 
+        Константа читается из кеша в памяти процесса (constance_near_cache),
+        при промахе - из Redis. Ошибка Redis не кешируется.
+
         :param name: Название константы
         :return: Значение константы
         """
         redis_key = self._get_key(name)
+        redis_value = constance_near_cache.get(redis_key)
+        if redis_value is MISSING:
+            generation = constance_near_cache.generation
+            async with Redis(connection_pool=self._redis_pool) as redis:
+                try:
+                    redis_value = await redis.get(
+                        redis_key,
+                    )
+                except RedisError:
+                    logger.error(f"Ошибка получения константы {redis_key} из Redis")
+                    return self._defaults.get(name)
+            if redis_value is not None:
+                try:
+                    redis_value = self._deserialize(redis_value)
+                except ValueError as exp:
+                    logger.error(f"Ошибка чтения константы {redis_key}: {exp}")
+                    return self._defaults.get(name)
+            constance_near_cache.set(redis_key, redis_value, generation)
+
+        if redis_value is not None:
+            return redis_value
+        return self._defaults.get(name)
+
+    async def _set(self, name: str, constance_value: Any) -> None:
+        """
+        Сохранить константу в JSON и уведомить процессы об изменении.
+
+        :param name: Название константы
+        :param constance_value: Значение константы
+        """
+        redis_key = self._get_key(name)
         async with Redis(connection_pool=self._redis_pool) as redis:
-            try:
-                redis_value: bytes | None = await redis.get(
-                    redis_key,
-                )
-            except RedisError:
-                logger.error(f"Ошибка получения константы {redis_key} из Redis")
-                redis_value = None
+            await redis.set(redis_key, self._serialize(constance_value))
+            await redis.publish(settings.constance.near_cache_channel, redis_key)
+        constance_near_cache.invalidate(redis_key)
 
-            if redis_value:
-                return self._deserialize(redis_value)
-            return self._defaults.get(name)
+    async def load_snapshot(self) -> dict[str, Any]:
+        """
+        Загрузить все константы с префиксом _PREFIX.
+
+        Ключи перебираются SCAN, значения каждой страницы SCAN читаются одним MGET.
+        Константы, значение которых не удалось прочитать, пропускаются.
+
+        :return: значения констант по ключам Redis.
+        """
+        snapshot: dict[str, Any] = {}
+        async with Redis(connection_pool=self._redis_pool) as redis:
+            cursor = 0
+            while True:  # noqa: WPS457
+                cursor, redis_keys = await redis.scan(
+                    cursor,
+                    match=f"{self._PREFIX}*",
+                    count=settings.constance.snapshot_scan_count,
+                )
+                if redis_keys:
+                    redis_values = await redis.mget(redis_keys)
+                    for redis_key, redis_value in zip(redis_keys, redis_values):
+                        if redis_value is None:
+                            continue
+                        redis_key = _decode(redis_key)
+                        try:
+                            snapshot[redis_key] = self._deserialize(redis_value)
+                        except ValueError as exp:
+                            logger.error(f"Ошибка чтения константы {redis_key}: {exp}")
+                if not cursor:
+                    return snapshot
 
     @classmethod
     def _get_key(cls, name: str) -> str:
         return f"{cls._PREFIX}{name}"
 
+    @staticmethod
+    def _serialize(constance_value: Any) -> bytes:
+        """
+        Преобразуем объект питона в JSON.
+
+        :param constance_value: Значение
+        :returns: байты JSON
+        """
+        return orjson.dumps(constance_value)
+
     @staticmethod
     def _deserialize(redis_bytes: bytes | str) -> Any:
         """
         Преобразуем байты в объект питона.
 
         :param redis_bytes: байты, которое преобразуем
+        :raises ValueError: Если значение в pickle, а чтение pickle отключено.
         :returns: Значение
         """
-        if isinstance(redis_bytes, bytes):
+        if isinstance(redis_bytes, str):
+            # Пул с decode_responses: pickle прочитать нельзя, строка не в JSON возвращается как есть
+            try:
+                return orjson.loads(redis_bytes)
+            except orjson.JSONDecodeError:
+                return redis_bytes
+        if redis_bytes.startswith(PICKLE_PROTO):
+            if not settings.constance.pickle_fallback:
+                raise ValueError("Значение в pickle, чтение pickle отключено.")
             return pickle.loads(redis_bytes)  # noqa: S301
-        return redis_bytes
+        return orjson.loads(redis_bytes)
+
+
+def _decode(redis_value: bytes | str) -> str:
+    if isinstance(redis_value, bytes):
+        return redis_value.decode()
+    return redis_value
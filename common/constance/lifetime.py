@@ -3,16 +3,19 @@ from redis.asyncio import ConnectionPool
 from redis.asyncio.retry import Retry
 from redis.backoff import ConstantBackoff
 
+from common.constance.client import Constance
+from common.constance.near_cache import constance_near_cache
+
 from configuration.settings import settings
 
 
 async def setup_constance() -> ConnectionPool:
     """
-    Создать пул коннектов к redis.
+    Создать пул коннектов к redis, подписаться на изменения констант и загрузить их.
 
     :return: пул коннектов к редис.
     """
-    return ConnectionPool.from_url(
+    constance_pool = ConnectionPool.from_url(
         str(settings.constance.url),
         retry=Retry(
             ConstantBackoff(settings.constance.number_retries_on_error),
@@ -20,6 +23,12 @@ async def setup_constance() -> ConnectionPool:
         ),
         retry_on_error=[BusyLoadingError],
     )
+    await constance_near_cache.start(
+        constance_pool,
+        Constance._PREFIX,  # noqa: WPS437
+        Constance(constance_pool).load_snapshot,
+    )
+    return constance_pool
 
 
 async def stop_constance(constance_pool: ConnectionPool) -> None:
@@ -28,4 +37,5 @@ async def stop_constance(constance_pool: ConnectionPool) -> None:
 
     :param constance_pool: пул коннектов к редис.
     """
+    await constance_near_cache.close()
     await constance_pool.disconnect()
@@ -0,0 +1,151 @@
+"""Кеш констант в памяти процесса."""
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+from prometheus_client import Counter
+from redis.asyncio import ConnectionPool
+from redis.exceptions import RedisError
+
+from common.redis.near_cache import NearCache
+from common.utils.ttl_cache import MISSING, TTLCache
+
+from configuration.settings import settings
+
+constance_near_cache_requests = Counter(
+    "constance_near_cache_requests",
+    "Number of constance reads from the in-process cache by result.",
+    ["result"],
+)
+
+
+class ConstanceNearCache(NearCache[Any]):
+    """
+    Кеш констант в памяти процесса перед Redis.
+
+    Константа удаляется из кеша по уведомлениям NearCache, канал с ключами констант -
+    settings.constance.near_cache_channel. Если уведомление не дошло,
+    константа обновится через settings.constance.near_cache_ttl.
+    При settings.constance.snapshot после подписки и каждые snapshot_refresh_interval
+    секунд в кеш загружаются все константы (load_snapshot), поэтому чтение констант
+    не обращается в Redis и после старта процесса.
+    """
+
+    subscription_name = "изменения констант"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._load_snapshot: Callable[[], Awaitable[dict[str, Any]]] | None = None
+
+    @property
+    def reconnect_delay(self) -> float:
+        """
+        Пауза перед переподключением к уведомлениям об изменении констант, сек.
+
+        :return: пауза, сек.
+        """
+        return settings.constance.near_cache_reconnect_delay
+
+    def create_cache(self) -> TTLCache[str, Any]:
+        """
+        Создать кеш констант.
+
+        Настройки констант есть, только если Constance подключен.
+
+        :return: кеш констант.
+        """
+        return TTLCache(
+            maxsize=settings.constance.near_cache_maxsize,
+            ttl=settings.constance.near_cache_ttl,
+        )
+
+    def get(self, key: str) -> Any:
+        """
+        Получить константу.
+
+        :param key: Ключ константы в Redis.
+        :return: значение константы или MISSING, если её нет в кеше или нет подписки.
+        """
+        if not settings.constance.near_cache or not self.listening:
+            return MISSING
+        constance_value = self.cache.get(key)
+        constance_near_cache_requests.labels(
+            result="miss" if constance_value is MISSING else "hit",
+        ).inc()
+        return constance_value
+
+    def set(self, key: str, constance_value: Any, generation: int) -> None:  # noqa: WPS125
+        """
+        Сохранить константу, если есть подписка и кеш не очищался после её чтения из Redis.
+
+        :param key: Ключ константы в Redis.
+        :param constance_value: Значение константы (None - константы нет в Redis).
+        :param generation: Номер очистки кеша до чтения константы из Redis.
+        """
+        if settings.constance.near_cache and self.listening and generation == self.generation:
+            self.cache.set(key, constance_value)
+
+    async def start(
+        self,
+        redis_pool: ConnectionPool,
+        prefix: str,
+        load_snapshot: Callable[[], Awaitable[dict[str, Any]]] | None = None,
+    ) -> None:
+        """
+        Подписаться на изменения констант и удалять их из кеша по уведомлениям.
+
+        С load_snapshot ожидает подписки и загрузки констант
+        не дольше settings.constance.snapshot_timeout.
+
+        :param redis_pool: Пул коннектов к Redis констант.
+        :param prefix: Префикс ключей констант.
+        :param load_snapshot: Загрузка всех констант из Redis.
+        """
+        if not settings.constance.near_cache or self._tasks:
+            return
+        if settings.constance.snapshot:
+            self._load_snapshot = load_snapshot
+        self.listen(redis_pool, settings.constance.near_cache_channel, prefix)
+        if self._load_snapshot is None:
+            return
+        self._tasks.append(asyncio.create_task(self._refresh_forever()))
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), settings.constance.snapshot_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Константы не загружены при старте, они будут прочитаны из Redis.")
+
+    async def close(self) -> None:
+        """Остановить подписку на изменения констант."""
+        await super().close()
+        self._load_snapshot = None
+
+    async def refresh(self) -> None:
+        """
+        Заменить кеш всеми константами из Redis.
+
+        Без подписки и если кеш очищался во время загрузки, константы не сохраняются.
+        """
+        if self._load_snapshot is None or not self.listening:
+            return
+        generation = self.generation
+        snapshot = await self._load_snapshot()
+        if generation != self.generation or not self.listening:
+            return
+        self.cache.clear()
+        for key, constance_value in snapshot.items():
+            self.cache.set(key, constance_value)
+
+    async def on_subscribed(self) -> None:
+        """Загрузить все константы после подписки."""
+        await self.refresh()
+
+    async def _refresh_forever(self) -> None:
+        while True:  # noqa: WPS457
+            await asyncio.sleep(settings.constance.snapshot_refresh_interval)
+            try:
+                await self.refresh()
+            except RedisError as exc:
+                logger.warning(f"Константы не перезагружены: {exc}")
+
+
+constance_near_cache = ConstanceNearCache()
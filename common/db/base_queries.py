@@ -43,6 +43,20 @@ class BaseQuery:
             lambda record: record.update(name="query-printer"),  # type: ignore
         )
 
+    @asynccontextmanager
+    async def connection(
+        self,
+        timeout: float | None = None,
+    ) -> AsyncGenerator[AsyncConnection[Any], None]:
+        """
+        Контекстный менеджер для получения соединения из пула.
+
+        :param timeout: timeout на получение коннекта (None - timeout пула).
+        :yields: соединение.
+        """
+        async with self.db.connection(timeout=timeout) as connection:  # type: ignore
+            yield connection
+
     @asynccontextmanager
     async def cursor(
         self,
@@ -58,9 +72,7 @@ class BaseQuery:
         :yields: курсор.
         """
         if isinstance(self.db, AsyncConnectionPool):
-            async with self.db.connection(
-                timeout=self.timeout,
-            ) as connection:
+            async with self.connection(self.timeout) as connection:
                 if autocommit is not None:
                     await connection.set_autocommit(autocommit)
                 async with connection.cursor(
@@ -71,6 +83,29 @@ class BaseQuery:
         else:
             yield self.db
 
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncGenerator[AsyncConnection[Any], None]:
+        """
+        Контекстный менеджер для выполнения запросов в pipeline-режиме.
+
+        Запросы, выполненные через курсоры соединения, отправляются в одной транзакции
+        без ожидания ответа на каждый из них: результаты приходят при первом fetch
+        или при выходе из контекста. Если упал один из запросов, выбрасывается
+        исключение именно этого запроса (а не PipelineAborted для последующих).
+        Для каждого запроса нужен отдельный курсор, иначе результат перезапишется.
+
+        :yields: соединение в pipeline-режиме внутри транзакции.
+        """
+        if isinstance(self.db, AsyncConnectionPool):
+            async with self.connection(self.timeout) as connection:
+                async with connection.pipeline():
+                    async with connection.transaction():
+                        yield connection
+        else:
+            async with self.db.connection.pipeline():
+                async with self.db.connection.transaction():
+                    yield self.db.connection
+
 
 class BaseTestQuery(BaseQuery):
     """Базовый класс для тестовых запросов."""
@@ -0,0 +1,76 @@
+"""Keyset-пагинация запросов."""
+from dataclasses import dataclass
+from typing import Any
+
+from psycopg import sql
+
+KEYSET_PARAM_PREFIX = "keyset_"
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    """
+    Страница keyset-пагинации.
+
+    Вместо OFFSET страница начинается со строки, следующей за позицией
+    (значениями колонок сортировки последней строки предыдущей страницы):
+    WHERE (sort_key, id) > (...) ORDER BY sort_key, id. Стоимость страницы
+    не зависит от её номера, если сортировка покрыта индексом.
+    Все колонки сортируются в одном направлении, последней колонкой
+    должен быть уникальный ключ (id).
+    """
+
+    # Колонки сортировки, например ("price", "id") или ("product.price", "product.id")
+    columns: tuple[str, ...]
+    # Значения колонок сортировки, после которых начинается страница. None - с начала
+    position: tuple[Any, ...] | None = None
+    # Страница перед позицией: строки выбираются в обратном порядке
+    reverse: bool = False
+
+    @property
+    def predicate(self) -> sql.Composable:
+        """
+        Условие WHERE для строк страницы.
+
+        :return: (колонки) > (позиция), для reverse - (колонки) < (позиция).
+        """
+        if self.position is None:
+            return sql.SQL("TRUE")
+        return sql.SQL("({columns}) {operator} ({values})").format(
+            columns=sql.SQL(", ").join(_identifier(column) for column in self.columns),
+            operator=sql.SQL("<" if self.reverse else ">"),
+            values=sql.SQL(", ").join(
+                sql.Placeholder(f"{KEYSET_PARAM_PREFIX}{index}")
+                for index in range(len(self.columns))
+            ),
+        )
+
+    @property
+    def order_by(self) -> sql.Composable:
+        """
+        Сортировка строк страницы для ORDER BY.
+
+        :return: колонки сортировки, для reverse - по убыванию.
+        """
+        direction = sql.SQL(" DESC" if self.reverse else "")
+        return sql.SQL(", ").join(
+            sql.Composed([_identifier(column), direction]) for column in self.columns
+        )
+
+    @property
+    def params(self) -> dict[str, Any]:
+        """
+        Параметры условия predicate.
+
+        :return: значения позиции по именам параметров.
+        """
+        if self.position is None:
+            return {}
+        return {
+            f"{KEYSET_PARAM_PREFIX}{index}": value  # noqa: WPS221
+            for index, value in enumerate(self.position)
+        }
+
+
+def _identifier(column: str) -> sql.Identifier:
+    return sql.Identifier(*column.split("."))
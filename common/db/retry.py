@@ -1,83 +1,174 @@
 import asyncio
+import random
+from dataclasses import dataclass, field
 from functools import wraps
+from time import monotonic
 from typing import Any, Awaitable, Callable, ParamSpec, TypeVar
 
+import psycopg
 from loguru import logger
-from psycopg import OperationalError
 from psycopg_pool import PoolTimeout
 
 PT = ParamSpec("PT")
 RT = TypeVar("RT")
 DECF = Callable[PT, Awaitable[RT]]
 
+# serialization_failure, deadlock_detected, admin_shutdown, crash_shutdown, cannot_connect_now
+RETRYABLE_SQLSTATES = frozenset(("40001", "40P01", "57P01", "57P02", "57P03"))
+# connection_exception
+RETRYABLE_SQLSTATE_CLASSES = frozenset(("08",))
 
-def db_command_retryer(  # noqa: WPS231, C901
-    retries: int,
-) -> Callable[[DECF], DECF]:
-    """Фабрика декораторов.
 
-    Принимает параметр retries, который означает сколько
-    раз нужно повторить запрос при падении.
+class RetryBudget:
+    """
+    Общий на процесс лимит повторов.
+
+    Каждый первый вызов добавляет ratio токенов (не больше max_tokens),
+    каждый повтор забирает один токен. Пока БД недоступна, повторы быстро
+    исчерпывают бюджет и не умножают нагрузку на неё.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        """
+        Инициализация бюджета.
+
+        :param ratio: Доля повторов от первых вызовов.
+        :param max_tokens: Максимальный запас повторов.
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        """Учесть первый вызов."""
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        """
+        Забрать токен на повтор.
+
+        :return: True, если повтор разрешён.
+        """
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
 
-    :param retries: количество ретраев.
 
-    :returns: decorator.
+@dataclass(frozen=True)
+class RetryPolicy:
     """
-    left_retries = {"retries": retries}
+    Политика повторов запросов к БД.
+
+    Повторяются таймауты получения соединения, ошибки с SQLSTATE из
+    retryable_sqlstates (serialization failure, deadlock и др.) и, если включено
+    retry_connection_errors, ошибки соединения.
+    Пауза перед повтором - экспоненциальная с полным jitter:
+    random(0, min(max_delay, base_delay * 2 ** номер_повтора)).
+    Повтор не выполняется, если исчерпаны попытки, пауза не укладывается в deadline
+    от начала первой попытки или бюджет повторов процесса исчерпан:
+    в этих случаях выбрасывается исходная ошибка.
+    Оборачиваемая функция должна выполнять транзакцию целиком.
+    """
+
+    # Максимальное количество попыток, включая первую
+    max_attempts: int = 3
+    # Базовая пауза перед повтором, сек
+    base_delay: float = 0.01
+    # Максимальная пауза перед повтором, сек
+    max_delay: float = 0.2
+    # Общее время на все попытки, сек. None - без ограничения
+    deadline: float | None = 2.0
+    retryable_sqlstates: frozenset[str] = RETRYABLE_SQLSTATES
+    # Повторять ли ошибки соединения. Если соединение оборвалось на COMMIT,
+    # неизвестно, применилась ли транзакция, поэтому для неидемпотентных
+    # транзакций их повтор нужно отключать
+    retry_connection_errors: bool = True
+    budget: RetryBudget | None = field(default=None, compare=False)
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """
+        Можно ли повторить вызов после ошибки.
+
+        :param exc: Ошибка вызова.
+        :return: True, если ошибка временная.
+        """
+        if isinstance(exc, (PoolTimeout, asyncio.TimeoutError)):
+            return True
+        # Ошибки драйвера, обёрнутые SQLAlchemy
+        error = getattr(exc, "orig", None) or exc
+        if not isinstance(error, psycopg.Error):
+            return False
+        if error.sqlstate in self.retryable_sqlstates:
+            return True
+        if not self.retry_connection_errors:
+            return False
+        if error.sqlstate is None:
+            return isinstance(error, psycopg.OperationalError)
+        return error.sqlstate[:2] in RETRYABLE_SQLSTATE_CLASSES
+
+    def get_delay(self, retry: int) -> float:
+        """
+        Пауза перед повтором.
 
-    def decorator(  # noqa: WPS231
-        func: DECF,
-    ) -> DECF:
+        :param retry: Номер повтора, начиная с 1.
+        :return: пауза, сек.
+        """
+        return random.uniform(  # noqa: S311
+            0,
+            min(self.max_delay, self.base_delay * 2 ** retry),
+        )
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[RT]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> RT:
+        """
+        Вызвать функцию с повторами.
+
+        :param func: Асинхронная функция, выполняющая запрос к БД.
+        :param args: Позиционные аргументы функции.
+        :param kwargs: Именованные аргументы функции.
+        :raises Exception: Ошибка последней попытки, если повторить нельзя.
+        :return: результат функции.
+        """
+        started_at = monotonic()
+        if self.budget is not None:
+            self.budget.deposit()
+        attempt = 1
+        while True:  # noqa: WPS457
+            try:
+                return await func(*args, **kwargs)
+            except Exception as exc:
+                delay = self.get_delay(attempt)
+                if not self._can_retry(exc, attempt, monotonic() - started_at + delay):
+                    raise
+                logger.warning(
+                    f"Повтор {func.__name__} через {delay:.3f} сек. "
+                    f"(попытка {attempt + 1} из {self.max_attempts}): {exc!r}",
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def __call__(self, func: DECF) -> DECF:  # type: ignore
         """
         Декоратор для функций, которые делают запрос к БД.
 
         :param func: оборачиваемая функция.
-
-        :returns: inner.
+        :returns: функция с повторами.
         """
 
         @wraps(func)
-        async def inner(  # noqa: WPS430
-            *args: Any,
-            **kwargs: Any,
-        ) -> RT:
-            """
-            Добавляем ретраи для функции, которая делает запрос к БД.
-
-            :param args: позиционные агрументы оборачиваемой функции.
-            :param kwargs: именованные агрументы оборачиваемой функции.
-
-            :raises OperationalError: если не получилось выпольнить запрос
-                к базе и все ретраи исчерпаны.
-            :raises PoolTimeout: если не получилось выпольнить запрос
-                к базе из-за PoolTimeout и все ретраи исчерпаны.
-
-            :returns: значения, которые возвращает оборачиваемся функция.
-            """
-            number_of_retries = 1
-            timeout_exc = None
-
-            while number_of_retries < left_retries["retries"] + 1:
-                try:
-                    logger.info(
-                        f"Trying to execute {func.__name__}. "
-                        f"Attempt - {number_of_retries}",
-                    )
-                    return await func(*args, **kwargs)  # type: ignore
-                except (PoolTimeout, asyncio.TimeoutError) as t_exc:
-                    logger.error(f"Can't execute {func.__name__} due to {t_exc}")
-                    number_of_retries += left_retries["retries"] // 3
-                    timeout_exc = t_exc
-                except OperationalError as exc:
-                    logger.error(f"Can't execute {func.__name__} due to {exc}")
-                    number_of_retries += 1
-
-            # если хотя бы один ретрай упал по таймауту, считаем что запрос упал
-            # по таймауту
-            if timeout_exc is not None:
-                raise PoolTimeout("Max retries reached. Can't execute query")
-            raise OperationalError("Max retries reached. Can't execute query")
+        async def inner(*args: Any, **kwargs: Any) -> RT:  # noqa: WPS430
+            return await self.call(func, *args, **kwargs)
 
         return inner  # type: ignore
 
-    return decorator
+    def _can_retry(self, exc: Exception, attempt: int, elapsed: float) -> bool:
+        if attempt >= self.max_attempts or not self.is_retryable(exc):
+            return False
+        if self.deadline is not None and elapsed > self.deadline:
+            return False
+        return self.budget is None or self.budget.withdraw()
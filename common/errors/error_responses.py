@@ -5,6 +5,7 @@ from common.errors.schema import ErrorResponse, ErrResponseBody
 PAGE_NOT_FOUND_ERR_CODE = 1
 UNKNOWN_ERR_CODE = 1
 INVALID_UUID_ERR_CODE = 18
+INVALID_CURSOR_ERR_CODE = 19
 
 
 page_not_found = ErrorResponse(
@@ -27,6 +28,16 @@ invalid_uuid = ErrorResponse(
 )
 
 
+invalid_cursor = ErrorResponse(
+    body=ErrResponseBody(
+        message="Некорректный курсор страницы.",
+        error_code=INVALID_CURSOR_ERR_CODE,
+        verbose_message="Некорректный курсор страницы.",
+    ),
+    status_code=status.HTTP_400_BAD_REQUEST,
+)
+
+
 unknown_error = ErrorResponse(
     body=ErrResponseBody(
         message="Что-то пошло не так.",
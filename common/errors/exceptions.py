@@ -2,6 +2,7 @@ import abc
 from typing import Any
 
 from common.errors.error_responses import (
+    invalid_cursor,
     invalid_uuid,
     page_not_found,
     user_not_authorized,
@@ -51,6 +52,12 @@ class InvalidUuidError(ServiceError):
     response_data: ErrorResponse = invalid_uuid
 
 
+class InvalidCursorError(ServiceError):
+    """Некорректный или подделанный курсор страницы."""
+
+    response_data: ErrorResponse = invalid_cursor
+
+
 class UserNotAuthorizedError(ServiceError):
     """Пользователь не авторизован."""
 
@@ -1,8 +1,18 @@
-from typing import Any, Dict, List, Optional, TypeVar
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+from uuid import UUID
 
 from fastapi import Request
 from pydantic import BaseModel
 
+from common.db.keyset import KeysetPage
+from common.errors.exceptions import InvalidCursorError
 from common.utils.urls import remove_query_param, replace_query_param
 
 from configuration.constants import (
@@ -10,8 +20,21 @@ from configuration.constants import (
     DEFAULT_PAGE_SIZE,
     PAGINATION_MAX_LIMIT,
 )
+from configuration.settings import settings
 
 MT = TypeVar("MT", bound=BaseModel)
+# Длина подписи курсора, байт
+CURSOR_SIGNATURE_SIZE = 16
+# Значения позиции курсора, которые JSON возвращает без изменения типа
+CURSOR_JSON_TYPES = (str, int, float, bool, type(None))
+# Теги типов значений позиции курсора, которых нет в JSON: тип, запись в строку
+# и разбор из строки. datetime раньше date: datetime - наследник date
+CURSOR_VALUE_TYPES: dict[str, tuple[type, Callable[[Any], str], Callable[[str], Any]]] = {
+    "datetime": (datetime, datetime.isoformat, datetime.fromisoformat),
+    "date": (date, date.isoformat, date.fromisoformat),
+    "decimal": (Decimal, str, Decimal),
+    "uuid": (UUID, str, UUID),
+}
 
 
 def _positive_int(
@@ -36,16 +59,123 @@ def _positive_int(
     return ret
 
 
+def _urlsafe_b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _urlsafe_b64decode(encoded: str) -> bytes:
+    return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+
+
+def _sign_cursor(payload: str) -> bytes:
+    return hmac.new(
+        settings.web.pagination_cursor_signing_key.encode(),
+        payload.encode(),
+        hashlib.sha256,
+    ).digest()[:CURSOR_SIGNATURE_SIZE]
+
+
+def _encode_cursor_value(cursor_value: Any) -> Any:
+    if isinstance(cursor_value, CURSOR_JSON_TYPES):
+        return cursor_value
+    for tag, (value_type, to_string, _) in CURSOR_VALUE_TYPES.items():
+        if isinstance(cursor_value, value_type):
+            return {"t": tag, "v": to_string(cursor_value)}
+    raise TypeError(f"Тип значения позиции курсора не поддерживается: {type(cursor_value)}")
+
+
+def _decode_cursor_value(cursor_value: Any) -> Any:
+    if isinstance(cursor_value, CURSOR_JSON_TYPES):
+        return cursor_value
+    if not isinstance(cursor_value, dict) or cursor_value.keys() != {"t", "v"}:
+        raise InvalidCursorError
+    value_type = CURSOR_VALUE_TYPES.get(cursor_value["t"])
+    if value_type is None or not isinstance(cursor_value["v"], str):
+        raise InvalidCursorError
+    try:
+        return value_type[2](cursor_value["v"])
+    except (ArithmeticError, ValueError) as exc:
+        raise InvalidCursorError from exc
+
+
+def encode_cursor(page: KeysetPage) -> str:
+    """
+    Закодировать позицию keyset-страницы в подписанный курсор.
+
+    Значения позиции типов, которых нет в JSON (datetime, date, Decimal, UUID),
+    кодируются с тегом типа и раскодируются тем же типом.
+
+    :param page: Страница keyset-пагинации.
+    :raises TypeError: Тип значения позиции не поддерживается.
+    :return: курсор для query параметра.
+    """
+    position = None
+    if page.position is not None:
+        position = [_encode_cursor_value(cursor_value) for cursor_value in page.position]
+    payload = _urlsafe_b64encode(
+        json.dumps(
+            {"o": page.columns, "p": position, "r": page.reverse},
+            separators=(",", ":"),
+        ).encode(),
+    )
+    return f"{payload}.{_urlsafe_b64encode(_sign_cursor(payload))}"
+
+
+def decode_cursor(cursor: str, columns: tuple[str, ...]) -> KeysetPage:
+    """
+    Раскодировать подписанный курсор keyset-страницы.
+
+    :param cursor: Курсор из query параметра.
+    :param columns: Колонки сортировки, для которых выдан курсор.
+    :raises InvalidCursorError: Курсор поврежден, подделан или выдан для другой сортировки.
+    :return: страница keyset-пагинации.
+    """
+    payload, _, signature = cursor.partition(".")
+    try:
+        valid = hmac.compare_digest(_urlsafe_b64decode(signature), _sign_cursor(payload))
+        decoded = json.loads(_urlsafe_b64decode(payload)) if valid else None
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursorError from exc
+    if (
+        not isinstance(decoded, dict)
+        or decoded.get("o") != list(columns)
+        or not isinstance(decoded.get("p"), list)
+        or len(decoded["p"]) != len(columns)
+    ):
+        raise InvalidCursorError
+    position = tuple(_decode_cursor_value(cursor_value) for cursor_value in decoded["p"])
+    return KeysetPage(columns, position, bool(decoded.get("r")))
+
+
+def _get_field(row: Any, column: str) -> Any:
+    field = column.rsplit(".", 1)[-1]
+    if isinstance(row, dict):
+        return row[field]
+    return getattr(row, field)
+
+
 class CursorPagination:  # noqa: WPS230
-    """Кастомный класс пагинатора."""
+    """
+    Кастомный класс пагинатора.
+
+    По умолчанию страницы выбираются по номеру страницы (OFFSET), стоимость
+    страницы растет с её номером. Если задан ordering, пагинатор работает в
+    keyset-режиме: query параметр cursor содержит подписанную позицию страницы
+    (значения колонок сортировки граничной строки), запрос строит по keyset
+    условие WHERE (колонки) > (позиция), и стоимость страницы не зависит от глубины.
+    """
 
     page_data: List[MT]  # type: ignore
     max_page_size = PAGINATION_MAX_LIMIT
     default_page_size: int = DEFAULT_PAGE_SIZE
     default_page = 1
+    # Колонки сортировки keyset-режима, последняя - уникальный ключ.
+    # Значения берутся из одноименных полей строк. None - пагинация по номеру страницы
+    ordering: Optional[tuple[str, ...]] = None
 
     page_query_param = "page"
     page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
 
     def __init__(self, request: Request):
         self.has_next = False
@@ -67,6 +197,10 @@ class CursorPagination:  # noqa: WPS230
         self.page_number = self._get_page_number()
         self.offset = (self.page_number - 1) * self._page_size
         self.limit = self._page_size + 1
+        self.keyset: Optional[KeysetPage] = None
+        if self.ordering:
+            self.keyset = self._get_keyset()
+            self.offset = 0
 
     def paginate_queryset(
         self,
@@ -83,6 +217,9 @@ class CursorPagination:  # noqa: WPS230
         if not self._page_size:
             return None
 
+        if self.keyset is not None:
+            return self._paginate_keyset(queryset)
+
         if not self.page_number:
             self.page_number = 1
 
@@ -102,6 +239,8 @@ class CursorPagination:  # noqa: WPS230
         """
         Возвращает response с разбивкой по страницам.
 
+        В keyset-режиме count не считается и равен None.
+
         :param data: Сериализованные данные станицы.
         :return: Response.
         """
@@ -130,6 +269,57 @@ class CursorPagination:  # noqa: WPS230
         except (KeyError, ValueError):
             return self.page_size
 
+    def _get_keyset(self) -> KeysetPage:
+        """
+        Возвращает страницу keyset-пагинации из query параметра cursor.
+
+        :return: страница keyset-пагинации.
+        """
+        cursor = self.request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return KeysetPage(self.ordering)  # type: ignore
+        return decode_cursor(cursor, self.ordering)  # type: ignore
+
+    def _paginate_keyset(self, queryset: List[MT]) -> List[MT]:
+        """
+        Возвращает строки keyset-страницы.
+
+        Запрос выбирает limit строк: лишняя строка означает, что в направлении
+        выборки есть еще страница. Строки страницы перед позицией выбираются
+        в обратном порядке и разворачиваются.
+
+        :param queryset: строки запроса.
+        :return: строки страницы в порядке сортировки.
+        """
+        keyset: KeysetPage = self.keyset  # type: ignore
+        self.page_data = list(queryset[: self._page_size])
+        has_more = len(queryset) > len(self.page_data)
+        if keyset.reverse:
+            self.page_data.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = keyset.position is not None
+        return self.page_data
+
+    def _get_keyset_link(self, row: Any, reverse: bool) -> str:
+        """
+        Возвращает ссылку на keyset-страницу после или перед строкой.
+
+        :param row: граничная строка текущей страницы.
+        :param reverse: ссылка на страницу перед строкой.
+        :return: ссылка на страницу.
+        """
+        ordering: tuple[str, ...] = self.ordering  # type: ignore
+        page = KeysetPage(
+            ordering,
+            tuple(_get_field(row, column) for column in ordering),
+            reverse,
+        )
+        url = remove_query_param(self.request.url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(page))
+
     def _get_page_number(self) -> int:
         """
         Возвращает номер страницы из query параметров.
@@ -147,12 +337,14 @@ class CursorPagination:  # noqa: WPS230
         except (KeyError, ValueError):
             return DEFAULT_PAGE_NUMBER
 
-    def _get_count(self) -> int:
+    def _get_count(self) -> Optional[int]:
         """
         Вовзращает фейковое QuerySet.count.
 
-        :return: int
+        :return: int или None в keyset-режиме
         """
+        if self.keyset is not None:
+            return None
         if not self._page_size:
             return 0
         if not self.page_data:
@@ -171,6 +363,10 @@ class CursorPagination:  # noqa: WPS230
         """
         if not self.has_next:
             return None
+        if self.keyset is not None:
+            if not self.page_data:
+                return None
+            return self._get_keyset_link(self.page_data[-1], reverse=False)
         url = self.request.url
         page_number = (self.page_number or 1) + 1
         return replace_query_param(url, self.page_query_param, page_number)
@@ -183,6 +379,10 @@ class CursorPagination:  # noqa: WPS230
         """
         if not self.has_previous:
             return None
+        if self.keyset is not None:
+            if not self.page_data:
+                return None
+            return self._get_keyset_link(self.page_data[0], reverse=True)
         url = self.request.url
         page_number = (self.page_number or 1) - 1
         if page_number < 2:
@@ -0,0 +1,166 @@
+"""Кеш в памяти процесса, очищаемый по уведомлениям Redis."""
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from typing import Any, Generic, TypeVar
+
+from loguru import logger
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import RedisError
+
+from common.utils.ttl_cache import TTLCache
+
+CachedT = TypeVar("CachedT")
+
+# Канал keyspace-уведомлений о ключе: __keyspace@<db>__:<ключ>
+KEYSPACE_CHANNEL_SEPARATOR = "__:"
+
+
+class NearCache(ABC, Generic[CachedT]):
+    """
+    Кеш значений из Redis в памяти процесса.
+
+    Значение удаляется из кеша по keyspace-уведомлению Redis об изменении его ключа
+    (нужен notify-keyspace-events с флагами K, g, $ и x) или по сообщению в канал
+    с ключом значения (пустое сообщение удаляет все значения).
+    При подписке и при её обрыве кеш очищается: уведомления без подписки теряются,
+    поэтому без подписки (listening) кеш не читается и не пополняется.
+    Каждая очистка увеличивает generation: значение, прочитанное из Redis до очистки,
+    не сохраняется.
+
+    Наследник создаёт кеш (create_cache) и задаёт паузу перед переподключением
+    (reconnect_delay): настройки читаются при обращении, так как компоненты
+    с кешем подключаются к сервису не всегда.
+    """
+
+    # Что отслеживает подписка, для логов
+    subscription_name: str = "изменения значений"
+
+    def __init__(self) -> None:
+        self.listening = False
+        self._cache: TTLCache[str, CachedT] | None = None
+        # Номер очистки: значение, прочитанное из Redis до очистки, не кешируется
+        self.generation = 0
+        self._tasks: list[asyncio.Task[None]] = []
+        # Выставляется после первой попытки подписки, успешной или нет
+        self._subscribed = asyncio.Event()
+
+    @property
+    def cache(self) -> TTLCache[str, CachedT]:
+        """
+        Кеш значений.
+
+        Создаётся при первом обращении.
+
+        :return: кеш значений.
+        """
+        if self._cache is None:
+            self._cache = self.create_cache()
+        return self._cache
+
+    @property
+    @abstractmethod
+    def reconnect_delay(self) -> float:
+        """
+        Пауза перед переподключением к уведомлениям, сек.
+
+        :return: пауза, сек.
+        """
+
+    @abstractmethod
+    def create_cache(self) -> TTLCache[str, CachedT]:
+        """
+        Создать кеш значений.
+
+        :return: кеш значений.
+        """
+
+    def invalidate(self, key: str | None = None) -> None:
+        """
+        Удалить значение из кеша.
+
+        :param key: Ключ значения (None - удалить все значения).
+        """
+        self.generation += 1
+        if self._cache is None:
+            return
+        if key:
+            self._cache.pop(key)
+        else:
+            self._cache.clear()
+
+    def listen(
+        self,
+        redis_pool: ConnectionPool,
+        channel: str,
+        key_prefix: str,
+        cache_key_prefix: str = "",
+    ) -> None:
+        """
+        Подписаться на изменения ключей и удалять значения по уведомлениям.
+
+        :param redis_pool: Пул коннектов к Redis.
+        :param channel: Канал pub/sub с ключами изменённых значений.
+        :param key_prefix: Префикс ключей Redis, об изменении которых приходят уведомления.
+        :param cache_key_prefix: Часть ключа Redis, которой нет в ключе кеша.
+        """
+        self._subscribed.clear()
+        self._tasks.append(
+            asyncio.create_task(
+                self._listen_forever(redis_pool, channel, key_prefix, cache_key_prefix),
+            ),
+        )
+
+    async def close(self) -> None:
+        """Остановить подписку на изменения и очистить кеш."""
+        for task in self._tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks.clear()
+        self.listening = False
+        self.invalidate()
+
+    async def on_subscribed(self) -> None:
+        """Действие после подписки и очистки кеша."""
+
+    async def _listen_forever(
+        self,
+        redis_pool: ConnectionPool,
+        channel: str,
+        key_prefix: str,
+        cache_key_prefix: str,
+    ) -> None:
+        db = redis_pool.connection_kwargs.get("db", 0)
+        while True:  # noqa: WPS457
+            try:
+                async with Redis(connection_pool=redis_pool) as redis:
+                    async with redis.pubsub() as pubsub:
+                        await pubsub.subscribe(channel)
+                        await pubsub.psubscribe(f"__keyspace@{db}__:{key_prefix}*")
+                        self.invalidate()
+                        self.listening = True
+                        await self.on_subscribed()
+                        self._subscribed.set()
+                        async for message in pubsub.listen():
+                            self._handle(message, cache_key_prefix)
+            except RedisError as exc:
+                logger.warning(f"Подписка на {self.subscription_name} прервана: {exc}")
+            finally:
+                self.listening = False
+                self._subscribed.set()
+                self.invalidate()
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _handle(self, message: dict[str, Any], cache_key_prefix: str) -> None:
+        if message["type"] == "pmessage":
+            redis_key = _decode(message["channel"]).split(KEYSPACE_CHANNEL_SEPARATOR, 1)[1]
+            self.invalidate(redis_key.removeprefix(cache_key_prefix))
+        elif message["type"] == "message":
+            self.invalidate(_decode(message["data"]))
+
+
+def _decode(redis_value: bytes | str) -> str:
+    if isinstance(redis_value, bytes):
+        return redis_value.decode()
+    return redis_value
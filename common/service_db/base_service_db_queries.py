@@ -1,23 +1,137 @@
+"""Модуль для работы с БД сервиса."""
+from contextlib import asynccontextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any, AsyncGenerator, Awaitable, Callable, TypeVar
+
 from fastapi import Depends
-from psycopg import AsyncCursor
+from psycopg import AsyncConnection, AsyncCursor
+from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
 
 from common.db.base_queries import BaseQuery
-from common.service_db.dependencies import get_service_db_pool
+from common.db.retry import RetryBudget, RetryPolicy
+from common.service_db import instrumentation
+from common.service_db.dependencies import get_service_db_pool, get_service_db_replicas
+from common.service_db.replicas import ReplicaRouter
 
 from configuration.settings import settings
 
+QueryT = TypeVar("QueryT", bound="BaseServiceDbQuery")
+RT = TypeVar("RT")
+
+service_db_retry_budget = RetryBudget(
+    ratio=settings.service_db.retry_budget_ratio,
+    max_tokens=settings.service_db.retry_budget_max_tokens,
+)
+
 
 class BaseServiceDbQuery(BaseQuery):
-    """Базовый класс для всех запросов в service_db."""
+    """
+    Базовый класс для всех запросов в service_db.
+
+    Запросы с read_only = True выполняются через cursor() на реплике,
+    если реплики подключены и есть доступная. Остальные запросы,
+    а также запросы через pipeline() и соединения пула, выполняются на primary.
+    """
+
+    # Запрос только читает данные и допускает отставание реплики
+    read_only: bool = False
+    # Повторы транзакций, помеченных retry_transaction
+    retry_policy = RetryPolicy(
+        max_attempts=settings.service_db.command_retries,
+        base_delay=settings.service_db.retry_base_delay,
+        max_delay=settings.service_db.retry_max_delay,
+        deadline=settings.service_db.retry_deadline,
+        retry_connection_errors=False,
+        budget=service_db_retry_budget,
+    )
 
     def __init__(  # noqa: WPS612
         self,
         db: AsyncConnectionPool | AsyncCursor = Depends(get_service_db_pool),
+        replicas: ReplicaRouter | None = Depends(get_service_db_replicas),
     ):
         """
         Иницилизация базового класса.
 
         :param db: пул соединений с базой или открытый курсор.
+        :param replicas: маршрутизатор запросов на чтение по репликам.
         """
         super().__init__(db, settings.service_db.connection_timeout)
+        # При создании запроса вне FastAPI сюда попадает значение по умолчанию Depends
+        self.replicas = replicas if isinstance(replicas, ReplicaRouter) else None
+
+    @asynccontextmanager
+    async def connection(
+        self,
+        timeout: float | None = None,
+    ) -> AsyncGenerator[AsyncConnection[Any], None]:
+        """
+        Контекстный менеджер для получения соединения из пула с учётом ожидания.
+
+        :param timeout: timeout на получение коннекта (None - timeout пула).
+        :yields: соединение.
+        """
+        started_at = perf_counter()
+        async with super().connection(timeout) as connection:
+            instrumentation.query_observer.observe_acquire(
+                type(self).__name__,
+                perf_counter() - started_at,
+            )
+            yield connection
+
+    @asynccontextmanager
+    async def cursor(
+        self,
+        binary: bool = True,
+        autocommit: bool | None = None,
+    ) -> AsyncGenerator[AsyncCursor[Any], None]:
+        """
+        Контекстный менеджер для получения курсора на реплике или на primary.
+
+        :param binary: Указывает на формат возвращаемых данных.
+        :param autocommit: Если передан bool, то установит autocommit.
+            Если передан None, set_autocommit не вызовется.
+        :yields: курсор.
+        """
+        replica = None
+        if self.read_only and self.replicas and isinstance(self.db, AsyncConnectionPool):
+            replica = self.replicas.pick()
+        if replica is None:
+            async with super().cursor(binary, autocommit) as cursor:
+                yield cursor
+            return
+
+        async with self.replicas.use(replica) as pool:  # type: ignore
+            async with pool.connection(timeout=self.timeout) as connection:
+                if autocommit is not None:
+                    await connection.set_autocommit(autocommit)
+                async with connection.cursor(
+                    binary=binary,
+                    row_factory=dict_row,
+                ) as cursor:
+                    yield cursor
+
+
+def retry_transaction(
+    method: Callable[..., Awaitable[RT]],
+) -> Callable[..., Awaitable[RT]]:
+    """
+    Повторять транзакцию запроса по retry_policy при временных ошибках.
+
+    Метод должен сам брать соединение из пула и выполнять транзакцию целиком.
+    Если запрос выполняется на переданном курсоре (внутри чужой транзакции),
+    повторять нечего: ошибка уходит вызывающему.
+
+    :param method: метод запроса.
+    :return: метод с повторами.
+    """
+
+    @wraps(method)
+    async def inner(self: QueryT, *args: Any, **kwargs: Any) -> RT:  # noqa: WPS430
+        if not isinstance(self.db, AsyncConnectionPool):
+            return await method(self, *args, **kwargs)
+        return await self.retry_policy.call(method, self, *args, **kwargs)
+
+    return inner
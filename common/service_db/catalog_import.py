@@ -0,0 +1,433 @@
+"""
+Массовая загрузка каталога (категорий и товаров) из CSV или NDJSON.
+
+Файл читается построчно чанками по chunk_size строк, поэтому может быть больше памяти.
+Каждый чанк загружается бинарным COPY во временную staging-таблицу и переносится
+в целевую таблицу одним INSERT ... ON CONFLICT (id) DO UPDATE. В той же транзакции
+сохраняется позиция в файле, поэтому повторный запуск для того же файла
+продолжает прерванную загрузку с первого незагруженного чанка:
+
+    python -m common.service_db.catalog_import category categories.csv
+    python -m common.service_db.catalog_import product products.ndjson
+"""
+import csv
+import json
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import IO, Any, Callable
+
+import click
+import psycopg
+from psycopg import sql
+
+from configuration.settings import settings
+
+CSV_FORMAT = "csv"
+NDJSON_FORMAT = "ndjson"
+FORMAT_BY_SUFFIX = {  # noqa: WPS407
+    ".csv": CSV_FORMAT,
+    ".ndjson": NDJSON_FORMAT,
+    ".jsonl": NDJSON_FORMAT,
+}
+DEFAULT_CHUNK_SIZE = 50000
+
+# Колонка staging-таблицы с номером строки: при повторе id в чанке побеждает последняя строка
+SQL_CREATE_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {table}, line BIGINT NOT NULL)
+ON COMMIT DELETE ROWS
+"""
+SQL_SELECT_PROGRESS = """
+SELECT position, rows
+FROM catalog_import_progress
+WHERE source = %(source)s AND fingerprint = %(fingerprint)s
+"""
+SQL_SAVE_PROGRESS = """
+INSERT INTO catalog_import_progress (source, fingerprint, position, rows)
+VALUES (%(source)s, %(fingerprint)s, %(position)s, %(rows)s)
+ON CONFLICT (source) DO UPDATE
+SET
+    fingerprint = excluded.fingerprint,
+    position = excluded.position,
+    rows = excluded.rows,
+    updated_at = NOW()
+"""
+# Строки вставлены с явными id, поэтому последовательность SERIAL догоняется до них
+SQL_SYNC_SEQUENCE = """
+SELECT SETVAL(PG_GET_SERIAL_SEQUENCE({table_name}, 'id'), MAX(id))
+FROM {table}
+"""
+SQL_UPSERT_CATEGORY = """
+INSERT INTO category (id, name, parent_id)
+SELECT DISTINCT ON (id) id, name, parent_id
+FROM catalog_import_category
+ORDER BY id, line DESC
+ON CONFLICT (id) DO UPDATE
+SET
+    name = excluded.name,
+    parent_id = excluded.parent_id
+WHERE
+    (category.name, category.parent_id)
+    IS DISTINCT FROM (excluded.name, excluded.parent_id)
+"""
+SQL_UPSERT_PRODUCT = """
+INSERT INTO product (id, name, quantity, price, category_id)
+SELECT DISTINCT ON (id) id, name, quantity, price, category_id
+FROM catalog_import_product
+ORDER BY id, line DESC
+ON CONFLICT (id) DO UPDATE
+SET
+    name = excluded.name,
+    quantity = excluded.quantity,
+    price = excluded.price,
+    category_id = excluded.category_id
+WHERE
+    (product.name, product.quantity, product.price, product.category_id)
+    IS DISTINCT FROM (excluded.name, excluded.quantity, excluded.price, excluded.category_id)
+"""
+# Триггер цены товара не пересчитывает заказы в транзакции чанка, а отмечает товар
+# для задачи recalculate_stale_order_totals: иначе чанк блокирует все заказы с товарами
+SQL_DEFER_ORDER_TOTALS = "SET LOCAL store.defer_order_totals = 'on'"
+# Остаток из файла заменяет остаток товара целиком, включая шарды остатка
+SQL_DELETE_PRODUCT_SHARDS = """
+DELETE FROM product_stock_shard
+USING catalog_import_product
+WHERE product_stock_shard.product_id = catalog_import_product.id
+"""
+
+
+class CatalogImportError(ValueError):
+    """Ошибка в данных загружаемого файла."""
+
+
+@dataclass(frozen=True)
+class CatalogColumn:
+    """Колонка загружаемой таблицы."""
+
+    name: str
+    # Тип колонки в БД для бинарного COPY
+    pg_type: str
+    parse: Callable[[Any], Any]
+    required: bool = True
+    # Значение для пустого или отсутствующего необязательного поля
+    default: Any = None
+
+
+@dataclass(frozen=True)
+class CatalogTable:
+    """Загружаемая таблица каталога."""
+
+    name: str
+    columns: tuple[CatalogColumn, ...]
+    # Запросы переноса чанка из staging-таблицы
+    upsert_queries: tuple[str, ...]
+
+    @property
+    def staging(self) -> str:
+        """
+        Имя staging-таблицы.
+
+        :return: имя временной таблицы.
+        """
+        return f"catalog_import_{self.name}"
+
+
+@dataclass
+class ImportResult:
+    """Итог загрузки файла."""
+
+    rows: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        """
+        Скорость загрузки.
+
+        :return: строк в секунду.
+        """
+        return self.rows / self.elapsed if self.elapsed else 0
+
+
+def _parse_str(value: Any) -> str:
+    return str(value)
+
+
+CATALOG_TABLES = {  # noqa: WPS407
+    "category": CatalogTable(
+        name="category",
+        columns=(
+            CatalogColumn("id", "int4", int),
+            CatalogColumn("name", "varchar", _parse_str),
+            CatalogColumn("parent_id", "int4", int, required=False),
+        ),
+        upsert_queries=(SQL_UPSERT_CATEGORY,),
+    ),
+    "product": CatalogTable(
+        name="product",
+        columns=(
+            CatalogColumn("id", "int4", int),
+            CatalogColumn("name", "varchar", _parse_str),
+            CatalogColumn("quantity", "int4", int, required=False, default=0),
+            CatalogColumn("price", "numeric", Decimal),
+            CatalogColumn("category_id", "int4", int, required=False),
+        ),
+        upsert_queries=(SQL_DEFER_ORDER_TOTALS, SQL_DELETE_PRODUCT_SHARDS, SQL_UPSERT_PRODUCT),
+    ),
+}
+
+
+class LineReader:
+    """
+    Построчное чтение файла с учётом позиции в байтах.
+
+    position указывает на начало первой непрочитанной строки,
+    поэтому с неё можно продолжить чтение после перезапуска.
+    """
+
+    def __init__(self, file: IO[bytes], position: int = 0):
+        """
+        Инициализация.
+
+        :param file: Файл, открытый в бинарном режиме.
+        :param position: Позиция, с которой начинается чтение.
+        """
+        self.file = file
+        self.position = position
+        file.seek(position)
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Читать строки файла.
+
+        :yields: строка файла.
+        """
+        for line in self.file:
+            self.position += len(line)
+            yield line.decode()
+
+
+def read_records(
+    reader: LineReader,
+    file_format: str,
+    header: list[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Читать записи файла.
+
+    :param reader: Построчное чтение файла.
+    :param file_format: Формат файла: csv или ndjson.
+    :param header: Заголовок CSV.
+    :raises CatalogImportError: Строка NDJSON не является объектом.
+    :yields: запись файла.
+    """
+    if file_format == CSV_FORMAT:
+        for record in csv.reader(reader):
+            yield dict(zip(header or (), record))
+        return
+    for line in reader:
+        if not line.strip():
+            continue
+        record = json.loads(line, parse_float=Decimal)
+        if not isinstance(record, dict):
+            raise CatalogImportError(f"Строка NDJSON не является объектом: {line.strip()}")
+        yield record
+
+
+def parse_record(
+    table: CatalogTable,
+    record: dict[str, Any],
+    record_number: int,
+) -> list[Any]:
+    """
+    Привести запись файла к строке staging-таблицы.
+
+    :param table: Загружаемая таблица.
+    :param record: Запись файла.
+    :param record_number: Номер записи для сообщения об ошибке.
+    :raises CatalogImportError: В записи нет обязательного поля или поле некорректно.
+    :return: значения колонок таблицы.
+    """
+    row = []
+    for column in table.columns:
+        value = record.get(column.name)
+        if value is None or value == "":
+            if column.required:
+                raise CatalogImportError(
+                    f"Запись {record_number}: не заполнено поле {column.name}.",
+                )
+            row.append(column.default)
+            continue
+        try:
+            row.append(column.parse(value))
+        except (ArithmeticError, TypeError, ValueError) as exc:
+            raise CatalogImportError(
+                f"Запись {record_number}: некорректное поле {column.name}={value!r}.",
+            ) from exc
+    return row
+
+
+def get_fingerprint(path: Path) -> str:
+    """
+    Отпечаток файла, чтобы не продолжать загрузку по позиции в другом файле.
+
+    :param path: Путь к файлу.
+    :return: размер и время изменения файла.
+    """
+    stat = path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def import_file(  # noqa: WPS210, WPS213, WPS231
+    conninfo: str,
+    table_name: str,
+    path: Path,
+    file_format: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    restart: bool = False,
+) -> ImportResult:
+    """
+    Загрузить файл в таблицу каталога.
+
+    Родительская категория должна быть в том же или более раннем чанке,
+    категории товаров должны быть загружены до товаров.
+    Остаток товара из файла заменяет его остаток в БД вместе с шардами остатка.
+
+    :param conninfo: URL до БД.
+    :param table_name: Таблица: category или product.
+    :param path: Путь к файлу.
+    :param file_format: Формат файла: csv или ndjson. None - по расширению файла.
+    :param chunk_size: Количество строк в одной транзакции.
+    :param restart: Загрузить файл с начала, даже если он загружался ранее.
+    :raises CatalogImportError: Данные файла некорректны.
+    :return: количество загруженных строк и время загрузки.
+    """
+    table = CATALOG_TABLES[table_name]
+    file_format = file_format or FORMAT_BY_SUFFIX.get(path.suffix.lower())
+    if file_format not in {CSV_FORMAT, NDJSON_FORMAT}:
+        raise CatalogImportError(f"Неизвестный формат файла {path.name}.")
+    source = f"{table.name}:{path.resolve()}"
+    fingerprint = get_fingerprint(path)
+    staging = sql.Identifier(table.staging)
+    copy_query = sql.SQL("COPY {staging} ({columns}) FROM STDIN (FORMAT BINARY)").format(
+        staging=staging,
+        columns=sql.SQL(", ").join(
+            sql.Identifier(column) for column in [*(col.name for col in table.columns), "line"]
+        ),
+    )
+    copy_types = [*(column.pg_type for column in table.columns), "int8"]
+
+    with psycopg.connect(conninfo=conninfo, autocommit=True) as conn:
+        # Данные и позиция фиксируются одной транзакцией: потерянный при сбое
+        # коммит только загрузит чанк повторно
+        conn.execute("SET synchronous_commit TO OFF")
+        conn.execute(
+            sql.SQL(SQL_CREATE_STAGING).format(staging=staging, table=sql.Identifier(table.name)),
+        )
+        position, loaded_rows = 0, 0
+        progress = conn.execute(
+            SQL_SELECT_PROGRESS,
+            {"source": source, "fingerprint": fingerprint},
+        ).fetchone()
+        if progress is not None and not restart:
+            position, loaded_rows = progress
+            click.echo(f"{source}: продолжение с {loaded_rows} строки")
+
+        started_at = time.monotonic()
+        rows = 0
+        with open(path, "rb") as file:
+            header = None
+            if file_format == CSV_FORMAT:
+                header_reader = LineReader(file)
+                header = next(csv.reader(header_reader), [])
+                position = max(position, header_reader.position)
+                missing = {col.name for col in table.columns if col.required} - set(header)
+                if missing:
+                    raise CatalogImportError(
+                        f"В заголовке CSV нет колонок: {', '.join(sorted(missing))}.",
+                    )
+
+            reader = LineReader(file, position)
+            records = read_records(reader, file_format, header)
+            while True:  # noqa: WPS457
+                chunk = []
+                for record in records:
+                    record_number = loaded_rows + rows + len(chunk) + 1
+                    chunk.append([*parse_record(table, record, record_number), record_number])
+                    if len(chunk) >= chunk_size:
+                        break
+                if not chunk:
+                    break
+                with conn.transaction():
+                    with conn.cursor() as cursor:
+                        with cursor.copy(copy_query) as copy:
+                            copy.set_types(copy_types)
+                            for row in chunk:
+                                copy.write_row(row)
+                        for query in table.upsert_queries:
+                            cursor.execute(query)
+                        cursor.execute(
+                            sql.SQL(SQL_SYNC_SEQUENCE).format(
+                                table_name=sql.Literal(table.name),
+                                table=sql.Identifier(table.name),
+                            ),
+                        )
+                        rows += len(chunk)
+                        cursor.execute(
+                            SQL_SAVE_PROGRESS,
+                            {
+                                "source": source,
+                                "fingerprint": fingerprint,
+                                "position": reader.position,
+                                "rows": loaded_rows + rows,
+                            },
+                        )
+                elapsed = time.monotonic() - started_at
+                click.echo(
+                    f"{table.name}: {loaded_rows + rows} строк, "
+                    f"{ImportResult(rows, elapsed).rate:.0f} строк/с",
+                )
+    return ImportResult(rows, time.monotonic() - started_at)
+
+
+@click.command()
+@click.argument("table", type=click.Choice(list(CATALOG_TABLES)))
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice([CSV_FORMAT, NDJSON_FORMAT]),
+    default=None,
+    help="Формат файла, по умолчанию по расширению.",
+)
+@click.option("--chunk-size", default=DEFAULT_CHUNK_SIZE, show_default=True, type=click.IntRange(1))
+@click.option("--restart", is_flag=True, help="Загрузить файл с начала.")
+def catalog_import(
+    table: str,
+    path: Path,
+    file_format: str | None,
+    chunk_size: int,
+    restart: bool,
+) -> None:
+    """Загрузить категории или товары из CSV/NDJSON файла."""
+    try:
+        result = import_file(
+            str(settings.service_db.url),
+            table,
+            path,
+            file_format,
+            chunk_size,
+            restart,
+        )
+    except (CatalogImportError, json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(
+        f"Загружено {result.rows} строк за {result.elapsed:.1f} сек. "
+        f"({result.rate:.0f} строк/с)",
+    )
+
+
+if __name__ == "__main__":
+    catalog_import()
@@ -1,5 +1,8 @@
 from psycopg_pool import AsyncConnectionPool
 from starlette.requests import Request
+from taskiq import Context, TaskiqDepends
+
+from common.service_db.replicas import ReplicaRouter
 
 
 def get_service_db_pool(request: Request) -> AsyncConnectionPool:
@@ -10,3 +13,25 @@ def get_service_db_pool(request: Request) -> AsyncConnectionPool:
     :returns: database connections pool.
     """
     return request.app.state.clients.service_db_pool
+
+
+def get_service_db_replicas(request: Request) -> ReplicaRouter | None:
+    """
+    Вернуть маршрутизатор запросов на чтение по репликам БД сервиса.
+
+    :param request: current request.
+    :returns: маршрутизатор или None, если реплики не подключены.
+    """
+    return getattr(request.app.state.clients, "service_db_replicas", None)
+
+
+def get_taskiq_service_db_pool(
+    context: Context = TaskiqDepends(),
+) -> AsyncConnectionPool:
+    """
+    Вернуть пул коннектов к БД сервиса в taskiq.
+
+    :param context: контекст taskiq.
+    :returns: database connections pool.
+    """
+    return context.state.clients.service_db_pool
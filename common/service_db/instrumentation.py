@@ -0,0 +1,147 @@
+"""Измерение запросов к БД сервиса."""
+import random
+from collections.abc import Mapping, Sequence
+from time import perf_counter
+from typing import Any
+
+import psycopg
+from loguru import logger
+from psycopg import AsyncCursor, sql
+
+from common.service_db.query_registry import service_db_queries
+
+from configuration.settings import settings
+
+UNREGISTERED_QUERY = "unregistered"
+SQL_EXPLAIN = "EXPLAIN (ANALYZE, BUFFERS) "
+
+query_log = logger.patch(
+    lambda record: record.update(name="query-printer"),  # type: ignore
+)
+
+
+class QueryObserver:
+    """Получатель измерений запросов. По умолчанию измерения отбрасываются."""
+
+    def observe_execution(self, query_name: str, duration: float, rows: int) -> None:
+        """
+        Учесть выполнение запроса.
+
+        :param query_name: Имя запроса из реестра запросов.
+        :param duration: Время выполнения, сек.
+        :param rows: Количество возвращённых или изменённых строк.
+        """
+
+    def observe_acquire(self, query_name: str, wait: float) -> None:
+        """
+        Учесть ожидание соединения из пула.
+
+        :param query_name: Имя класса запроса.
+        :param wait: Время ожидания, сек.
+        """
+
+
+query_observer = QueryObserver()
+
+
+def set_query_observer(observer: QueryObserver) -> None:
+    """
+    Установить получателя измерений запросов.
+
+    :param observer: Получатель измерений.
+    """
+    global query_observer  # noqa: WPS420
+    query_observer = observer  # noqa: WPS442
+
+
+def redact_params(params: Any) -> Any:
+    """
+    Скрыть значения параметров запроса для лога.
+
+    :param params: Параметры запроса.
+    :return: параметры с тем же составом и скрытыми значениями.
+    """
+    if isinstance(params, Mapping):
+        return {name: "***" for name in params}
+    if isinstance(params, Sequence) and not isinstance(params, (str, bytes)):
+        return ["***"] * len(params)
+    return params
+
+
+class InstrumentedAsyncCursor(AsyncCursor):  # type: ignore
+    """
+    Курсор, измеряющий время выполнения и количество строк каждого запроса.
+
+    Запросы дольше settings.service_db.slow_query_threshold (0 - отключено)
+    логируются со скрытыми параметрами. Для доли slow_query_explain_rate медленных запросов
+    логируется план EXPLAIN (ANALYZE, BUFFERS): запрос выполняется повторно
+    в транзакции (или точке сохранения), которая затем откатывается.
+    Запросы в pipeline-режиме не измеряются: их результат приходит позже.
+    """
+
+    async def execute(  # type: ignore
+        self,
+        query: Any,
+        params: Any = None,
+        **kwargs: Any,
+    ) -> "InstrumentedAsyncCursor":
+        """
+        Выполнить запрос и учесть его время выполнения.
+
+        :param query: Текст запроса.
+        :param params: Параметры запроса.
+        :param kwargs: Именованные аргументы AsyncCursor.execute.
+        :return: курсор.
+        """
+        if self.connection._pipeline is not None:  # noqa: WPS437
+            return await super().execute(query, params, **kwargs)
+
+        started_at = perf_counter()
+        await super().execute(query, params, **kwargs)
+        duration = perf_counter() - started_at
+
+        query_name = UNREGISTERED_QUERY
+        if isinstance(query, str):
+            query_name = service_db_queries.names.get(query, UNREGISTERED_QUERY)
+        query_observer.observe_execution(query_name, duration, max(self.rowcount, 0))
+        threshold = settings.service_db.slow_query_threshold
+        if 0 < threshold <= duration:
+            await self._log_slow_query(query_name, query, params, duration)
+        return self
+
+    async def _log_slow_query(
+        self,
+        query_name: str,
+        query: Any,
+        params: Any,
+        duration: float,
+    ) -> None:
+        message = (
+            f"Медленный запрос {query_name} ({duration * 1000:.1f} мс): "
+            f"{query!s} params={redact_params(params)}"
+        )
+        if random.random() < settings.service_db.slow_query_explain_rate:  # noqa: S311
+            plan = await self._explain(query, params)
+            if plan:
+                message = f"{message}\n{plan}"
+        query_log.warning(message)
+
+    async def _explain(self, query: Any, params: Any) -> str | None:
+        if isinstance(query, str):
+            query = SQL_EXPLAIN + query
+        else:
+            query = sql.Composed([sql.SQL(SQL_EXPLAIN), query])
+        try:
+            async with self.connection.transaction(force_rollback=True):
+                # Обычный курсор, чтобы EXPLAIN сам не измерялся
+                cursor = AsyncCursor(self.connection)
+                await cursor.execute(query, params, prepare=False)
+                plan = [row[0] for row in await cursor.fetchall()]
+        except psycopg.Error as exc:
+            query_log.warning(f"Не удалось получить план медленного запроса: {exc}")
+            return None
+        # В БД с кодировкой SQL_ASCII текст приходит байтами
+        return "\n".join(
+            line.decode(errors="replace") if isinstance(line, bytes) else line
+            for line in plan
+        )
@@ -1,9 +1,15 @@
 import os
+from typing import Any
 
 import psycopg_pool
+from psycopg import AsyncConnection
 
 from common.db.base_queries import PrepareAsyncConnection
+from common.service_db.instrumentation import InstrumentedAsyncCursor
+from common.service_db.pool import ServiceDbPool
+from common.service_db.replicas import Replica, ReplicaRouter
 
+from configuration.app_settings.service_db_settings import ConnectionMode
 from configuration.settings import settings
 
 
@@ -11,17 +17,12 @@ async def setup_service_db() -> psycopg_pool.AsyncConnectionPool:
     """
     Создать пул коннектов к БД сервиса.
 
+    В режиме pgbouncer подготовленные запросы отключены, в режиме direct
+    запросы подготавливаются на сервере после settings.service_db.prepare_threshold выполнений.
+
     :return: Пул коннектов к БД проекта.
     """
-    service_db_pool = psycopg_pool.AsyncConnectionPool(
-        conninfo=str(settings.service_db.url),
-        connection_class=PrepareAsyncConnection,
-        min_size=settings.service_db.pool_min_size,
-        max_size=settings.service_db.pool_max_size,
-        max_lifetime=settings.service_db.pool_max_lifetime,
-        kwargs={"application_name": os.uname()[1]},
-        open=False,
-    )
+    service_db_pool = _create_pool(str(settings.service_db.url))
     await service_db_pool.open(wait=True)
     return service_db_pool
 
@@ -33,3 +34,56 @@ async def stop_service_db(service_db_pool: psycopg_pool.AsyncConnectionPool) ->
     :param service_db_pool: Пул коннектов к БД проекта.
     """
     await service_db_pool.close()
+
+
+async def setup_service_db_replicas() -> ReplicaRouter:
+    """
+    Создать пулы коннектов к репликам БД сервиса.
+
+    Пулы открываются без ожидания соединений: недоступная при старте реплика
+    не участвует в ротации до первой успешной проверки отставания.
+
+    :return: Маршрутизатор запросов на чтение по репликам.
+    """
+    replicas = []
+    for replica_url in settings.service_db.replica_urls:
+        pool = _create_pool(str(replica_url))
+        await pool.open()
+        replicas.append(Replica(name=f"{replica_url.host}:{replica_url.port}", pool=pool))
+    replica_router = ReplicaRouter(
+        replicas,
+        max_lag=settings.service_db.replica_max_lag,
+        probe_interval=settings.service_db.replica_probe_interval,
+        connection_timeout=settings.service_db.connection_timeout,
+    )
+    await replica_router.start()
+    return replica_router
+
+
+async def stop_service_db_replicas(replica_router: ReplicaRouter) -> None:
+    """
+    Закрыть пулы коннектов к репликам БД сервиса.
+
+    :param replica_router: Маршрутизатор запросов на чтение по репликам.
+    """
+    await replica_router.close()
+
+
+def _create_pool(conninfo: str) -> ServiceDbPool:
+    connection_kwargs: dict[str, Any] = {
+        "application_name": os.uname()[1],
+        "cursor_factory": InstrumentedAsyncCursor,
+    }
+    connection_class: type[AsyncConnection] = PrepareAsyncConnection
+    if settings.service_db.connection_mode == ConnectionMode.DIRECT:
+        connection_kwargs["prepare_threshold"] = settings.service_db.prepare_threshold
+        connection_class = AsyncConnection
+    return ServiceDbPool(
+        conninfo=conninfo,
+        connection_class=connection_class,
+        min_size=settings.service_db.pool_min_size,
+        max_size=settings.service_db.pool_max_size,
+        max_lifetime=settings.service_db.pool_max_lifetime,
+        kwargs=connection_kwargs,
+        open=False,
+    )
@@ -1,16 +1,24 @@
 import datetime
 import os
 import time
+from dataclasses import dataclass
 from importlib import import_module
+from types import ModuleType
 
 import click
 import psycopg
 from loguru import logger
+from psycopg import sql
 from psycopg.errors import UndefinedTable
 
+from common.db.retry import RetryPolicy
+
 from configuration.constants import MIGRATION_MODULE, MIGRATION_PATH
 from configuration.settings import settings
 
+# lock_not_available: не дождались блокировки за lock_timeout
+LOCK_TIMEOUT_SQLSTATES = frozenset(("55P03",))
+
 DEFAULT_MIGRATION_FILE = """def upgrade(cur):
     cur.execute(\"\"\"
 
@@ -24,6 +32,51 @@ def downgrade(cur):
 """
 
 
+@dataclass(frozen=True)
+class MigrationOptions:
+    """
+    Параметры выполнения миграции.
+
+    Задаются флагами уровня модуля миграции: ATOMIC, LOCK_TIMEOUT_MS,
+    STATEMENT_TIMEOUT_MS, LOCK_RETRIES. Миграция с ATOMIC = False выполняется
+    вне транзакции (например, CREATE INDEX CONCURRENTLY): каждый cur.execute
+    должен содержать одну команду, а сама миграция - безопасно выполняться повторно,
+    так как при ошибке или повторе часть команд уже применена.
+    """
+
+    # Выполнять миграцию в одной транзакции вместе с записью в таблицу migrations
+    atomic: bool = True
+    # lock_timeout команд миграции, мс. 0 - без ограничения
+    lock_timeout_ms: int = 0
+    # statement_timeout команд миграции, мс. 0 - без ограничения
+    statement_timeout_ms: int = 0
+    # Повторы миграции после ошибки lock_timeout
+    lock_retries: int = 0
+
+    @classmethod
+    def from_module(cls, migration_module: ModuleType) -> "MigrationOptions":
+        """
+        Прочитать параметры из флагов модуля миграции.
+
+        :param migration_module: Модуль миграции.
+        :return: параметры миграции, для отсутствующих флагов - из настроек.
+        """
+        return cls(
+            atomic=getattr(migration_module, "ATOMIC", True),
+            lock_timeout_ms=getattr(
+                migration_module,
+                "LOCK_TIMEOUT_MS",
+                settings.service_db.migration_lock_timeout_ms,
+            ),
+            statement_timeout_ms=getattr(migration_module, "STATEMENT_TIMEOUT_MS", 0),
+            lock_retries=getattr(
+                migration_module,
+                "LOCK_RETRIES",
+                settings.service_db.migration_lock_retries,
+            ),
+        )
+
+
 @click.group()
 def migrate():
     """Группировка команд миграций для click."""
@@ -48,30 +101,24 @@ def create(name):
 @click.command()
 def downgrade():
     """Отменить последнюю примененную миграцию."""
-    with psycopg.connect(conninfo=str(settings.service_db.url)) as conn:
+    with psycopg.connect(conninfo=str(settings.service_db.url), autocommit=True) as conn:
         with conn.cursor() as cur:
-            with conn.transaction():
-                cur.execute(
-                    "SELECT name, count(*) OVER() FROM migrations "
-                    "GROUP BY name ORDER BY name DESC LIMIT 1;",
-                )
-                fetch = cur.fetchone()
-                if not fetch:
-                    click.echo("Шутки шутить вздумал?")
-                    click.echo("Нельзя откатывать не накатив.")
-                    return
-                if fetch[1] == 1:
-                    click.echo("Шутки шутить вздумал?")
-                    click.echo("Нельзя откатывать первую миграцию.")
-                    return
-                filename = fetch[0]
-                click.echo(f"running downgrade migration file {filename}")
-                migration_module = _import_migration_from_filename(filename)
-                migration_module.downgrade(cur)
-                cur.execute(
-                    "DELETE FROM migrations WHERE migrations.name = %s;",
-                    (filename,),
-                )
+            cur.execute(
+                "SELECT name, count(*) OVER() FROM migrations "
+                "GROUP BY name ORDER BY name DESC LIMIT 1;",
+            )
+            fetch = cur.fetchone()
+        if not fetch:
+            click.echo("Шутки шутить вздумал?")
+            click.echo("Нельзя откатывать не накатив.")
+            return
+        if fetch[1] == 1:
+            click.echo("Шутки шутить вздумал?")
+            click.echo("Нельзя откатывать первую миграцию.")
+            return
+        filename = fetch[0]
+        click.echo(f"running downgrade migration file {filename}")
+        run_migration(conn, filename, upgrade=False)
 
 
 def func_upgrade(db_url: str):  # noqa: WPS210
@@ -89,21 +136,149 @@ def func_upgrade(db_url: str):  # noqa: WPS210
             except UndefinedTable:
                 migrated_filenames = set()
     logger.debug(f"applyed migrations {migrated_filenames}")
-    with psycopg.connect(conninfo=db_url) as conn:
-        with conn.cursor() as cur:
-            with conn.transaction():
-                filenames_to_migrate_set = _all_migration_files() - migrated_filenames
-                if not filenames_to_migrate_set:
-                    click.echo("Nothing to migrate")
-                filenames_to_migrate = sorted(filenames_to_migrate_set)
-                for filename in filenames_to_migrate:
-                    click.echo(f"running upgrade migration file {filename}")
-                    migration_module = _import_migration_from_filename(filename)
-                    migration_module.upgrade(cur)
-                    cur.execute(
-                        "INSERT INTO migrations VALUES (%s);",
-                        (filename,),
-                    )
+    filenames_to_migrate = sorted(_all_migration_files() - migrated_filenames)
+    if not filenames_to_migrate:
+        click.echo("Nothing to migrate")
+        return
+    with psycopg.connect(conninfo=db_url, autocommit=True) as conn:
+        for filename in filenames_to_migrate:
+            click.echo(f"running upgrade migration file {filename}")
+            run_migration(conn, filename, upgrade=True)
+
+
+def run_migration(conn: psycopg.Connection, filename: str, upgrade: bool) -> None:
+    """
+    Применить или откатить миграцию с учётом её флагов.
+
+    Каждая миграция выполняется отдельно: миграция с ATOMIC = True - в своей транзакции
+    вместе с записью в таблицу migrations. После ошибки lock_timeout миграция повторяется
+    до LOCK_RETRIES раз с экспоненциальной паузой.
+
+    :param conn: Соединение с БД в режиме autocommit.
+    :param filename: Имя файла миграции.
+    :param upgrade: True - применить миграцию, False - откатить.
+    :raises psycopg.Error: Ошибка последней попытки.
+    """
+    migration_module = _import_migration_from_filename(filename)
+    options = MigrationOptions.from_module(migration_module)
+    retry_policy = RetryPolicy(
+        max_attempts=options.lock_retries + 1,
+        base_delay=settings.service_db.migration_retry_base_delay,
+        max_delay=settings.service_db.migration_retry_max_delay,
+        deadline=None,
+        retryable_sqlstates=LOCK_TIMEOUT_SQLSTATES,
+        retry_connection_errors=False,
+    )
+    started_at = time.perf_counter()
+    attempt = 1
+    while True:  # noqa: WPS457
+        try:
+            _execute_migration(conn, migration_module, filename, options, upgrade)
+        except psycopg.Error as exc:
+            if attempt >= retry_policy.max_attempts or not retry_policy.is_retryable(exc):
+                raise
+            delay = retry_policy.get_delay(attempt)
+            logger.warning(
+                f"Миграция {filename} не дождалась блокировки, повтор через {delay:.1f} сек. "
+                f"(попытка {attempt + 1} из {retry_policy.max_attempts}): {exc}",
+            )
+            time.sleep(delay)
+            attempt += 1
+            continue
+        break
+    logger.info(
+        f"Миграция {filename} {'применена' if upgrade else 'откачена'} "
+        f"за {time.perf_counter() - started_at:.3f} сек. (попыток: {attempt}).",
+    )
+
+
+def create_index_concurrently(
+    cur: psycopg.Cursor,
+    name: str,
+    table: str,
+    definition: str,
+) -> None:
+    """
+    Создать индекс без блокировки записи в таблицу (для миграций с ATOMIC = False).
+
+    Индекс секционированной таблицы создаётся на родителе (ON ONLY), затем
+    конкурентно на каждой партиции и присоединяется к родителю. Повторный вызов
+    пропускает готовые индексы и пересоздаёт невалидные, оставшиеся после ошибки.
+
+    :param cur: Курсор соединения в режиме autocommit.
+    :param name: Имя индекса.
+    :param table: Имя таблицы.
+    :param definition: Колонки и параметры индекса, например "(category_id, id)".
+    """
+    cur.execute(
+        "SELECT relkind = 'p', (SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)) "
+        "FROM pg_class WHERE oid = %s::regclass",
+        (name, table),
+    )
+    is_partitioned, is_valid = cur.fetchone()  # type: ignore
+    if is_valid:
+        return
+    if not is_partitioned:
+        if is_valid is not None:
+            cur.execute(sql.SQL("DROP INDEX CONCURRENTLY {0}").format(sql.Identifier(name)))
+        cur.execute(
+            sql.SQL("CREATE INDEX CONCURRENTLY {0} ON {1} {2}").format(
+                sql.Identifier(name),
+                sql.Identifier(table),
+                sql.SQL(definition),
+            ),
+        )
+        return
+
+    cur.execute(
+        sql.SQL("CREATE INDEX IF NOT EXISTS {0} ON ONLY {1} {2}").format(
+            sql.Identifier(name),
+            sql.Identifier(table),
+            sql.SQL(definition),
+        ),
+    )
+    cur.execute(
+        "SELECT partition.relname::text, ("
+        "SELECT TRUE FROM pg_inherits AS attached "
+        "JOIN pg_index ON pg_index.indexrelid = attached.inhrelid "
+        "WHERE attached.inhparent = %s::regclass AND pg_index.indrelid = partition.oid"
+        ") FROM pg_inherits JOIN pg_class AS partition ON partition.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = %s::regclass ORDER BY partition.relname",
+        (name, table),
+    )
+    for partition, is_attached in cur.fetchall():
+        if is_attached:
+            continue
+        # В БД с кодировкой SQL_ASCII текст приходит байтами
+        partition = partition.decode() if isinstance(partition, bytes) else partition
+        partition_index = f"{partition}_{name}"
+        create_index_concurrently(cur, partition_index, partition, definition)
+        cur.execute(
+            sql.SQL("ALTER INDEX {0} ATTACH PARTITION {1}").format(
+                sql.Identifier(name),
+                sql.Identifier(partition_index),
+            ),
+        )
+
+
+def drop_index_concurrently(cur: psycopg.Cursor, name: str) -> None:
+    """
+    Удалить индекс без блокировки записи в таблицу (для миграций с ATOMIC = False).
+
+    Индекс секционированной таблицы нельзя удалить конкурентно: он удаляется
+    обычным DROP INDEX, который ждёт блокировку не дольше lock_timeout миграции.
+
+    :param cur: Курсор соединения в режиме autocommit.
+    :param name: Имя индекса.
+    """
+    cur.execute("SELECT relkind = 'I' FROM pg_class WHERE oid = to_regclass(%s)", (name,))
+    row = cur.fetchone()
+    if row is None:
+        return
+    if row[0]:
+        cur.execute(sql.SQL("DROP INDEX {0}").format(sql.Identifier(name)))
+    else:
+        cur.execute(sql.SQL("DROP INDEX CONCURRENTLY {0}").format(sql.Identifier(name)))
 
 
 @click.command()
@@ -117,6 +292,44 @@ migrate.add_command(upgrade)
 migrate.add_command(downgrade)
 
 
+def _execute_migration(
+    conn: psycopg.Connection,
+    migration_module: ModuleType,
+    filename: str,
+    options: MigrationOptions,
+    upgrade: bool,
+) -> None:
+    migration = migration_module.upgrade if upgrade else migration_module.downgrade
+    with conn.cursor() as cur:
+        if options.atomic:
+            with conn.transaction():
+                _set_timeouts(cur, options, is_local=True)
+                migration(cur)
+                _record_migration(cur, filename, upgrade)
+            return
+        _set_timeouts(cur, options, is_local=False)
+        try:
+            migration(cur)
+        finally:
+            cur.execute("RESET lock_timeout")
+            cur.execute("RESET statement_timeout")
+        _record_migration(cur, filename, upgrade)
+
+
+def _set_timeouts(cur: psycopg.Cursor, options: MigrationOptions, is_local: bool) -> None:
+    cur.execute(
+        "SELECT set_config('lock_timeout', %s, %s), set_config('statement_timeout', %s, %s)",
+        (f"{options.lock_timeout_ms}ms", is_local, f"{options.statement_timeout_ms}ms", is_local),
+    )
+
+
+def _record_migration(cur: psycopg.Cursor, filename: str, upgrade: bool) -> None:
+    if upgrade:
+        cur.execute("INSERT INTO migrations VALUES (%s);", (filename,))
+    else:
+        cur.execute("DELETE FROM migrations WHERE migrations.name = %s;", (filename,))
+
+
 def _import_migration_from_filename(filename):
     if ".py" in filename:
         filename = filename[:-3]
@@ -0,0 +1,131 @@
+"""Пул соединений к БД сервиса с телеметрией и адаптивным размером."""
+from time import monotonic
+from typing import Any, Callable
+from weakref import WeakKeyDictionary
+
+from loguru import logger
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+
+# Вызывается при выдаче соединения: время ожидания и возраст соединения, сек.
+GetconnHook = Callable[[float, float], None]
+
+
+class ServiceDbPool(AsyncConnectionPool):  # type: ignore
+    """
+    Пул соединений, сообщающий время ожидания и возраст выдаваемых соединений.
+
+    Счётчики psycopg_pool (get_stats) дают только суммарное время ожидания,
+    поэтому для гистограмм время ожидания каждого запроса соединения
+    передаётся в on_getconn.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """
+        Инициализация пула.
+
+        :param args: позиционные аргументы AsyncConnectionPool.
+        :param kwargs: именованные аргументы AsyncConnectionPool.
+        """
+        self.on_getconn: GetconnHook | None = None
+        self._created_at: WeakKeyDictionary[AsyncConnection[Any], float] = (
+            WeakKeyDictionary()
+        )
+        self._configure_connection = kwargs.pop("configure", None)
+        super().__init__(*args, configure=self._track_connection, **kwargs)
+
+    async def getconn(self, timeout: float | None = None) -> AsyncConnection[Any]:
+        """
+        Получить соединение из пула.
+
+        :param timeout: таймаут ожидания соединения.
+        :return: соединение.
+        """
+        started_at = monotonic()
+        connection = await super().getconn(timeout)
+        if self.on_getconn is not None:
+            now = monotonic()
+            self.on_getconn(
+                now - started_at,
+                now - self._created_at.get(connection, now),
+            )
+        return connection
+
+    async def _track_connection(self, connection: AsyncConnection[Any]) -> None:
+        self._created_at[connection] = monotonic()
+        if self._configure_connection is not None:
+            await self._configure_connection(connection)
+
+
+class PoolSizeController:
+    """
+    Адаптивный максимальный размер пула.
+
+    psycopg_pool открывает соединения до max_size, только пока запросы ждут
+    соединения, и закрывает простаивающие соединения сверх min_size. Контроллер
+    двигает сам max_size в границах [lower, upper] по статистике за интервал:
+    - среднее ожидание соединения больше grow_wait_ms - max_size увеличивается на step;
+    - ожиданий не было и доля занятого времени соединений меньше shrink_usage -
+      max_size уменьшается на step.
+    Контроллер сбрасывает счётчики пула (pop_stats), поэтому должен быть их
+    единственным потребителем.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        pool: AsyncConnectionPool,
+        lower: int,
+        upper: int,
+        grow_wait_ms: float,
+        shrink_usage: float,
+        step: int = 1,
+    ):
+        """
+        Инициализация контроллера.
+
+        :param pool: Пул соединений.
+        :param lower: Минимальный max_size пула.
+        :param upper: Максимальный max_size пула.
+        :param grow_wait_ms: Среднее ожидание соединения, при котором пул растёт, мс.
+        :param shrink_usage: Доля занятого времени соединений, ниже которой пул уменьшается.
+        :param step: Шаг изменения max_size.
+        """
+        self.pool = pool
+        self.lower = max(lower, pool.min_size, 1)
+        self.upper = max(upper, self.lower)
+        self.grow_wait_ms = grow_wait_ms
+        self.shrink_usage = shrink_usage
+        self.step = step
+        self._adjusted_at = monotonic()
+        self.pool.pop_stats()
+
+    async def adjust(self) -> int:
+        """
+        Изменить max_size пула по статистике с предыдущего вызова.
+
+        :return: новый max_size пула.
+        """
+        stats = self.pool.pop_stats()
+        now = monotonic()
+        interval_ms = (now - self._adjusted_at) * 1000
+        self._adjusted_at = now
+
+        max_size = self.pool.max_size
+        queued = stats.get("requests_queued", 0)
+        wait_ms = stats.get("requests_wait_ms", 0) / queued if queued else 0
+        usage = stats.get("usage_ms", 0) / (interval_ms * max_size) if interval_ms else 0
+        if wait_ms > self.grow_wait_ms:
+            new_max_size = min(max_size + self.step, self.upper)
+        elif not queued and usage < self.shrink_usage:
+            new_max_size = max(max_size - self.step, self.lower)
+        else:
+            new_max_size = max_size
+        new_max_size = min(max(new_max_size, self.lower), self.upper)
+
+        if new_max_size != max_size:
+            logger.info(
+                f"Размер пула {self.pool.name}: {max_size} -> {new_max_size}, "
+                f"ожидание соединения {wait_ms:.1f} мс, загрузка {usage:.2f}.",
+            )
+            await self.pool.resize(self.pool.min_size, new_max_size)
+        return new_max_size
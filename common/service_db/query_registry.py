@@ -0,0 +1,160 @@
+"""Реестр SQL-запросов сервиса."""
+import re
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Generic, TypeVar
+
+from psycopg import sql as psycopg_sql
+from pydantic import TypeAdapter
+
+from configuration.constants import SERVICE_PATH
+
+SQL_PATH = Path(f"{SERVICE_PATH}/db/service_db/sql")
+# Поле шаблона запроса, например {keyset} для условия keyset-пагинации
+SQL_TEMPLATE_FIELD_PATTERN = re.compile(r"\{\w+\}")
+
+ResultT = TypeVar("ResultT")
+
+
+class CompiledQuery(Generic[ResultT]):
+    """
+    Текст SQL-запроса с заранее построенным валидатором результата.
+
+    Схема валидации строится один раз при регистрации запроса,
+    а не на каждый вызов запроса.
+    Текст запроса может быть шаблоном с полями {name} для частей запроса,
+    собираемых при вызове (см. format).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sql: str,
+        result_type: type[ResultT] | None = None,
+        names: dict[str, str] | None = None,
+    ):
+        """
+        Инициализация запроса.
+
+        :param name: Имя запроса (имя sql-файла без расширения).
+        :param sql: Текст запроса.
+        :param result_type: Модель строки результата.
+        :param names: Имена запросов по текстам, куда добавляются тексты собранных шаблонов.
+        """
+        self.name = name
+        self.sql = sql
+        self.result_type = result_type
+        self.names = names
+        self.adapter: TypeAdapter[ResultT] | None = None
+        self.list_adapter: TypeAdapter[list[ResultT]] | None = None
+        if result_type is not None:
+            self.adapter = TypeAdapter(result_type)
+            self.list_adapter = TypeAdapter(list[result_type])  # type: ignore
+
+    def format(self, **parts: psycopg_sql.Composable) -> str:
+        """
+        Собрать запрос из шаблона.
+
+        Текст собранного запроса запоминается в реестре под именем шаблона,
+        чтобы измерения запросов учитывались под этим именем.
+
+        :param parts: Части запроса по именам полей шаблона.
+        :return: текст запроса.
+        """
+        query = psycopg_sql.SQL(self.sql).format(**parts).as_string()
+        if self.names is not None:
+            self.names.setdefault(query, self.name)
+        return query
+
+    def validate(self, row: Any) -> ResultT:
+        """
+        Провалидировать строку результата.
+
+        :param row: Строка результата (dict_row).
+        :return: модель строки результата.
+        """
+        return self.adapter.validate_python(row)  # type: ignore
+
+    def validate_many(self, rows: list[Any]) -> list[ResultT]:
+        """
+        Провалидировать строки результата.
+
+        :param rows: Строки результата (dict_row).
+        :return: модели строк результата.
+        """
+        return self.list_adapter.validate_python(rows)  # type: ignore
+
+
+class QueryRegistry:
+    """
+    Реестр SQL-запросов из каталога sql.
+
+    Все файлы каталога читаются один раз при первом обращении к реестру.
+    Запрос регистрируется при импорте модуля запроса вместе с моделью результата,
+    валидатор которой строится при регистрации и переиспользуется всеми вызовами.
+    """
+
+    def __init__(self, sql_path: Path):
+        """
+        Инициализация реестра.
+
+        :param sql_path: Каталог с sql-файлами.
+        """
+        self.sql_path = sql_path
+        self._compiled: dict[tuple[str, Any], CompiledQuery[Any]] = {}
+
+    @cached_property
+    def sources(self) -> dict[str, str]:
+        """
+        Тексты всех запросов каталога.
+
+        :return: текст запроса по имени sql-файла без расширения.
+        """
+        return {
+            sql_file.stem: sql_file.read_text()
+            for sql_file in sorted(self.sql_path.glob("*.sql"))
+        }
+
+    @cached_property
+    def names(self) -> dict[str, str]:
+        """
+        Имена запросов по их текстам.
+
+        :return: имя sql-файла без расширения по тексту запроса.
+        """
+        return {query: name for name, query in self.sources.items()}
+
+    def get(
+        self,
+        name: str,
+        result_type: type[ResultT] | None = None,
+    ) -> CompiledQuery[ResultT]:
+        """
+        Получить запрос по имени sql-файла.
+
+        :param name: Имя sql-файла без расширения.
+        :param result_type: Модель строки результата.
+        :raises KeyError: Если sql-файла нет в каталоге.
+        :return: скомпилированный запрос.
+        """
+        key = (name, result_type)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            if name not in self.sources:
+                raise KeyError(f"Запрос {name} не найден в {self.sql_path}.")
+            compiled = CompiledQuery(name, self.sources[name], result_type, self.names)
+            self._compiled[key] = compiled
+        return compiled
+
+
+def is_sql_template(query: str) -> bool:
+    """
+    Является ли текст запроса шаблоном.
+
+    :param query: Текст запроса.
+    :return: True, если в тексте есть поля {name}.
+    """
+    return SQL_TEMPLATE_FIELD_PATTERN.search(query) is not None
+
+
+service_db_queries = QueryRegistry(SQL_PATH)
@@ -0,0 +1,148 @@
+"""Маршрутизация запросов на чтение по репликам БД сервиса."""
+import asyncio
+import random
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import AsyncGenerator
+
+import psycopg
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+# Отставание реплики в секундах. Реплика, которая применила всё полученное WAL,
+# не отстаёт, даже если последняя транзакция на primary была давно.
+SQL_REPLICA_LAG = """
+SELECT
+    CASE
+        WHEN
+            NOT PG_IS_IN_RECOVERY()
+            OR PG_LAST_WAL_RECEIVE_LSN() = PG_LAST_WAL_REPLAY_LSN()
+            THEN 0
+        ELSE
+            COALESCE(
+                EXTRACT(EPOCH FROM NOW() - PG_LAST_XACT_REPLAY_TIMESTAMP()), 0
+            )
+    END AS lag
+"""
+
+
+@dataclass
+class Replica:
+    """Реплика БД сервиса."""
+
+    name: str
+    pool: AsyncConnectionPool
+    # Количество выполняющихся на реплике запросов
+    outstanding: int = 0
+    # Отставание по последней проверке, None - проверка не удалась
+    lag: float | None = None
+    # Участвует ли реплика в ротации
+    available: bool = False
+
+
+class ReplicaRouter:
+    """
+    Выбор реплики для запросов на чтение.
+
+    Запрос направляется на доступную реплику с наименьшим числом выполняющихся
+    запросов. Фоновая проверка отставания выводит из ротации реплики, отставание
+    которых больше max_lag или которые не ответили, и возвращает их после восстановления.
+    Если доступных реплик нет, запросы на чтение выполняются на primary.
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        max_lag: float,
+        probe_interval: float,
+        connection_timeout: float | None = None,
+    ):
+        """
+        Инициализация маршрутизатора.
+
+        :param replicas: Реплики.
+        :param max_lag: Допустимое отставание реплики, сек.
+        :param probe_interval: Интервал проверки отставания, сек.
+        :param connection_timeout: Таймаут получения соединения для проверки.
+        """
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.probe_interval = probe_interval
+        self.connection_timeout = connection_timeout
+        self._probe_task: asyncio.Task[None] | None = None
+
+    def pick(self) -> Replica | None:
+        """
+        Выбрать реплику с наименьшим числом выполняющихся запросов.
+
+        :return: реплика или None, если доступных реплик нет.
+        """
+        available = [replica for replica in self.replicas if replica.available]
+        if not available:
+            return None
+        least_outstanding = min(replica.outstanding for replica in available)
+        return random.choice(  # noqa: S311
+            [
+                replica
+                for replica in available
+                if replica.outstanding == least_outstanding
+            ],
+        )
+
+    @asynccontextmanager
+    async def use(self, replica: Replica) -> AsyncGenerator[AsyncConnectionPool, None]:
+        """
+        Учесть выполняющийся на реплике запрос.
+
+        :param replica: Реплика.
+        :yields: пул соединений реплики.
+        """
+        replica.outstanding += 1
+        try:
+            yield replica.pool
+        finally:
+            replica.outstanding -= 1
+
+    async def probe(self) -> None:
+        """Проверить отставание всех реплик и обновить их участие в ротации."""
+        await asyncio.gather(*[self._probe_replica(replica) for replica in self.replicas])
+
+    async def start(self) -> None:
+        """Проверить реплики и запустить их периодическую проверку."""
+        await self.probe()
+        if self.replicas:
+            self._probe_task = asyncio.create_task(self._probe_forever())
+
+    async def close(self) -> None:
+        """Остановить проверку и закрыть пулы реплик."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._probe_task
+        for replica in self.replicas:
+            await replica.pool.close()
+
+    async def _probe_forever(self) -> None:
+        while True:  # noqa: WPS457
+            await asyncio.sleep(self.probe_interval)
+            await self.probe()
+
+    async def _probe_replica(self, replica: Replica) -> None:
+        try:
+            async with replica.pool.connection(
+                timeout=self.connection_timeout,
+            ) as connection:
+                cursor = await connection.execute(SQL_REPLICA_LAG)
+                replica.lag = float((await cursor.fetchone())[0])  # type: ignore
+        except (psycopg.Error, PoolTimeout) as exc:
+            replica.lag = None
+            logger.warning(f"Не удалось проверить отставание реплики {replica.name}: {exc}")
+
+        available = replica.lag is not None and replica.lag <= self.max_lag
+        if available != replica.available:
+            logger.warning(
+                f"Реплика {replica.name} "
+                f"{'возвращена в ротацию' if available else 'выведена из ротации'}, "
+                f"отставание: {replica.lag}.",
+            )
+        replica.available = available
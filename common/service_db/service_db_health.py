@@ -3,7 +3,7 @@ import traceback
 from loguru import logger
 from psycopg_pool import AsyncConnectionPool
 
-from common.db.retry import db_command_retryer
+from common.db.retry import RetryPolicy
 from common.db.utils import check_connection
 
 from configuration.settings import settings
@@ -16,9 +16,13 @@ async def service_db_health(service_db_pool: AsyncConnectionPool) -> dict[str, s
     :param service_db_pool: Пул коннектов к БД
     :return: errors
     """
-    retryer = db_command_retryer(settings.service_db.command_retries)
+    retry_policy = RetryPolicy(
+        max_attempts=settings.service_db.command_retries,
+        deadline=settings.service_db.connection_timeout * settings.service_db.command_retries,
+    )
     try:
-        await retryer(check_connection)(
+        await retry_policy.call(
+            check_connection,
             service_db_pool,
             settings.service_db.connection_timeout,
         )
@@ -5,6 +5,7 @@ from psycopg import sql
 from psycopg_pool import AsyncConnectionPool
 
 from common.service_db import migrator
+from common.service_db.replicas import ReplicaRouter
 
 from configuration import clients
 from configuration.constants import SERVICE_NAME_LOWER, SERVICE_PATH
@@ -117,3 +118,33 @@ async def service_db_pool_close(pool: AsyncConnectionPool) -> None:
     """Мок service_db."""
     await pool.close()
     await drop_db()
+
+
+async def service_db_replicas_init(
+    worker_id: str,
+) -> ReplicaRouter:
+    """
+    Мок реплик service_db: реплики не подключены, чтение идёт в primary.
+
+    :return: mocked replica router.
+    """
+    replica_router = ReplicaRouter(
+        [],
+        max_lag=settings.service_db.replica_max_lag,
+        probe_interval=settings.service_db.replica_probe_interval,
+    )
+
+    async def startup():  # noqa: WPS430
+        return replica_router
+
+    async def shutdown(router):  # noqa: WPS430
+        """Реплики закрываются в service_db_replicas_close."""
+
+    clients.CLIENTS_LIFETIME["service_db_replicas"] = (startup, shutdown)
+
+    return replica_router
+
+
+async def service_db_replicas_close(replica_router: ReplicaRouter) -> None:
+    """Мок реплик service_db."""
+    await replica_router.close()
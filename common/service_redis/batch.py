@@ -0,0 +1,235 @@
+"""Пакетное выполнение команд redis."""
+from types import TracebackType
+from typing import Any, Callable, Generic, Mapping, Sequence, Set, TypeVar
+
+from loguru import logger
+from redis import exceptions as redis_exceptions
+from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+
+ResultT = TypeVar("ResultT")
+
+_NOT_EXECUTED = object()
+
+
+class BatchResult(Generic[ResultT]):
+    """Результат команды пакета, доступный после выполнения пакета."""
+
+    def __init__(self) -> None:
+        self._result: Any = _NOT_EXECUTED
+
+    @property
+    def result(self) -> ResultT:
+        """
+        Результат команды.
+
+        :raises RuntimeError: Если пакет ещё не выполнен.
+        :return: результат команды.
+        """
+        if self._result is _NOT_EXECUTED:
+            raise RuntimeError("Пакет команд Redis ещё не выполнен.")
+        return self._result
+
+
+class RedisBatch:
+    """
+    Пакет команд redis.
+
+    Команды накапливаются и отправляются пайплайном: по chunk_size команд за round-trip.
+    Транзакционный пакет (MULTI/EXEC) отправляется одним пайплайном независимо от chunk_size.
+    Методы добавления команд возвращают BatchResult, результат которого доступен
+    после выполнения пакета. Пакет выполняется методом execute или при выходе
+    из контекстного менеджера без исключения.
+    """
+
+    def __init__(
+        self,
+        redis_pool: ConnectionPool,
+        transaction: bool,
+        chunk_size: int,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError(f"Размер пайплайна пакета команд Redis должен быть больше 0: {chunk_size}")
+        self.redis_pool = redis_pool
+        self.transaction = transaction
+        self.chunk_size = chunk_size
+        self._commands: list[tuple[Callable[[Pipeline], Any], BatchResult[Any]]] = []
+
+    async def __aenter__(self) -> "RedisBatch":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            await self.execute()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def get(self, key: str) -> BatchResult[bytes | None]:
+        """
+        Добавить GET.
+
+        :param key: Ключ.
+        :return: значение ключа.
+        """
+        return self._add(lambda pipe: pipe.get(key))
+
+    def mget(self, keys: Sequence[str]) -> BatchResult[list[bytes | None]]:
+        """
+        Добавить MGET.
+
+        :param keys: Ключи.
+        :return: значения ключей в порядке ключей.
+        """
+        return self._add(lambda pipe: pipe.mget(keys))
+
+    def set(  # noqa: WPS125
+        self,
+        key: str,
+        value: Any,  # noqa: WPS110
+        ex: int | None = None,
+        nx: bool = False,
+    ) -> BatchResult[bool | None]:
+        """
+        Добавить SET.
+
+        :param key: Ключ.
+        :param value: Значение.
+        :param ex: Время жизни ключа, сек.
+        :param nx: Записать, только если ключа нет.
+        :return: True или None, если ключ не записан из-за nx.
+        """
+        return self._add(lambda pipe: pipe.set(key, value, ex=ex, nx=nx))
+
+    def mset(self, mapping: Mapping[str, Any]) -> BatchResult[bool]:
+        """
+        Добавить MSET.
+
+        :param mapping: Значения по ключам.
+        :return: True.
+        """
+        return self._add(lambda pipe: pipe.mset(mapping))
+
+    def delete(self, *keys: str) -> BatchResult[int]:
+        """
+        Добавить DEL.
+
+        :param keys: Ключи.
+        :return: количество удалённых ключей.
+        """
+        return self._add(lambda pipe: pipe.delete(*keys))
+
+    def expire(self, key: str, ex: int) -> BatchResult[bool]:
+        """
+        Добавить EXPIRE.
+
+        :param key: Ключ.
+        :param ex: Время жизни ключа, сек.
+        :return: True, если ключ существует.
+        """
+        return self._add(lambda pipe: pipe.expire(key, ex))
+
+    def hget(self, name: str, key: str) -> BatchResult[bytes | None]:
+        """
+        Добавить HGET.
+
+        :param name: Ключ хеша.
+        :param key: Ключ в хеше.
+        :return: значение элемента хеша.
+        """
+        return self._add(lambda pipe: pipe.hget(name, key))
+
+    def hmget(self, name: str, keys: Sequence[str]) -> BatchResult[list[bytes | None]]:
+        """
+        Добавить HMGET.
+
+        :param name: Ключ хеша.
+        :param keys: Ключи в хеше.
+        :return: значения элементов хеша в порядке ключей.
+        """
+        return self._add(lambda pipe: pipe.hmget(name, keys))
+
+    def hgetall(self, name: str) -> BatchResult[dict[bytes, bytes]]:
+        """
+        Добавить HGETALL.
+
+        :param name: Ключ хеша.
+        :return: элементы хеша.
+        """
+        return self._add(lambda pipe: pipe.hgetall(name))
+
+    def hset(self, name: str, mapping: Mapping[str, Any]) -> BatchResult[int]:
+        """
+        Добавить HSET.
+
+        :param name: Ключ хеша.
+        :param mapping: Значения элементов хеша по ключам.
+        :return: количество добавленных элементов.
+        """
+        return self._add(lambda pipe: pipe.hset(name, mapping=mapping))
+
+    def smembers(self, name: str) -> BatchResult[Set[bytes]]:
+        """
+        Добавить SMEMBERS.
+
+        :param name: Ключ множества.
+        :return: элементы множества.
+        """
+        return self._add(lambda pipe: pipe.smembers(name))
+
+    def eval_script(
+        self,
+        script: str,
+        keys: Sequence[str],
+        args: Sequence[Any],
+    ) -> BatchResult[Any]:
+        """
+        Добавить вызов Lua-скрипта через EVALSHA.
+
+        Отсутствующие на сервере скрипты загружаются перед выполнением пайплайна.
+
+        :param script: Текст Lua-скрипта.
+        :param keys: Ключи redis, с которыми работает скрипт (KEYS).
+        :param args: Аргументы скрипта (ARGV).
+        :return: результат выполнения скрипта.
+        """
+        return self._add(lambda pipe: pipe.register_script(script)(keys=keys, args=args))
+
+    async def execute(self) -> None:
+        """
+        Выполнить накопленные команды.
+
+        Если команда завершилась ошибкой, ошибка выбрасывается после выполнения
+        её пайплайна, следующие пайплайны не отправляются.
+
+        :raises redis_exceptions.RedisError: Ошибка Redis.
+        """
+        commands, self._commands = self._commands, []
+        chunk_size = max(len(commands), 1) if self.transaction else self.chunk_size
+        try:
+            async with Redis(connection_pool=self.redis_pool) as redis:
+                for offset in range(0, len(commands), chunk_size):
+                    chunk = commands[offset:offset + chunk_size]
+                    async with redis.pipeline(transaction=self.transaction) as pipe:
+                        for command, _ in chunk:
+                            # Команды пайплайна и вызов скрипта - awaitable, возвращают пайплайн
+                            await command(pipe)
+                        results = await pipe.execute()
+                    for (_, batch_result), command_result in zip(chunk, results):
+                        batch_result._result = command_result  # noqa: WPS437
+        except redis_exceptions.RedisError as exp:
+            logger.error(
+                f"Ошибка выполнения пакета команд Redis: {exp}",
+                exc_info=True,
+            )
+            raise
+
+    def _add(self, command: Callable[[Pipeline], Any]) -> BatchResult[Any]:
+        batch_result: BatchResult[Any] = BatchResult()
+        self._commands.append((command, batch_result))
+        return batch_result
@@ -0,0 +1,202 @@
+"""Read-through кеш значений в Redis."""
+import asyncio
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from loguru import logger
+from pydantic import BaseModel, TypeAdapter
+from redis.exceptions import RedisError
+
+from common.service_redis.client import ServiceRedis
+
+CachedT = TypeVar("CachedT")
+
+# Удалить значения и увеличить их версии.
+# KEYS: ключ значения и ключ его версии по очереди; ARGV[1] - время жизни версии, сек.
+LUA_INVALIDATE = """
+for index = 1, #KEYS, 2 do
+    redis.call('DEL', KEYS[index])
+    redis.call('INCR', KEYS[index + 1])
+    redis.call('EXPIRE', KEYS[index + 1], ARGV[1])
+end
+return 1
+"""
+
+# Записать значение, если его версия не изменилась с начала загрузки.
+# KEYS[1] - ключ значения, KEYS[2] - ключ версии;
+# ARGV[1] - версия до загрузки ('' - версии не было), ARGV[2] - значение, ARGV[3] - ttl, сек.
+LUA_SET_IF_VERSION = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+class CacheEntry(BaseModel):
+    """Модель значения в кеше."""
+
+    # Значение в JSON-совместимом виде, None - значения нет в источнике
+    value: Any  # noqa: WPS110
+    # Время загрузки значения из источника, сек.
+    delta: float
+    # Время истечения значения, unix timestamp
+    expiry: float
+
+
+class ReadThroughCache(Generic[CachedT]):
+    """
+    Read-through кеш значений в Redis.
+
+    При промахе значение загружается через loader и записывается в Redis.
+    Одновременные загрузки одного ключа в процессе объединяются: загружает одна
+    корутина, остальные ждут её результата.
+    Значение обновляется до истечения с вероятностью, растущей к концу срока жизни
+    (now - delta * beta * ln(random()) >= expiry, где delta - время последней загрузки),
+    поэтому ключи, записанные одновременно, не истекают одновременно, а горячий ключ
+    обновляет одна корутина, пока остальные читают текущее значение.
+    Отсутствующее в источнике значение (None) кешируется на missing_ttl.
+    Удаление из кеша увеличивает версию значения в Redis ({prefix}:{key}:version),
+    а загруженное значение записывается, только если версия не изменилась с начала
+    загрузки, поэтому загрузка, начатая до удаления в любом процессе,
+    не возвращает в кеш устаревшее значение. Версия живёт ttl секунд: значение,
+    загружавшееся дольше, после удаления может остаться в кеше до истечения.
+    Если Redis недоступен, значение загружается из источника.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        value_type: type[CachedT],
+        ttl: int,
+        missing_ttl: int,
+        beta: float = 1.0,
+    ) -> None:
+        self.prefix = prefix
+        self.adapter: TypeAdapter[CachedT | None] = TypeAdapter(value_type | None)  # type: ignore
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.beta = beta
+        self._loads: dict[str, asyncio.Future[CachedT | None]] = {}
+        self._invalidated: set[str] = set()
+
+    def get_name(self, key: str) -> str:
+        """
+        Ключ Redis значения.
+
+        :param key: Ключ значения.
+        :return: ключ Redis.
+        """
+        return f"{self.prefix}:{key}"
+
+    def get_version_name(self, name: str) -> str:
+        """
+        Ключ Redis версии значения.
+
+        :param name: Ключ Redis значения.
+        :return: ключ Redis версии.
+        """
+        return f"{name}:version"
+
+    async def get(
+        self,
+        redis: ServiceRedis,
+        key: str,
+        loader: Callable[[], Awaitable[CachedT | None]],
+    ) -> CachedT | None:
+        """
+        Получить значение из кеша или загрузить его из источника.
+
+        :param redis: Клиент Redis.
+        :param key: Ключ значения.
+        :param loader: Загрузка значения из источника.
+        :return: значение или None, если его нет в источнике.
+        """
+        name = self.get_name(key)
+        try:
+            async with redis.client() as client:
+                raw_entry, version = await client.mget(name, self.get_version_name(name))
+        except RedisError as exp:
+            logger.warning(f"Кеш {name} недоступен: {exp}")
+            return await loader()
+        if raw_entry is None:
+            return await self._load(redis, name, loader, version)
+        entry = CacheEntry.model_validate_json(raw_entry)
+        if name in self._loads or not self._should_refresh(entry):
+            return self.adapter.validate_python(entry.value)
+        return await self._load(redis, name, loader, version)
+
+    async def invalidate(self, redis: ServiceRedis, keys: list[str]) -> None:
+        """
+        Удалить значения из кеша.
+
+        Загрузка, начатая до удаления в этом или другом процессе,
+        не записывает своё значение в кеш.
+        Ошибка Redis не выбрасывается: устаревшее значение истечёт через ttl.
+        :param redis: Клиент Redis.
+        :param keys: Ключи значений.
+        """
+        if not keys:
+            return
+        names = [self.get_name(key) for key in keys]
+        self._invalidated.update(name for name in names if name in self._loads)
+        redis_keys = [
+            redis_key
+            for name in names
+            for redis_key in (name, self.get_version_name(name))
+        ]
+        try:
+            await redis.eval_script(LUA_INVALIDATE, keys=redis_keys, args=[self.ttl])
+        except RedisError as exp:
+            logger.warning(f"Не удалось удалить из кеша {names}: {exp}")
+
+    def _should_refresh(self, entry: CacheEntry) -> bool:
+        early = -entry.delta * self.beta * math.log(1 - random.random())  # noqa: S311
+        return time.time() + early >= entry.expiry
+
+    async def _load(
+        self,
+        redis: ServiceRedis,
+        name: str,
+        loader: Callable[[], Awaitable[CachedT | None]],
+        version: bytes | None,
+    ) -> CachedT | None:
+        load = self._loads.get(name)
+        if load is None:
+            load = asyncio.ensure_future(self._refill(redis, name, loader, version))
+            self._loads[name] = load
+            load.add_done_callback(lambda _: self._loads.pop(name, None))
+        # Отмена ожидающего запроса не отменяет загрузку для остальных
+        return await asyncio.shield(load)
+
+    async def _refill(
+        self,
+        redis: ServiceRedis,
+        name: str,
+        loader: Callable[[], Awaitable[CachedT | None]],
+        version: bytes | None,
+    ) -> CachedT | None:
+        self._invalidated.discard(name)
+        started_at = time.monotonic()
+        cache_value = await loader()
+        if name in self._invalidated:
+            self._invalidated.discard(name)
+            return cache_value
+        ttl = self.ttl if cache_value is not None else self.missing_ttl
+        entry = CacheEntry(
+            value=self.adapter.dump_python(cache_value, mode="json"),
+            delta=time.monotonic() - started_at,
+            expiry=time.time() + ttl,
+        )
+        try:
+            await redis.eval_script(
+                LUA_SET_IF_VERSION,
+                keys=[name, self.get_version_name(name)],
+                args=[version or "", entry.model_dump_json(), ttl],
+            )
+        except RedisError as exp:
+            logger.warning(f"Не удалось записать в кеш {name}: {exp}")
+        return cache_value
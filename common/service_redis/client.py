@@ -1,6 +1,6 @@
 """Базовый клиент redis."""
 from contextlib import asynccontextmanager
-from typing import Any, Mapping, Optional, Set
+from typing import Any, Mapping, Optional, Sequence, Set
 
 from fastapi import Depends
 from loguru import logger
@@ -8,6 +8,7 @@ from redis import exceptions as redis_exceptions
 from redis.asyncio import ConnectionPool, Redis
 
 from common.redis import BaseRedis
+from common.service_redis.batch import RedisBatch
 from common.service_redis.dependencies import get_service_redis_pool
 
 from configuration.settings import settings
@@ -210,6 +211,33 @@ class ServiceRedis(BaseRedis):
             )
             raise
 
+    async def eval_script(
+        self,
+        script: str,
+        keys: Sequence[str],
+        args: Sequence[Any],
+    ) -> Any:
+        """
+        Выполнить Lua-скрипт атомарно на сервере Redis.
+
+        Скрипт вызывается через EVALSHA и загружается на сервер при первом вызове.
+
+        :param script: текст Lua-скрипта.
+        :param keys: ключи Redis, с которыми работает скрипт (KEYS).
+        :param args: аргументы скрипта (ARGV).
+        :raises redis_exceptions.RedisError: Ошибка Redis.
+        :return: результат выполнения скрипта.
+        """
+        try:
+            async with Redis(connection_pool=self.redis_pool) as redis:
+                return await redis.register_script(script)(keys=keys, args=args)
+        except redis_exceptions.RedisError as exp:
+            logger.error(
+                f"Ошибка выполнения Lua-скрипта Redis: {exp}",
+                exc_info=True,
+            )
+            raise
+
     async def set(
         self,
         key: str,
@@ -238,6 +266,91 @@ class ServiceRedis(BaseRedis):
         async with Redis(connection_pool=self.redis_pool) as redis:
             return await redis.delete(key)
 
+    def batch(
+        self,
+        transaction: bool = False,
+        chunk_size: int | None = None,
+    ) -> RedisBatch:
+        """
+        Создать пакет команд, отправляемых пайплайном.
+
+        Пример:
+            async with redis.batch() as batch:
+                stock = batch.get("stock")
+                batch.set("order", 1, ex=60)
+            stock.result
+
+        :param transaction: Выполнить пакет в MULTI/EXEC (пакет не разбивается на части).
+        :param chunk_size: Команд в пайплайне (None - settings.service_redis.batch_chunk_size).
+        :raises ValueError: chunk_size меньше 1.
+        :return: пакет команд.
+        """
+        if chunk_size is None:
+            chunk_size = settings.service_redis.batch_chunk_size
+        return RedisBatch(self.redis_pool, transaction=transaction, chunk_size=chunk_size)
+
+    async def mget(self, keys: Sequence[str]) -> list[bytes | None]:
+        """
+        Получить значения ключей.
+
+        Ключи запрашиваются командами MGET по settings.service_redis.batch_chunk_size ключей,
+        отправляемыми одним пакетом.
+
+        :param keys: Ключи.
+        :return: значения в порядке ключей (None для отсутствующих ключей).
+        """
+        chunk_size = settings.service_redis.batch_chunk_size
+        async with self.batch() as batch:
+            chunks = [
+                batch.mget(keys[offset:offset + chunk_size])
+                for offset in range(0, len(keys), chunk_size)
+            ]
+        return [cache_value for chunk in chunks for cache_value in chunk.result]
+
+    async def mset(
+        self,
+        mapping: Mapping[str, Any],
+        ex: int | None = settings.service_redis.default_ttl,
+    ) -> None:
+        """
+        Сохранить значения ключей.
+
+        MSET не задаёт время жизни, поэтому при ex значения записываются командами SET
+        одним пакетом, без ex - командами MSET по settings.service_redis.batch_chunk_size ключей.
+        Пакет не транзакционный: при ошибке часть значений может быть записана.
+
+        :param mapping: Значения по ключам.
+        :param ex: Время жизни ключей, сек.
+        """
+        async with self.batch() as batch:
+            if ex is not None:
+                for key, cache_value in mapping.items():
+                    batch.set(key, cache_value, ex=ex)
+                return
+            items = list(mapping.items())
+            chunk_size = settings.service_redis.batch_chunk_size
+            for offset in range(0, len(items), chunk_size):
+                batch.mset(dict(items[offset:offset + chunk_size]))
+
+    async def hmget(self, name: str, keys: Sequence[str]) -> list[bytes | None]:
+        """
+        Получить значения элементов хеша.
+
+        Элементы запрашиваются командами HMGET по settings.service_redis.batch_chunk_size ключей,
+        отправляемыми одним пакетом.
+
+        :param name: Ключ хеша в Redis.
+        :param keys: Ключи в хеше.
+        :return: значения в порядке ключей (None для отсутствующих элементов).
+        """
+        chunk_size = settings.service_redis.batch_chunk_size
+        async with self.batch() as batch:
+            chunks = [
+                batch.hmget(name, keys[offset:offset + chunk_size])
+                for offset in range(0, len(keys), chunk_size)
+            ]
+        return [cache_value for chunk in chunks for cache_value in chunk.result]
+
     @asynccontextmanager
     async def client(self):
         """
@@ -1,5 +1,6 @@
 from redis.asyncio import ConnectionPool
 from starlette.requests import Request
+from taskiq import Context, TaskiqDepends
 
 
 def get_service_redis_pool(request: Request) -> ConnectionPool:
@@ -10,3 +11,15 @@ def get_service_redis_pool(request: Request) -> ConnectionPool:
     :returns: redis connections pool.
     """
     return request.app.state.clients.service_redis_pool
+
+
+def get_taskiq_service_redis_pool(
+    context: Context = TaskiqDepends(),
+) -> ConnectionPool:
+    """
+    Вернуть пул коннектов к редис в taskiq.
+
+    :param context: контекст taskiq.
+    :returns: redis connections pool.
+    """
+    return context.state.clients.service_redis_pool
@@ -5,7 +5,7 @@ from loguru import logger
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine
 
-from common.db.retry import db_command_retryer
+from common.db.retry import RetryPolicy
 
 from configuration.settings import settings
 
@@ -30,9 +30,13 @@ async def sqlalchemy_db_health(sqlalchemy_engine: AsyncEngine) -> dict[str, str]
     :param sqlalchemy_engine: движок SQLAlchemy
     :return: errors
     """
-    retryer = db_command_retryer(settings.sqlalchemy_db.command_retries)
+    retry_policy = RetryPolicy(
+        max_attempts=settings.sqlalchemy_db.command_retries,
+        deadline=settings.sqlalchemy_db.connection_timeout * settings.sqlalchemy_db.command_retries,
+    )
     try:
-        await retryer(check_db_connection)(
+        await retry_policy.call(
+            check_db_connection,
             sqlalchemy_engine,
             settings.sqlalchemy_db.connection_timeout,
         )
@@ -0,0 +1,99 @@
+"""Кеш проверок jti в памяти процесса."""
+from typing import Any
+
+from prometheus_client import Counter
+from redis.asyncio import ConnectionPool
+
+from common.redis.near_cache import NearCache
+from common.utils.ttl_cache import MISSING, TTLCache
+
+from configuration.settings import settings
+
+token_cache_local_requests = Counter(
+    "token_cache_local_requests",
+    "Number of jti checks served from the in-process cache by result.",
+    ["result"],
+)
+
+
+class JtiCache(NearCache[bool]):
+    """
+    Результаты проверки jti в памяти процесса перед кешем токенов в Redis.
+
+    Найденный jti хранится settings.token_cache.local_cache_ttl секунд,
+    ненайденный - local_cache_negative_ttl секунд. jti удаляется из кеша
+    по уведомлениям NearCache, канал с jti - settings.token_cache.revocation_channel
+    (например, при выходе пользователя).
+    """
+
+    subscription_name = "отзыв токенов"
+
+    @property
+    def reconnect_delay(self) -> float:
+        """
+        Пауза перед переподключением к уведомлениям об отзыве токенов, сек.
+
+        :return: пауза, сек.
+        """
+        return settings.token_cache.local_cache_reconnect_delay
+
+    def create_cache(self) -> TTLCache[str, bool]:
+        """
+        Создать кеш проверок jti.
+
+        Настройки кеша токенов есть, только если он подключен.
+
+        :return: кеш проверок jti.
+        """
+        return TTLCache(
+            maxsize=settings.token_cache.local_cache_maxsize,
+            ttl=settings.token_cache.local_cache_ttl,
+        )
+
+    def get(self, jti: str) -> bool | Any:
+        """
+        Получить результат проверки jti.
+
+        :param jti: jti пользователя.
+        :return: есть ли jti в кеше токенов или MISSING, если результата нет или нет подписки.
+        """
+        if not settings.token_cache.local_cache or not self.listening:
+            return MISSING
+        is_cached = self.cache.get(jti)
+        token_cache_local_requests.labels(
+            result="miss" if is_cached is MISSING else "hit",
+        ).inc()
+        return is_cached
+
+    def set(self, jti: str, is_cached: bool, generation: int) -> None:  # noqa: WPS125
+        """
+        Сохранить результат проверки jti, если есть подписка и кеш не очищался после проверки в Redis.
+
+        :param jti: jti пользователя.
+        :param is_cached: есть ли jti в кеше токенов.
+        :param generation: Номер очистки кеша до проверки jti в Redis.
+        """
+        if not settings.token_cache.local_cache or not self.listening or generation != self.generation:
+            return
+        if is_cached:
+            self.cache.set(jti, is_cached)
+        else:
+            self.cache.set(jti, is_cached, ttl=settings.token_cache.local_cache_negative_ttl)
+
+    async def start(self, redis_pool: ConnectionPool, prefix: str) -> None:
+        """
+        Подписаться на изменения кеша токенов и удалять jti по уведомлениям.
+
+        :param redis_pool: Пул коннектов к кешу токенов.
+        :param prefix: Префикс ключей jti.
+        """
+        if settings.token_cache.local_cache and not self._tasks:
+            self.listen(
+                redis_pool,
+                settings.token_cache.revocation_channel,
+                f"{prefix}:",
+                cache_key_prefix=f"{prefix}:",
+            )
+
+
+jti_cache = JtiCache()
@@ -3,16 +3,19 @@ from redis.asyncio import ConnectionPool
 from redis.asyncio.retry import Retry
 from redis.backoff import ConstantBackoff
 
+from common.token_cache.jti_cache import jti_cache
+from common.token_cache.token_cache import TokenCacheService
+
 from configuration.settings import settings
 
 
 async def setup_token_cache_redis() -> ConnectionPool:
     """
-    Создать пул коннектов к редису кеша токенов.
+    Создать пул коннектов к редису кеша токенов и подписаться на отзыв токенов.
 
     :return: Пул токен кеша
     """
-    return ConnectionPool.from_url(
+    token_cache_redis_pool = ConnectionPool.from_url(
         str(settings.token_cache.redis_url),
         retry=Retry(
             ConstantBackoff(settings.token_cache.redis_number_retries_on_error),
@@ -20,6 +23,9 @@ async def setup_token_cache_redis() -> ConnectionPool:
         ),
         retry_on_error=[BusyLoadingError],
     )
+    if settings.auth.token_cache_checking:
+        await jti_cache.start(token_cache_redis_pool, TokenCacheService.PREFIX)
+    return token_cache_redis_pool
 
 
 async def stop_token_cache_redis(token_cache_redis_pool: ConnectionPool) -> None:
@@ -28,4 +34,5 @@ async def stop_token_cache_redis(token_cache_redis_pool: ConnectionPool) -> None
 
     :param token_cache_redis_pool: Пул токен кеша.
     """
+    await jti_cache.close()
     await token_cache_redis_pool.disconnect()
@@ -4,6 +4,8 @@ from redis import exceptions as redis_exceptions
 from redis.asyncio import ConnectionPool, Redis
 
 from common.token_cache.dependencies import get_token_cache_redis_pool
+from common.token_cache.jti_cache import jti_cache
+from common.utils.ttl_cache import MISSING
 
 from configuration.settings import settings
 
@@ -22,23 +24,25 @@ class TokenCacheService:
     async def is_jwt_cached(self, jti: str) -> bool:
         """Проверка нализия jwt в кеше токенов.
 
+        Результат проверки кешируется в памяти процесса (jti_cache),
+        ошибка подключения к кешу токенов не кешируется.
+
         :param jti: jti пользователя
         :return: есть ли jti в кеше токенов
         """
-        if settings.auth.token_cache_checking:
-            profile_hex = ":".join([self.PREFIX, str(jti)])
-            logger.info(f"Сформирован profile_hex: {profile_hex}")
-            try:
-                async with Redis(  # type: ignore
-                    connection_pool=self._redis_pool,
-                ) as redis:
-                    cache = await redis.get(
-                        profile_hex,
-                    )
-                    logger.info(f"Кеш токенов получен {cache!r}.")
-            except redis_exceptions.ConnectionError as exp:
-                logger.error(f"Ошибка подключения к кешу токенов {exp}.")
-                return True
-            return bool(cache)
-        logger.info("Кеш токенов отключен.")
-        return True
+        if not settings.auth.token_cache_checking:
+            return True
+        is_cached = jti_cache.get(jti)
+        if is_cached is not MISSING:
+            return is_cached
+        generation = jti_cache.generation
+        try:
+            async with Redis(  # type: ignore
+                connection_pool=self._redis_pool,
+            ) as redis:
+                is_cached = bool(await redis.get(f"{self.PREFIX}:{jti}"))
+        except redis_exceptions.ConnectionError as exp:
+            logger.error(f"Ошибка подключения к кешу токенов {exp}.")
+            return True
+        jti_cache.set(jti, is_cached, generation)
+        return is_cached
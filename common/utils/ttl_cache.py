@@ -0,0 +1,71 @@
+"""Ограниченный кеш в памяти процесса со временем жизни значений."""
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+CachedT = TypeVar("CachedT")
+
+# Значение get для ключа, которого нет в кеше (None может быть закешированным значением)
+MISSING: Any = object()
+
+
+class TTLCache(Generic[KeyT, CachedT]):
+    """
+    LRU-кеш в памяти процесса со временем жизни значений.
+
+    При превышении maxsize вытесняется давно не читанное значение.
+    Истёкшие значения удаляются при чтении или вытеснении.
+    Кеш не потокобезопасен и рассчитан на использование из одного event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[KeyT, tuple[float, CachedT]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: KeyT, default: Any = MISSING) -> CachedT | Any:
+        """
+        Получить значение.
+
+        :param key: Ключ.
+        :param default: Значение, если ключа нет или значение истекло.
+        :return: значение или default.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]  # noqa: WPS420
+            return default
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: KeyT, cache_value: CachedT, ttl: float | None = None) -> None:  # noqa: WPS125
+        """
+        Сохранить значение.
+
+        :param key: Ключ.
+        :param cache_value: Значение.
+        :param ttl: Время жизни значения, сек. (по умолчанию ttl кеша).
+        """
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), cache_value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: KeyT) -> None:
+        """
+        Удалить значение.
+
+        :param key: Ключ.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Удалить все значения."""
+        self._entries.clear()
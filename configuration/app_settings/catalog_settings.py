@@ -0,0 +1,37 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from common.utils.paths import PROJECT_ROOT
+
+from configuration.constants import ENV_PREFIX
+
+
+class CatalogSettings(BaseSettings):
+    """Настройки каталога товаров."""
+
+    model_config = SettingsConfigDict(
+        env_prefix=f"{ENV_PREFIX}CATALOG_",
+        env_file=PROJECT_ROOT.joinpath(".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    # Кешировать поддеревья категорий в памяти процесса
+    category_cache: bool = True
+    # Максимальное количество поддеревьев категорий в кеше
+    category_cache_maxsize: int = 1024
+    # Время жизни поддерева категории в кеше, сек.
+    category_cache_ttl: float = 300.0
+    # Пауза перед переподключением к уведомлениям об изменении категорий, сек.
+    category_listen_reconnect_delay: float = 5.0
+    # Количество товаров на странице по умолчанию
+    products_page_size: int = 50
+    # Максимальное количество товаров на странице
+    products_max_page_size: int = 500
+    # Кешировать товары с остатком в Redis
+    product_cache: bool = True
+    # Время жизни товара в кеше, сек.
+    product_cache_ttl: int = 60
+    # Время жизни отсутствия товара в кеше, сек.
+    product_cache_missing_ttl: int = 10
+    # Коэффициент раннего обновления товара в кеше (0 - обновлять только после истечения)
+    product_cache_early_refresh_beta: float = 1.0
@@ -25,6 +25,26 @@ class ConstanceSettings(BaseSettings):
     retry_on_error_backoff: int = 1
     number_retries_on_error: int = 60
     default_ttl: int = 86400
+    # Кешировать константы в памяти процесса
+    near_cache: bool = True
+    # Время жизни константы в памяти процесса, сек.
+    near_cache_ttl: float = 60.0
+    # Максимальное количество констант в памяти процесса
+    near_cache_maxsize: int = 1024
+    # Канал pub/sub с ключами изменённых констант (пустое сообщение - все константы)
+    near_cache_channel: str = "constance:changed"
+    # Пауза перед переподключением к уведомлениям об изменении констант, сек.
+    near_cache_reconnect_delay: float = 5.0
+    # Загружать все константы в память процесса при старте и периодически
+    snapshot: bool = True
+    # Период перезагрузки всех констант, сек. (меньше near_cache_ttl)
+    snapshot_refresh_interval: float = 30.0
+    # Время ожидания загрузки констант при старте, сек.
+    snapshot_timeout: float = 5.0
+    # Количество ключей на странице SCAN при загрузке констант
+    snapshot_scan_count: int = 500
+    # Читать значения констант в pickle, записанные до перехода на JSON
+    pickle_fallback: bool = True
 
     @property
     def url(self) -> URL:
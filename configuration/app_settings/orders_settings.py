@@ -0,0 +1,51 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from common.utils.paths import PROJECT_ROOT
+
+from configuration.constants import ENV_PREFIX
+
+
+class OrdersSettings(BaseSettings):
+    """Настройки приложения."""
+
+    model_config = SettingsConfigDict(
+        env_prefix=f"{ENV_PREFIX}ORDERS_",
+        env_file=PROJECT_ROOT.joinpath(".env"),
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    # Товары распродажи, остаток которых резервируется в Redis
+    flash_sale_product_ids: set[int] = set()
+    # Количество резервов, переносимых в Postgres одной транзакцией
+    flash_sale_flush_batch_size: int = 1000
+    # Время жизни блокировки переноса резервов и сверки остатков, сек.
+    flash_sale_lock_ttl: int = 60
+    # Время жизни кеша состава заказа в Redis, сек.
+    flash_sale_order_ttl: int = 86400
+    # Объединять одновременные добавления одного товара в одну транзакцию
+    coalesce_add_item: bool = False
+    # Окно ожидания добавлений товара для объединения в пачку, мс
+    coalesce_window_ms: int = 5
+    # Максимальное количество добавлений товара в одной пачке
+    coalesce_max_batch_size: int = 100
+    # Время хранения ответа по ключу идемпотентности, сек.
+    idempotency_ttl: int = 86400
+    # Время жизни метки выполняющегося запроса с ключом идемпотентности, сек.
+    idempotency_in_flight_ttl: int = 30
+    # Время ожидания выполняющегося запроса с тем же ключом идемпотентности, сек.
+    idempotency_wait_timeout: float = 10
+    # Интервал проверки выполняющегося запроса с тем же ключом идемпотентности, сек.
+    idempotency_poll_interval: float = 0.05
+    # Количество заказов в одной транзакции сверки итогов заказов
+    order_totals_verify_batch_size: int = 1000
+    # Исправлять найденные сверкой расхождения итогов заказов
+    order_totals_fix_drift: bool = True
+    # Количество идентификаторов заказов в одной партиции customer_order и order_item
+    order_partition_size: int = 1000000
+    # Количество партиций, заранее создаваемых после партиции последнего заказа
+    order_partition_premake: int = 3
+    # Возраст заказов, после которого их партиции отсоединяются, дней (0 - не отсоединять)
+    order_partition_retention_days: int = 365
+    # lock_timeout DDL обслуживания партиций заказов, мс
+    order_partition_lock_timeout_ms: int = 1000
@@ -1,3 +1,5 @@
+import enum
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from yarl import URL
 
@@ -7,6 +9,28 @@ from configuration import types
 from configuration.constants import ENV_PREFIX, SERVICE_NAME_LOWER
 
 
+class AddItemEngine(str, enum.Enum):  # noqa: WPS600
+    """Способы выполнения добавления товара в заказ."""
+
+    # Отдельные запросы проверки, списания и upsert в явной транзакции
+    TRANSACTION = "transaction"
+    # Один data-modifying CTE, выполняемый за один сетевой round-trip
+    CTE = "cte"
+    # Те же запросы, что и в TRANSACTION, отправленные одним пакетом в pipeline-режиме
+    PIPELINE = "pipeline"
+    # Списание из шардов остатка product_stock_shard с откатом на product.quantity
+    SHARDED = "sharded"
+
+
+class ConnectionMode(str, enum.Enum):  # noqa: WPS600
+    """Способы подключения к БД сервиса."""
+
+    # Через pgbouncer в transaction mode: подготовленные запросы отключены
+    PGBOUNCER = "pgbouncer"
+    # Напрямую к Postgres: запросы подготавливаются на сервере при выполнении
+    DIRECT = "direct"
+
+
 class ServiceDbSettings(BaseSettings):
     """Настройки приложения."""
 
@@ -26,8 +50,49 @@ class ServiceDbSettings(BaseSettings):
     pool_min_size: int = 1
     pool_max_size: int = 5
     pool_max_lifetime: float = 1500.0
+    # Интервал выгрузки статистики пула в метрики и изменения его размера, сек
+    pool_stats_interval: float = 10.0
+    # Адаптивный размер пула: max_size меняется от pool_min_size до pool_adaptive_max_size
+    pool_adaptive: bool = False
+    pool_adaptive_max_size: int = 20
+    # Среднее ожидание соединения за интервал, при котором пул растёт, мс
+    pool_adaptive_grow_wait_ms: float = 20.0
+    # Доля занятого времени соединений за интервал, ниже которой пул уменьшается
+    pool_adaptive_shrink_usage: float = 0.3
     connection_timeout: float = 1.0
+    # Максимальное количество попыток запроса (транзакции, проверки health)
     command_retries: int = 3
+    # Пауза перед повтором транзакции: экспоненциальная от base до max, сек
+    retry_base_delay: float = 0.01
+    retry_max_delay: float = 0.2
+    # Общее время на все попытки транзакции, сек
+    retry_deadline: float = 2.0
+    # Бюджет повторов процесса: доля повторов от транзакций и запас повторов
+    retry_budget_ratio: float = 0.1
+    retry_budget_max_tokens: float = 10.0
+    # Способ подключения к БД
+    connection_mode: ConnectionMode = ConnectionMode.PGBOUNCER
+    # Через сколько выполнений запрос подготавливается на сервере (в режиме direct, 0 - сразу)
+    prepare_threshold: int = 0
+    # Способ выполнения добавления товара в заказ
+    add_item_engine: AddItemEngine = AddItemEngine.TRANSACTION
+    # Порог медленного запроса, сек. 0 - медленные запросы не логируются
+    slow_query_threshold: float = 1.0
+    # Доля медленных запросов, для которых логируется EXPLAIN (ANALYZE, BUFFERS)
+    slow_query_explain_rate: float = 0.0
+    # Реплики для запросов на чтение: host или host:port (порт по умолчанию - port)
+    replica_hosts: list[str] = []
+    # Допустимое отставание реплики, сек. Отстающая реплика выводится из ротации
+    replica_max_lag: float = 5.0
+    # Интервал проверки отставания реплик, сек
+    replica_probe_interval: float = 1.0
+    # lock_timeout миграций без флага LOCK_TIMEOUT_MS, мс. 0 - без ограничения
+    migration_lock_timeout_ms: int = 5000
+    # Повторы миграции после ошибки lock_timeout для миграций без флага LOCK_RETRIES
+    migration_lock_retries: int = 3
+    # Пауза перед повтором миграции: экспоненциальная от base до max, сек
+    migration_retry_base_delay: float = 1.0
+    migration_retry_max_delay: float = 30.0
 
     @property
     def url(self) -> URL:
@@ -44,3 +109,18 @@ class ServiceDbSettings(BaseSettings):
             password=self.password,
             path=f"/{self.base_name}",
         )
+
+    @property
+    def replica_urls(self) -> list[URL]:
+        """
+        Собрать URL до реплик БД из настроек.
+
+        :return: database URLs.
+        """
+        replica_urls = []
+        for replica_host in self.replica_hosts:
+            host, _, port = replica_host.partition(":")
+            replica_urls.append(
+                self.url.with_host(host).with_port(int(port) if port else self.port),
+            )
+        return replica_urls
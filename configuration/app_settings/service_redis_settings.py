@@ -1,3 +1,4 @@
+from pydantic import PositiveInt
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from yarl import URL
 
@@ -26,6 +27,8 @@ class ServiceRedisSettings(BaseSettings):
     number_retries_on_error: int = 60
     default_ttl: int = 86400
     redis_scan_count: int = 100
+    # Количество команд в одном пайплайне и ключей в одной команде MGET/HMGET
+    batch_chunk_size: PositiveInt = 500
 
     @property
     def url(self) -> URL:
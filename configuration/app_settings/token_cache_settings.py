@@ -24,6 +24,18 @@ class TokenCacheSettings(BaseSettings):
     redis_base: int = 3
     redis_retry_on_error_backoff: int = 1
     redis_number_retries_on_error: int = 60
+    # Кешировать проверку jti в памяти процесса
+    local_cache: bool = True
+    # Максимальное количество jti в памяти процесса
+    local_cache_maxsize: int = 10000
+    # Время жизни найденного jti в памяти процесса, сек.
+    local_cache_ttl: float = 5.0
+    # Время жизни ненайденного jti в памяти процесса, сек.
+    local_cache_negative_ttl: float = 1.0
+    # Канал pub/sub с отозванными jti
+    revocation_channel: str = "STORE://jtis:revoked"
+    # Пауза перед переподключением к уведомлениям об отзыве токенов, сек.
+    local_cache_reconnect_delay: float = 5.0
 
     @property
     def redis_url(self) -> URL:
@@ -2,6 +2,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from common.utils.paths import PROJECT_ROOT
 
+from configuration import types
 from configuration.constants import ENV_PREFIX
 
 
@@ -25,3 +26,7 @@ class WebSettings(BaseSettings):
     kill_pod_by_db_pool_timeout: bool = False
     # Макс кол-во попыток получить коннект
     pool_timeout_errors_limit: int = 3
+    # Ключ подписи курсоров keyset-пагинации
+    pagination_cursor_signing_key: types.VaultLocalStr = types.VaultLocalStr(
+        "pagination_cursor_signing_key",
+    )
@@ -9,7 +9,13 @@ from redis.asyncio import ConnectionPool
 from common.constance.lifetime import setup_constance, stop_constance
 from common.elastic.lifetime import setup_elasticsearch, stop_elasticsearch
 from common.rabbitmq.lifetime import setup_rabbit, stop_rabbit
-from common.service_db.lifetime import setup_service_db, stop_service_db
+from common.service_db.lifetime import (
+    setup_service_db,
+    setup_service_db_replicas,
+    stop_service_db,
+    stop_service_db_replicas,
+)
+from common.service_db.replicas import ReplicaRouter
 from common.service_db.service_db_health import service_db_health
 from common.service_redis.lifetime import setup_service_redis, stop_service_redis
 from common.sqlalchemy.lifetime import close_engine, setup_sqlalchemy_engine
@@ -19,6 +25,7 @@ ClientState = TypeVar("ClientState")
 ServiceHealthFunc = Coroutine[Any, Any, dict[str, str]]
 CLIENTS_LIFETIME = {  # noqa: WPS407 - мутабельность нужна для моков
     "service_db_pool": (setup_service_db, stop_service_db),
+    "service_db_replicas": (setup_service_db_replicas, stop_service_db_replicas),
     "service_redis_pool": (setup_service_redis, stop_service_redis),
     "token_cache_redis_pool": (setup_token_cache_redis, stop_token_cache_redis),
     "constance_pool": (setup_constance, stop_constance),
@@ -102,6 +109,8 @@ class WebClientsState(BaseClientState):
 
     # Не удалять строчку, по ней идет поиск
     service_db_pool: psycopg_pool.AsyncConnectionPool
+    service_db_replicas: ReplicaRouter
+    service_redis_pool: ConnectionPool
 
     def get_funcs_for_health_check(self):
         """
@@ -121,6 +130,8 @@ class TaskiqClientsState(BaseClientState):
     """Класс для хранения подключенных клиентов в taskiq lifetime."""
 
     # Не удалять строчку, по ней идет поиск
+    service_db_pool: psycopg_pool.AsyncConnectionPool
+    service_redis_pool: ConnectionPool
     token_cache_redis_pool: ConnectionPool
 
     def get_funcs_for_health_check(self):
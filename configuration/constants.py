@@ -13,3 +13,7 @@ NO_LOG_URLS: tuple[str, ...] = (
     "/api/docs",
     "/api/openapi.json",
 )
+# Пагинация
+DEFAULT_PAGE_NUMBER = 1
+DEFAULT_PAGE_SIZE = 20
+PAGINATION_MAX_LIMIT = 100
@@ -10,10 +10,13 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from common.utils.paths import PROJECT_ROOT, TEMP_DIR
 
 from configuration.app_settings.auth_settings import AuthSettings
+from configuration.app_settings.catalog_settings import CatalogSettings
 from configuration.app_settings.locale_settings import LocaleSettings
 from configuration.app_settings.logging_settings import LoggingSettings
+from configuration.app_settings.orders_settings import OrdersSettings
 from configuration.app_settings.sentry_settings import SentrySettings
 from configuration.app_settings.service_db_settings import ServiceDbSettings
+from configuration.app_settings.service_redis_settings import ServiceRedisSettings
 from configuration.app_settings.telemetry_settings import TelemetrySettings
 from configuration.app_settings.web_settings import WebSettings
 from configuration.constants import ENV_PREFIX
@@ -62,6 +65,11 @@ class Settings(BaseSettings):
     # Не удалять строчку, по ней идет поиск
 
     service_db: ServiceDbSettings = ServiceDbSettings()
+    service_redis: ServiceRedisSettings = ServiceRedisSettings()
+    # Заказы
+    orders: OrdersSettings = OrdersSettings()
+    # Каталог
+    catalog: CatalogSettings = CatalogSettings()
 
     if TYPE_CHECKING:  # noqa: WPS604
         # TYPE_CHECKING elasticsearch
@@ -80,12 +88,6 @@ class Settings(BaseSettings):
         from configuration.app_settings.rabbitmq_settings import RabbitSettings
 
         rabbit: RabbitSettings = RabbitSettings()
-        # TYPE_CHECKING service_redis
-        from configuration.app_settings.service_redis_settings import (
-            ServiceRedisSettings,
-        )
-
-        service_redis: ServiceRedisSettings = ServiceRedisSettings()
         # TYPE_CHECKING token_cache
         from configuration.app_settings.token_cache_settings import TokenCacheSettings
 
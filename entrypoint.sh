@@ -4,6 +4,18 @@ case $1 in
     start_app)
         python store/web/main.py
     ;;
+    start_taskiq)
+        taskiq worker common.taskiq.broker:rabbit_broker store.tasks
+    ;;
+    start_scheduler)
+        taskiq scheduler common.taskiq.broker:scheduler store.tasks
+    ;;
+    benchmark)
+        python -m store.benchmarks.add_item "${@:2}"
+    ;;
+    catalog_import)
+        python -m common.service_db.catalog_import "${@:2}"
+    ;;
     shell)
         bash
     ;;
@@ -29,6 +41,10 @@ case $1 in
         Usage: $0 ARG
         Please use one from next arguments:
             'start_app' - start store application
+            'start_taskiq' - start taskiq worker
+            'start_scheduler' - start taskiq scheduler for periodic tasks
+            'benchmark' - run add-item load test, writes benchmark.json
+            'catalog_import' - load categories or products from CSV/NDJSON file
             'shell' - run shell into docker container of an application
             'format' - start formating Ruff linter
             'sqlfluff' - start linter SqlFluff
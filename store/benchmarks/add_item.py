@@ -0,0 +1,484 @@
+"""
+Нагрузочный тест добавления товаров в заказ.
+
+Создаёт отдельную БД, наполняет её товарами и заказами и нагружает приложение
+get_app() конкурентными запросами POST /orders/{order_id}/items без сетевого слоя.
+Результат пишется в JSON для сравнения между коммитами:
+
+    python -m store.benchmarks.add_item --requests 10000 --concurrency 200
+"""
+import asyncio
+import json
+import random
+import statistics
+import subprocess  # noqa: S404
+import time
+from collections import Counter
+from contextlib import suppress
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import click
+import psycopg
+from asgi_lifespan import LifespanManager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from httpx import AsyncClient
+from psycopg import sql
+from pydantic import BaseModel
+from starlette import status
+
+from common.service_db import migrator
+
+from configuration.app_settings.logging_settings import LogLevel
+from configuration.app_settings.service_db_settings import AddItemEngine
+from configuration.settings import settings
+
+# Пересоздаётся только БД с этим суффиксом, чтобы не удалить БД сервиса
+BENCHMARK_DATABASE_SUFFIX = "_benchmark"
+
+SQL_SEED_PRODUCTS = """
+INSERT INTO product (id, name, quantity, price)
+SELECT id, 'product ' || id, %(stock)s, 1.00
+FROM GENERATE_SERIES(1, %(products)s) AS id
+"""
+
+SQL_SEED_CLIENT = "INSERT INTO client (id, name) VALUES (1, 'benchmark')"
+
+SQL_SEED_ORDERS = """
+INSERT INTO customer_order (id, client_id) OVERRIDING SYSTEM VALUE
+SELECT id, 1
+FROM GENERATE_SERIES(1, %(orders)s) AS id
+"""
+
+SQL_LOCK_WAITERS = """
+SELECT COUNT(*)
+FROM pg_stat_activity
+WHERE datname = CURRENT_DATABASE() AND wait_event_type = 'Lock'
+"""
+
+SQL_DEADLOCKS = """
+SELECT deadlocks
+FROM pg_stat_database
+WHERE datname = CURRENT_DATABASE()
+"""
+
+PERCENTILES = (50, 95, 99)
+
+
+class BenchmarkConfig(BaseModel):
+    """Параметры нагрузочного теста."""
+
+    products: int = 1000
+    orders: int = 10000
+    hot_products: int = 10
+    hot_ratio: float = 0.8
+    requests: int = 10000
+    concurrency: int = 100
+    quantity: int = 1
+    stock: int = 1000000
+    seed: int = 0
+    lock_sample_interval: float = 0.05
+
+
+class LatencyStats(BaseModel):
+    """Задержки запросов, мс."""
+
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class LockWaitStats(BaseModel):
+    """Ожидания блокировок по выборкам pg_stat_activity."""
+
+    samples: int
+    max_waiters: int
+    mean_waiters: float
+    # Оценка суммарного времени ожидания блокировок всеми соединениями, сек.
+    wait_seconds: float
+
+
+class BenchmarkResult(BaseModel):
+    """Результат нагрузочного теста."""
+
+    commit: str
+    started_at: datetime
+    config: BenchmarkConfig
+    settings: dict[str, Any]
+    duration_seconds: float
+    throughput_rps: float
+    latency_ms: LatencyStats
+    status_codes: dict[int, int]
+    db_errors: dict[str, int]
+    deadlocks: int
+    lock_waits: LockWaitStats
+
+
+def build_plan(config: BenchmarkConfig) -> list[tuple[int, int]]:
+    """
+    Сформировать последовательность запросов.
+
+    Доля hot_ratio запросов приходится на первые hot_products товаров,
+    остальные запросы распределены равномерно по остальным товарам.
+
+    :param config: Параметры нагрузочного теста.
+    :return: пары (идентификатор заказа, идентификатор товара).
+    """
+    rnd = random.Random(config.seed)  # noqa: S311
+    hot_products = min(config.hot_products, config.products)
+    plan = []
+    for _ in range(config.requests):
+        if hot_products == config.products or (
+            hot_products and rnd.random() < config.hot_ratio
+        ):
+            product_id = rnd.randint(1, hot_products)
+        else:
+            product_id = rnd.randint(hot_products + 1, config.products)
+        plan.append((rnd.randint(1, config.orders), product_id))
+    return plan
+
+
+async def run_load(
+    client: AsyncClient,
+    app: FastAPI,
+    plan: list[tuple[int, int]],
+    concurrency: int,
+    quantity: int = 1,
+) -> tuple[list[float], Counter[int]]:
+    """
+    Выполнить запросы добавления товара в заказ с заданной конкурентностью.
+
+    :param client: Клиент приложения.
+    :param app: Приложение.
+    :param plan: Пары (идентификатор заказа, идентификатор товара).
+    :param concurrency: Количество одновременных запросов.
+    :param quantity: Количество товара в каждом запросе.
+    :return: задержки запросов в секундах и количество ответов по статусам.
+    """
+    latencies: list[float] = []
+    status_codes: Counter[int] = Counter()
+    requests = iter(plan)
+
+    async def worker() -> None:  # noqa: WPS430
+        for order_id, product_id in requests:
+            started_at = time.perf_counter()
+            response = await client.post(
+                app.url_path_for("add_order_item", order_id=order_id),
+                json={"product_id": product_id, "quantity": quantity},
+            )
+            latencies.append(time.perf_counter() - started_at)
+            status_codes[response.status_code] += 1
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies, status_codes
+
+
+def get_latency_stats(latencies: list[float]) -> LatencyStats:
+    """
+    Посчитать статистику задержек.
+
+    :param latencies: Задержки запросов, сек.
+    :return: статистика задержек в миллисекундах.
+    """
+    latencies_ms = [latency * 1000 for latency in latencies]
+    percentiles = statistics.quantiles(latencies_ms, n=100, method="inclusive")
+    p50, p95, p99 = (percentiles[percentile - 1] for percentile in PERCENTILES)
+    return LatencyStats(
+        mean=statistics.fmean(latencies_ms),
+        p50=p50,
+        p95=p95,
+        p99=p99,
+        max=max(latencies_ms),
+    )
+
+
+async def sample_lock_waiters(
+    db_url: str,
+    interval: float,
+    samples: list[int],
+) -> None:
+    """
+    Периодически считать соединения, ожидающие блокировку, до отмены задачи.
+
+    :param db_url: URL до БД.
+    :param interval: Интервал выборки, сек.
+    :param samples: Список, в который добавляются выборки.
+    """
+    async with await psycopg.AsyncConnection.connect(db_url, autocommit=True) as conn:
+        while True:  # noqa: WPS457
+            cursor = await conn.execute(SQL_LOCK_WAITERS)
+            samples.append((await cursor.fetchone())[0])  # type: ignore
+            await asyncio.sleep(interval)
+
+
+def get_deadlocks(db_url: str) -> int:
+    """
+    Количество deadlock в БД с момента сброса статистики.
+
+    :param db_url: URL до БД.
+    :return: количество deadlock.
+    """
+    with psycopg.connect(db_url) as conn:
+        return conn.execute(SQL_DEADLOCKS).fetchone()[0]  # type: ignore
+
+
+def create_database(config: BenchmarkConfig) -> str:
+    """
+    Пересоздать БД нагрузочного теста, применить миграции и наполнить её.
+
+    :param config: Параметры нагрузочного теста.
+    :return: URL до БД.
+    """
+    with psycopg.connect(
+        str(settings.service_db.url.with_path("/postgres")),
+        autocommit=True,
+    ) as conn:
+        database = sql.Identifier(settings.service_db.base_name)
+        conn.execute(sql.SQL("DROP DATABASE IF EXISTS {0}").format(database))
+        conn.execute(sql.SQL("CREATE DATABASE {0}").format(database))
+
+    db_url = str(settings.service_db.url)
+    migrator.func_upgrade(db_url)
+    with psycopg.connect(db_url) as conn:
+        conn.execute(SQL_SEED_PRODUCTS, config.model_dump())
+        conn.execute(SQL_SEED_CLIENT)
+        conn.execute(SQL_SEED_ORDERS, config.model_dump())
+    return db_url
+
+
+def drop_database() -> None:
+    """Удалить БД нагрузочного теста."""
+    with psycopg.connect(
+        str(settings.service_db.url.with_path("/postgres")),
+        autocommit=True,
+    ) as conn:
+        conn.execute(
+            sql.SQL("DROP DATABASE IF EXISTS {0}").format(
+                sql.Identifier(settings.service_db.base_name),
+            ),
+        )
+
+
+def validate_database(ctx: click.Context, param: click.Parameter, database: str) -> str:
+    """
+    Проверить, что БД нагрузочного теста можно пересоздать.
+
+    :param ctx: Контекст click.
+    :param param: Параметр --database.
+    :param database: Имя БД.
+    :raises BadParameter: Если имя БД без суффикса _benchmark или совпадает с БД сервиса.
+    :return: имя БД.
+    """
+    if (
+        not database.endswith(BENCHMARK_DATABASE_SUFFIX)
+        or database == settings.service_db.base_name
+    ):
+        raise click.BadParameter(
+            f"БД удаляется после теста, её имя должно оканчиваться на {BENCHMARK_DATABASE_SUFFIX} "
+            f"и не совпадать с БД сервиса {settings.service_db.base_name}.",
+        )
+    return database
+
+
+def get_commit() -> str:
+    """
+    Хеш текущего коммита.
+
+    :return: хеш коммита или settings.commit_hash, если git недоступен.
+    """
+    with suppress(OSError, subprocess.CalledProcessError):
+        return subprocess.check_output(  # noqa: S603 S607
+            ["git", "rev-parse", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    return settings.commit_hash
+
+
+async def run_benchmark(config: BenchmarkConfig) -> BenchmarkResult:
+    """
+    Выполнить нагрузочный тест на подготовленной БД.
+
+    Ошибки БД (deadlock, serialization failure и др.) считаются по SQLSTATE.
+
+    :param config: Параметры нагрузочного теста.
+    :return: результат нагрузочного теста.
+    """
+    from store.web.application import get_app  # noqa: WPS433
+
+    db_url = str(settings.service_db.url)
+    db_errors: Counter[str] = Counter()
+
+    async def db_error_handler(  # noqa: WPS430
+        request: Request,
+        exc: psycopg.Error,
+    ) -> JSONResponse:
+        db_errors[exc.sqlstate or exc.__class__.__name__] += 1
+        return JSONResponse(
+            {"message": str(exc)},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    app = get_app()
+    app.add_exception_handler(psycopg.Error, db_error_handler)  # type: ignore
+    plan = build_plan(config)
+    started_at = datetime.now(timezone.utc)
+    deadlocks_before = get_deadlocks(db_url)
+    lock_samples: list[int] = []
+    async with LifespanManager(app):
+        async with AsyncClient(app=app, base_url="http://benchmark") as client:
+            sampler = asyncio.create_task(
+                sample_lock_waiters(db_url, config.lock_sample_interval, lock_samples),
+            )
+            load_started_at = time.perf_counter()
+            latencies, status_codes = await run_load(
+                client,
+                app,
+                plan,
+                config.concurrency,
+                config.quantity,
+            )
+            duration = time.perf_counter() - load_started_at
+            sampler.cancel()
+            with suppress(asyncio.CancelledError):
+                await sampler
+
+    return BenchmarkResult(
+        commit=get_commit(),
+        started_at=started_at,
+        config=config,
+        settings={
+            "add_item_engine": settings.service_db.add_item_engine,
+            "connection_mode": settings.service_db.connection_mode,
+            "pool_max_size": settings.service_db.pool_max_size,
+            "coalesce_add_item": settings.orders.coalesce_add_item,
+        },
+        duration_seconds=duration,
+        throughput_rps=len(latencies) / duration,
+        latency_ms=get_latency_stats(latencies),
+        status_codes=dict(status_codes),
+        db_errors=dict(db_errors),
+        deadlocks=get_deadlocks(db_url) - deadlocks_before,
+        lock_waits=LockWaitStats(
+            samples=len(lock_samples),
+            max_waiters=max(lock_samples, default=0),
+            mean_waiters=statistics.fmean(lock_samples) if lock_samples else 0,
+            wait_seconds=sum(lock_samples) * config.lock_sample_interval,
+        ),
+    )
+
+
+@click.command()
+@click.option("--products", default=1000, show_default=True, help="Товаров.")
+@click.option("--orders", default=10000, show_default=True, help="Заказов.")
+@click.option(
+    "--hot-products",
+    default=10,
+    show_default=True,
+    help="Горячих товаров (первые по id).",
+)
+@click.option(
+    "--hot-ratio",
+    default=0.8,
+    show_default=True,
+    help="Доля запросов к горячим товарам.",
+)
+@click.option("--requests", default=10000, show_default=True, help="Запросов.")
+@click.option(
+    "--concurrency",
+    default=100,
+    show_default=True,
+    help="Одновременных запросов.",
+)
+@click.option(
+    "--quantity",
+    default=1,
+    show_default=True,
+    help="Количество товара в запросе.",
+)
+@click.option(
+    "--stock",
+    default=1000000,
+    show_default=True,
+    help="Начальный остаток каждого товара.",
+)
+@click.option("--seed", default=0, show_default=True, help="Seed генератора запросов.")
+@click.option(
+    "--engine",
+    type=click.Choice([engine.value for engine in AddItemEngine]),
+    default=None,
+    help="Способ добавления товара (по умолчанию из настроек).",
+)
+@click.option(
+    "--database",
+    default=f"{settings.service_db.base_name}{BENCHMARK_DATABASE_SUFFIX}",
+    show_default=True,
+    callback=validate_database,
+    help=f"Имя пересоздаваемой БД нагрузочного теста (с суффиксом {BENCHMARK_DATABASE_SUFFIX}).",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=Path("benchmark.json"),
+    show_default=True,
+    help="Файл результата.",
+)
+@click.option("--keep-db", is_flag=True, help="Не удалять БД после теста.")
+def benchmark(  # noqa: WPS211
+    products: int,
+    orders: int,
+    hot_products: int,
+    hot_ratio: float,
+    requests: int,
+    concurrency: int,
+    quantity: int,
+    stock: int,
+    seed: int,
+    engine: str | None,
+    database: str,
+    output: Path,
+    keep_db: bool,
+) -> None:
+    """Нагрузочный тест добавления товаров в заказ."""
+    config = BenchmarkConfig(
+        products=products,
+        orders=orders,
+        hot_products=hot_products,
+        hot_ratio=hot_ratio,
+        requests=requests,
+        concurrency=concurrency,
+        quantity=quantity,
+        stock=stock,
+        seed=seed,
+    )
+    settings.service_db.base_name = database
+    settings.logging.log_level = LogLevel.WARNING
+    settings.logging.lib_log_level = LogLevel.WARNING
+    if engine:
+        settings.service_db.add_item_engine = AddItemEngine(engine)
+
+    click.echo(f"Наполнение БД {database}")
+    create_database(config)
+    try:
+        result = asyncio.run(run_benchmark(config))
+    finally:
+        if not keep_db:
+            drop_database()
+
+    output.write_text(json.dumps(result.model_dump(mode="json"), indent=2))
+    click.echo(
+        f"{result.throughput_rps:.0f} rps, "
+        f"p50 {result.latency_ms.p50:.1f} ms, "
+        f"p95 {result.latency_ms.p95:.1f} ms, "
+        f"p99 {result.latency_ms.p99:.1f} ms, "
+        f"статусы {result.status_codes}, ошибки БД {result.db_errors}, "
+        f"deadlock {result.deadlocks}. Результат записан в {output}",
+    )
+
+
+if __name__ == "__main__":
+    benchmark()
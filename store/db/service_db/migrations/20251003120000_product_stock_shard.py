@@ -0,0 +1,15 @@
+def upgrade(cur):
+    cur.execute(
+        """
+        CREATE TABLE product_stock_shard (
+            product_id INT NOT NULL REFERENCES product(id) ON DELETE CASCADE,
+            shard_id SMALLINT NOT NULL,
+            quantity INT NOT NULL DEFAULT 0 CHECK (quantity >= 0),
+            PRIMARY KEY (product_id, shard_id)
+        );
+    """,
+    )
+
+
+def downgrade(cur):
+    cur.execute("""DROP TABLE product_stock_shard;""")
@@ -0,0 +1,14 @@
+def upgrade(cur):
+    cur.execute(
+        """
+        CREATE TABLE flash_sale_flush (
+            batch_id UUID PRIMARY KEY,
+            flushed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+        CREATE INDEX idx_flash_sale_flush_flushed_at ON flash_sale_flush(flushed_at);
+    """,
+    )
+
+
+def downgrade(cur):
+    cur.execute("""DROP TABLE flash_sale_flush;""")
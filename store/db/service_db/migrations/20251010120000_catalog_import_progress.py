@@ -0,0 +1,16 @@
+def upgrade(cur):
+    cur.execute(
+        """
+        CREATE TABLE catalog_import_progress (
+            source TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            position BIGINT NOT NULL,
+            rows BIGINT NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+    """,
+    )
+
+
+def downgrade(cur):
+    cur.execute("""DROP TABLE catalog_import_progress;""")
@@ -0,0 +1,121 @@
+def upgrade(cur):
+    # category_closure_rebuild пересчитывает пути до корня для категорий по parent_id,
+    # при перемещении категории пересчитываются пути всего её поддерева.
+    # category_notify_changed уведомляет кеш поддеревьев категорий об изменениях.
+    cur.execute(
+        """
+        CREATE TABLE category_closure (
+            ancestor_id INT NOT NULL REFERENCES category(id) ON DELETE CASCADE,
+            descendant_id INT NOT NULL REFERENCES category(id) ON DELETE CASCADE,
+            depth INT NOT NULL,
+            PRIMARY KEY (ancestor_id, descendant_id)
+        );
+        CREATE INDEX idx_category_closure_descendant ON category_closure(descendant_id);
+
+        DROP INDEX idx_product_category;
+        CREATE INDEX idx_product_category_id ON product(category_id, id);
+
+        CREATE FUNCTION category_closure_rebuild(category_ids INT[]) RETURNS VOID AS $$
+        DECLARE
+            has_cycle BOOLEAN;
+        BEGIN
+            DELETE FROM category_closure WHERE descendant_id = ANY(category_ids);
+            WITH RECURSIVE path AS (
+                SELECT
+                    id AS descendant_id,
+                    id AS ancestor_id,
+                    parent_id,
+                    0 AS depth,
+                    ARRAY[id] AS visited,
+                    FALSE AS is_cycle
+                FROM category
+                WHERE id = ANY(category_ids)
+                UNION ALL
+                SELECT
+                    path.descendant_id,
+                    category.id,
+                    category.parent_id,
+                    path.depth + 1,
+                    path.visited || category.id,
+                    category.id = ANY(path.visited)
+                FROM path
+                JOIN category ON category.id = path.parent_id
+                WHERE NOT path.is_cycle
+            ),
+            inserted AS (
+                INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+                SELECT ancestor_id, descendant_id, depth
+                FROM path
+                WHERE NOT is_cycle
+            )
+            SELECT BOOL_OR(is_cycle) INTO has_cycle FROM path;
+            IF has_cycle THEN
+                RAISE EXCEPTION 'category parent_id forms a cycle'
+                    USING ERRCODE = 'check_violation';
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION category_closure_insert() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM category_closure_rebuild(ARRAY(SELECT id FROM new_category));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION category_closure_update() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM category_closure_rebuild(
+                ARRAY(
+                    SELECT category_closure.descendant_id
+                    FROM old_category
+                    JOIN new_category ON new_category.id = old_category.id
+                    JOIN category_closure ON category_closure.ancestor_id = new_category.id
+                    WHERE old_category.parent_id IS DISTINCT FROM new_category.parent_id
+                )
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION category_notify_changed() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM PG_NOTIFY('category_changed', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER category_closure_insert
+        AFTER INSERT ON category
+        REFERENCING NEW TABLE AS new_category
+        FOR EACH STATEMENT EXECUTE FUNCTION category_closure_insert();
+
+        CREATE TRIGGER category_closure_update
+        AFTER UPDATE ON category
+        REFERENCING OLD TABLE AS old_category NEW TABLE AS new_category
+        FOR EACH STATEMENT EXECUTE FUNCTION category_closure_update();
+
+        CREATE TRIGGER category_notify_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON category
+        FOR EACH STATEMENT EXECUTE FUNCTION category_notify_changed();
+
+        SELECT category_closure_rebuild(ARRAY(SELECT id FROM category));
+    """,
+    )
+
+
+def downgrade(cur):
+    cur.execute(
+        """
+        DROP TRIGGER category_notify_changed ON category;
+        DROP TRIGGER category_closure_update ON category;
+        DROP TRIGGER category_closure_insert ON category;
+        DROP FUNCTION category_notify_changed();
+        DROP FUNCTION category_closure_update();
+        DROP FUNCTION category_closure_insert();
+        DROP FUNCTION category_closure_rebuild(INT[]);
+        DROP INDEX idx_product_category_id;
+        CREATE INDEX idx_product_category ON product(category_id);
+        DROP TABLE category_closure;
+        """,
+    )
@@ -0,0 +1,163 @@
+def upgrade(cur):
+    # Итоги заказа (items_count - количество единиц товара, total_amount - сумма по текущим
+    # ценам) поддерживаются триггерами в транзакции, изменившей состав заказа или цену товара,
+    # поэтому их обновляют все способы добавления товара, включая пачки и перенос распродажи.
+    # Строки заказов блокируются по возрастанию id, чтобы транзакции, меняющие
+    # несколько заказов, не взаимоблокировались.
+    cur.execute(
+        """
+        ALTER TABLE customer_order
+            ADD COLUMN items_count BIGINT NOT NULL DEFAULT 0,
+            ADD COLUMN total_amount NUMERIC(14,2) NOT NULL DEFAULT 0;
+        CREATE INDEX idx_order_item_product ON order_item(product_id);
+
+        CREATE FUNCTION order_item_totals_insert() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM 1
+            FROM customer_order
+            WHERE id IN (SELECT order_id FROM new_item)
+            ORDER BY id
+            FOR NO KEY UPDATE;
+            UPDATE customer_order
+            SET
+                items_count = customer_order.items_count + delta.items_count,
+                total_amount = customer_order.total_amount + delta.total_amount
+            FROM (
+                SELECT
+                    new_item.order_id,
+                    SUM(new_item.quantity) AS items_count,
+                    SUM(new_item.quantity * product.price) AS total_amount
+                FROM new_item
+                JOIN product ON product.id = new_item.product_id
+                GROUP BY new_item.order_id
+            ) AS delta
+            WHERE customer_order.id = delta.order_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION order_item_totals_update() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM 1
+            FROM customer_order
+            WHERE id IN (SELECT order_id FROM new_item UNION SELECT order_id FROM old_item)
+            ORDER BY id
+            FOR NO KEY UPDATE;
+            UPDATE customer_order
+            SET
+                items_count = customer_order.items_count + delta.items_count,
+                total_amount = customer_order.total_amount + delta.total_amount
+            FROM (
+                SELECT
+                    item.order_id,
+                    SUM(item.quantity) AS items_count,
+                    SUM(item.quantity * product.price) AS total_amount
+                FROM (
+                    SELECT order_id, product_id, quantity FROM new_item
+                    UNION ALL
+                    SELECT order_id, product_id, -quantity FROM old_item
+                ) AS item
+                JOIN product ON product.id = item.product_id
+                GROUP BY item.order_id
+            ) AS delta
+            WHERE customer_order.id = delta.order_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION order_item_totals_delete() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM 1
+            FROM customer_order
+            WHERE id IN (SELECT order_id FROM old_item)
+            ORDER BY id
+            FOR NO KEY UPDATE;
+            UPDATE customer_order
+            SET
+                items_count = customer_order.items_count - delta.items_count,
+                total_amount = customer_order.total_amount - delta.total_amount
+            FROM (
+                SELECT
+                    old_item.order_id,
+                    SUM(old_item.quantity) AS items_count,
+                    SUM(old_item.quantity * product.price) AS total_amount
+                FROM old_item
+                JOIN product ON product.id = old_item.product_id
+                GROUP BY old_item.order_id
+            ) AS delta
+            WHERE customer_order.id = delta.order_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE FUNCTION product_price_totals_update() RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM 1
+            FROM customer_order
+            WHERE id IN (SELECT order_id FROM order_item WHERE product_id = NEW.id)
+            ORDER BY id
+            FOR NO KEY UPDATE;
+            UPDATE customer_order
+            SET total_amount = customer_order.total_amount + order_item.quantity * (NEW.price - OLD.price)
+            FROM order_item
+            WHERE order_item.product_id = NEW.id AND customer_order.id = order_item.order_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER order_item_totals_insert
+        AFTER INSERT ON order_item
+        REFERENCING NEW TABLE AS new_item
+        FOR EACH STATEMENT EXECUTE FUNCTION order_item_totals_insert();
+
+        CREATE TRIGGER order_item_totals_update
+        AFTER UPDATE ON order_item
+        REFERENCING OLD TABLE AS old_item NEW TABLE AS new_item
+        FOR EACH STATEMENT EXECUTE FUNCTION order_item_totals_update();
+
+        CREATE TRIGGER order_item_totals_delete
+        AFTER DELETE ON order_item
+        REFERENCING OLD TABLE AS old_item
+        FOR EACH STATEMENT EXECUTE FUNCTION order_item_totals_delete();
+
+        CREATE TRIGGER product_price_totals_update
+        AFTER UPDATE OF price ON product
+        FOR EACH ROW
+        WHEN (OLD.price IS DISTINCT FROM NEW.price)
+        EXECUTE FUNCTION product_price_totals_update();
+
+        UPDATE customer_order
+        SET
+            items_count = totals.items_count,
+            total_amount = totals.total_amount
+        FROM (
+            SELECT
+                order_item.order_id,
+                SUM(order_item.quantity) AS items_count,
+                SUM(order_item.quantity * product.price) AS total_amount
+            FROM order_item
+            JOIN product ON product.id = order_item.product_id
+            GROUP BY order_item.order_id
+        ) AS totals
+        WHERE customer_order.id = totals.order_id;
+    """,
+    )
+
+
+def downgrade(cur):
+    cur.execute(
+        """
+        DROP TRIGGER product_price_totals_update ON product;
+        DROP TRIGGER order_item_totals_delete ON order_item;
+        DROP TRIGGER order_item_totals_update ON order_item;
+        DROP TRIGGER order_item_totals_insert ON order_item;
+        DROP FUNCTION product_price_totals_update();
+        DROP FUNCTION order_item_totals_delete();
+        DROP FUNCTION order_item_totals_update();
+        DROP FUNCTION order_item_totals_insert();
+        DROP INDEX idx_order_item_product;
+        ALTER TABLE customer_order
+            DROP COLUMN total_amount,
+            DROP COLUMN items_count;
+        """,
+    )
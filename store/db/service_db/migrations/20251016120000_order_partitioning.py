@@ -0,0 +1,155 @@
+from psycopg import sql
+
+# Размер и запас партиций на момент миграции. Миграция не читает настройки:
+# её результат не должен зависеть от окружения, в котором она выполняется.
+# Следующие партиции создаёт задача maintain_order_partitions по текущим настройкам
+INITIAL_PARTITION_SIZE = 1000000
+INITIAL_PARTITION_PREMAKE = 3
+
+ORDER_TOTALS_TRIGGERS = """
+    CREATE TRIGGER order_item_totals_insert
+    AFTER INSERT ON order_item
+    REFERENCING NEW TABLE AS new_item
+    FOR EACH STATEMENT EXECUTE FUNCTION order_item_totals_insert();
+
+    CREATE TRIGGER order_item_totals_update
+    AFTER UPDATE ON order_item
+    REFERENCING OLD TABLE AS old_item NEW TABLE AS new_item
+    FOR EACH STATEMENT EXECUTE FUNCTION order_item_totals_update();
+
+    CREATE TRIGGER order_item_totals_delete
+    AFTER DELETE ON order_item
+    REFERENCING OLD TABLE AS old_item
+    FOR EACH STATEMENT EXECUTE FUNCTION order_item_totals_delete();
+"""
+
+
+def upgrade(cur):
+    # customer_order и order_item секционируются по диапазонам идентификатора заказа:
+    # при секционировании по created_at ключ секционирования пришлось бы добавить
+    # в первичный ключ заказа, внешний ключ и уникальный (order_id, product_id).
+    # Идентификаторы заказов растут вместе с created_at, поэтому старые заказы
+    # лежат в младших партициях, которые отсоединяет задача maintain_order_partitions.
+    # Identity-колонки секционированных таблиц не поддерживаются до Postgres 17,
+    # поэтому идентификаторы выдаются последовательностями bigserial.
+    # Данные копируются до создания индексов и триггеров итогов заказа.
+    cur.execute(
+        """
+        ALTER TABLE order_item RENAME TO order_item_unpartitioned;
+        ALTER TABLE order_item_unpartitioned ALTER COLUMN id DROP IDENTITY;
+        ALTER TABLE customer_order RENAME TO customer_order_unpartitioned;
+        ALTER TABLE customer_order_unpartitioned ALTER COLUMN id DROP IDENTITY;
+
+        CREATE TABLE customer_order (
+            id BIGSERIAL NOT NULL,
+            client_id INT NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            items_count BIGINT NOT NULL DEFAULT 0,
+            total_amount NUMERIC(14,2) NOT NULL DEFAULT 0
+        ) PARTITION BY RANGE (id);
+        CREATE TABLE order_item (
+            id BIGSERIAL NOT NULL,
+            order_id BIGINT NOT NULL,
+            product_id INT NOT NULL,
+            quantity INT NOT NULL
+        ) PARTITION BY RANGE (order_id);
+        """,
+    )
+    cur.execute("SELECT COALESCE(MAX(id), 0) FROM customer_order_unpartitioned")
+    last_order_id = cur.fetchone()[0]
+    partitions_count = last_order_id // INITIAL_PARTITION_SIZE + 1 + INITIAL_PARTITION_PREMAKE
+    for from_id in range(0, partitions_count * INITIAL_PARTITION_SIZE, INITIAL_PARTITION_SIZE):
+        for table in ("customer_order", "order_item"):
+            cur.execute(
+                sql.SQL(
+                    "CREATE TABLE {partition} PARTITION OF {table} "
+                    "FOR VALUES FROM ({from_id}) TO ({to_id})",
+                ).format(
+                    partition=sql.Identifier(f"{table}_p{from_id}"),
+                    table=sql.Identifier(table),
+                    from_id=sql.Literal(from_id),
+                    to_id=sql.Literal(from_id + INITIAL_PARTITION_SIZE),
+                ),
+            )
+    cur.execute(
+        """
+        INSERT INTO customer_order (id, client_id, created_at, items_count, total_amount)
+        SELECT id, client_id, created_at, items_count, total_amount
+        FROM customer_order_unpartitioned;
+        INSERT INTO order_item (id, order_id, product_id, quantity)
+        SELECT id, order_id, product_id, quantity
+        FROM order_item_unpartitioned;
+        DROP TABLE order_item_unpartitioned;
+        DROP TABLE customer_order_unpartitioned;
+
+        ALTER TABLE customer_order ADD PRIMARY KEY (id);
+        ALTER TABLE customer_order
+            ADD FOREIGN KEY (client_id) REFERENCES client(id) ON DELETE CASCADE;
+        CREATE INDEX idx_order_client ON customer_order(client_id);
+        ALTER TABLE order_item ADD PRIMARY KEY (id, order_id);
+        ALTER TABLE order_item
+            ADD FOREIGN KEY (order_id) REFERENCES customer_order(id) ON DELETE CASCADE,
+            ADD FOREIGN KEY (product_id) REFERENCES product(id) ON DELETE RESTRICT;
+        CREATE UNIQUE INDEX idx_order_item_order_product ON order_item(order_id, product_id);
+        CREATE INDEX idx_order_item_product ON order_item(product_id);
+
+        SELECT SETVAL('customer_order_id_seq', COALESCE(MAX(id), 0) + 1, FALSE) FROM customer_order;
+        SELECT SETVAL('order_item_id_seq', COALESCE(MAX(id), 0) + 1, FALSE) FROM order_item;
+        """,
+    )
+    cur.execute(ORDER_TOTALS_TRIGGERS)
+
+
+def downgrade(cur):
+    # Отсоединённые задачей партиции в таблицы не возвращаются
+    cur.execute(
+        """
+        ALTER TABLE order_item RENAME TO order_item_partitioned;
+        ALTER TABLE customer_order RENAME TO customer_order_partitioned;
+        ALTER SEQUENCE order_item_id_seq RENAME TO order_item_partitioned_id_seq;
+        ALTER SEQUENCE customer_order_id_seq RENAME TO customer_order_partitioned_id_seq;
+
+        CREATE TABLE customer_order (
+            id BIGINT GENERATED ALWAYS AS IDENTITY,
+            client_id INT NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            items_count BIGINT NOT NULL DEFAULT 0,
+            total_amount NUMERIC(14,2) NOT NULL DEFAULT 0
+        );
+        CREATE TABLE order_item (
+            id BIGINT GENERATED ALWAYS AS IDENTITY,
+            order_id BIGINT NOT NULL,
+            product_id INT NOT NULL,
+            quantity INT NOT NULL
+        );
+        INSERT INTO customer_order (id, client_id, created_at, items_count, total_amount)
+        OVERRIDING SYSTEM VALUE
+        SELECT id, client_id, created_at, items_count, total_amount
+        FROM customer_order_partitioned;
+        INSERT INTO order_item (id, order_id, product_id, quantity)
+        OVERRIDING SYSTEM VALUE
+        SELECT id, order_id, product_id, quantity
+        FROM order_item_partitioned;
+        DROP TABLE order_item_partitioned;
+        DROP TABLE customer_order_partitioned;
+
+        ALTER TABLE customer_order ADD PRIMARY KEY (id);
+        ALTER TABLE customer_order
+            ADD FOREIGN KEY (client_id) REFERENCES client(id) ON DELETE CASCADE;
+        CREATE INDEX idx_order_client ON customer_order(client_id);
+        ALTER TABLE order_item ADD PRIMARY KEY (id);
+        ALTER TABLE order_item
+            ADD FOREIGN KEY (order_id) REFERENCES customer_order(id) ON DELETE CASCADE,
+            ADD FOREIGN KEY (product_id) REFERENCES product(id) ON DELETE RESTRICT;
+        CREATE UNIQUE INDEX idx_order_item_order_product ON order_item(order_id, product_id);
+        CREATE INDEX idx_order_item_product ON order_item(product_id);
+
+        SELECT SETVAL(
+            PG_GET_SERIAL_SEQUENCE('customer_order', 'id'), COALESCE(MAX(id), 0) + 1, FALSE
+        ) FROM customer_order;
+        SELECT SETVAL(
+            PG_GET_SERIAL_SEQUENCE('order_item', 'id'), COALESCE(MAX(id), 0) + 1, FALSE
+        ) FROM order_item;
+        """,
+    )
+    cur.execute(ORDER_TOTALS_TRIGGERS)
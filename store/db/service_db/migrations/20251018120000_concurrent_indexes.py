@@ -0,0 +1,18 @@
+from common.service_db.migrator import create_index_concurrently
+
+# CREATE INDEX CONCURRENTLY не выполняется в транзакции
+ATOMIC = False
+
+
+def upgrade(cur):
+    # Индекс страницы товаров категорий (keyset по id) и индекс order_item по товару
+    # для триггера итогов заказов создаются миграциями category_closure, customer_order_totals
+    # и order_partitioning. Здесь они только проверяются: отсутствующий или невалидный индекс
+    # (в том числе на партиции order_item) пересоздаётся без блокировки записи.
+    create_index_concurrently(cur, "idx_product_category_id", "product", "(category_id, id)")
+    create_index_concurrently(cur, "idx_order_item_product", "order_item", "(product_id)")
+
+
+def downgrade(cur):
+    # Индексы принадлежат предыдущим миграциям и удаляются их downgrade
+    pass  # noqa: WPS420
@@ -0,0 +1,50 @@
+PRODUCT_PRICE_TOTALS_UPDATE = """
+    CREATE OR REPLACE FUNCTION product_price_totals_update() RETURNS TRIGGER AS $$
+    BEGIN
+        {deferred}
+        PERFORM 1
+        FROM customer_order
+        WHERE id IN (SELECT order_id FROM order_item WHERE product_id = NEW.id)
+        ORDER BY id
+        FOR NO KEY UPDATE;
+        UPDATE customer_order
+        SET total_amount = customer_order.total_amount + order_item.quantity * (NEW.price - OLD.price)
+        FROM order_item
+        WHERE order_item.product_id = NEW.id AND customer_order.id = order_item.order_id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+DEFERRED = """
+        IF current_setting('store.defer_order_totals', true) = 'on' THEN
+            INSERT INTO order_totals_stale_product (product_id)
+            VALUES (NEW.id)
+            ON CONFLICT (product_id) DO UPDATE SET changed_at = clock_timestamp();
+            RETURN NULL;
+        END IF;
+"""
+
+
+def upgrade(cur):
+    # Триггер изменения цены блокирует и пересчитывает все заказы с товаром за всю историю
+    # в транзакции, изменившей цену. Массовые записи (загрузка каталога) включают
+    # SET LOCAL store.defer_order_totals = 'on': триггер только отмечает товар
+    # в order_totals_stale_product, а заказы пересчитывает задача
+    # recalculate_stale_order_totals короткими транзакциями по пачкам заказов.
+    cur.execute(
+        """
+        CREATE TABLE order_totals_stale_product (
+            product_id INT PRIMARY KEY,
+            changed_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+        );
+        """
+        + PRODUCT_PRICE_TOTALS_UPDATE.format(deferred=DEFERRED),
+    )
+
+
+def downgrade(cur):
+    cur.execute(
+        PRODUCT_PRICE_TOTALS_UPDATE.format(deferred="")
+        + "DROP TABLE order_totals_stale_product;",
+    )
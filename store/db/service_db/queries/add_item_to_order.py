@@ -1,37 +1,20 @@
-from pathlib import Path
+from typing import Any
 
+from psycopg import AsyncCursor
 from psycopg.errors import ForeignKeyViolation
 from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
-from pydantic import BaseModel, Field, NonNegativeInt, TypeAdapter
+from pydantic import BaseModel, Field, NonNegativeInt
 
-from common.service_db.base_service_db_queries import BaseServiceDbQuery
-
-from store.web.exceptions import OrderCheckViolationError, OrderNotFoundError
-
-SQL_ADD_ITEM_TO_ORDER = (
-    Path(__file__)
-    .parent.parent.joinpath(
-        "sql/add_item_to_order.sql",
-    )
-    .read_text()
-)
-
-SQL_UPDATE_PRODUCT = (
-    Path(__file__)
-    .parent.parent.joinpath(
-        "sql/update_product_quantity.sql",
-    )
-    .read_text()
+from common.service_db.base_service_db_queries import (
+    BaseServiceDbQuery,
+    retry_transaction,
 )
+from common.service_db.query_registry import service_db_queries
 
-SQL_SELECT_FOR_UPDATE_PRODUCT = (
-    Path(__file__)
-    .parent.parent.joinpath(
-        "sql/select_product.sql",
-    )
-    .read_text()
-)
+from configuration.app_settings.service_db_settings import AddItemEngine
+from configuration.settings import settings
+from store.web.exceptions import OrderCheckViolationError, OrderNotFoundError
 
 
 class AddItemToOrderResult(BaseModel):
@@ -44,15 +27,74 @@ class AddItemToOrderResult(BaseModel):
     )
 
 
+QUERY_ADD_ITEM_TO_ORDER = service_db_queries.get(
+    "add_item_to_order",
+    AddItemToOrderResult,
+)
+
+QUERY_ADD_ITEM_TO_ORDER_CTE = service_db_queries.get(
+    "add_item_to_order_cte",
+    AddItemToOrderResult,
+)
+
+QUERY_DECREMENT_STOCK_SHARD = service_db_queries.get("decrement_stock_shard")
+
+QUERY_DECREMENT_STOCK_SHARD_WAIT = service_db_queries.get("decrement_stock_shard_wait")
+
+QUERY_LOCK_PRODUCT = service_db_queries.get("lock_product")
+
+QUERY_LOCK_STOCK_SHARDS = service_db_queries.get("lock_stock_shards")
+
+QUERY_DECREMENT_STOCK_SHARDS = service_db_queries.get("decrement_stock_shards")
+
+QUERY_UPDATE_PRODUCT = service_db_queries.get("update_product_quantity")
+
+QUERY_SELECT_FOR_UPDATE_PRODUCT = service_db_queries.get("select_product")
+
+
 class AddItemToOrderDbQuery(BaseServiceDbQuery):
     """Класс запроса добавления товара в заказ."""
 
-    async def __call__(  # noqa: WPS238 WPS210
+    @retry_transaction
+    async def __call__(
         self,
         order_id: int,
         product_id: int,
         quantity: int,
     ) -> AddItemToOrderResult:
+        """
+        Запрос на добавления товара в заказ.
+
+        Способ выполнения выбирается настройкой service_db.add_item_engine:
+        - transaction: проверка, списание и upsert отдельными запросами в транзакции;
+        - cte: те же действия одним data-modifying CTE за один round-trip;
+        - pipeline: запросы transaction, отправленные одним пакетом в pipeline-режиме;
+        - sharded: списание из шардов остатка товара, затем из product.quantity.
+        :param order_id: Идентификатор заказа.
+        :param product_id: Идентификатор товара.
+        :param quantity: Количество товара.
+        :return: объект результата изменения состава заказа AddItemToOrderResult
+        """
+        query_params = {
+            "order_id": order_id,
+            "product_id": product_id,
+            "quantity": quantity,
+        }
+        add_item_engine = settings.service_db.add_item_engine
+        if add_item_engine == AddItemEngine.CTE:
+            raw_result = await self._add_item_single_statement(query_params)
+        elif add_item_engine == AddItemEngine.PIPELINE:
+            raw_result = await self._add_item_pipeline(query_params)
+        elif add_item_engine == AddItemEngine.SHARDED:
+            raw_result = await self._add_item_sharded(query_params)
+        else:
+            raw_result = await self._add_item_transaction(query_params)
+        return QUERY_ADD_ITEM_TO_ORDER.validate(raw_result)
+
+    async def _add_item_transaction(  # noqa: WPS238
+        self,
+        query_params: dict[str, Any],
+    ) -> dict[str, Any] | None:
         """
         Транзакционный запрос на добавления товара в заказ.
 
@@ -62,46 +104,181 @@ class AddItemToOrderDbQuery(BaseServiceDbQuery):
         3. Добавление товара в заказ или увеличение его количества.
         Проверка наличия товара и его обновление делается отдельными запросами без CTE для возможности
         внесения дополнительной бизнес логики в дальнейшем.
-        :param order_id: Идентификатор заказа.
-        :param product_id: Идентификатор товара.
-        :param quantity: Количество товара.
+        :param query_params: Идентификатор заказа, идентификатор и количество товара.
         :raises TypeError: Если тип db не валиден.
         :raises OrderNotFoundError: Если заказ не найден (ошибка целостности БД).
         :raises OrderCheckViolationError: Если данные по продукту не соответствуют требованиям.
-        :return: объект результата изменения состава заказа AddItemToOrderResult или None
+        :return: строка результата изменения состава заказа.
         """
-        query_upsert_params = {
-            "order_id": order_id,
-            "product_id": product_id,
-            "quantity": quantity,
-        }
-        query_product_params = {
-            "product_id": product_id,
-            "quantity": quantity,
-        }
-
         if not isinstance(self.db, AsyncConnectionPool):
             raise TypeError("Тип db не валиден.")
-        async with self.db.connection() as conn:
+        async with self.connection() as conn:
             async with conn.transaction():
                 async with conn.cursor(  # type: ignore
                     binary=True,
                     row_factory=dict_row,
                 ) as cursor:
                     await cursor.execute(
-                        SQL_SELECT_FOR_UPDATE_PRODUCT,
-                        query_product_params,
+                        QUERY_SELECT_FOR_UPDATE_PRODUCT.sql,
+                        query_params,
                     )
                     if not await cursor.fetchone():
                         raise OrderCheckViolationError
 
-                    await cursor.execute(SQL_UPDATE_PRODUCT, query_product_params)
+                    await cursor.execute(QUERY_UPDATE_PRODUCT.sql, query_params)
+
+                    try:
+                        await cursor.execute(QUERY_ADD_ITEM_TO_ORDER.sql, query_params)
+                    except ForeignKeyViolation as exc:
+                        if exc.diag.constraint_name == "order_item_order_id_fkey":
+                            raise OrderNotFoundError
+                    return await cursor.fetchone()
+
+    async def _add_item_single_statement(
+        self,
+        query_params: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """
+        Добавление товара в заказ одним запросом.
+
+        Списание остатка и upsert позиции заказа выполняются одним data-modifying CTE
+        в режиме autocommit: строка продукта блокируется только на время этого запроса.
+        :param query_params: Идентификатор заказа, идентификатор и количество товара.
+        :raises OrderNotFoundError: Если заказ не найден (ошибка целостности БД).
+        :raises OrderCheckViolationError: Если данные по продукту не соответствуют требованиям.
+        :return: строка результата изменения состава заказа.
+        """
+        async with self.cursor(autocommit=True) as cursor:
+            try:
+                await cursor.execute(QUERY_ADD_ITEM_TO_ORDER_CTE.sql, query_params)
+            except ForeignKeyViolation as exc:
+                if exc.diag.constraint_name == "order_item_order_id_fkey":
+                    raise OrderNotFoundError
+                raise
+            raw_result = await cursor.fetchone()
+        if not raw_result:
+            raise OrderCheckViolationError
+        return raw_result
+
+    async def _add_item_pipeline(
+        self,
+        query_params: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """
+        Транзакционный запрос на добавления товара в заказ в pipeline-режиме.
+
+        Выполняются те же запросы, что и в _add_item_transaction, но отправляются
+        вместе с BEGIN и COMMIT одним пакетом, без ожидания ответа на каждый запрос.
+        Проверка наличия товара делается по результату блокирующего select уже после
+        отправки всех запросов: при нехватке товара транзакция откатывается.
+        Если заказ не найден, OrderNotFoundError выбрасывается и при нехватке товара,
+        так как ошибка upsert приходит вместе с результатом select. Если товар не найден,
+        upsert нарушает внешний ключ на товар, это тоже OrderCheckViolationError.
+        :param query_params: Идентификатор заказа, идентификатор и количество товара.
+        :raises OrderNotFoundError: Если заказ не найден (ошибка целостности БД).
+        :raises OrderCheckViolationError: Если данные по продукту не соответствуют требованиям.
+        :return: строка результата изменения состава заказа.
+        """
+        async with self.pipeline() as conn:
+            select_cursor = conn.cursor(binary=True, row_factory=dict_row)
+            upsert_cursor = conn.cursor(binary=True, row_factory=dict_row)
+            await select_cursor.execute(QUERY_SELECT_FOR_UPDATE_PRODUCT.sql, query_params)
+            await conn.execute(QUERY_UPDATE_PRODUCT.sql, query_params)
+            await upsert_cursor.execute(QUERY_ADD_ITEM_TO_ORDER.sql, query_params)
+            try:
+                product = await select_cursor.fetchone()
+            except ForeignKeyViolation as exc:
+                if exc.diag.constraint_name == "order_item_order_id_fkey":
+                    raise OrderNotFoundError
+                if exc.diag.constraint_name == "order_item_product_id_fkey":
+                    raise OrderCheckViolationError
+                raise
+            if not product:
+                raise OrderCheckViolationError
+            return await upsert_cursor.fetchone()
+
+    async def _add_item_sharded(  # noqa: WPS238
+        self,
+        query_params: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """
+        Транзакционный запрос на добавления товара в заказ с шардированным остатком.
+
+        Остаток товара хранится в product.quantity и в строках product_stock_shard.
+        1. Списание из случайного шарда с достаточным остатком, занятые шарды пропускаются.
+        2. Если все подходящие шарды заняты, ожидание блокировки одного из них.
+        3. Если подходящих шардов нет, блокировка строки продукта и всех его шардов
+           (в том же порядке, что и при перебалансировке) и списание из product.quantity,
+           а недостающего количества - из нескольких шардов по порядку.
+        4. Добавление товара в заказ или увеличение его количества.
+        :param query_params: Идентификатор заказа, идентификатор и количество товара.
+        :raises TypeError: Если тип db не валиден.
+        :raises OrderNotFoundError: Если заказ не найден (ошибка целостности БД).
+        :raises OrderCheckViolationError: Если данные по продукту не соответствуют требованиям.
+        :return: строка результата изменения состава заказа.
+        """
+        if not isinstance(self.db, AsyncConnectionPool):
+            raise TypeError("Тип db не валиден.")
+        async with self.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor(  # type: ignore
+                    binary=True,
+                    row_factory=dict_row,
+                ) as cursor:
+                    await cursor.execute(QUERY_DECREMENT_STOCK_SHARD.sql, query_params)
+                    if not await cursor.fetchone():
+                        await cursor.execute(
+                            QUERY_DECREMENT_STOCK_SHARD_WAIT.sql,
+                            query_params,
+                        )
+                    if not cursor.rowcount:
+                        await self._decrement_stock_locked(cursor, query_params)
 
                     try:
-                        await cursor.execute(SQL_ADD_ITEM_TO_ORDER, query_upsert_params)
+                        await cursor.execute(QUERY_ADD_ITEM_TO_ORDER.sql, query_params)
                     except ForeignKeyViolation as exc:
                         if exc.diag.constraint_name == "order_item_order_id_fkey":
                             raise OrderNotFoundError
-                    raw_result = await cursor.fetchone()
+                        raise
+                    return await cursor.fetchone()
+
+    async def _decrement_stock_locked(
+        self,
+        cursor: AsyncCursor[dict[str, Any]],
+        query_params: dict[str, Any],
+    ) -> None:
+        await cursor.execute(QUERY_LOCK_PRODUCT.sql, query_params)
+        product = await cursor.fetchone()
+        if not product:
+            raise OrderCheckViolationError
+        await cursor.execute(QUERY_LOCK_STOCK_SHARDS.sql, query_params)
+        shards = await cursor.fetchall()
+
+        remaining = query_params["quantity"]
+        product_quantity = min(product["quantity"], remaining)
+        remaining -= product_quantity
+        shard_quantities: dict[int, int] = {}
+        for shard in shards:
+            if not remaining:
+                break
+            shard_quantity = min(shard["quantity"], remaining)
+            if shard_quantity > 0:
+                shard_quantities[shard["shard_id"]] = shard_quantity
+                remaining -= shard_quantity
+        if remaining:
+            raise OrderCheckViolationError
 
-                    return TypeAdapter(AddItemToOrderResult).validate_python(raw_result)
+        if product_quantity:
+            await cursor.execute(
+                QUERY_UPDATE_PRODUCT.sql,
+                {"product_id": query_params["product_id"], "quantity": product_quantity},
+            )
+        if shard_quantities:
+            await cursor.execute(
+                QUERY_DECREMENT_STOCK_SHARDS.sql,
+                {
+                    "product_id": query_params["product_id"],
+                    "shard_ids": list(shard_quantities.keys()),
+                    "quantities": list(shard_quantities.values()),
+                },
+            )
@@ -0,0 +1,117 @@
+
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from common.errors.exceptions import ServiceError
+from common.service_db.base_service_db_queries import (
+    BaseServiceDbQuery,
+    retry_transaction,
+)
+from common.service_db.query_registry import service_db_queries
+
+from store.db.service_db.queries.add_item_to_order import AddItemToOrderResult
+from store.web.exceptions import OrderCheckViolationError, OrderNotFoundError
+
+QUERY_LOCK_PRODUCT = service_db_queries.get("lock_product")
+
+QUERY_LOCK_ORDERS = service_db_queries.get("lock_orders")
+
+QUERY_UPDATE_PRODUCTS = service_db_queries.get("update_products_quantity")
+
+QUERY_ADD_ITEMS_TO_ORDER = service_db_queries.get(
+    "add_items_to_order",
+    AddItemToOrderResult,
+)
+
+
+class AddItemToOrdersDbQuery(BaseServiceDbQuery):
+    """Класс запроса добавления товара в несколько заказов."""
+
+    @retry_transaction
+    async def __call__(  # noqa: WPS210 WPS231
+        self,
+        product_id: int,
+        items: list[tuple[int, int]],
+    ) -> list[AddItemToOrderResult | ServiceError]:
+        """
+        Транзакционный запрос на добавление товара в несколько заказов.
+
+        Позиции обрабатываются в одной транзакции фиксированным числом запросов:
+        1. Блокировка строки товара.
+        2. Блокировка найденных заказов от удаления (FOR KEY SHARE, как при проверке FK).
+        3. Распределение остатка по позициям в переданном порядке.
+        4. Списание остатка одним обновлением.
+        5. Добавление товара в заказы одним upsert по массивам.
+        Ошибка одной позиции не отменяет остальные.
+        :param product_id: Идентификатор товара.
+        :param items: Пары (идентификатор заказа, количество товара).
+        :raises TypeError: Если тип db не валиден.
+        :return: результат или ошибка для каждой позиции в порядке переданных позиций.
+        """
+        order_ids = sorted({order_id for order_id, _ in items})
+
+        if not isinstance(self.db, AsyncConnectionPool):
+            raise TypeError("Тип db не валиден.")
+        async with self.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor(  # type: ignore
+                    binary=True,
+                    row_factory=dict_row,
+                ) as cursor:
+                    await cursor.execute(QUERY_LOCK_PRODUCT.sql, {"product_id": product_id})
+                    product = await cursor.fetchone()
+                    stock = product["quantity"] if product else 0
+
+                    await cursor.execute(QUERY_LOCK_ORDERS.sql, {"order_ids": order_ids})
+                    found_order_ids = {row["id"] for row in await cursor.fetchall()}
+
+                    allocated: list[int | ServiceError] = []
+                    order_quantities: dict[int, int] = {}
+                    for order_id, quantity in items:
+                        if order_id not in found_order_ids:
+                            allocated.append(OrderNotFoundError())
+                        elif not product or quantity > stock:
+                            allocated.append(OrderCheckViolationError())
+                        else:
+                            stock -= quantity
+                            allocated.append(quantity)
+                            order_quantities[order_id] = (
+                                order_quantities.get(order_id, 0) + quantity
+                            )
+                    if not order_quantities:
+                        return allocated  # type: ignore
+
+                    await cursor.execute(
+                        QUERY_UPDATE_PRODUCTS.sql,
+                        {
+                            "product_ids": [product_id],
+                            "quantities": [sum(order_quantities.values())],
+                        },
+                    )
+                    await cursor.execute(
+                        QUERY_ADD_ITEMS_TO_ORDER.sql,
+                        {
+                            "order_ids": list(order_quantities.keys()),
+                            "product_ids": [product_id] * len(order_quantities),
+                            "quantities": list(order_quantities.values()),
+                        },
+                    )
+                    totals = {
+                        row["order_id"]: row["order_quantity"]
+                        for row in await cursor.fetchall()
+                    }
+
+        # Несколько позиций одного заказа получают нарастающий итог,
+        # как если бы они выполнялись по очереди.
+        results: list[AddItemToOrderResult | ServiceError] = []
+        for (order_id, _), allocation in reversed(list(zip(items, allocated))):
+            if isinstance(allocation, ServiceError):
+                results.append(allocation)
+                continue
+            results.append(
+                QUERY_ADD_ITEMS_TO_ORDER.validate(
+                    {"product_id": product_id, "order_quantity": totals[order_id]},
+                ),
+            )
+            totals[order_id] -= allocation
+        return results[::-1]
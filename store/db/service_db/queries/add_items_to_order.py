@@ -0,0 +1,105 @@
+
+from psycopg.errors import ForeignKeyViolation
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from common.service_db.base_service_db_queries import (
+    BaseServiceDbQuery,
+    retry_transaction,
+)
+from common.service_db.query_registry import service_db_queries
+
+from store.db.service_db.queries.add_item_to_order import AddItemToOrderResult
+from store.web.exceptions import (
+    OrderCheckViolationError,
+    OrderNotFoundError,
+    ProductNotBatchableError,
+)
+
+QUERY_ADD_ITEMS_TO_ORDER = service_db_queries.get(
+    "add_items_to_order",
+    AddItemToOrderResult,
+)
+
+QUERY_UPDATE_PRODUCTS = service_db_queries.get("update_products_quantity")
+
+QUERY_SELECT_FOR_UPDATE_PRODUCTS = service_db_queries.get("select_products")
+
+
+class AddItemsToOrderDbQuery(BaseServiceDbQuery):
+    """Класс запроса пакетного добавления товаров в заказ."""
+
+    @retry_transaction
+    async def __call__(  # noqa: WPS210
+        self,
+        order_id: int,
+        items: dict[int, int],
+    ) -> list[AddItemToOrderResult]:
+        """
+        Транзакционный запрос на добавление нескольких товаров в заказ.
+
+        Все позиции обрабатываются в одной транзакции фиксированным числом запросов:
+        1. Проверка наличия товаров и блокировка строк продуктов в порядке их id,
+        чтобы параллельные корзины с пересекающимся составом не попадали в deadlock.
+        Остаток товара с шардами (product_stock_shard) списывается только способом
+        sharded по одному товару, такой товар в пакете не принимается.
+        2. Обновление количества всех товаров на складе одним запросом.
+        3. Добавление товаров в заказ одним upsert по массивам.
+        :param order_id: Идентификатор заказа.
+        :param items: Количество товара по идентификатору товара.
+        :raises TypeError: Если тип db не валиден.
+        :raises OrderNotFoundError: Если заказ не найден (ошибка целостности БД).
+        :raises OrderCheckViolationError: Если хотя бы одного товара недостаточно.
+        :raises ProductNotBatchableError: Если у товара есть шарды остатка.
+        :return: результаты изменения состава заказа в порядке переданных товаров.
+        """
+        product_ids = list(items.keys())
+        quantities = list(items.values())
+        query_products_params = {
+            "product_ids": product_ids,
+            "quantities": quantities,
+        }
+        query_upsert_params = {
+            "order_ids": [order_id] * len(product_ids),
+            "product_ids": product_ids,
+            "quantities": quantities,
+        }
+
+        if not isinstance(self.db, AsyncConnectionPool):
+            raise TypeError("Тип db не валиден.")
+        async with self.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor(  # type: ignore
+                    binary=True,
+                    row_factory=dict_row,
+                ) as cursor:
+                    await cursor.execute(
+                        QUERY_SELECT_FOR_UPDATE_PRODUCTS.sql,
+                        query_products_params,
+                    )
+                    products = await cursor.fetchall()
+                    if any(product["sharded"] for product in products):
+                        raise ProductNotBatchableError
+                    if len(products) != len(product_ids) or not all(
+                        product["in_stock"] for product in products
+                    ):
+                        raise OrderCheckViolationError
+
+                    await cursor.execute(QUERY_UPDATE_PRODUCTS.sql, query_products_params)
+
+                    try:
+                        await cursor.execute(
+                            QUERY_ADD_ITEMS_TO_ORDER.sql,
+                            query_upsert_params,
+                        )
+                    except ForeignKeyViolation as exc:
+                        if exc.diag.constraint_name == "order_item_order_id_fkey":
+                            raise OrderNotFoundError
+                        raise
+                    raw_results = {
+                        row["product_id"]: row for row in await cursor.fetchall()
+                    }
+
+                    return QUERY_ADD_ITEMS_TO_ORDER.validate_many(
+                        [raw_results[product_id] for product_id in product_ids],
+                    )
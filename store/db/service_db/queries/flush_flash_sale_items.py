@@ -0,0 +1,90 @@
+import uuid
+
+from loguru import logger
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from common.service_db.base_service_db_queries import (
+    BaseServiceDbQuery,
+    retry_transaction,
+)
+from common.service_db.query_registry import service_db_queries
+
+from store.web.exceptions import OrderCheckViolationError
+
+QUERY_INSERT_FLASH_SALE_FLUSH = service_db_queries.get("insert_flash_sale_flush")
+
+QUERY_DELETE_FLASH_SALE_FLUSH = service_db_queries.get("delete_flash_sale_flush")
+
+QUERY_LOCK_PRODUCTS = service_db_queries.get("lock_products")
+
+QUERY_UPDATE_PRODUCTS = service_db_queries.get("update_products_quantity")
+
+QUERY_ADD_ITEMS_TO_EXISTING_ORDERS = service_db_queries.get("add_items_to_existing_orders")
+
+
+class FlushFlashSaleItemsDbQuery(BaseServiceDbQuery):
+    """Класс запроса переноса резервов распродажи из Redis в Postgres."""
+
+    @retry_transaction
+    async def __call__(  # noqa: WPS210
+        self,
+        batch_id: uuid.UUID,
+        items: dict[tuple[int, int], int],
+    ) -> bool:
+        """
+        Транзакционный запрос переноса пачки резервов в Postgres.
+
+        Идентификатор пачки сохраняется в той же транзакции, поэтому повторный перенос
+        той же пачки (после падения между коммитом и очисткой Redis) ничего не меняет.
+        Строки товаров блокируются в порядке id, как и при пакетном добавлении.
+        Резервы в удалённые заказы не переносятся.
+        Если остатка товара в Postgres не хватает на резервы пачки (остаток списан
+        в обход Redis), транзакция откатывается, а пачка остаётся в Redis до исправления.
+        :param batch_id: Идентификатор пачки резервов.
+        :param items: Количество товара по паре (идентификатор заказа, идентификатор товара).
+        :raises TypeError: Если тип db не валиден.
+        :raises OrderCheckViolationError: Если остатка товара не хватает на резервы пачки.
+        :return: True, если пачка перенесена, False, если она была перенесена ранее.
+        """
+        products: dict[int, int] = {}
+        for (_, product_id), quantity in items.items():
+            products[product_id] = products.get(product_id, 0) + quantity
+        query_products_params = {
+            "product_ids": list(products.keys()),
+            "quantities": list(products.values()),
+        }
+        query_upsert_params = {
+            "order_ids": [order_id for order_id, _ in items.keys()],
+            "product_ids": [product_id for _, product_id in items.keys()],
+            "quantities": list(items.values()),
+        }
+
+        if not isinstance(self.db, AsyncConnectionPool):
+            raise TypeError("Тип db не валиден.")
+        async with self.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor(  # type: ignore
+                    binary=True,
+                    row_factory=dict_row,
+                ) as cursor:
+                    await cursor.execute(
+                        QUERY_INSERT_FLASH_SALE_FLUSH.sql,
+                        {"batch_id": batch_id},
+                    )
+                    if not cursor.rowcount:
+                        return False
+                    await cursor.execute(QUERY_LOCK_PRODUCTS.sql, query_products_params)
+                    await cursor.execute(QUERY_UPDATE_PRODUCTS.sql, query_products_params)
+                    if cursor.rowcount != len(products):
+                        logger.error(
+                            f"Остатка товаров не хватает на резервы пачки {batch_id}: "
+                            f"{products}.",
+                        )
+                        raise OrderCheckViolationError
+                    await cursor.execute(
+                        QUERY_ADD_ITEMS_TO_EXISTING_ORDERS.sql,
+                        query_upsert_params,
+                    )
+                    await cursor.execute(QUERY_DELETE_FLASH_SALE_FLUSH.sql)
+                    return True
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from psycopg import AsyncConnection, sql
+from psycopg.errors import LockNotAvailable
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from pydantic import BaseModel, Field, NonNegativeInt
+
+from common.service_db.base_service_db_queries import BaseServiceDbQuery
+from common.service_db.query_registry import service_db_queries
+
+# Таблицы в порядке отсоединения партиций: сначала ссылающаяся order_item
+ORDER_PARTITIONED_TABLES = ("order_item", "customer_order")
+
+
+class OrderPartition(BaseModel):
+    """Модель партиции заказов."""
+
+    name: str = Field(..., title="Имя партиции customer_order")
+    from_id: NonNegativeInt = Field(..., title="Первый идентификатор заказа партиции")
+    to_id: NonNegativeInt = Field(..., title="Идентификатор заказа после последнего в партиции")
+
+
+class ForeignKey(BaseModel):
+    """Модель внешнего ключа таблицы."""
+
+    name: str = Field(..., title="Имя ограничения")
+
+
+class MaintainOrderPartitionsResult(BaseModel):
+    """Модель результата обслуживания партиций заказов."""
+
+    created: list[NonNegativeInt] = Field([], title="Начала созданных партиций")
+    detached: list[NonNegativeInt] = Field([], title="Начала отсоединённых партиций")
+    locked: list[NonNegativeInt] = Field(
+        [],
+        title="Начала партиций, пропущенных из-за lock_timeout",
+    )
+
+
+QUERY_SELECT_ORDER_PARTITIONS = service_db_queries.get(
+    "select_order_partitions",
+    OrderPartition,
+)
+QUERY_SELECT_LAST_ORDER_ID = service_db_queries.get("select_last_order_id")
+QUERY_SELECT_ORDER_PARTITION_NEWEST = service_db_queries.get("select_order_partition_newest")
+QUERY_SELECT_FOREIGN_KEYS = service_db_queries.get("select_foreign_keys", ForeignKey)
+QUERY_SET_LOCK_TIMEOUT = service_db_queries.get("set_lock_timeout")
+QUERY_CREATE_ORDER_PARTITION = service_db_queries.get("create_order_partition")
+QUERY_DETACH_ORDER_PARTITION = service_db_queries.get("detach_order_partition")
+QUERY_DROP_CONSTRAINT = service_db_queries.get("drop_constraint")
+
+
+def get_partition_name(table: str, from_id: int) -> str:
+    """
+    Имя партиции таблицы заказов.
+
+    :param table: customer_order или order_item.
+    :param from_id: Первый идентификатор заказа партиции.
+    :return: имя партиции.
+    """
+    return f"{table}_p{from_id}"
+
+
+class MaintainOrderPartitionsDbQuery(BaseServiceDbQuery):
+    """Класс запроса обслуживания партиций customer_order и order_item."""
+
+    async def __call__(  # noqa: WPS210
+        self,
+        partition_size: int,
+        premake: int,
+        retention_days: int,
+        lock_timeout_ms: int,
+    ) -> MaintainOrderPartitionsResult:
+        """
+        Создать партиции заказов заранее и отсоединить партиции старых заказов.
+
+        Партиции создаются после последней существующей, пока не будет premake партиций
+        после партиции последнего заказа. Отсоединяются партиции, все идентификаторы
+        которых уже выданы, а последний заказ старше retention_days: партиции order_item
+        и customer_order отсоединяются в одной транзакции и остаются отдельными таблицами
+        без внешних ключей (архив). Пустые партиции не отсоединяются.
+        Каждая партиция обслуживается в своей транзакции с lock_timeout: партиция,
+        блокировку таблиц для которой не удалось получить, пропускается до следующего запуска.
+        :param partition_size: Количество идентификаторов заказов в новой партиции.
+        :param premake: Количество партиций после партиции последнего заказа.
+        :param retention_days: Возраст заказов для отсоединения, дней (0 - не отсоединять).
+        :param lock_timeout_ms: lock_timeout DDL, мс.
+        :raises TypeError: Если тип db не валиден.
+        :return: созданные, отсоединённые и пропущенные партиции.
+        """
+        if not isinstance(self.db, AsyncConnectionPool):
+            raise TypeError("Тип db не валиден.")
+        result = MaintainOrderPartitionsResult()
+        async with self.connection() as conn:
+            async with conn.cursor(row_factory=dict_row) as cursor:  # type: ignore
+                await cursor.execute(QUERY_SELECT_ORDER_PARTITIONS.sql)
+                partitions = QUERY_SELECT_ORDER_PARTITIONS.validate_many(await cursor.fetchall())
+                await cursor.execute(QUERY_SELECT_LAST_ORDER_ID.sql)
+                last_order_id = (await cursor.fetchone())["last_order_id"]  # type: ignore
+            await conn.commit()
+
+            from_id = partitions[-1].to_id if partitions else 0
+            premake_to_id = (last_order_id // partition_size + 1 + premake) * partition_size
+            while from_id < premake_to_id:
+                if await self._create(conn, from_id, from_id + partition_size, lock_timeout_ms):
+                    result.created.append(from_id)
+                else:
+                    result.locked.append(from_id)
+                    break
+                from_id += partition_size
+
+            if not retention_days:
+                return result
+            retention_from = datetime.now(timezone.utc) - timedelta(days=retention_days)
+            for partition in partitions:
+                if partition.to_id > last_order_id:
+                    break
+                newest = await self._get_newest(conn, partition)
+                if newest is None or newest >= retention_from:
+                    continue
+                if await self._detach(conn, partition.from_id, lock_timeout_ms):
+                    result.detached.append(partition.from_id)
+                else:
+                    result.locked.append(partition.from_id)
+        return result
+
+    async def _create(
+        self,
+        conn: AsyncConnection[Any],
+        from_id: int,
+        to_id: int,
+        lock_timeout_ms: int,
+    ) -> bool:
+        try:
+            async with conn.transaction():
+                await self._set_lock_timeout(conn, lock_timeout_ms)
+                for table in ORDER_PARTITIONED_TABLES[::-1]:
+                    await conn.execute(
+                        QUERY_CREATE_ORDER_PARTITION.format(
+                            partition=sql.Identifier(get_partition_name(table, from_id)),
+                            table=sql.Identifier(table),
+                            from_id=sql.Literal(from_id),
+                            to_id=sql.Literal(to_id),
+                        ),
+                        prepare=False,
+                    )
+        except LockNotAvailable:
+            return False
+        return True
+
+    async def _detach(
+        self,
+        conn: AsyncConnection[Any],
+        from_id: int,
+        lock_timeout_ms: int,
+    ) -> bool:
+        try:
+            async with conn.transaction():
+                await self._set_lock_timeout(conn, lock_timeout_ms)
+                for table in ORDER_PARTITIONED_TABLES:
+                    partition = get_partition_name(table, from_id)
+                    await conn.execute(
+                        QUERY_DETACH_ORDER_PARTITION.format(
+                            table=sql.Identifier(table),
+                            partition=sql.Identifier(partition),
+                        ),
+                        prepare=False,
+                    )
+                    # Архив не должен мешать изменению и очистке живых таблиц
+                    async with conn.cursor(row_factory=dict_row) as cursor:  # type: ignore
+                        await cursor.execute(QUERY_SELECT_FOREIGN_KEYS.sql, {"table": partition})
+                        foreign_keys = QUERY_SELECT_FOREIGN_KEYS.validate_many(
+                            await cursor.fetchall(),
+                        )
+                    for foreign_key in foreign_keys:
+                        await conn.execute(
+                            QUERY_DROP_CONSTRAINT.format(
+                                table=sql.Identifier(partition),
+                                constraint=sql.Identifier(foreign_key.name),
+                            ),
+                            prepare=False,
+                        )
+        except LockNotAvailable:
+            return False
+        return True
+
+    async def _get_newest(
+        self,
+        conn: AsyncConnection[Any],
+        partition: OrderPartition,
+    ) -> datetime | None:
+        async with conn.transaction():
+            newest = await conn.execute(
+                QUERY_SELECT_ORDER_PARTITION_NEWEST.format(
+                    partition=sql.Identifier(partition.name),
+                ),
+                prepare=False,
+            )
+            row = await newest.fetchone()
+        return row[0] if row else None
+
+    async def _set_lock_timeout(self, conn: AsyncConnection[Any], lock_timeout_ms: int) -> None:
+        await conn.execute(QUERY_SET_LOCK_TIMEOUT.sql, {"lock_timeout": f"{lock_timeout_ms}ms"})
+
@@ -0,0 +1,52 @@
+
+from pydantic import BaseModel, Field, NonNegativeInt
+
+from common.service_db.base_service_db_queries import (
+    BaseServiceDbQuery,
+    retry_transaction,
+)
+from common.service_db.query_registry import service_db_queries
+
+
+class RebalanceStockShardsResult(BaseModel):
+    """Модель результата перебалансировки шардов остатка товара."""
+
+    product_id: NonNegativeInt = Field(..., title="Идентификатор товара")
+    quantity: NonNegativeInt = Field(..., title="Общий остаток товара")
+    shard_count: NonNegativeInt = Field(..., title="Количество шардов")
+
+
+QUERY_REBALANCE_STOCK_SHARDS = service_db_queries.get(
+    "rebalance_stock_shards",
+    RebalanceStockShardsResult,
+)
+
+
+class RebalanceStockShardsDbQuery(BaseServiceDbQuery):
+    """Класс запроса перебалансировки шардов остатка товара."""
+
+    @retry_transaction
+    async def __call__(
+        self,
+        product_id: int,
+        shard_count: int,
+    ) -> RebalanceStockShardsResult | None:
+        """
+        Перераспределить остаток товара по заданному количеству шардов.
+
+        Общий остаток (product.quantity плюс все шарды) делится поровну между
+        shard_count шардами, product.quantity обнуляется.
+        При shard_count = 0 шарды удаляются и весь остаток возвращается в product.quantity.
+        :param product_id: Идентификатор товара.
+        :param shard_count: Новое количество шардов.
+        :return: результат перебалансировки или None, если товар не найден.
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(
+                QUERY_REBALANCE_STOCK_SHARDS.sql,
+                {"product_id": product_id, "shard_count": shard_count},
+            )
+            raw_result = await cursor.fetchone()
+        if not raw_result:
+            return None
+        return QUERY_REBALANCE_STOCK_SHARDS.validate(raw_result)
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from common.service_db.base_service_db_queries import (
+    BaseServiceDbQuery,
+    retry_transaction,
+)
+from common.service_db.query_registry import service_db_queries
+
+from store.db.service_db.queries.verify_order_totals import (
+    QUERY_SELECT_ORDER_TOTALS_DRIFT,
+    QUERY_UPDATE_ORDER_TOTALS,
+)
+
+QUERY_SELECT_STALE_PRODUCTS = service_db_queries.get("select_order_totals_stale_products")
+QUERY_LOCK_PRODUCT_ORDERS_BATCH = service_db_queries.get("lock_product_orders_batch")
+QUERY_DELETE_STALE_PRODUCTS = service_db_queries.get("delete_order_totals_stale_products")
+
+
+class SelectStaleOrderTotalsProductsDbQuery(BaseServiceDbQuery):
+    """Класс запроса товаров, после изменения цены которых итоги заказов не пересчитаны."""
+
+    async def __call__(self, limit: int) -> dict[int, datetime]:
+        """
+        Получить товары с отложенным пересчётом итогов заказов.
+
+        :param limit: Количество товаров.
+        :return: время изменения цены по идентификатору товара.
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(QUERY_SELECT_STALE_PRODUCTS.sql, {"limit": limit})
+            return {row["product_id"]: row["changed_at"] for row in await cursor.fetchall()}
+
+
+class RecalculateOrderTotalsDbQuery(BaseServiceDbQuery):
+    """Класс запроса пересчёта итогов заказов с товарами, цена которых изменилась."""
+
+    @retry_transaction
+    async def __call__(
+        self,
+        stale_products: dict[int, datetime],
+        after_order_id: int,
+        batch_size: int,
+    ) -> int | None:
+        """
+        Пересчитать итоги пачки заказов с товарами по составу заказов.
+
+        Заказы пачки блокируются по возрастанию id, как и в триггерах итогов.
+        Когда заказов больше нет, товары снимаются с пересчёта, если их цена
+        не менялась снова после чтения stale_products.
+        :param stale_products: Время изменения цены по идентификатору товара.
+        :param after_order_id: Пересчитывать заказы с id больше этого.
+        :param batch_size: Количество заказов в пачке.
+        :raises TypeError: Если тип db не валиден.
+        :return: последний пересчитанный заказ или None, если заказов больше нет.
+        """
+        product_ids = list(stale_products.keys())
+        if not isinstance(self.db, AsyncConnectionPool):
+            raise TypeError("Тип db не валиден.")
+        async with self.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor(  # type: ignore
+                    binary=True,
+                    row_factory=dict_row,
+                ) as cursor:
+                    await cursor.execute(
+                        QUERY_LOCK_PRODUCT_ORDERS_BATCH.sql,
+                        {
+                            "product_ids": product_ids,
+                            "after_order_id": after_order_id,
+                            "batch_size": batch_size,
+                        },
+                    )
+                    order_ids = [row["id"] for row in await cursor.fetchall()]
+                    if not order_ids:
+                        await cursor.execute(
+                            QUERY_DELETE_STALE_PRODUCTS.sql,
+                            {
+                                "product_ids": product_ids,
+                                "changed_ats": list(stale_products.values()),
+                            },
+                        )
+                        return None
+
+                    await cursor.execute(
+                        QUERY_SELECT_ORDER_TOTALS_DRIFT.sql,
+                        {"order_ids": order_ids},
+                    )
+                    drift = QUERY_SELECT_ORDER_TOTALS_DRIFT.validate_many(
+                        await cursor.fetchall(),
+                    )
+                    if drift:
+                        await cursor.execute(
+                            QUERY_UPDATE_ORDER_TOTALS.sql,
+                            {
+                                "order_ids": [row.order_id for row in drift],
+                                "items_counts": [row.expected_items_count for row in drift],
+                                "total_amounts": [row.expected_total_amount for row in drift],
+                            },
+                        )
+        return order_ids[-1]
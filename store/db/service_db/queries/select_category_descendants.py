@@ -0,0 +1,27 @@
+from common.service_db.base_service_db_queries import BaseServiceDbQuery
+from common.service_db.query_registry import service_db_queries
+
+QUERY_SELECT_CATEGORY_DESCENDANTS = service_db_queries.get("select_category_descendants")
+
+
+class SelectCategoryDescendantsDbQuery(BaseServiceDbQuery):
+    """
+    Класс запроса поддерева категории по таблице замыкания category_closure.
+
+    Выполняется на primary: поддерево кешируется до уведомления об изменении
+    категорий, а отстающая реплика вернула бы поддерево до изменения.
+    """
+
+    async def __call__(self, category_id: int) -> list[int]:
+        """
+        Получить категорию и всех её потомков.
+
+        :param category_id: Идентификатор категории.
+        :return: идентификаторы категорий поддерева (пустой список, если категории нет).
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(
+                QUERY_SELECT_CATEGORY_DESCENDANTS.sql,
+                {"category_id": category_id},
+            )
+            return [row["descendant_id"] for row in await cursor.fetchall()]
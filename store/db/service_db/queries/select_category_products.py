@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+from pydantic import BaseModel, Field, NonNegativeInt
+
+from common.db.keyset import KeysetPage
+from common.service_db.base_service_db_queries import BaseServiceDbQuery
+from common.service_db.query_registry import service_db_queries
+
+
+class CategoryProduct(BaseModel):
+    """Модель товара категории."""
+
+    id: NonNegativeInt = Field(..., title="Идентификатор товара")
+    name: str = Field(..., title="Название товара")
+    quantity: int = Field(..., title="Остаток товара")
+    price: Decimal = Field(..., title="Цена товара")
+    category_id: NonNegativeInt = Field(..., title="Идентификатор категории")
+
+
+QUERY_SELECT_CATEGORY_PRODUCTS = service_db_queries.get(
+    "select_category_products",
+    CategoryProduct,
+)
+
+
+class SelectCategoryProductsDbQuery(BaseServiceDbQuery):
+    """Класс запроса страницы товаров категорий."""
+
+    read_only = True
+
+    async def __call__(
+        self,
+        category_ids: list[int],
+        page: KeysetPage,
+        limit: int,
+    ) -> list[CategoryProduct]:
+        """
+        Получить страницу товаров категорий.
+
+        Страница начинается после позиции page, поэтому её стоимость
+        не зависит от количества предыдущих страниц.
+
+        :param category_ids: Идентификаторы категорий.
+        :param page: Страница keyset-пагинации по колонкам товара.
+        :param limit: Количество товаров.
+        :return: товары в порядке выборки страницы.
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(
+                QUERY_SELECT_CATEGORY_PRODUCTS.format(
+                    keyset=page.predicate,
+                    keyset_order=page.order_by,
+                ),
+                {"category_ids": category_ids, "limit": limit, **page.params},
+            )
+            return QUERY_SELECT_CATEGORY_PRODUCTS.validate_many(await cursor.fetchall())
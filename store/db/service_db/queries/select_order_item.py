@@ -0,0 +1,45 @@
+
+from pydantic import BaseModel, Field, NonNegativeInt
+
+from common.service_db.base_service_db_queries import BaseServiceDbQuery
+from common.service_db.query_registry import service_db_queries
+
+
+class OrderItemQuantity(BaseModel):
+    """Модель количества товара в заказе."""
+
+    order_id: NonNegativeInt = Field(..., title="Идентификатор заказа")
+    quantity: NonNegativeInt = Field(..., title="Количество товара в заказе")
+
+
+QUERY_SELECT_ORDER_ITEM = service_db_queries.get(
+    "select_order_item",
+    OrderItemQuantity,
+)
+
+
+class SelectOrderItemDbQuery(BaseServiceDbQuery):
+    """Класс запроса количества товара в заказе."""
+
+    async def __call__(
+        self,
+        order_id: int,
+        product_id: int,
+    ) -> OrderItemQuantity | None:
+        """
+        Получить количество товара в заказе без блокировок.
+
+        :param order_id: Идентификатор заказа.
+        :param product_id: Идентификатор товара.
+        :return: количество товара в заказе (0, если товара в заказе нет)
+            или None, если заказ не найден.
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(
+                QUERY_SELECT_ORDER_ITEM.sql,
+                {"order_id": order_id, "product_id": product_id},
+            )
+            raw_result = await cursor.fetchone()
+        if not raw_result:
+            return None
+        return QUERY_SELECT_ORDER_ITEM.validate(raw_result)
@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+from pydantic import BaseModel, Field, NonNegativeInt
+
+from common.service_db.base_service_db_queries import BaseServiceDbQuery
+from common.service_db.query_registry import service_db_queries
+
+
+class OrderSummary(BaseModel):
+    """Модель итогов заказа."""
+
+    order_id: NonNegativeInt = Field(..., title="Идентификатор заказа")
+    items_count: NonNegativeInt = Field(..., title="Количество единиц товара в заказе")
+    total_amount: Decimal = Field(..., title="Сумма заказа по текущим ценам")
+
+
+QUERY_SELECT_ORDER_SUMMARY = service_db_queries.get(
+    "select_order_summary",
+    OrderSummary,
+)
+
+
+class SelectOrderSummaryDbQuery(BaseServiceDbQuery):
+    """Класс запроса итогов заказа."""
+
+    async def __call__(self, order_id: int) -> OrderSummary | None:
+        """
+        Получить итоги заказа по первичному ключу.
+
+        Итоги хранятся в customer_order и поддерживаются триггерами,
+        поэтому состав заказа не агрегируется.
+        :param order_id: Идентификатор заказа.
+        :return: итоги заказа или None, если заказ не найден.
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(QUERY_SELECT_ORDER_SUMMARY.sql, {"order_id": order_id})
+            raw_result = await cursor.fetchone()
+        if not raw_result:
+            return None
+        return QUERY_SELECT_ORDER_SUMMARY.validate(raw_result)
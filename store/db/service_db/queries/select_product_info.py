@@ -0,0 +1,42 @@
+from decimal import Decimal
+
+from pydantic import BaseModel, Field, NonNegativeInt
+
+from common.service_db.base_service_db_queries import BaseServiceDbQuery
+from common.service_db.query_registry import service_db_queries
+
+
+class ProductInfo(BaseModel):
+    """Модель товара с остатком на складе."""
+
+    id: NonNegativeInt = Field(..., title="Идентификатор товара")
+    name: str = Field(..., title="Название товара")
+    quantity: NonNegativeInt = Field(..., title="Остаток товара на складе")
+    price: Decimal = Field(..., title="Цена товара")
+    category_id: NonNegativeInt | None = Field(None, title="Идентификатор категории")
+
+
+QUERY_SELECT_PRODUCT_INFO = service_db_queries.get(
+    "select_product_info",
+    ProductInfo,
+)
+
+
+class SelectProductInfoDbQuery(BaseServiceDbQuery):
+    """Класс запроса товара с остатком на складе."""
+
+    async def __call__(self, product_id: int) -> ProductInfo | None:
+        """
+        Получить товар с остатком на складе без блокировок.
+
+        Остаток включает шарды остатка товара. Запрос выполняется на основном сервере:
+        значение с реплики, отстающей от списания, попало бы в кеш товаров.
+        :param product_id: Идентификатор товара.
+        :return: товар или None, если товар не найден.
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(QUERY_SELECT_PRODUCT_INFO.sql, {"product_id": product_id})
+            raw_result = await cursor.fetchone()
+        if not raw_result:
+            return None
+        return QUERY_SELECT_PRODUCT_INFO.validate(raw_result)
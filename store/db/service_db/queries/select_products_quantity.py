@@ -0,0 +1,23 @@
+
+from common.service_db.base_service_db_queries import BaseServiceDbQuery
+from common.service_db.query_registry import service_db_queries
+
+QUERY_SELECT_PRODUCTS_QUANTITY = service_db_queries.get("select_products_quantity")
+
+
+class SelectProductsQuantityDbQuery(BaseServiceDbQuery):
+    """Класс запроса остатков товаров на складе."""
+
+    async def __call__(self, product_ids: list[int]) -> dict[int, int]:
+        """
+        Получить остатки товаров на складе без блокировок.
+
+        :param product_ids: Идентификаторы товаров.
+        :return: остаток товара по идентификатору товара (только найденные товары).
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(
+                QUERY_SELECT_PRODUCTS_QUANTITY.sql,
+                {"product_ids": product_ids},
+            )
+            return {row["id"]: row["quantity"] for row in await cursor.fetchall()}
@@ -0,0 +1,99 @@
+from decimal import Decimal
+
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from pydantic import BaseModel, Field, NonNegativeInt
+
+from common.service_db.base_service_db_queries import (
+    BaseServiceDbQuery,
+    retry_transaction,
+)
+from common.service_db.query_registry import service_db_queries
+
+
+class OrderTotalsDrift(BaseModel):
+    """Модель расхождения итогов заказа с его составом."""
+
+    order_id: NonNegativeInt = Field(..., title="Идентификатор заказа")
+    items_count: int = Field(..., title="Сохранённое количество единиц товара")
+    total_amount: Decimal = Field(..., title="Сохранённая сумма заказа")
+    expected_items_count: NonNegativeInt = Field(
+        ...,
+        title="Количество единиц товара по составу заказа",
+    )
+    expected_total_amount: Decimal = Field(..., title="Сумма заказа по составу заказа")
+
+
+class OrderTotalsBatch(BaseModel):
+    """Модель результата проверки пачки заказов."""
+
+    last_order_id: NonNegativeInt | None = Field(
+        ...,
+        title="Последний проверенный заказ (None - заказов больше нет)",
+    )
+    drift: list[OrderTotalsDrift] = Field(..., title="Заказы с расхождением итогов")
+
+
+QUERY_LOCK_ORDER_TOTALS_BATCH = service_db_queries.get("lock_order_totals_batch")
+QUERY_SELECT_ORDER_TOTALS_DRIFT = service_db_queries.get(
+    "select_order_totals_drift",
+    OrderTotalsDrift,
+)
+QUERY_UPDATE_ORDER_TOTALS = service_db_queries.get("update_order_totals")
+
+
+class VerifyOrderTotalsDbQuery(BaseServiceDbQuery):
+    """Класс запроса сверки итогов заказов с их составом."""
+
+    @retry_transaction
+    async def __call__(
+        self,
+        after_order_id: int,
+        batch_size: int,
+        fix: bool,
+    ) -> OrderTotalsBatch:
+        """
+        Пересчитать итоги пачки заказов по составу и найти расхождения.
+
+        Заказы пачки блокируются по возрастанию id до конца транзакции,
+        поэтому пересчёт не теряет изменения, выполняемые одновременно с ним:
+        незафиксированные изменения состава применят свою разницу после сверки.
+        :param after_order_id: Проверять заказы с id больше этого.
+        :param batch_size: Количество заказов в пачке.
+        :param fix: Исправить найденные расхождения.
+        :raises TypeError: Если тип db не валиден.
+        :return: последний проверенный заказ и найденные расхождения.
+        """
+        if not isinstance(self.db, AsyncConnectionPool):
+            raise TypeError("Тип db не валиден.")
+        async with self.connection() as conn:
+            async with conn.transaction():
+                async with conn.cursor(  # type: ignore
+                    binary=True,
+                    row_factory=dict_row,
+                ) as cursor:
+                    await cursor.execute(
+                        QUERY_LOCK_ORDER_TOTALS_BATCH.sql,
+                        {"after_order_id": after_order_id, "batch_size": batch_size},
+                    )
+                    order_ids = [row["id"] for row in await cursor.fetchall()]
+                    if not order_ids:
+                        return OrderTotalsBatch(last_order_id=None, drift=[])
+
+                    await cursor.execute(
+                        QUERY_SELECT_ORDER_TOTALS_DRIFT.sql,
+                        {"order_ids": order_ids},
+                    )
+                    drift = QUERY_SELECT_ORDER_TOTALS_DRIFT.validate_many(
+                        await cursor.fetchall(),
+                    )
+                    if fix and drift:
+                        await cursor.execute(
+                            QUERY_UPDATE_ORDER_TOTALS.sql,
+                            {
+                                "order_ids": [row.order_id for row in drift],
+                                "items_counts": [row.expected_items_count for row in drift],
+                                "total_amounts": [row.expected_total_amount for row in drift],
+                            },
+                        )
+        return OrderTotalsBatch(last_order_id=order_ids[-1], drift=drift)
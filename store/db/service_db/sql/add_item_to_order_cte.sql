@@ -0,0 +1,18 @@
+WITH updated_product AS (
+    UPDATE product
+    SET quantity = product.quantity - %(quantity)s
+    WHERE
+        product.id = %(product_id)s
+        AND product.quantity >= %(quantity)s
+    RETURNING product.id
+)
+
+INSERT INTO order_item (order_id, product_id, quantity)
+SELECT
+    %(order_id)s,
+    updated_product.id,
+    %(quantity)s
+FROM updated_product
+ON CONFLICT (order_id, product_id)
+DO UPDATE SET quantity = order_item.quantity + excluded.quantity
+RETURNING product_id, quantity AS order_quantity
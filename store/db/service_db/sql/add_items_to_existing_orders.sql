@@ -0,0 +1,12 @@
+INSERT INTO order_item (order_id, product_id, quantity)
+SELECT
+    item.order_id,
+    item.product_id,
+    item.quantity
+FROM UNNEST(
+    %(order_ids)s::BIGINT [], %(product_ids)s::INT [], %(quantities)s::INT []
+) AS item (order_id, product_id, quantity)
+INNER JOIN customer_order ON item.order_id = customer_order.id
+ON CONFLICT (order_id, product_id)
+DO UPDATE SET quantity = order_item.quantity + excluded.quantity
+RETURNING order_id, product_id, quantity AS order_quantity
@@ -1,3 +1,12 @@
--- TRUNCATE TABLE
---
--- RESTART IDENTITY;
+TRUNCATE TABLE
+catalog_import_progress,
+flash_sale_flush,
+order_totals_stale_product,
+product_stock_shard,
+order_item,
+customer_order,
+client,
+product,
+category_closure,
+category
+RESTART IDENTITY;
@@ -0,0 +1,2 @@
+CREATE TABLE {partition} PARTITION OF {table}
+FOR VALUES FROM ({from_id}) TO ({to_id})
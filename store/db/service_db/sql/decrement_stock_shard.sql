@@ -0,0 +1,18 @@
+WITH candidate AS (
+    SELECT shard_id
+    FROM product_stock_shard
+    WHERE
+        product_id = %(product_id)s
+        AND quantity >= %(quantity)s
+    ORDER BY RANDOM()
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+
+UPDATE product_stock_shard
+SET quantity = product_stock_shard.quantity - %(quantity)s
+FROM candidate
+WHERE
+    product_stock_shard.product_id = %(product_id)s
+    AND product_stock_shard.shard_id = candidate.shard_id
+RETURNING product_stock_shard.shard_id
@@ -0,0 +1,6 @@
+UPDATE product_stock_shard
+SET quantity = product_stock_shard.quantity - item.quantity
+FROM UNNEST(%(shard_ids)s::INT [], %(quantities)s::INT []) AS item (shard_id, quantity)
+WHERE
+    product_stock_shard.product_id = %(product_id)s
+    AND product_stock_shard.shard_id = item.shard_id;
@@ -0,0 +1,2 @@
+DELETE FROM flash_sale_flush
+WHERE flushed_at < NOW() - INTERVAL '1 day';
@@ -0,0 +1,7 @@
+DELETE FROM order_totals_stale_product
+USING UNNEST(
+    %(product_ids)s::INT [], %(changed_ats)s::TIMESTAMPTZ []
+) AS stale (product_id, changed_at)
+WHERE
+    order_totals_stale_product.product_id = stale.product_id
+    AND order_totals_stale_product.changed_at = stale.changed_at;
@@ -0,0 +1 @@
+ALTER TABLE {table} DETACH PARTITION {partition}
@@ -0,0 +1 @@
+ALTER TABLE {table} DROP CONSTRAINT {constraint}
@@ -0,0 +1,3 @@
+INSERT INTO flash_sale_flush (batch_id)
+VALUES (%(batch_id)s::UUID)
+ON CONFLICT (batch_id) DO NOTHING;
@@ -0,0 +1,6 @@
+SELECT id
+FROM customer_order
+WHERE id > %(after_order_id)s
+ORDER BY id
+LIMIT %(batch_size)s
+FOR NO KEY UPDATE;
@@ -0,0 +1,5 @@
+SELECT id
+FROM customer_order
+WHERE id = ANY(%(order_ids)s::BIGINT [])
+ORDER BY id
+FOR KEY SHARE;
@@ -0,0 +1,4 @@
+SELECT quantity
+FROM product
+WHERE id = %(product_id)s
+FOR UPDATE;
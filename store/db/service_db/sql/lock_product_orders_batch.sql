@@ -0,0 +1,13 @@
+SELECT id
+FROM customer_order
+WHERE id IN (
+    SELECT DISTINCT order_item.order_id
+    FROM order_item
+    WHERE
+        order_item.product_id = ANY(%(product_ids)s::INT [])
+        AND order_item.order_id > %(after_order_id)s
+    ORDER BY order_item.order_id
+    LIMIT %(batch_size)s
+)
+ORDER BY id
+FOR NO KEY UPDATE;
@@ -0,0 +1,5 @@
+SELECT id
+FROM product
+WHERE id = ANY(%(product_ids)s::INT [])
+ORDER BY id
+FOR UPDATE;
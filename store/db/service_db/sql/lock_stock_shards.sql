@@ -0,0 +1,7 @@
+SELECT
+    shard_id,
+    quantity
+FROM product_stock_shard
+WHERE product_id = %(product_id)s
+ORDER BY shard_id
+FOR UPDATE;
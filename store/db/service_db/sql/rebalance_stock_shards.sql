@@ -0,0 +1,43 @@
+WITH locked_product AS (
+    SELECT
+        id,
+        quantity
+    FROM product
+    WHERE id = %(product_id)s
+    FOR UPDATE
+),
+
+removed_shard AS (
+    DELETE FROM product_stock_shard
+    WHERE product_id = %(product_id)s
+    RETURNING quantity
+),
+
+total AS (
+    SELECT
+        locked_product.id,
+        locked_product.quantity
+        + (SELECT COALESCE(SUM(removed_shard.quantity), 0) FROM removed_shard) AS quantity
+    FROM locked_product
+),
+
+inserted_shard AS (
+    INSERT INTO product_stock_shard (product_id, shard_id, quantity)
+    SELECT
+        total.id,
+        shard.id,
+        total.quantity / %(shard_count)s
+        + (shard.id < total.quantity %% %(shard_count)s)::INT
+    FROM total
+    CROSS JOIN GENERATE_SERIES(0, %(shard_count)s - 1) AS shard (id)
+    RETURNING shard_id
+)
+
+UPDATE product
+SET quantity = CASE WHEN %(shard_count)s > 0 THEN 0 ELSE total.quantity END
+FROM total
+WHERE product.id = total.id
+RETURNING
+    product.id AS product_id,
+    total.quantity,
+    (SELECT COUNT(*) FROM inserted_shard) AS shard_count
@@ -0,0 +1,3 @@
+SELECT descendant_id
+FROM category_closure
+WHERE ancestor_id = %(category_id)s
@@ -0,0 +1,12 @@
+SELECT
+    id,
+    name,
+    quantity,
+    price,
+    category_id
+FROM product
+WHERE
+    category_id = ANY(%(category_ids)s::INT [])
+    AND {keyset}
+ORDER BY {keyset_order}
+LIMIT %(limit)s
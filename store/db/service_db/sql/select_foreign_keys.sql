@@ -0,0 +1,3 @@
+SELECT conname AS name
+FROM pg_constraint
+WHERE conrelid = %(table)s::REGCLASS AND contype = 'f'
@@ -0,0 +1,2 @@
+SELECT COALESCE(MAX(id), 0) AS last_order_id
+FROM customer_order
@@ -0,0 +1,9 @@
+SELECT
+    customer_order.id AS order_id,
+    COALESCE(order_item.quantity, 0) AS quantity
+FROM customer_order
+LEFT JOIN order_item
+    ON
+        customer_order.id = order_item.order_id
+        AND order_item.product_id = %(product_id)s
+WHERE customer_order.id = %(order_id)s
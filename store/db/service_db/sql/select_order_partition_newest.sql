@@ -0,0 +1,4 @@
+SELECT created_at
+FROM {partition}
+ORDER BY id DESC
+LIMIT 1
@@ -0,0 +1,12 @@
+SELECT
+    partition.relname AS name,
+    bounds.bound[1]::BIGINT AS from_id,
+    bounds.bound[2]::BIGINT AS to_id
+FROM pg_inherits
+INNER JOIN pg_class AS partition ON pg_inherits.inhrelid = partition.oid
+CROSS JOIN LATERAL REGEXP_MATCH(
+    PG_GET_EXPR(partition.relpartbound, partition.oid),
+    'FROM \(''(\d+)''\) TO \(''(\d+)''\)'
+) AS bounds (bound)
+WHERE pg_inherits.inhparent = 'customer_order'::REGCLASS
+ORDER BY from_id
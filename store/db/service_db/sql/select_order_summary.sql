@@ -0,0 +1,6 @@
+SELECT
+    id AS order_id,
+    items_count,
+    total_amount
+FROM customer_order
+WHERE id = %(order_id)s
@@ -0,0 +1,15 @@
+SELECT
+    customer_order.id AS order_id,
+    customer_order.items_count,
+    customer_order.total_amount,
+    COALESCE(SUM(order_item.quantity), 0) AS expected_items_count,
+    COALESCE(SUM(order_item.quantity * product.price), 0) AS expected_total_amount
+FROM customer_order
+LEFT JOIN order_item ON customer_order.id = order_item.order_id
+LEFT JOIN product ON order_item.product_id = product.id
+WHERE customer_order.id = ANY(%(order_ids)s::BIGINT [])
+GROUP BY customer_order.id
+HAVING
+    customer_order.items_count != COALESCE(SUM(order_item.quantity), 0)
+    OR customer_order.total_amount != COALESCE(SUM(order_item.quantity * product.price), 0)
+ORDER BY customer_order.id
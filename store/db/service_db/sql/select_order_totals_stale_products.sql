@@ -0,0 +1,6 @@
+SELECT
+    product_id,
+    changed_at
+FROM order_totals_stale_product
+ORDER BY product_id
+LIMIT %(limit)s
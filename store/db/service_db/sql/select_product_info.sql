@@ -0,0 +1,10 @@
+SELECT
+    product.id,
+    product.name,
+    product.quantity + COALESCE(SUM(product_stock_shard.quantity), 0) AS quantity,
+    product.price,
+    product.category_id
+FROM product
+LEFT JOIN product_stock_shard ON product_stock_shard.product_id = product.id
+WHERE product.id = %(product_id)s
+GROUP BY product.id
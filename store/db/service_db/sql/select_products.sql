@@ -0,0 +1,14 @@
+SELECT
+    product.id,
+    product.quantity >= item.quantity AS in_stock,
+    EXISTS (
+        SELECT 1
+        FROM product_stock_shard
+        WHERE product_stock_shard.product_id = product.id
+    ) AS sharded
+FROM product
+INNER JOIN
+    UNNEST(%(product_ids)s::INT [], %(quantities)s::INT []) AS item (product_id, quantity)
+    ON product.id = item.product_id
+ORDER BY product.id
+FOR UPDATE OF product;
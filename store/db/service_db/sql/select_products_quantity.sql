@@ -0,0 +1,5 @@
+SELECT
+    id,
+    quantity
+FROM product
+WHERE id = ANY(%(product_ids)s::INT [])
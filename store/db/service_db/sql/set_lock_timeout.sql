@@ -0,0 +1 @@
+SELECT SET_CONFIG('lock_timeout', %(lock_timeout)s, TRUE)
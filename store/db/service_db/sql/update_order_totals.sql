@@ -0,0 +1,8 @@
+UPDATE customer_order
+SET
+    items_count = totals.items_count,
+    total_amount = totals.total_amount
+FROM UNNEST(
+    %(order_ids)s::BIGINT [], %(items_counts)s::BIGINT [], %(total_amounts)s::NUMERIC []
+) AS totals (order_id, items_count, total_amount)
+WHERE customer_order.id = totals.order_id
@@ -0,0 +1,4 @@
+UPDATE product
+SET quantity = product.quantity - item.quantity
+FROM UNNEST(%(product_ids)s::INT [], %(quantities)s::INT []) AS item (product_id, quantity)
+WHERE product.id = item.product_id AND product.quantity >= item.quantity;
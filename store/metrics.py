@@ -1,4 +1,6 @@
-from prometheus_client import CollectorRegistry, Counter
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+from common.service_db.instrumentation import QueryObserver
 
 registry = CollectorRegistry()
 
@@ -8,3 +10,115 @@ db_pool_timeout_errors_count = Counter(
     "Number of pool connection errors.",
     registry=registry,
 )
+
+flash_sale_redis_errors_count = Counter(
+    "flash_sale_redis_errors_count",
+    "Number of flash sale reservations rejected because Redis is unavailable.",
+    registry=registry,
+)
+
+flash_sale_stock_drift = Gauge(
+    "flash_sale_stock_drift",
+    "Flash sale stock drift between Postgres and Redis found by reconciliation.",
+    ["product_id"],
+    registry=registry,
+)
+
+order_totals_drift_count = Counter(
+    "order_totals_drift_count",
+    "Number of orders whose stored totals differ from their items, found by verification.",
+    registry=registry,
+)
+
+add_item_coalesced_batch_size = Histogram(
+    "add_item_coalesced_batch_size",
+    "Number of add item requests executed in one coalesced transaction.",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+    registry=registry,
+)
+
+service_db_pool_size = Gauge(
+    "service_db_pool_size",
+    "Number of open service_db pool connections.",
+    registry=registry,
+)
+
+service_db_pool_max_size = Gauge(
+    "service_db_pool_max_size",
+    "Current max size of the service_db pool.",
+    registry=registry,
+)
+
+service_db_pool_connections_in_use = Gauge(
+    "service_db_pool_connections_in_use",
+    "Number of service_db pool connections in use.",
+    registry=registry,
+)
+
+service_db_pool_requests_waiting = Gauge(
+    "service_db_pool_requests_waiting",
+    "Number of requests waiting for a service_db pool connection.",
+    registry=registry,
+)
+
+service_db_pool_wait_seconds = Histogram(
+    "service_db_pool_wait_seconds",
+    "Time spent waiting for a service_db pool connection.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    registry=registry,
+)
+
+service_db_pool_connection_age_seconds = Histogram(
+    "service_db_pool_connection_age_seconds",
+    "Age of service_db pool connections when they are handed out.",
+    buckets=(1, 10, 60, 300, 600, 900, 1200, 1500, 1800),
+    registry=registry,
+)
+
+service_db_query_duration_seconds = Histogram(
+    "service_db_query_duration_seconds",
+    "Execution time of service_db statements by query name.",
+    ["query"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    registry=registry,
+)
+
+service_db_query_rows = Histogram(
+    "service_db_query_rows",
+    "Number of rows returned or affected by service_db statements by query name.",
+    ["query"],
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000),
+    registry=registry,
+)
+
+service_db_query_acquire_seconds = Histogram(
+    "service_db_query_acquire_seconds",
+    "Time spent waiting for a service_db pool connection by query class.",
+    ["query"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+    registry=registry,
+)
+
+
+class QueryMetricsObserver(QueryObserver):
+    """Выгрузка измерений запросов к БД сервиса в метрики."""
+
+    def observe_execution(self, query_name: str, duration: float, rows: int) -> None:
+        """
+        Учесть выполнение запроса.
+
+        :param query_name: Имя запроса из реестра запросов.
+        :param duration: Время выполнения, сек.
+        :param rows: Количество возвращённых или изменённых строк.
+        """
+        service_db_query_duration_seconds.labels(query=query_name).observe(duration)
+        service_db_query_rows.labels(query=query_name).observe(rows)
+
+    def observe_acquire(self, query_name: str, wait: float) -> None:
+        """
+        Учесть ожидание соединения из пула.
+
+        :param query_name: Имя класса запроса.
+        :param wait: Время ожидания, сек.
+        """
+        service_db_query_acquire_seconds.labels(query=query_name).observe(wait)
@@ -0,0 +1,115 @@
+"""Объединение одновременных добавлений товара в заказы."""
+import asyncio
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from configuration.settings import settings
+from store import metrics
+from store.db.service_db.queries.add_item_to_order import AddItemToOrderResult
+from store.db.service_db.queries.add_item_to_orders import AddItemToOrdersDbQuery
+
+
+@dataclass
+class _CoalescedItem:
+    order_id: int
+    quantity: int
+    future: asyncio.Future
+
+
+@dataclass
+class _Batch:
+    items: list[_CoalescedItem] = field(default_factory=list)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class AddItemCoalescer:
+    """
+    Объединение одновременных добавлений одного товара в заказы.
+
+    Первое добавление товара открывает пачку и ждёт settings.orders.coalesce_window_ms
+    (или заполнения пачки до coalesce_max_batch_size), остальные добавления этого товара
+    за это время попадают в ту же пачку. Пачка выполняется одной транзакцией
+    AddItemToOrdersDbQuery, каждый запрос получает свой результат или ошибку.
+    Запросы, отменённые до выполнения пачки, в неё не попадают.
+    """
+
+    def __init__(self) -> None:
+        self._batches: dict[int, _Batch] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def __call__(
+        self,
+        db_query: AddItemToOrdersDbQuery,
+        order_id: int,
+        product_id: int,
+        quantity: int,
+    ) -> AddItemToOrderResult:
+        """
+        Добавить товар в заказ в составе пачки.
+
+        :param db_query: Объект запроса к БД, выполняющий пачку.
+        :param order_id: Идентификатор заказа.
+        :param product_id: Идентификатор товара.
+        :param quantity: Количество товара.
+        :return: результат изменения состава заказа.
+        """
+        batch = self._batches.get(product_id)
+        if batch is None:
+            batch = _Batch()
+            self._batches[product_id] = batch
+            task = asyncio.create_task(self._run(db_query, product_id, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        future = asyncio.get_running_loop().create_future()
+        batch.items.append(_CoalescedItem(order_id, quantity, future))
+        if len(batch.items) >= settings.orders.coalesce_max_batch_size:
+            self._close(product_id, batch)
+        return await future
+
+    def _close(self, product_id: int, batch: _Batch) -> None:
+        if self._batches.get(product_id) is batch:
+            self._batches.pop(product_id)
+        batch.full.set()
+
+    async def _run(
+        self,
+        db_query: AddItemToOrdersDbQuery,
+        product_id: int,
+        batch: _Batch,
+    ) -> None:
+        try:
+            await asyncio.wait_for(
+                batch.full.wait(),
+                timeout=settings.orders.coalesce_window_ms / 1000,
+            )
+        except asyncio.TimeoutError:
+            self._close(product_id, batch)
+
+        # Запрос, отменённый за время окна, не получит ответа и не должен списывать остаток
+        items = [item for item in batch.items if not item.future.cancelled()]
+        if not items:
+            return
+        metrics.add_item_coalesced_batch_size.observe(len(items))
+        try:
+            results = await db_query(
+                product_id=product_id,
+                items=[(item.order_id, item.quantity) for item in items],
+            )
+        except Exception as exc:
+            logger.error(
+                f"Ошибка добавления пачки товара ID: {product_id} в заказы: {exc}",
+            )
+            results = [exc] * len(items)
+
+        for item, result in zip(items, results):
+            if item.future.done():
+                continue
+            if isinstance(result, Exception):
+                item.future.set_exception(result)
+            else:
+                item.future.set_result(result)
+
+
+add_item_coalescer = AddItemCoalescer()
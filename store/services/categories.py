@@ -0,0 +1,163 @@
+"""Товары поддерева категорий."""
+import asyncio
+from contextlib import suppress
+from typing import Any
+
+import psycopg
+from fastapi import Depends
+from loguru import logger
+
+from common.db.keyset import KeysetPage
+from common.utils.ttl_cache import MISSING, TTLCache
+
+from configuration.settings import settings
+from store.db.service_db.queries.select_category_descendants import (
+    SelectCategoryDescendantsDbQuery,
+)
+from store.db.service_db.queries.select_category_products import (
+    CategoryProduct,
+    SelectCategoryProductsDbQuery,
+)
+from store.web.exceptions import CategoryNotFoundError
+
+# Канал уведомлений триггера category_notify_changed
+CATEGORY_CHANGED_CHANNEL = "category_changed"
+
+
+class CategoryTreeCache:
+    """
+    Кеш поддеревьев категорий в памяти процесса.
+
+    Триггер на category уведомляет канал category_changed о любом изменении категорий,
+    по уведомлению кеш очищается целиком. Пока соединение для уведомлений
+    не установлено, кеш не используется: изменение категорий прошло бы незамеченным.
+    При обрыве соединения подписка восстанавливается через
+    settings.catalog.category_listen_reconnect_delay.
+    Кеш ограничен settings.catalog.category_cache_maxsize поддеревьями,
+    несуществующие категории не кешируются.
+    """
+
+    def __init__(self) -> None:
+        self.listening = False
+        self._descendants: TTLCache[int, list[int]] = TTLCache(
+            maxsize=settings.catalog.category_cache_maxsize,
+            ttl=settings.catalog.category_cache_ttl,
+        )
+        # Номер очистки: поддерево, прочитанное до очистки, не кешируется
+        self._generation = 0
+        self._listen_task: asyncio.Task[None] | None = None
+
+    async def get_descendants(
+        self,
+        db_query: SelectCategoryDescendantsDbQuery,
+        category_id: int,
+    ) -> list[int]:
+        """
+        Получить категорию и всех её потомков.
+
+        :param db_query: Запрос поддерева категории.
+        :param category_id: Идентификатор категории.
+        :return: идентификаторы категорий поддерева (пустой список, если категории нет).
+        """
+        use_cache = self.listening and settings.catalog.category_cache
+        descendants = self._descendants.get(category_id) if use_cache else MISSING
+        if descendants is not MISSING:
+            return descendants
+        generation = self._generation
+        descendants = await db_query(category_id)
+        if descendants and use_cache and self.listening and generation == self._generation:
+            self._descendants.set(category_id, descendants)
+        return descendants
+
+    def invalidate(self) -> None:
+        """Очистить кеш."""
+        self._descendants.clear()
+        self._generation += 1
+
+    async def start(self, conninfo: str) -> None:
+        """
+        Подписаться на изменения категорий и очищать кеш по уведомлениям.
+
+        :param conninfo: URL до БД.
+        """
+        connection = await self._connect(conninfo)
+        self._listen_task = asyncio.create_task(self._listen_forever(conninfo, connection))
+
+    async def close(self) -> None:
+        """Остановить подписку на изменения категорий."""
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listen_task
+            self._listen_task = None
+
+    async def _connect(self, conninfo: str) -> psycopg.AsyncConnection[Any] | None:
+        connection = None
+        try:
+            connection = await psycopg.AsyncConnection.connect(conninfo, autocommit=True)
+            await connection.execute(f"LISTEN {CATEGORY_CHANGED_CHANNEL}")
+        except psycopg.Error as exc:
+            logger.warning(f"Нет подписки на изменения категорий: {exc}")
+            if connection is not None:
+                await connection.close()
+            return None
+        self.invalidate()
+        self.listening = True
+        return connection
+
+    async def _listen_forever(
+        self,
+        conninfo: str,
+        connection: psycopg.AsyncConnection[Any] | None,
+    ) -> None:
+        while True:  # noqa: WPS457
+            if connection is not None:
+                try:
+                    async with connection:
+                        async for _ in connection.notifies():  # noqa: WPS328
+                            self.invalidate()
+                except psycopg.Error as exc:
+                    logger.warning(f"Подписка на изменения категорий прервана: {exc}")
+                finally:
+                    self.listening = False
+                    self.invalidate()
+            await asyncio.sleep(settings.catalog.category_listen_reconnect_delay)
+            connection = await self._connect(conninfo)
+
+
+category_tree_cache = CategoryTreeCache()
+
+
+class CategoryProductsService:
+    """Сервис получения товаров категории и всех её подкатегорий."""
+
+    def __init__(
+        self,
+        descendants_db_query: SelectCategoryDescendantsDbQuery = Depends(),
+        products_db_query: SelectCategoryProductsDbQuery = Depends(),
+    ) -> None:
+        self.descendants_db_query = descendants_db_query
+        self.products_db_query = products_db_query
+
+    async def __call__(
+        self,
+        category_id: int,
+        page: KeysetPage,
+        limit: int,
+    ) -> list[CategoryProduct]:
+        """
+        Получить страницу товаров поддерева категории.
+
+        :param category_id: Идентификатор категории.
+        :param page: Страница keyset-пагинации по колонкам товара.
+        :param limit: Количество товаров.
+        :raises CategoryNotFoundError: Категория не найдена.
+        :return: товары в порядке выборки страницы.
+        """
+        category_ids = await category_tree_cache.get_descendants(
+            self.descendants_db_query,
+            category_id,
+        )
+        if not category_ids:
+            raise CategoryNotFoundError
+        return await self.products_db_query(category_ids, page, limit)
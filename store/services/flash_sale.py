@@ -0,0 +1,268 @@
+"""Резервирование остатков товаров распродажи в Redis."""
+import uuid
+
+from fastapi import Depends
+
+from common.service_redis.client import ServiceRedis
+
+from configuration.settings import settings
+from store.web.exceptions import OrderCheckViolationError
+
+PREFIX = "STORE://flash_sale"
+PENDING_KEY = f"{PREFIX}:pending"
+PROCESSING_KEY = f"{PREFIX}:processing"
+PROCESSING_BATCH_ID_KEY = f"{PREFIX}:processing:batch_id"
+LOCK_KEY = f"{PREFIX}:lock"
+
+STOCK_NOT_SEEDED = -1
+STOCK_NOT_ENOUGH = -2
+
+# Сумма резервов товара ARGV[1] в списке резервов вида "order_id:product_id:quantity"
+LUA_RESERVED = """
+local function reserved(list_key, product_id)
+    local total = 0
+    for _, item in ipairs(redis.call('LRANGE', list_key, 0, -1)) do
+        local _, item_product_id, quantity = string.match(item, '(%d+):(%d+):(%d+)')
+        if item_product_id == product_id then
+            total = total + tonumber(quantity)
+        end
+    end
+    return total
+end
+"""
+
+# KEYS: остаток товара, состав заказа, резервы
+# ARGV: количество, товар, заказ, количество товара в заказе в Postgres, ttl заказа
+LUA_RESERVE = """
+local stock = redis.call('GET', KEYS[1])
+if not stock then
+    return -1
+end
+local quantity = tonumber(ARGV[1])
+if tonumber(stock) < quantity then
+    return -2
+end
+redis.call('DECRBY', KEYS[1], quantity)
+redis.call('HSETNX', KEYS[2], ARGV[2], ARGV[4])
+local order_quantity = redis.call('HINCRBY', KEYS[2], ARGV[2], quantity)
+redis.call('EXPIRE', KEYS[2], ARGV[5])
+redis.call('RPUSH', KEYS[3], ARGV[3] .. ':' .. ARGV[2] .. ':' .. ARGV[1])
+return order_quantity
+"""
+
+# KEYS: остаток товара, резервы, резервы в переносе
+# ARGV: товар, остаток товара в Postgres
+LUA_SEED = (
+    LUA_RESERVED
+    + """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+local stock = tonumber(ARGV[2]) - reserved(KEYS[2], ARGV[1]) - reserved(KEYS[3], ARGV[1])
+redis.call('SET', KEYS[1], stock)
+return 1
+"""
+)
+
+# KEYS: резервы, резервы в переносе, идентификатор пачки в переносе
+# ARGV: размер пачки, идентификатор новой пачки
+# unpack в Lua 5.1 (Redis) глобальный, в Lua 5.2+ (fakeredis в тестах) - table.unpack
+LUA_TAKE_BATCH = """
+local unpack = table.unpack or unpack
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+    if #items == 0 then
+        return {}
+    end
+    redis.call('RPUSH', KEYS[2], unpack(items))
+    redis.call('LTRIM', KEYS[1], #items, -1)
+    redis.call('SET', KEYS[3], ARGV[2])
+end
+local batch = redis.call('LRANGE', KEYS[2], 0, -1)
+table.insert(batch, 1, redis.call('GET', KEYS[3]))
+return batch
+"""
+
+# KEYS: остаток товара, резервы, резервы в переносе
+# ARGV: товар, остаток товара в Postgres
+LUA_RECONCILE = (
+    LUA_RESERVED
+    + """
+local stock = redis.call('GET', KEYS[1])
+if not stock or redis.call('EXISTS', KEYS[3]) == 1 then
+    return false
+end
+local drift = tonumber(ARGV[2]) - tonumber(stock) - reserved(KEYS[2], ARGV[1])
+if drift ~= 0 then
+    redis.call('INCRBY', KEYS[1], drift)
+end
+return drift
+"""
+)
+
+
+def get_stock_key(product_id: int) -> str:
+    """
+    Ключ остатка товара в Redis.
+
+    :param product_id: Идентификатор товара.
+    :return: ключ.
+    """
+    return f"{PREFIX}:stock:{product_id}"
+
+
+def get_order_key(order_id: int) -> str:
+    """
+    Ключ состава заказа в Redis.
+
+    :param order_id: Идентификатор заказа.
+    :return: ключ.
+    """
+    return f"{PREFIX}:order:{order_id}"
+
+
+class FlashSaleInventory:
+    """
+    Остатки товаров распродажи в Redis.
+
+    Остаток товара и состав заказа меняются атомарно Lua-скриптом, каждый резерв
+    добавляется в список PENDING_KEY и позже переносится в Postgres пачками.
+    Инвариант: остаток в Postgres = остаток в Redis + сумма ещё не перенесённых резервов.
+    """
+
+    def __init__(
+        self,
+        redis: ServiceRedis = Depends(),
+    ) -> None:
+        self.redis = redis
+
+    async def reserve(
+        self,
+        order_id: int,
+        product_id: int,
+        quantity: int,
+        order_quantity: int,
+    ) -> int | None:
+        """
+        Зарезервировать товар в заказ.
+
+        :param order_id: Идентификатор заказа.
+        :param product_id: Идентификатор товара.
+        :param quantity: Количество товара.
+        :param order_quantity: Количество товара в заказе по данным Postgres.
+        :raises OrderCheckViolationError: Если товара недостаточно.
+        :return: новое количество товара в заказе или None, если остаток не загружен в Redis.
+        """
+        result = int(
+            await self.redis.eval_script(
+                LUA_RESERVE,
+                keys=[get_stock_key(product_id), get_order_key(order_id), PENDING_KEY],
+                args=[
+                    quantity,
+                    product_id,
+                    order_id,
+                    order_quantity,
+                    settings.orders.flash_sale_order_ttl,
+                ],
+            ),
+        )
+        if result == STOCK_NOT_SEEDED:
+            return None
+        if result == STOCK_NOT_ENOUGH:
+            raise OrderCheckViolationError
+        return result
+
+    async def seed(self, products_quantity: dict[int, int]) -> list[int]:
+        """
+        Загрузить остатки товаров в Redis, если их там нет.
+
+        Из остатка вычитаются ещё не перенесённые в Postgres резервы.
+        Остатки всех товаров загружаются одним пакетом команд.
+
+        :param products_quantity: Остаток в Postgres по идентификатору товара.
+        :return: идентификаторы товаров, остатки которых загружены.
+        """
+        async with self.redis.batch() as batch:
+            seeded = {
+                product_id: batch.eval_script(
+                    LUA_SEED,
+                    keys=[get_stock_key(product_id), PENDING_KEY, PROCESSING_KEY],
+                    args=[product_id, quantity],
+                )
+                for product_id, quantity in products_quantity.items()
+            }
+        return [product_id for product_id, result in seeded.items() if result.result]
+
+    async def take_batch(self) -> tuple[uuid.UUID, dict[tuple[int, int], int]] | None:
+        """
+        Взять пачку резервов для переноса в Postgres.
+
+        Если предыдущая пачка не была подтверждена, возвращается она же.
+
+        :return: идентификатор пачки и количество товара по паре (заказ, товар)
+            или None, если резервов нет.
+        """
+        batch = await self.redis.eval_script(
+            LUA_TAKE_BATCH,
+            keys=[PENDING_KEY, PROCESSING_KEY, PROCESSING_BATCH_ID_KEY],
+            args=[settings.orders.flash_sale_flush_batch_size, str(uuid.uuid4())],
+        )
+        if not batch:
+            return None
+        batch_id, *reservations = batch
+        items: dict[tuple[int, int], int] = {}
+        for reservation in reservations:
+            order_id, product_id, quantity = map(int, _decode(reservation).split(":"))
+            items[order_id, product_id] = items.get((order_id, product_id), 0) + quantity
+        return uuid.UUID(_decode(batch_id)), items
+
+    async def ack_batch(self) -> None:
+        """Подтвердить перенос пачки резервов в Postgres."""
+        async with self.redis.client() as redis:
+            await redis.delete(PROCESSING_KEY, PROCESSING_BATCH_ID_KEY)
+
+    async def reconcile(self, product_id: int, quantity: int) -> int | None:
+        """
+        Сверить остаток товара в Redis с Postgres и исправить расхождение.
+
+        Вызывается только после переноса всех пачек под блокировкой LOCK_KEY.
+
+        :param product_id: Идентификатор товара.
+        :param quantity: Остаток товара в Postgres.
+        :return: расхождение (Postgres минус Redis с резервами)
+            или None, если остаток не загружен или есть неподтверждённая пачка.
+        """
+        drift = await self.redis.eval_script(
+            LUA_RECONCILE,
+            keys=[get_stock_key(product_id), PENDING_KEY, PROCESSING_KEY],
+            args=[product_id, quantity],
+        )
+        if drift is None:
+            return None
+        return int(drift)
+
+    async def acquire_lock(self) -> bool:
+        """
+        Взять блокировку переноса резервов и сверки остатков.
+
+        :return: True, если блокировка взята.
+        """
+        async with self.redis.client() as redis:
+            return bool(
+                await redis.set(
+                    LOCK_KEY,
+                    1,
+                    nx=True,
+                    ex=settings.orders.flash_sale_lock_ttl,
+                ),
+            )
+
+    async def release_lock(self) -> None:
+        """Снять блокировку переноса резервов и сверки остатков."""
+        await self.redis.delete(LOCK_KEY)
+
+
+def _decode(redis_value: bytes | str) -> str:
+    if isinstance(redis_value, bytes):
+        return redis_value.decode()
+    return redis_value
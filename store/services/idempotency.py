@@ -0,0 +1,130 @@
+"""Идемпотентное выполнение запросов по заголовку Idempotency-Key."""
+import asyncio
+import hashlib
+from typing import Any
+
+from fastapi import Depends
+from pydantic import BaseModel
+
+from common.service_redis.client import ServiceRedis
+
+from configuration.settings import settings
+from store.web.exceptions import IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+
+PREFIX = "STORE://idempotency"
+
+
+class StoredResponse(BaseModel):
+    """Сохранённый ответ на запрос."""
+
+    status_code: int
+    body: dict[str, Any]
+
+
+class _IdempotencyRecord(BaseModel):
+    fingerprint: str
+    response: StoredResponse | None = None
+
+
+def get_fingerprint(*parts: str) -> str:
+    """
+    Отпечаток запроса для сравнения повторов с одним ключом идемпотентности.
+
+    :param parts: Части запроса (путь, тело).
+    :return: sha256 от частей запроса.
+    """
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+class IdempotencyService:
+    """
+    Хранение ответов по ключу идемпотентности в Redis.
+
+    Первый запрос с ключом ставит метку выполнения (SET NX), повторы с тем же ключом
+    ждут сохранения ответа и получают его вместо повторного выполнения.
+    Если запрос завершился ошибкой, метка удаляется и повтор выполняется заново.
+    """
+
+    def __init__(
+        self,
+        redis: ServiceRedis = Depends(),
+    ) -> None:
+        self.redis = redis
+
+    async def start(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: str,
+    ) -> StoredResponse | None:
+        """
+        Начать выполнение запроса с ключом идемпотентности.
+
+        :param scope: Область действия ключа (метод и ресурс).
+        :param key: Ключ идемпотентности.
+        :param fingerprint: Отпечаток запроса.
+        :raises IdempotencyKeyReusedError: Если ключ использован с другим запросом.
+        :raises IdempotencyKeyInProgressError: Если запрос с ключом не завершился
+            за settings.orders.idempotency_wait_timeout.
+        :return: сохранённый ответ или None, если запрос нужно выполнить.
+        """
+        name = _get_name(scope, key)
+        in_flight = _IdempotencyRecord(fingerprint=fingerprint).model_dump_json()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.orders.idempotency_wait_timeout
+        while True:  # noqa: WPS457
+            async with self.redis.client() as redis:
+                if await redis.set(
+                    name,
+                    in_flight,
+                    nx=True,
+                    ex=settings.orders.idempotency_in_flight_ttl,
+                ):
+                    return None
+                raw_record = await redis.get(name)
+            if raw_record is not None:
+                record = _IdempotencyRecord.model_validate_json(raw_record)
+                if record.fingerprint != fingerprint:
+                    raise IdempotencyKeyReusedError
+                if record.response:
+                    return record.response
+            if loop.time() >= deadline:
+                raise IdempotencyKeyInProgressError
+            await asyncio.sleep(settings.orders.idempotency_poll_interval)
+
+    async def complete(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: str,
+        response: StoredResponse,
+    ) -> None:
+        """
+        Сохранить ответ на запрос с ключом идемпотентности.
+
+        :param scope: Область действия ключа (метод и ресурс).
+        :param key: Ключ идемпотентности.
+        :param fingerprint: Отпечаток запроса.
+        :param response: Ответ на запрос.
+        """
+        await self.redis.set(
+            _get_name(scope, key),
+            _IdempotencyRecord(
+                fingerprint=fingerprint,
+                response=response,
+            ).model_dump_json(),
+            ex=settings.orders.idempotency_ttl,
+        )
+
+    async def release(self, scope: str, key: str) -> None:
+        """
+        Снять метку выполнения запроса, завершившегося ошибкой.
+
+        :param scope: Область действия ключа (метод и ресурс).
+        :param key: Ключ идемпотентности.
+        """
+        await self.redis.delete(_get_name(scope, key))
+
+
+def _get_name(scope: str, key: str) -> str:
+    return f"{PREFIX}:{scope}:{key}"
@@ -0,0 +1,163 @@
+"""Добавление товаров в заказ."""
+from fastapi import Depends
+from loguru import logger
+from redis.exceptions import RedisError
+
+from common.service_redis.client import ServiceRedis
+
+from configuration.app_settings.service_db_settings import AddItemEngine
+from configuration.settings import settings
+from store import metrics
+from store.db.service_db.queries.add_item_to_order import (
+    AddItemToOrderDbQuery,
+    AddItemToOrderResult,
+)
+from store.db.service_db.queries.add_item_to_orders import AddItemToOrdersDbQuery
+from store.db.service_db.queries.select_order_item import SelectOrderItemDbQuery
+from store.db.service_db.queries.select_products_quantity import (
+    SelectProductsQuantityDbQuery,
+)
+from store.services.add_item_coalescer import add_item_coalescer
+from store.services.flash_sale import FlashSaleInventory
+from store.services.products import invalidate_products
+from store.web.exceptions import (
+    FlashSaleUnavailableError,
+    OrderCheckViolationError,
+    OrderNotFoundError,
+)
+
+
+class AddItemToOrderService:
+    """
+    Сервис добавления товара в заказ.
+
+    Товары распродажи (settings.orders.flash_sale_product_ids) резервируются в Redis
+    и переносятся в Postgres задачей flush_flash_sale_items, остальные товары
+    добавляются в заказ запросом к Postgres. При settings.orders.coalesce_add_item
+    одновременные добавления одного товара объединяются в одну транзакцию
+    (кроме способа sharded, остаток которого хранится в шардах).
+    После фиксации списания остатка в Postgres товар удаляется из кеша товаров.
+    """
+
+    def __init__(
+        self,
+        order_db_query: AddItemToOrderDbQuery = Depends(),
+        orders_db_query: AddItemToOrdersDbQuery = Depends(),
+        order_item_db_query: SelectOrderItemDbQuery = Depends(),
+        products_quantity_db_query: SelectProductsQuantityDbQuery = Depends(),
+        flash_sale_inventory: FlashSaleInventory = Depends(),
+        redis: ServiceRedis = Depends(),
+    ) -> None:
+        self.order_db_query = order_db_query
+        self.orders_db_query = orders_db_query
+        self.order_item_db_query = order_item_db_query
+        self.products_quantity_db_query = products_quantity_db_query
+        self.flash_sale_inventory = flash_sale_inventory
+        self.redis = redis
+
+    async def __call__(
+        self,
+        order_id: int,
+        product_id: int,
+        quantity: int,
+    ) -> AddItemToOrderResult:
+        """
+        Добавить товар в заказ.
+
+        Если Redis недоступен, товар распродажи не добавляется: остаток в Postgres
+        ещё содержит резервы, не перенесённые из Redis, и списание из него продаст
+        больше, чем есть. Ошибка Redis после выполнения скрипта резервирования
+        оставляет резерв в Redis, он будет перенесён в заказ задачей flush_flash_sale_items.
+        :param order_id: Идентификатор заказа.
+        :param product_id: Идентификатор товара.
+        :param quantity: Количество товара.
+        :raises OrderNotFoundError: Если заказ не найден.
+        :raises OrderCheckViolationError: Если товара недостаточно.
+        :raises FlashSaleUnavailableError: Если Redis недоступен для товара распродажи.
+        :return: результат изменения состава заказа.
+        """
+        if product_id in settings.orders.flash_sale_product_ids:
+            try:
+                return await self._reserve(order_id, product_id, quantity)
+            except RedisError as exc:
+                metrics.flash_sale_redis_errors_count.inc()
+                logger.warning(
+                    f"Redis недоступен, товар ID: {product_id} не добавлен "
+                    f"в заказ ID: {order_id}: {exc}",
+                )
+                raise FlashSaleUnavailableError
+        if (
+            settings.orders.coalesce_add_item
+            and settings.service_db.add_item_engine != AddItemEngine.SHARDED
+        ):
+            add_item_result = await add_item_coalescer(
+                self.orders_db_query,
+                order_id=order_id,
+                product_id=product_id,
+                quantity=quantity,
+            )
+        else:
+            add_item_result = await self.order_db_query(
+                order_id=order_id,
+                product_id=product_id,
+                quantity=quantity,
+            )
+        await invalidate_products(self.redis, [product_id])
+        return add_item_result
+
+    async def _reserve(
+        self,
+        order_id: int,
+        product_id: int,
+        quantity: int,
+    ) -> AddItemToOrderResult:
+        order_item = await self.order_item_db_query(
+            order_id=order_id,
+            product_id=product_id,
+        )
+        if not order_item:
+            raise OrderNotFoundError
+        order_quantity = await self.flash_sale_inventory.reserve(
+            order_id=order_id,
+            product_id=product_id,
+            quantity=quantity,
+            order_quantity=order_item.quantity,
+        )
+        if order_quantity is None:
+            await seed_flash_sale_stock(
+                self.flash_sale_inventory,
+                self.products_quantity_db_query,
+                [product_id],
+            )
+            order_quantity = await self.flash_sale_inventory.reserve(
+                order_id=order_id,
+                product_id=product_id,
+                quantity=quantity,
+                order_quantity=order_item.quantity,
+            )
+        if order_quantity is None:
+            raise OrderCheckViolationError
+        return AddItemToOrderResult(
+            product_id=product_id,
+            order_quantity=order_quantity,
+        )
+
+
+async def seed_flash_sale_stock(
+    flash_sale_inventory: FlashSaleInventory,
+    products_quantity_db_query: SelectProductsQuantityDbQuery,
+    product_ids: list[int],
+) -> None:
+    """
+    Загрузить остатки товаров распродажи из Postgres в Redis.
+
+    Уже загруженные остатки не перезаписываются.
+
+    :param flash_sale_inventory: Остатки товаров распродажи в Redis.
+    :param products_quantity_db_query: Объект запроса остатков товаров к БД.
+    :param product_ids: Идентификаторы товаров.
+    """
+    products_quantity = await products_quantity_db_query(product_ids=product_ids)
+    seeded = await flash_sale_inventory.seed(products_quantity)
+    if seeded:
+        logger.info(f"Остатки товаров распродажи ID: {seeded} загружены в Redis.")
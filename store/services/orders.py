@@ -0,0 +1,32 @@
+"""Итоги заказов."""
+from fastapi import Depends
+
+from store.db.service_db.queries.select_order_summary import (
+    OrderSummary,
+    SelectOrderSummaryDbQuery,
+)
+from store.web.exceptions import OrderNotFoundError
+
+
+class OrderSummaryService:
+    """Сервис получения итогов заказа."""
+
+    def __init__(
+        self,
+        order_summary_db_query: SelectOrderSummaryDbQuery = Depends(),
+    ) -> None:
+        self.order_summary_db_query = order_summary_db_query
+
+    async def __call__(self, order_id: int) -> OrderSummary:
+        """
+        Получить итоги заказа.
+
+        Резервы товаров распродажи попадают в итоги после переноса в Postgres.
+        :param order_id: Идентификатор заказа.
+        :raises OrderNotFoundError: Если заказ не найден.
+        :return: итоги заказа.
+        """
+        order_summary = await self.order_summary_db_query(order_id)
+        if order_summary is None:
+            raise OrderNotFoundError
+        return order_summary
@@ -0,0 +1,78 @@
+"""Товары с остатком на складе."""
+from functools import partial
+from typing import Iterable
+
+from fastapi import Depends
+
+from common.service_redis.cache import ReadThroughCache
+from common.service_redis.client import ServiceRedis
+
+from configuration.settings import settings
+from store.db.service_db.queries.select_product_info import (
+    ProductInfo,
+    SelectProductInfoDbQuery,
+)
+from store.web.exceptions import ProductNotFoundError
+
+PREFIX = "STORE://product"
+
+# Кеш товаров с остатком в Redis, загрузки товара объединяются в пределах процесса
+product_cache: ReadThroughCache[ProductInfo] = ReadThroughCache(
+    PREFIX,
+    ProductInfo,
+    ttl=settings.catalog.product_cache_ttl,
+    missing_ttl=settings.catalog.product_cache_missing_ttl,
+    beta=settings.catalog.product_cache_early_refresh_beta,
+)
+
+
+class ProductService:
+    """
+    Сервис получения товара с остатком на складе.
+
+    При settings.catalog.product_cache товар читается из кеша в Redis (product_cache),
+    транзакции, изменившие остаток, удаляют товар из кеша после фиксации
+    (invalidate_products).
+    """
+
+    def __init__(
+        self,
+        product_info_db_query: SelectProductInfoDbQuery = Depends(),
+        redis: ServiceRedis = Depends(),
+    ) -> None:
+        self.product_info_db_query = product_info_db_query
+        self.redis = redis
+
+    async def __call__(self, product_id: int) -> ProductInfo:
+        """
+        Получить товар с остатком на складе.
+
+        Резервы товаров распродажи попадают в остаток после переноса в Postgres.
+        :param product_id: Идентификатор товара.
+        :raises ProductNotFoundError: Если товар не найден.
+        :return: товар.
+        """
+        if settings.catalog.product_cache:
+            product = await product_cache.get(
+                self.redis,
+                str(product_id),
+                partial(self.product_info_db_query, product_id),
+            )
+        else:
+            product = await self.product_info_db_query(product_id)
+        if product is None:
+            raise ProductNotFoundError
+        return product
+
+
+async def invalidate_products(redis: ServiceRedis, product_ids: Iterable[int]) -> None:
+    """
+    Удалить товары из кеша после фиксации изменения их остатка.
+
+    Ошибка Redis не выбрасывается: изменение уже зафиксировано,
+    а устаревший товар истечёт через settings.catalog.product_cache_ttl.
+    :param redis: Клиент Redis.
+    :param product_ids: Идентификаторы товаров.
+    """
+    if settings.catalog.product_cache:
+        await product_cache.invalidate(redis, [str(product_id) for product_id in product_ids])
@@ -0,0 +1,100 @@
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool
+from redis.asyncio import ConnectionPool
+from taskiq import TaskiqDepends
+
+from common.service_db.dependencies import get_taskiq_service_db_pool
+from common.service_redis.client import ServiceRedis
+from common.service_redis.dependencies import get_taskiq_service_redis_pool
+from common.taskiq.broker import rabbit_broker
+
+from configuration.settings import settings
+from store import metrics
+from store.db.service_db.queries.flush_flash_sale_items import (
+    FlushFlashSaleItemsDbQuery,
+)
+from store.db.service_db.queries.select_products_quantity import (
+    SelectProductsQuantityDbQuery,
+)
+from store.services.flash_sale import FlashSaleInventory
+from store.services.products import invalidate_products
+
+
+@rabbit_broker.task(schedule=[{"cron": "* * * * *"}])
+async def flush_flash_sale_items(
+    service_db_pool: AsyncConnectionPool = TaskiqDepends(get_taskiq_service_db_pool),
+    service_redis_pool: ConnectionPool = TaskiqDepends(get_taskiq_service_redis_pool),
+) -> None:
+    """
+    Перенести резервы товаров распродажи из Redis в Postgres.
+
+    :param service_db_pool: Пул коннектов к БД сервиса.
+    :param service_redis_pool: Пул коннектов к Redis сервиса.
+    """
+    flash_sale_inventory = FlashSaleInventory(ServiceRedis(service_redis_pool))
+    if not await flash_sale_inventory.acquire_lock():
+        logger.info("Перенос резервов распродажи уже выполняется.")
+        return
+    try:
+        await _flush(flash_sale_inventory, FlushFlashSaleItemsDbQuery(service_db_pool))
+    finally:
+        await flash_sale_inventory.release_lock()
+
+
+@rabbit_broker.task(schedule=[{"cron": "*/5 * * * *"}])
+async def reconcile_flash_sale_stock(
+    service_db_pool: AsyncConnectionPool = TaskiqDepends(get_taskiq_service_db_pool),
+    service_redis_pool: ConnectionPool = TaskiqDepends(get_taskiq_service_redis_pool),
+) -> None:
+    """
+    Сверить остатки товаров распродажи в Redis с Postgres.
+
+    Перед сверкой в Postgres переносятся все резервы.
+    Найденное расхождение исправляется в Redis и публикуется в метрике.
+
+    :param service_db_pool: Пул коннектов к БД сервиса.
+    :param service_redis_pool: Пул коннектов к Redis сервиса.
+    """
+    flash_sale_inventory = FlashSaleInventory(ServiceRedis(service_redis_pool))
+    if not await flash_sale_inventory.acquire_lock():
+        logger.info("Перенос резервов распродажи уже выполняется.")
+        return
+    try:
+        await _flush(flash_sale_inventory, FlushFlashSaleItemsDbQuery(service_db_pool))
+        products_quantity = await SelectProductsQuantityDbQuery(service_db_pool)(
+            product_ids=list(settings.orders.flash_sale_product_ids),
+        )
+        for product_id, quantity in products_quantity.items():
+            drift = await flash_sale_inventory.reconcile(
+                product_id=product_id,
+                quantity=quantity,
+            )
+            if drift is None:
+                continue
+            metrics.flash_sale_stock_drift.labels(product_id=product_id).set(drift)
+            if drift:
+                logger.warning(
+                    f"Остаток товара распродажи ID: {product_id} в Redis "
+                    f"исправлен на {drift}.",
+                )
+    finally:
+        await flash_sale_inventory.release_lock()
+
+
+async def _flush(
+    flash_sale_inventory: FlashSaleInventory,
+    flush_db_query: FlushFlashSaleItemsDbQuery,
+) -> None:
+    while True:  # noqa: WPS457
+        batch = await flash_sale_inventory.take_batch()
+        if not batch:
+            return
+        batch_id, items = batch
+        if not await flush_db_query(batch_id=batch_id, items=items):
+            logger.warning(f"Пачка резервов {batch_id} уже перенесена в Postgres.")
+        await flash_sale_inventory.ack_batch()
+        await invalidate_products(
+            flash_sale_inventory.redis,
+            {product_id for _, product_id in items},
+        )
+        logger.info(f"Перенесено резервов распродажи: {len(items)}.")
@@ -0,0 +1,37 @@
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool
+from taskiq import TaskiqDepends
+
+from common.service_db.dependencies import get_taskiq_service_db_pool
+from common.taskiq.broker import rabbit_broker
+
+from configuration.settings import settings
+from store.db.service_db.queries.maintain_order_partitions import (
+    MaintainOrderPartitionsDbQuery,
+)
+
+
+@rabbit_broker.task(schedule=[{"cron": "15 * * * *"}])
+async def maintain_order_partitions(
+    service_db_pool: AsyncConnectionPool = TaskiqDepends(get_taskiq_service_db_pool),
+) -> None:
+    """
+    Создать партиции заказов заранее и отсоединить партиции старых заказов.
+
+    :param service_db_pool: Пул коннектов к БД сервиса.
+    """
+    result = await MaintainOrderPartitionsDbQuery(service_db_pool)(
+        partition_size=settings.orders.order_partition_size,
+        premake=settings.orders.order_partition_premake,
+        retention_days=settings.orders.order_partition_retention_days,
+        lock_timeout_ms=settings.orders.order_partition_lock_timeout_ms,
+    )
+    if result.created:
+        logger.info(f"Созданы партиции заказов с id от {result.created}.")
+    if result.detached:
+        logger.info(f"Отсоединены в архив партиции заказов с id от {result.detached}.")
+    if result.locked:
+        logger.warning(
+            f"Партиции заказов с id от {result.locked} не обслужены: "
+            f"таблицы заказов заблокированы дольше lock_timeout.",
+        )
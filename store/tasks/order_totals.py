@@ -0,0 +1,94 @@
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool
+from taskiq import TaskiqDepends
+
+from common.service_db.dependencies import get_taskiq_service_db_pool
+from common.taskiq.broker import rabbit_broker
+
+from configuration.settings import settings
+from store import metrics
+from store.db.service_db.queries.recalculate_order_totals import (
+    RecalculateOrderTotalsDbQuery,
+    SelectStaleOrderTotalsProductsDbQuery,
+)
+from store.db.service_db.queries.verify_order_totals import VerifyOrderTotalsDbQuery
+
+
+@rabbit_broker.task(schedule=[{"cron": "30 3 * * *"}])
+async def verify_order_totals(
+    service_db_pool: AsyncConnectionPool = TaskiqDepends(get_taskiq_service_db_pool),
+) -> None:
+    """
+    Сверить итоги заказов (items_count, total_amount) с составом заказов.
+
+    Заказы проверяются пачками по settings.orders.order_totals_verify_batch_size,
+    каждая пачка в своей транзакции. Расхождения публикуются в метрике
+    и при settings.orders.order_totals_fix_drift исправляются.
+    Перед сверкой пересчитываются итоги с отложенным пересчётом цен,
+    чтобы они не считались расхождениями.
+
+    :param service_db_pool: Пул коннектов к БД сервиса.
+    """
+    await _recalculate_stale_order_totals(service_db_pool)
+    verify_db_query = VerifyOrderTotalsDbQuery(service_db_pool)
+    after_order_id = 0
+    checked_batches = 0
+    drift_count = 0
+    while True:  # noqa: WPS457
+        batch = await verify_db_query(
+            after_order_id=after_order_id,
+            batch_size=settings.orders.order_totals_verify_batch_size,
+            fix=settings.orders.order_totals_fix_drift,
+        )
+        if batch.last_order_id is None:
+            break
+        after_order_id = batch.last_order_id
+        checked_batches += 1
+        drift_count += len(batch.drift)
+        metrics.order_totals_drift_count.inc(len(batch.drift))
+        for drift in batch.drift:
+            logger.warning(
+                f"Итоги заказа ID: {drift.order_id} расходятся с составом: "
+                f"{drift.items_count} шт. на {drift.total_amount}, "
+                f"ожидалось {drift.expected_items_count} шт. на {drift.expected_total_amount}.",
+            )
+    logger.info(
+        f"Сверка итогов заказов завершена: пачек {checked_batches}, расхождений {drift_count}.",
+    )
+
+
+@rabbit_broker.task(schedule=[{"cron": "* * * * *"}])
+async def recalculate_stale_order_totals(
+    service_db_pool: AsyncConnectionPool = TaskiqDepends(get_taskiq_service_db_pool),
+) -> None:
+    """
+    Пересчитать итоги заказов с товарами, цена которых изменена массовой записью.
+
+    Массовые записи (загрузка каталога) не пересчитывают заказы в своей транзакции,
+    а отмечают товары в order_totals_stale_product. Заказы с этими товарами
+    пересчитываются пачками по settings.orders.order_totals_verify_batch_size,
+    каждая пачка в своей транзакции.
+
+    :param service_db_pool: Пул коннектов к БД сервиса.
+    """
+    await _recalculate_stale_order_totals(service_db_pool)
+
+
+async def _recalculate_stale_order_totals(service_db_pool: AsyncConnectionPool) -> None:
+    select_stale_db_query = SelectStaleOrderTotalsProductsDbQuery(service_db_pool)
+    recalculate_db_query = RecalculateOrderTotalsDbQuery(service_db_pool)
+    batch_size = settings.orders.order_totals_verify_batch_size
+    while True:  # noqa: WPS457
+        stale_products = await select_stale_db_query(limit=batch_size)
+        if not stale_products:
+            return
+        after_order_id: int | None = 0
+        while after_order_id is not None:
+            after_order_id = await recalculate_db_query(
+                stale_products=stale_products,
+                after_order_id=after_order_id,
+                batch_size=batch_size,
+            )
+        logger.info(
+            f"Пересчитаны итоги заказов с товарами ID: {list(stale_products.keys())}.",
+        )
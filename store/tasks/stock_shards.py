@@ -0,0 +1,64 @@
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool
+from taskiq import TaskiqDepends
+
+from common.service_db.dependencies import get_taskiq_service_db_pool
+from common.taskiq.broker import rabbit_broker
+
+from configuration.app_settings.service_db_settings import AddItemEngine
+from configuration.settings import settings
+from store.db.service_db.queries.rebalance_stock_shards import (
+    RebalanceStockShardsDbQuery,
+)
+
+
+def is_stock_sharding_allowed(product_id: int, shard_count: int) -> bool:
+    """
+    Проверить, можно ли распределить остаток товара по шардам.
+
+    Шарды остатка читает только способ добавления товара sharded: остальные способы,
+    пакетное добавление и перенос резервов распродажи списывают только product.quantity,
+    который после перебалансировки обнуляется. Отключить шардирование можно всегда.
+
+    :param product_id: Идентификатор товара.
+    :param shard_count: Новое количество шардов.
+    :return: можно ли выполнить перебалансировку.
+    """
+    if not shard_count:
+        return True
+    return (
+        settings.service_db.add_item_engine == AddItemEngine.SHARDED
+        and product_id not in settings.orders.flash_sale_product_ids
+    )
+
+
+@rabbit_broker.task
+async def rebalance_stock_shards(
+    product_id: int,
+    shard_count: int,
+    service_db_pool: AsyncConnectionPool = TaskiqDepends(get_taskiq_service_db_pool),
+) -> None:
+    """
+    Перераспределить остаток товара по шардам.
+
+    :param product_id: Идентификатор товара.
+    :param shard_count: Новое количество шардов (0 - отключить шардирование).
+    :param service_db_pool: Пул коннектов к БД сервиса.
+    """
+    if not is_stock_sharding_allowed(product_id, shard_count):
+        logger.warning(
+            f"Остаток товара ID: {product_id} не распределён по шардам: "
+            "шардирование недоступно для товара или способа добавления.",
+        )
+        return
+    result = await RebalanceStockShardsDbQuery(service_db_pool)(
+        product_id=product_id,
+        shard_count=shard_count,
+    )
+    if not result:
+        logger.warning(f"Товар ID: {product_id} для перебалансировки шардов не найден.")
+        return
+    logger.info(
+        f"Остаток товара ID: {product_id} ({result.quantity}) "
+        f"распределён по {result.shard_count} шардам.",
+    )
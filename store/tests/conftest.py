@@ -1,30 +1,42 @@
-from typing import AsyncGenerator, Generator
+from typing import Any, AsyncGenerator, Generator
 
 import pytest
 from asgi_lifespan import LifespanManager
-from fakeredis.aioredis import FakeRedis
+from fakeredis.aioredis import FakeReader, FakeRedis
 from fastapi import FastAPI
 from httpx import AsyncClient
 from loguru import logger
 from taskiq import InMemoryBroker, TaskiqState
 
 from common.constance.tests.conftest import constance_close, constance_init
-from common.service_db.tests.conftest import service_db_pool_close, service_db_pool_init
+from common.service_db.tests.conftest import (
+    service_db_pool_close,
+    service_db_pool_init,
+    service_db_replicas_close,
+    service_db_replicas_init,
+)
 from common.service_redis.tests.conftest import service_redis_close, service_redis_init
 from common.taskiq import broker
 from common.token_cache.tests.conftest import token_cache_close, token_cache_init
 
 from configuration import clients
 from configuration.settings import Settings, settings
+from store.tests.db_queries import StoreTestDbQuery
 from store.web.application import get_app
 
 services_mocks = {
     "service_db_pool": (service_db_pool_init, service_db_pool_close),
+    "service_db_replicas": (service_db_replicas_init, service_db_replicas_close),
     "service_redis_pool": (service_redis_init, service_redis_close),
     "token_cache_redis_pool": (token_cache_init, token_cache_close),
     "constance_pool": (constance_init, constance_close),
 }
 
+# fakeredis 2.19 не реализует at_eof, который redis>=5.0.2 вызывает
+# при выдаче соединения из пула.
+if not hasattr(FakeReader, "at_eof"):
+    FakeReader.at_eof = lambda reader: False  # noqa: WPS437
+
 
 @pytest.fixture(scope="session")
 def anyio_backend() -> str:
@@ -152,3 +164,20 @@ async def client(
     async with LifespanManager(fastapi_app):
         async with AsyncClient(app=fastapi_app, base_url="http://test") as ac:
             yield ac
+
+
+@pytest.fixture()
+async def store_db_query(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+) -> StoreTestDbQuery:
+    """
+    Фикстура для наполнения тестовой БД.
+
+    Зависит от client, чтобы данные очищались при завершении приложения.
+
+    :param client: client for the app.
+    :param mock_clients: замоканные клиенты.
+    :return: объект тестовых запросов.
+    """
+    return StoreTestDbQuery(mock_clients["service_db_pool"])
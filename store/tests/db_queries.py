@@ -0,0 +1,104 @@
+"""Запросы для наполнения тестовой БД."""
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from common.db.base_queries import BaseTestQuery
+
+
+class ProductSchema(BaseModel):
+    """Тестовый товар."""
+
+    id: int
+    name: str = "product"
+    quantity: int = 0
+    price: Decimal = Decimal("1.00")
+    category_id: int | None = None
+
+
+class CategorySchema(BaseModel):
+    """Тестовая категория."""
+
+    id: int
+    name: str = "category"
+    parent_id: int | None = None
+
+
+class ClientSchema(BaseModel):
+    """Тестовый клиент."""
+
+    id: int
+    name: str = "client"
+
+
+class OrderSchema(BaseModel):
+    """Тестовый заказ."""
+
+    id: int
+    client_id: int
+
+
+class StoreTestDbQuery(BaseTestQuery):
+    """Запросы для создания тестовых данных."""
+
+    async def create_product(self, product: ProductSchema) -> None:
+        """
+        Создать товар.
+
+        :param product: товар.
+        """
+        await self._create_model(
+            "INSERT INTO product (id, name, quantity, price, category_id) "
+            "VALUES (%(id)s, %(name)s, %(quantity)s, %(price)s, %(category_id)s)",
+            product,
+        )
+
+    async def create_category(self, category: CategorySchema) -> None:
+        """
+        Создать категорию.
+
+        :param category: категория.
+        """
+        await self._create_model(
+            "INSERT INTO category (id, name, parent_id) "
+            "VALUES (%(id)s, %(name)s, %(parent_id)s)",
+            category,
+        )
+
+    async def create_client(self, client: ClientSchema) -> None:
+        """
+        Создать клиента.
+
+        :param client: клиент.
+        """
+        await self._create_model(
+            "INSERT INTO client (id, name) VALUES (%(id)s, %(name)s)",
+            client,
+        )
+
+    async def create_order(self, order: OrderSchema) -> None:
+        """
+        Создать заказ.
+
+        :param order: заказ.
+        """
+        await self._create_model(
+            "INSERT INTO customer_order (id, client_id) OVERRIDING SYSTEM VALUE "
+            "VALUES (%(id)s, %(client_id)s)",
+            order,
+        )
+
+    async def get_product_quantity(self, product_id: int) -> int:
+        """
+        Получить остаток товара на складе.
+
+        :param product_id: идентификатор товара.
+        :return: остаток товара.
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(
+                "SELECT quantity FROM product WHERE id = %(id)s",
+                {"id": product_id},
+            )
+            row = await cursor.fetchone()
+        return row["quantity"]  # type: ignore
@@ -0,0 +1,79 @@
+from collections import Counter
+
+import pytest
+from click.testing import CliRunner
+from fastapi import FastAPI
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+
+from configuration.settings import settings
+from store.benchmarks.add_item import (
+    BenchmarkConfig,
+    benchmark,
+    build_plan,
+    get_latency_stats,
+    run_load,
+)
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+
+
+def test_build_plan_hot_products() -> None:
+    """Запросы к горячим товарам составляют заданную долю."""
+    config = BenchmarkConfig(
+        products=100,
+        orders=10,
+        hot_products=2,
+        hot_ratio=0.9,
+        requests=1000,
+    )
+    plan = build_plan(config)
+
+    assert plan == build_plan(config)
+    assert {order_id for order_id, _ in plan} == set(range(1, 11))
+    assert {product_id for _, product_id in plan} <= set(range(1, 101))
+    hot_requests = sum(product_id <= 2 for _, product_id in plan)
+    assert 850 < hot_requests < 950
+
+
+@pytest.mark.anyio
+async def test_run_load(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Все запросы нагрузки выполняются и учитываются."""
+    await store_db_query.create_client(ClientSchema(id=1))
+    for order_id in (1, 2):
+        await store_db_query.create_order(OrderSchema(id=order_id, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=100))
+    await store_db_query.create_product(ProductSchema(id=2, quantity=100))
+    plan = build_plan(BenchmarkConfig(products=2, orders=2, hot_products=1, requests=20))
+
+    latencies, status_codes = await run_load(client, fastapi_app, plan, concurrency=5)
+
+    assert len(latencies) == 20
+    # 201 - первое добавление товара в заказ, 200 - увеличение количества
+    assert status_codes == Counter({201: 4, 200: 16})
+    assert get_latency_stats(latencies).p99 > 0
+
+
+@pytest.mark.parametrize(
+    "database",
+    [settings.service_db.base_name, "store_bench", "_benchmark_store"],
+)
+def test_benchmark_refuses_database(database: str, mocker: MockerFixture) -> None:
+    """БД без суффикса _benchmark не пересоздаётся."""
+    create_database = mocker.patch("store.benchmarks.add_item.create_database")
+    drop_database = mocker.patch("store.benchmarks.add_item.drop_database")
+
+    result = CliRunner().invoke(benchmark, ["--database", database])
+
+    assert result.exit_code == 2
+    assert "_benchmark" in result.output
+    create_database.assert_not_called()
+    drop_database.assert_not_called()
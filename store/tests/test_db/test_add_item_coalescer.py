@@ -0,0 +1,104 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from configuration.settings import Settings
+from store import metrics
+from store.db.service_db.queries.add_item_to_orders import AddItemToOrdersDbQuery
+from store.services.add_item_coalescer import AddItemCoalescer
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+from store.web.exceptions import OrderCheckViolationError, OrderNotFoundError
+
+
+@pytest.mark.anyio
+async def test_add_item_to_orders(
+    mock_clients: dict[str, Any],
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Остаток распределяется по позициям в порядке их передачи."""
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_order(OrderSchema(id=2, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=5))
+
+    results = await AddItemToOrdersDbQuery(mock_clients["service_db_pool"])(
+        product_id=1,
+        items=[(1, 2), (100, 1), (2, 1), (1, 1), (2, 3)],
+    )
+
+    assert [result.order_quantity for result in results[::3]] == [2, 3]  # type: ignore
+    assert isinstance(results[1], OrderNotFoundError)
+    assert results[2].order_quantity == 1  # type: ignore
+    assert isinstance(results[4], OrderCheckViolationError)
+    assert await store_db_query.get_product_quantity(1) == 1
+
+
+@pytest.mark.anyio
+async def test_add_item_coalescer(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Одновременные добавления товара выполняются одной пачкой."""
+    service_settings.orders.coalesce_window_ms = 50
+    service_settings.orders.coalesce_max_batch_size = 4
+    await store_db_query.create_client(ClientSchema(id=1))
+    for order_id in range(1, 6):
+        await store_db_query.create_order(OrderSchema(id=order_id, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=3))
+    batch_size_count = metrics.registry.get_sample_value(
+        "add_item_coalesced_batch_size_count",
+    )
+
+    coalescer = AddItemCoalescer()
+    query = AddItemToOrdersDbQuery(mock_clients["service_db_pool"])
+    results = await asyncio.gather(
+        *[
+            coalescer(query, order_id=order_id, product_id=1, quantity=1)
+            for order_id in range(1, 6)
+        ],
+        return_exceptions=True,
+    )
+
+    assert [result.order_quantity for result in results[:3]] == [1, 1, 1]  # type: ignore
+    assert all(isinstance(result, OrderCheckViolationError) for result in results[3:])
+    assert await store_db_query.get_product_quantity(1) == 0
+    # Пачка из 4 запросов закрыта по размеру, пятый запрос выполнен отдельной пачкой
+    assert (
+        metrics.registry.get_sample_value("add_item_coalesced_batch_size_count")
+        == batch_size_count + 2
+    )
+
+
+@pytest.mark.anyio
+async def test_add_item_coalescer_cancelled(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Запрос, отменённый за время окна, не списывает остаток и не добавляет товар в заказ."""
+    service_settings.orders.coalesce_window_ms = 50
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_order(OrderSchema(id=2, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=3))
+
+    coalescer = AddItemCoalescer()
+    query = AddItemToOrdersDbQuery(mock_clients["service_db_pool"])
+    cancelled = asyncio.create_task(coalescer(query, order_id=1, product_id=1, quantity=2))
+    added = asyncio.create_task(coalescer(query, order_id=2, product_id=1, quantity=1))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert (await added).order_quantity == 1
+    assert cancelled.cancelled()
+    assert await store_db_query.get_product_quantity(1) == 2
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute("SELECT order_id FROM order_item")
+        assert [row["order_id"] for row in await cursor.fetchall()] == [2]
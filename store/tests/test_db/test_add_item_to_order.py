@@ -0,0 +1,69 @@
+from typing import Any
+
+import pytest
+
+from configuration.app_settings.service_db_settings import AddItemEngine
+from configuration.settings import Settings
+from store.db.service_db.queries.add_item_to_order import AddItemToOrderDbQuery
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+from store.web.exceptions import OrderCheckViolationError, OrderNotFoundError
+
+CALLS_COUNT = 50
+
+
+@pytest.mark.anyio
+async def test_add_item_engines(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Все способы добавления товара дают одинаковый результат (задержка - в store/benchmarks)."""
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_product(
+        ProductSchema(id=1, quantity=CALLS_COUNT * len(AddItemEngine)),
+    )
+    query = AddItemToOrderDbQuery(mock_clients["service_db_pool"])
+
+    for order_id, engine in enumerate(AddItemEngine, start=1):
+        await store_db_query.create_order(OrderSchema(id=order_id, client_id=1))
+        service_settings.service_db.add_item_engine = engine
+        for _ in range(CALLS_COUNT):
+            result = await query(order_id=order_id, product_id=1, quantity=1)
+        assert result.order_quantity == CALLS_COUNT
+
+    assert await store_db_query.get_product_quantity(1) == 0
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("engine", list(AddItemEngine))
+@pytest.mark.parametrize(
+    ("order_id", "product_id", "error"),
+    [
+        (1, 999, OrderCheckViolationError),
+        (999, 1, OrderNotFoundError),
+    ],
+)
+async def test_add_item_engines_errors(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+    engine: AddItemEngine,
+    order_id: int,
+    product_id: int,
+    error: type[Exception],
+) -> None:
+    """Все способы добавления товара одинаково сообщают об отсутствии товара и заказа."""
+    service_settings.service_db.add_item_engine = engine
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=5))
+    query = AddItemToOrderDbQuery(mock_clients["service_db_pool"])
+
+    with pytest.raises(error):
+        await query(order_id=order_id, product_id=product_id, quantity=1)
+    assert await store_db_query.get_product_quantity(1) == 5
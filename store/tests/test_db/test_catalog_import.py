@@ -0,0 +1,80 @@
+import json
+import os
+from decimal import Decimal
+from pathlib import Path
+
+import psycopg
+import pytest
+
+from common.service_db.catalog_import import CatalogImportError, import_file
+
+from configuration.settings import settings
+from store.tests.db_queries import StoreTestDbQuery
+
+SQL_SELECT_PRODUCTS = "SELECT id, quantity, price, category_id FROM product ORDER BY id"
+
+
+def select_products() -> list[tuple[int, int, Decimal, int | None]]:
+    with psycopg.connect(str(settings.service_db.url)) as conn:
+        return conn.execute(SQL_SELECT_PRODUCTS).fetchall()  # type: ignore
+
+
+@pytest.mark.anyio
+async def test_import_catalog(
+    store_db_query: StoreTestDbQuery,
+    tmp_path: Path,
+) -> None:
+    """Категории и товары загружаются, повторная загрузка обновляет строки."""
+    categories = tmp_path / "categories.csv"
+    categories.write_text("id,name,parent_id\n2,child,1\n1,root,\n")
+    products = tmp_path / "products.ndjson"
+    products.write_text(
+        "\n".join(
+            json.dumps(product)
+            for product in (
+                {"id": 1, "name": "a", "quantity": 5, "price": 1.5, "category_id": 2},
+                {"id": 2, "name": "b", "price": "3.00"},
+                {"id": 1, "name": "a", "quantity": 7, "price": 1.5, "category_id": 2},
+            )
+        ),
+    )
+    conninfo = str(settings.service_db.url)
+
+    assert import_file(conninfo, "category", categories).rows == 2
+    assert import_file(conninfo, "product", products, chunk_size=10).rows == 3
+    assert select_products() == [(1, 7, Decimal("1.50"), 2), (2, 0, Decimal("3.00"), None)]
+
+    products.write_text('{"id": 2, "name": "b", "quantity": 1, "price": 2}\n')
+    assert import_file(conninfo, "product", products).rows == 1
+    assert select_products() == [(1, 7, Decimal("1.50"), 2), (2, 1, Decimal("2.00"), None)]
+
+    with psycopg.connect(conninfo) as conn:
+        next_id = conn.execute("SELECT NEXTVAL('product_id_seq')").fetchone()
+    assert next_id == (3,)
+
+
+@pytest.mark.anyio
+async def test_import_catalog_resume(
+    store_db_query: StoreTestDbQuery,
+    tmp_path: Path,
+) -> None:
+    """Прерванная загрузка продолжается с первого незагруженного чанка."""
+    products = tmp_path / "products.csv"
+    lines = [f"{product_id},p,1,1.00," for product_id in range(1, 6)]
+    lines[3] = "4,p,1,1.0x,"
+    products.write_text("\n".join(["id,name,quantity,price,category_id", *lines]))
+    stat = products.stat()
+    conninfo = str(settings.service_db.url)
+
+    with pytest.raises(CatalogImportError):
+        import_file(conninfo, "product", products, chunk_size=2)
+    assert [product[0] for product in select_products()] == [1, 2]
+
+    # Исправление без изменения отпечатка файла (размера и времени изменения)
+    products.write_text(products.read_text().replace("1.0x", "1.00"))
+    os.utime(products, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert import_file(conninfo, "product", products, chunk_size=2).rows == 3
+    assert [product[0] for product in select_products()] == [1, 2, 3, 4, 5]
+    assert import_file(conninfo, "product", products, chunk_size=2).rows == 0
+    assert import_file(conninfo, "product", products, restart=True).rows == 5
@@ -0,0 +1,31 @@
+import psycopg
+import pytest
+
+from store.db.service_db.queries.select_category_descendants import (
+    SelectCategoryDescendantsDbQuery,
+)
+from store.tests.db_queries import CategorySchema, StoreTestDbQuery
+
+
+@pytest.mark.anyio
+async def test_category_closure(store_db_query: StoreTestDbQuery) -> None:
+    """Таблица замыкания следует за вставкой и перемещением категорий."""
+    for category_id, parent_id in ((1, None), (2, 1), (3, 2), (4, None)):
+        await store_db_query.create_category(CategorySchema(id=category_id, parent_id=parent_id))
+    select_descendants = SelectCategoryDescendantsDbQuery(store_db_query.db)
+
+    assert sorted(await select_descendants(1)) == [1, 2, 3]
+    assert await select_descendants(5) == []
+
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute("UPDATE category SET parent_id = 4 WHERE id = 2")
+        await cursor.execute(
+            "SELECT depth FROM category_closure WHERE ancestor_id = 4 AND descendant_id = 3",
+        )
+        assert await cursor.fetchone() == {"depth": 2}
+    assert await select_descendants(1) == [1]
+    assert sorted(await select_descendants(4)) == [2, 3, 4]
+
+    async with store_db_query.cursor() as cursor:
+        with pytest.raises(psycopg.errors.CheckViolation):
+            await cursor.execute("UPDATE category SET parent_id = 3 WHERE id = 4")
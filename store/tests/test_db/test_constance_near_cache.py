@@ -0,0 +1,297 @@
+import asyncio
+import pickle  # noqa: S403
+from typing import Any, AsyncGenerator
+
+import orjson
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from pytest_mock import MockerFixture
+from redis.asyncio import ConnectionPool, Redis
+
+from common.constance.client import Constance
+from common.constance.near_cache import ConstanceNearCache, constance_near_cache
+from common.redis.near_cache import NearCache
+from common.utils.ttl_cache import MISSING, TTLCache
+
+from configuration.app_settings.constants_settings import ConstanceSettings
+from configuration.settings import Settings
+
+FLAG_KEY = f"{Constance._PREFIX}flag"  # noqa: WPS437
+
+
+@pytest.fixture()
+async def constance_settings(
+    service_settings: Settings,
+) -> AsyncGenerator[ConstanceSettings, None]:
+    """
+    Подключить настройки констант без загрузки всех констант.
+
+    :yield: настройки констант.
+    """
+    constance_settings = ConstanceSettings(snapshot=False)
+    # Настройки констант объявлены только для TYPE_CHECKING
+    object.__setattr__(service_settings, "constance", constance_settings)  # noqa: WPS609
+    yield constance_settings
+    await constance_near_cache.close()
+
+
+@pytest.fixture()
+def redis_pool(client: AsyncClient, mock_clients: dict[str, Any]) -> ConnectionPool:
+    """
+    Пул коннектов к тестовому Redis, очищаемому при завершении приложения.
+
+    :return: пул коннектов.
+    """
+    return mock_clients["service_redis_pool"].connection_pool
+
+
+@pytest.fixture()
+async def near_cache(
+    constance_settings: ConstanceSettings,
+    redis_pool: ConnectionPool,
+) -> AsyncGenerator[ConstanceNearCache, None]:
+    """
+    Кеш констант процесса, подписанный на изменения констант.
+
+    :yield: кеш констант.
+    """
+    await constance_near_cache.start(redis_pool, Constance._PREFIX)  # noqa: WPS437
+    await asyncio.wait_for(constance_near_cache._subscribed.wait(), 1)  # noqa: WPS437
+    yield constance_near_cache
+    await constance_near_cache.close()
+
+
+async def wait_invalidated(near_cache: ConstanceNearCache, generation: int) -> None:
+    while near_cache.generation == generation:
+        await asyncio.sleep(0.01)
+
+
+async def publish(redis_pool: ConnectionPool, channel: str, message: str) -> None:
+    async with Redis(connection_pool=redis_pool) as redis:
+        await redis.publish(channel, message)
+
+
+def get_requests(result: str) -> float:
+    return REGISTRY.get_sample_value(
+        "constance_near_cache_requests_total",
+        {"result": result},
+    ) or 0
+
+
+def test_ttl_cache_eviction(mocker: MockerFixture) -> None:
+    """При переполнении вытесняется давно не читанное значение, истёкшее значение не читается."""
+    monotonic = mocker.patch("common.utils.ttl_cache.time.monotonic", return_value=100.0)
+    cache: TTLCache[str, Any] = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", None)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+    cache.set("a", 1, ttl=1)
+    monotonic.return_value = 105.0
+    assert cache.get("a") is MISSING
+    assert cache.get("c") == 3
+    assert len(cache) == 1
+    monotonic.return_value = 110.0
+    assert cache.get("c", None) is None
+    assert not len(cache)
+
+    empty_cache: TTLCache[str, Any] = TTLCache(maxsize=0, ttl=10)
+    empty_cache.set("a", 1)
+    assert empty_cache.get("a") is MISSING
+
+
+def test_near_cache_abstract() -> None:
+    """Кеш без паузы переподключения и создания кеша не создаётся."""
+
+    class IncompleteNearCache(NearCache[Any]):  # noqa: WPS431
+        """Кеш без обязательных методов."""
+
+    with pytest.raises(TypeError):
+        IncompleteNearCache()  # type: ignore
+
+
+@pytest.mark.anyio
+async def test_invalidate_by_channel(
+    near_cache: ConstanceNearCache,
+    redis_pool: ConnectionPool,
+    constance_settings: ConstanceSettings,
+) -> None:
+    """Сообщение с ключом в канал удаляет константу, пустое сообщение - все константы."""
+    near_cache.set(FLAG_KEY, 1, near_cache.generation)
+    near_cache.set("other", 2, near_cache.generation)
+
+    generation = near_cache.generation
+    await publish(redis_pool, constance_settings.near_cache_channel, FLAG_KEY)
+    await asyncio.wait_for(wait_invalidated(near_cache, generation), 1)
+    assert near_cache.get(FLAG_KEY) is MISSING
+    assert near_cache.get("other") == 2
+
+    generation = near_cache.generation
+    await publish(redis_pool, constance_settings.near_cache_channel, "")
+    await asyncio.wait_for(wait_invalidated(near_cache, generation), 1)
+    assert near_cache.get("other") is MISSING
+
+
+@pytest.mark.anyio
+async def test_invalidate_by_keyspace(
+    near_cache: ConstanceNearCache,
+    redis_pool: ConnectionPool,
+) -> None:
+    """Keyspace-уведомление об изменении ключа удаляет константу."""
+    near_cache.set(FLAG_KEY, 1, near_cache.generation)
+    near_cache.set("other", 2, near_cache.generation)
+
+    generation = near_cache.generation
+    await publish(redis_pool, f"__keyspace@0__:{FLAG_KEY}", "set")
+    await asyncio.wait_for(wait_invalidated(near_cache, generation), 1)
+    assert near_cache.get(FLAG_KEY) is MISSING
+    assert near_cache.get("other") == 2
+
+
+@pytest.mark.anyio
+async def test_stale_read_not_cached(
+    near_cache: ConstanceNearCache,
+    redis_pool: ConnectionPool,
+    mocker: MockerFixture,
+) -> None:
+    """Константа, прочитанная из Redis до её изменения, не сохраняется в кеше."""
+    constance = Constance(redis_pool)
+    async with Redis(connection_pool=redis_pool) as redis:
+        await redis.set(FLAG_KEY, "1")
+
+    async def get_during_change(redis: Redis, name: str) -> str:  # noqa: WPS430
+        near_cache.invalidate(name)
+        return "1"
+
+    mocker.patch.object(Redis, "get", new=get_during_change)
+    assert await constance._get("flag") == 1  # noqa: WPS437
+    assert near_cache.cache.get(FLAG_KEY) is MISSING
+
+    mocker.stopall()
+    assert await constance._get("flag") == 1  # noqa: WPS437
+    assert near_cache.cache.get(FLAG_KEY) == 1
+
+
+@pytest.mark.anyio
+async def test_requests_counter(
+    near_cache: ConstanceNearCache,
+    constance_settings: ConstanceSettings,
+    redis_pool: ConnectionPool,
+) -> None:
+    """Чтения констант считаются по результату: из кеша или из Redis."""
+    constance = Constance(redis_pool, defaults={"missing": 5})
+    hits, misses = get_requests("hit"), get_requests("miss")
+
+    assert await constance._get("missing") == 5  # noqa: WPS437
+    assert await constance._get("missing") == 5  # noqa: WPS437
+    assert (get_requests("hit"), get_requests("miss")) == (hits + 1, misses + 1)
+
+    constance_settings.near_cache = False
+    assert await constance._get("missing") == 5  # noqa: WPS437
+    assert (get_requests("hit"), get_requests("miss")) == (hits + 1, misses + 1)
+
+
+@pytest.fixture()
+async def bytes_redis_pool(redis_pool: ConnectionPool) -> AsyncGenerator[ConnectionPool, None]:
+    """
+    Пул коннектов к тому же тестовому Redis без декодирования ответов.
+
+    :yield: пул коннектов.
+    """
+    bytes_redis_pool = ConnectionPool(
+        connection_class=redis_pool.connection_class,
+        **{**redis_pool.connection_kwargs, "decode_responses": False},
+    )
+    yield bytes_redis_pool
+    await bytes_redis_pool.disconnect()
+
+
+@pytest.mark.anyio
+async def test_load_snapshot(
+    constance_settings: ConstanceSettings,
+    redis_pool: ConnectionPool,
+    mocker: MockerFixture,
+) -> None:
+    """Все константы загружаются страницами SCAN, значения страницы - одним MGET."""
+    constance_settings.snapshot_scan_count = 3
+    constance = Constance(redis_pool)
+    for index in range(10):
+        await constance._set(f"flag{index}", {"index": index})  # noqa: WPS437
+    async with Redis(connection_pool=redis_pool) as redis:
+        await redis.set("OTHER://flag", "1")
+    mget = mocker.spy(Redis, "mget")
+
+    snapshot = await constance.load_snapshot()
+    assert snapshot == {
+        f"{Constance._PREFIX}flag{index}": {"index": index}  # noqa: WPS437
+        for index in range(10)
+    }
+    assert mget.call_count > 1
+
+    constance_settings.snapshot = True
+    near_cache = ConstanceNearCache()
+    await near_cache.start(redis_pool, Constance._PREFIX, constance.load_snapshot)  # noqa: WPS437
+    try:
+        assert near_cache.get(f"{Constance._PREFIX}flag9") == {"index": 9}  # noqa: WPS437
+        assert len(near_cache.cache) == 10
+    finally:
+        await near_cache.close()
+
+
+@pytest.mark.anyio
+async def test_json_round_trip(
+    constance_settings: ConstanceSettings,
+    redis_pool: ConnectionPool,
+    bytes_redis_pool: ConnectionPool,
+) -> None:
+    """Константа записывается в JSON и читается тем же значением."""
+    constance_value = {"name": "флаг", "limits": [1, 2.5], "enabled": True, "extra": None}
+    await Constance(redis_pool)._set("flag", constance_value)  # noqa: WPS437
+    async with Redis(connection_pool=bytes_redis_pool) as redis:
+        assert orjson.loads(await redis.get(FLAG_KEY)) == constance_value
+    constance_near_cache.invalidate()
+
+    assert await Constance(redis_pool)._get("flag") == constance_value  # noqa: WPS437
+    assert await Constance(bytes_redis_pool)._get("flag") == constance_value  # noqa: WPS437
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("pickle_fallback", [True, False])
+async def test_pickle_fallback(
+    constance_settings: ConstanceSettings,
+    bytes_redis_pool: ConnectionPool,
+    pickle_fallback: bool,
+) -> None:
+    """Значение в pickle читается, только пока включено чтение pickle."""
+    constance_settings.near_cache = False
+    constance_settings.pickle_fallback = pickle_fallback
+    async with Redis(connection_pool=bytes_redis_pool) as redis:
+        await redis.set(FLAG_KEY, pickle.dumps({"limit": 3}))
+    constance = Constance(bytes_redis_pool, defaults={"flag": 1})
+
+    expected = {"limit": 3} if pickle_fallback else 1
+    assert await constance._get("flag") == expected  # noqa: WPS437
+    assert await constance.load_snapshot() == ({FLAG_KEY: expected} if pickle_fallback else {})
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("near_cache_enabled", [True, False])
+@pytest.mark.parametrize("constance_value", [False, 0, "", []])
+async def test_falsy_value(
+    constance_settings: ConstanceSettings,
+    redis_pool: ConnectionPool,
+    near_cache_enabled: bool,
+    constance_value: Any,
+) -> None:
+    """Ложное значение константы возвращается вместо значения по умолчанию."""
+    constance_settings.near_cache = near_cache_enabled
+    constance = Constance(redis_pool, defaults={"flag": 1})
+    assert await constance._get("flag") == 1  # noqa: WPS437
+
+    await constance._set("flag", constance_value)  # noqa: WPS437
+    assert await constance._get("flag") == constance_value  # noqa: WPS437
+    assert await constance._get("flag") == constance_value  # noqa: WPS437
@@ -0,0 +1,216 @@
+import uuid
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from common.service_redis.client import ServiceRedis
+
+from configuration.settings import Settings
+from store.db.service_db.queries.flush_flash_sale_items import (
+    FlushFlashSaleItemsDbQuery,
+)
+from store.services.flash_sale import FlashSaleInventory, get_stock_key
+from store.tasks.flash_sale import _flush
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+from store.web.exceptions import OrderCheckViolationError
+
+
+@pytest.fixture()
+def flash_sale_inventory(mock_clients: dict[str, Any]) -> FlashSaleInventory:
+    """
+    Остатки товаров распродажи в тестовом Redis.
+
+    :return: остатки товаров распродажи.
+    """
+    return FlashSaleInventory(
+        ServiceRedis(mock_clients["service_redis_pool"].connection_pool),
+    )
+
+
+@pytest.fixture()
+async def order_with_product(store_db_query: StoreTestDbQuery) -> int:
+    """
+    Заказ и товар с остатком 3.
+
+    :return: идентификатор заказа.
+    """
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=3))
+    return 1
+
+
+async def get_order_quantity(store_db_query: StoreTestDbQuery, order_id: int) -> int | None:
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute(
+            "SELECT quantity FROM order_item WHERE order_id = %(order_id)s AND product_id = 1",
+            {"order_id": order_id},
+        )
+        row = await cursor.fetchone()
+    return row["quantity"] if row else None
+
+
+@pytest.mark.anyio
+async def test_reserve(
+    client: AsyncClient,
+    flash_sale_inventory: FlashSaleInventory,
+) -> None:
+    """Резерв списывает остаток в Redis и не превышает его."""
+    assert await flash_sale_inventory.reserve(1, 1, 1, order_quantity=0) is None
+
+    assert await flash_sale_inventory.seed({1: 3}) == [1]
+    assert await flash_sale_inventory.seed({1: 10}) == []
+    assert await flash_sale_inventory.reserve(1, 1, 2, order_quantity=1) == 3
+    assert await flash_sale_inventory.reserve(1, 1, 1, order_quantity=1) == 4
+    with pytest.raises(OrderCheckViolationError):
+        await flash_sale_inventory.reserve(1, 1, 1, order_quantity=1)
+
+    async with flash_sale_inventory.redis.client() as redis:
+        assert int(await redis.get(get_stock_key(1))) == 0
+
+
+@pytest.mark.anyio
+async def test_seed_subtracts_reservations(
+    client: AsyncClient,
+    flash_sale_inventory: FlashSaleInventory,
+) -> None:
+    """Остаток загружается в Redis за вычетом ещё не перенесённых резервов."""
+    await flash_sale_inventory.seed({1: 5})
+    await flash_sale_inventory.reserve(1, 1, 2, order_quantity=0)
+    await flash_sale_inventory.take_batch()
+    await flash_sale_inventory.reserve(2, 1, 1, order_quantity=0)
+    await flash_sale_inventory.redis.delete(get_stock_key(1))
+
+    assert await flash_sale_inventory.seed({1: 5}) == [1]
+    async with flash_sale_inventory.redis.client() as redis:
+        assert int(await redis.get(get_stock_key(1))) == 2
+
+
+@pytest.mark.anyio
+async def test_take_batch(
+    client: AsyncClient,
+    flash_sale_inventory: FlashSaleInventory,
+) -> None:
+    """Неподтверждённая пачка возвращается повторно, после подтверждения берётся следующая."""
+    assert await flash_sale_inventory.take_batch() is None
+    await flash_sale_inventory.seed({1: 10})
+    await flash_sale_inventory.reserve(1, 1, 2, order_quantity=0)
+    await flash_sale_inventory.reserve(1, 1, 1, order_quantity=2)
+    await flash_sale_inventory.reserve(2, 1, 1, order_quantity=0)
+
+    batch = await flash_sale_inventory.take_batch()
+    assert batch is not None
+    batch_id, items = batch
+    assert items == {(1, 1): 3, (2, 1): 1}
+
+    await flash_sale_inventory.reserve(3, 1, 1, order_quantity=0)
+    assert await flash_sale_inventory.take_batch() == (batch_id, items)
+
+    await flash_sale_inventory.ack_batch()
+    next_batch = await flash_sale_inventory.take_batch()
+    assert next_batch is not None
+    assert next_batch[0] != batch_id
+    assert next_batch[1] == {(3, 1): 1}
+
+
+@pytest.mark.anyio
+async def test_reconcile(
+    client: AsyncClient,
+    flash_sale_inventory: FlashSaleInventory,
+) -> None:
+    """Сверка учитывает резервы и исправляет расхождение остатка в Redis."""
+    assert await flash_sale_inventory.reconcile(1, 5) is None
+    await flash_sale_inventory.seed({1: 5})
+    await flash_sale_inventory.reserve(1, 1, 2, order_quantity=0)
+    assert await flash_sale_inventory.reconcile(1, 5) == 0
+
+    assert await flash_sale_inventory.reconcile(1, 7) == 2
+    async with flash_sale_inventory.redis.client() as redis:
+        assert int(await redis.get(get_stock_key(1))) == 5
+
+    await flash_sale_inventory.take_batch()
+    assert await flash_sale_inventory.reconcile(1, 0) is None
+
+
+@pytest.mark.anyio
+async def test_flush(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+    store_db_query: StoreTestDbQuery,
+    flash_sale_inventory: FlashSaleInventory,
+    order_with_product: int,
+) -> None:
+    """Перенос резервов списывает остаток в Postgres и добавляет товар в заказ один раз."""
+    flush_db_query = FlushFlashSaleItemsDbQuery(mock_clients["service_db_pool"])
+    await flash_sale_inventory.seed({1: 3})
+    await flash_sale_inventory.reserve(order_with_product, 1, 2, order_quantity=0)
+    await flash_sale_inventory.reserve(100, 1, 1, order_quantity=0)
+
+    batch = await flash_sale_inventory.take_batch()
+    assert batch is not None
+    await _flush(flash_sale_inventory, flush_db_query)
+
+    assert await store_db_query.get_product_quantity(1) == 0
+    assert await get_order_quantity(store_db_query, order_with_product) == 2
+    assert await get_order_quantity(store_db_query, 100) is None
+    assert await flash_sale_inventory.take_batch() is None
+    assert not await flush_db_query(batch_id=batch[0], items=batch[1])
+    assert await store_db_query.get_product_quantity(1) == 0
+
+
+@pytest.mark.anyio
+async def test_flush_not_enough_stock(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+    store_db_query: StoreTestDbQuery,
+    order_with_product: int,
+) -> None:
+    """Пачка, на которую не хватает остатка в Postgres, не переносится."""
+    flush_db_query = FlushFlashSaleItemsDbQuery(mock_clients["service_db_pool"])
+    batch_id = uuid.uuid4()
+    with pytest.raises(OrderCheckViolationError):
+        await flush_db_query(batch_id=batch_id, items={(order_with_product, 1): 4})
+
+    assert await store_db_query.get_product_quantity(1) == 3
+    assert await get_order_quantity(store_db_query, order_with_product) is None
+    assert await flush_db_query(batch_id=batch_id, items={(order_with_product, 1): 3})
+    assert await store_db_query.get_product_quantity(1) == 0
+
+
+@pytest.mark.anyio
+async def test_add_items_batch_rejects_flash_sale_product(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+    flash_sale_inventory: FlashSaleInventory,
+    order_with_product: int,
+) -> None:
+    """Товар распродажи не списывается пакетом мимо Redis, и перенос резервов не блокируется."""
+    service_settings.orders.flash_sale_product_ids = [1]
+    await flash_sale_inventory.seed({1: 3})
+    await flash_sale_inventory.reserve(order_with_product, 1, 3, order_quantity=0)
+
+    response = await client.post(
+        fastapi_app.url_path_for("add_order_items", order_id=order_with_product),
+        json={"items": [{"product_id": 1, "quantity": 1}]},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert await store_db_query.get_product_quantity(1) == 3
+
+    await _flush(
+        flash_sale_inventory,
+        FlushFlashSaleItemsDbQuery(mock_clients["service_db_pool"]),
+    )
+    assert await store_db_query.get_product_quantity(1) == 0
+    assert await get_order_quantity(store_db_query, order_with_product) == 3
+    assert await flash_sale_inventory.take_batch() is None
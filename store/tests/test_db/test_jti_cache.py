@@ -0,0 +1,181 @@
+import asyncio
+from typing import Any, AsyncGenerator
+
+import pytest
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio.client import PubSub
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from common.token_cache.jti_cache import jti_cache
+from common.token_cache.token_cache import TokenCacheService
+from common.utils.ttl_cache import MISSING
+
+from configuration.app_settings.token_cache_settings import TokenCacheSettings
+from configuration.settings import Settings
+
+JTI = "jti-1"
+JTI_KEY = f"{TokenCacheService.PREFIX}:{JTI}"
+
+
+@pytest.fixture()
+async def token_cache_settings(
+    service_settings: Settings,
+) -> AsyncGenerator[TokenCacheSettings, None]:
+    """
+    Подключить настройки кеша токенов.
+
+    :yield: настройки кеша токенов.
+    """
+    token_cache_settings = TokenCacheSettings()
+    # Настройки кеша токенов объявлены только для TYPE_CHECKING
+    object.__setattr__(service_settings, "token_cache", token_cache_settings)  # noqa: WPS609
+    service_settings.auth.token_cache_checking = True
+    yield token_cache_settings
+    await jti_cache.close()
+
+
+@pytest.fixture()
+def token_cache_pool(client: AsyncClient, mock_clients: dict[str, Any]) -> ConnectionPool:
+    """
+    Пул коннектов к тестовому кешу токенов.
+
+    :return: пул коннектов.
+    """
+    return mock_clients["token_cache_redis_pool"].connection_pool
+
+
+@pytest.fixture()
+async def listening_jti_cache(
+    token_cache_settings: TokenCacheSettings,
+    token_cache_pool: ConnectionPool,
+) -> None:
+    """Подписать кеш проверок jti на отзыв токенов."""
+    await jti_cache.start(token_cache_pool, TokenCacheService.PREFIX)
+    await asyncio.wait_for(jti_cache._subscribed.wait(), 1)  # noqa: WPS437
+
+
+async def redis_command(token_cache_pool: ConnectionPool, *args: Any) -> Any:
+    async with Redis(connection_pool=token_cache_pool) as redis:
+        return await redis.execute_command(*args)
+
+
+async def wait_invalidated(generation: int) -> None:
+    while jti_cache.generation == generation:
+        await asyncio.sleep(0.01)
+
+
+async def wait_unsubscribed() -> None:
+    while jti_cache.listening:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.anyio
+async def test_ttl(
+    listening_jti_cache: None,
+    token_cache_settings: TokenCacheSettings,
+    token_cache_pool: ConnectionPool,
+    mocker: MockerFixture,
+) -> None:
+    """Найденный jti кешируется на local_cache_ttl, ненайденный - на local_cache_negative_ttl."""
+    token_cache_settings.local_cache_ttl = 5
+    token_cache_settings.local_cache_negative_ttl = 1
+    clock = mocker.patch("common.utils.ttl_cache.time")
+    clock.monotonic.return_value = 100.0
+    token_cache = TokenCacheService(token_cache_pool)
+
+    assert not await token_cache.is_jwt_cached(JTI)
+    await redis_command(token_cache_pool, "SET", JTI_KEY, "1")
+    clock.monotonic.return_value = 100.5
+    assert not await token_cache.is_jwt_cached(JTI)
+    clock.monotonic.return_value = 101.0
+    assert await token_cache.is_jwt_cached(JTI)
+
+    await redis_command(token_cache_pool, "DEL", JTI_KEY)
+    clock.monotonic.return_value = 105.5
+    assert await token_cache.is_jwt_cached(JTI)
+    clock.monotonic.return_value = 106.0
+    assert not await token_cache.is_jwt_cached(JTI)
+
+
+@pytest.mark.anyio
+async def test_invalidate_by_revocation_channel(
+    listening_jti_cache: None,
+    token_cache_settings: TokenCacheSettings,
+    token_cache_pool: ConnectionPool,
+) -> None:
+    """Сообщение с jti в канал отзыва удаляет jti из кеша."""
+    token_cache = TokenCacheService(token_cache_pool)
+    await redis_command(token_cache_pool, "SET", JTI_KEY, "1")
+    assert await token_cache.is_jwt_cached(JTI)
+    await redis_command(token_cache_pool, "DEL", JTI_KEY)
+    assert await token_cache.is_jwt_cached(JTI)
+
+    generation = jti_cache.generation
+    await redis_command(token_cache_pool, "PUBLISH", token_cache_settings.revocation_channel, JTI)
+    await asyncio.wait_for(wait_invalidated(generation), 1)
+    assert jti_cache.cache.get(JTI) is MISSING
+    assert not await token_cache.is_jwt_cached(JTI)
+
+
+@pytest.mark.anyio
+async def test_invalidate_by_keyspace(
+    listening_jti_cache: None,
+    token_cache_pool: ConnectionPool,
+) -> None:
+    """Keyspace-уведомление об изменении ключа jti удаляет jti из кеша."""
+    token_cache = TokenCacheService(token_cache_pool)
+    assert not await token_cache.is_jwt_cached(JTI)
+    assert not await token_cache.is_jwt_cached("jti-2")
+    await redis_command(token_cache_pool, "SET", JTI_KEY, "1")
+
+    generation = jti_cache.generation
+    await redis_command(token_cache_pool, "PUBLISH", f"__keyspace@0__:{JTI_KEY}", "set")
+    await asyncio.wait_for(wait_invalidated(generation), 1)
+    assert jti_cache.cache.get(JTI) is MISSING
+    assert jti_cache.cache.get("jti-2") is False
+    assert await token_cache.is_jwt_cached(JTI)
+
+
+@pytest.mark.anyio
+async def test_connection_error_not_cached(
+    listening_jti_cache: None,
+    token_cache_settings: TokenCacheSettings,
+    token_cache_pool: ConnectionPool,
+    mocker: MockerFixture,
+) -> None:
+    """Ошибка подключения к кешу токенов пропускает токен и не кешируется."""
+    token_cache = TokenCacheService(token_cache_pool)
+    mocker.patch.object(Redis, "get", side_effect=RedisConnectionError)
+    assert await token_cache.is_jwt_cached(JTI)
+    assert jti_cache.cache.get(JTI) is MISSING
+
+    mocker.stopall()
+    assert not await token_cache.is_jwt_cached(JTI)
+    assert jti_cache.cache.get(JTI) is False
+
+
+@pytest.mark.anyio
+async def test_bypassed_without_subscription(
+    listening_jti_cache: None,
+    token_cache_settings: TokenCacheSettings,
+    token_cache_pool: ConnectionPool,
+    mocker: MockerFixture,
+) -> None:
+    """После обрыва подписки результаты проверки jti не читаются из кеша и не сохраняются."""
+    token_cache_settings.local_cache_reconnect_delay = 10
+    token_cache = TokenCacheService(token_cache_pool)
+    assert not await token_cache.is_jwt_cached(JTI)
+    assert jti_cache.cache.get(JTI) is False
+
+    mocker.patch.object(PubSub, "parse_response", side_effect=RedisConnectionError)
+    await redis_command(token_cache_pool, "PUBLISH", token_cache_settings.revocation_channel, "")
+    await asyncio.wait_for(wait_unsubscribed(), 1)
+
+    await redis_command(token_cache_pool, "SET", JTI_KEY, "1")
+    assert await token_cache.is_jwt_cached(JTI)
+    assert jti_cache.cache.get(JTI) is MISSING
+    await redis_command(token_cache_pool, "DEL", JTI_KEY)
+    assert not await token_cache.is_jwt_cached(JTI)
+    assert jti_cache.cache.get(JTI) is MISSING
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+from typing import Any
+
+import psycopg
+import pytest
+
+from common.service_db import migrator
+
+from configuration.settings import Settings
+
+MIGRATION_FILENAME = "99990101000000_test.py"
+
+
+@pytest.fixture
+def migration(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    migration_module = SimpleNamespace()
+    monkeypatch.setattr(
+        migrator,
+        "_import_migration_from_filename",
+        lambda filename: migration_module,
+    )
+    return migration_module
+
+
+@pytest.mark.anyio
+async def test_run_migration_retries_lock_timeout(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    migration: SimpleNamespace,
+) -> None:
+    """Миграция повторяется после lock_timeout, timeout действует только в её транзакции."""
+    service_settings.service_db.migration_retry_base_delay = 0.01
+    db_url = str(service_settings.service_db.url)
+    attempts = []
+    with psycopg.connect(db_url) as holder, psycopg.connect(db_url, autocommit=True) as conn:
+        holder.execute("LOCK TABLE product IN ACCESS EXCLUSIVE MODE")
+
+        def upgrade(cur: psycopg.Cursor) -> None:  # noqa: WPS430
+            attempts.append(
+                cur.execute("SELECT current_setting('lock_timeout') = '50ms'").fetchone()[0],
+            )
+            if len(attempts) > 1:
+                holder.rollback()
+            cur.execute("LOCK TABLE product IN SHARE MODE")
+
+        migration.LOCK_TIMEOUT_MS = 50
+        migration.LOCK_RETRIES = 1
+        migration.upgrade = upgrade
+        migrator.run_migration(conn, MIGRATION_FILENAME, upgrade=True)
+        assert attempts == [True, True]
+        assert conn.execute("SELECT current_setting('lock_timeout') = '0'").fetchone()[0]
+
+        holder.execute("LOCK TABLE product IN ACCESS EXCLUSIVE MODE")
+        migration.downgrade = lambda cur: cur.execute("LOCK TABLE product IN SHARE MODE")
+        migration.LOCK_RETRIES = 0
+        with pytest.raises(psycopg.errors.LockNotAvailable):
+            migrator.run_migration(conn, MIGRATION_FILENAME, upgrade=False)
+        holder.rollback()
+
+        migrator.run_migration(conn, MIGRATION_FILENAME, upgrade=False)
+        migrations = conn.execute(
+            "SELECT name FROM migrations WHERE name = %s",
+            (MIGRATION_FILENAME,),
+        ).fetchall()
+        assert migrations == []
+
+
+@pytest.mark.anyio
+async def test_run_migration_non_atomic(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    migration: SimpleNamespace,
+) -> None:
+    """Миграция с ATOMIC = False создаёт индексы конкурентно, в том числе на партициях."""
+    migration.ATOMIC = False
+    migration.upgrade = lambda cur: migrator.create_index_concurrently(
+        cur,
+        "idx_order_item_quantity",
+        "order_item",
+        "(quantity)",
+    )
+    migration.downgrade = lambda cur: migrator.drop_index_concurrently(
+        cur,
+        "idx_order_item_quantity",
+    )
+    with psycopg.connect(str(service_settings.service_db.url), autocommit=True) as conn:
+        migrator.run_migration(conn, MIGRATION_FILENAME, upgrade=True)
+        # Повтор после частичного выполнения пропускает готовые индексы
+        migration.upgrade(conn.cursor())
+        for index_name in ("idx_order_item_quantity", "idx_order_item_product"):
+            index = conn.execute(
+                "SELECT indisvalid, "
+                "(SELECT COUNT(*) FROM pg_inherits WHERE inhparent = indexrelid), "
+                "(SELECT COUNT(*) FROM pg_inherits WHERE inhparent = 'order_item'::regclass) "
+                "FROM pg_index WHERE indexrelid = %s::regclass",
+                (index_name,),
+            ).fetchone()
+            assert index[0]
+            assert index[1] == index[2]
+
+        migrator.run_migration(conn, MIGRATION_FILENAME, upgrade=False)
+        assert conn.execute(
+            "SELECT to_regclass('idx_order_item_quantity')",
+        ).fetchone() == (None,)
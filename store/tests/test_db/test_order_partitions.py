@@ -0,0 +1,75 @@
+from typing import Any
+
+import pytest
+
+from configuration.settings import Settings
+from store.db.service_db.queries.add_item_to_order import AddItemToOrderDbQuery
+from store.db.service_db.queries.maintain_order_partitions import (
+    MaintainOrderPartitionsDbQuery,
+)
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+
+PARTITION_SIZE = 10
+
+
+@pytest.mark.anyio
+async def test_maintain_order_partitions(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Партиции создаются после последнего заказа, партиции старых заказов отсоединяются."""
+    premake_to_id = (
+        service_settings.orders.order_partition_premake + 1
+    ) * service_settings.orders.order_partition_size
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=10))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    old_order_id = premake_to_id - 1
+    await store_db_query.create_order(OrderSchema(id=old_order_id, client_id=1))
+    await AddItemToOrderDbQuery(mock_clients["service_db_pool"])(
+        order_id=old_order_id,
+        product_id=1,
+        quantity=1,
+    )
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute(
+            "UPDATE customer_order SET created_at = NOW() - INTERVAL '40 days' "
+            "WHERE id = %(id)s",
+            {"id": old_order_id},
+        )
+    maintain = MaintainOrderPartitionsDbQuery(mock_clients["service_db_pool"])
+
+    result = await maintain(
+        partition_size=PARTITION_SIZE,
+        premake=1,
+        retention_days=0,
+        lock_timeout_ms=1000,
+    )
+    assert result.created == [premake_to_id]
+    assert result.detached == []
+    new_order_id = premake_to_id + 1
+    await store_db_query.create_order(OrderSchema(id=new_order_id, client_id=1))
+
+    result = await maintain(
+        partition_size=PARTITION_SIZE,
+        premake=1,
+        retention_days=30,
+        lock_timeout_ms=1000,
+    )
+    assert result.created == [premake_to_id + PARTITION_SIZE]
+    assert result.detached == [premake_to_id - service_settings.orders.order_partition_size]
+    assert result.locked == []
+
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute("SELECT id FROM customer_order ORDER BY id")
+        assert [row["id"] for row in await cursor.fetchall()] == [1, new_order_id]
+        await cursor.execute(
+            f"SELECT order_id FROM order_item_p{result.detached[0]}",  # noqa: S608
+        )
+        assert [row["order_id"] for row in await cursor.fetchall()] == [old_order_id]
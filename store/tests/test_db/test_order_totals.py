@@ -0,0 +1,119 @@
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import psycopg
+import pytest
+
+from common.service_db.catalog_import import import_file
+
+from configuration.app_settings.service_db_settings import AddItemEngine
+from configuration.settings import Settings, settings
+from store.db.service_db.queries.add_item_to_order import AddItemToOrderDbQuery
+from store.db.service_db.queries.select_order_summary import SelectOrderSummaryDbQuery
+from store.db.service_db.queries.verify_order_totals import VerifyOrderTotalsDbQuery
+from store.tasks.order_totals import recalculate_stale_order_totals
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+
+
+@pytest.mark.anyio
+async def test_order_totals_follow_order_items(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Итоги заказа обновляются всеми способами добавления, изменением цены и удалением."""
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=100, price=Decimal("2.50")))
+    await store_db_query.create_product(ProductSchema(id=2, quantity=100, price=Decimal("10.00")))
+    add_item = AddItemToOrderDbQuery(mock_clients["service_db_pool"])
+    order_summary = SelectOrderSummaryDbQuery(mock_clients["service_db_pool"])
+
+    for engine in AddItemEngine:
+        service_settings.service_db.add_item_engine = engine
+        await add_item(order_id=1, product_id=1, quantity=2)
+    await add_item(order_id=1, product_id=2, quantity=1)
+    summary = await order_summary(1)
+    assert summary.items_count == len(AddItemEngine) * 2 + 1
+    assert summary.total_amount == Decimal("2.50") * len(AddItemEngine) * 2 + Decimal("10.00")
+
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute("UPDATE product SET price = 3.00 WHERE id = 1")
+        await cursor.execute("DELETE FROM order_item WHERE product_id = 2")
+    summary = await order_summary(1)
+    assert summary.items_count == len(AddItemEngine) * 2
+    assert summary.total_amount == Decimal("3.00") * len(AddItemEngine) * 2
+
+    assert await order_summary(2) is None
+
+
+@pytest.mark.anyio
+async def test_verify_order_totals(
+    mock_clients: dict[str, Any],
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Сверка находит расхождения итогов пачками и исправляет их."""
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=10))
+    for order_id in (1, 2, 3):
+        await store_db_query.create_order(OrderSchema(id=order_id, client_id=1))
+    add_item = AddItemToOrderDbQuery(mock_clients["service_db_pool"])
+    await add_item(order_id=2, product_id=1, quantity=3)
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute("UPDATE customer_order SET items_count = 5 WHERE id IN (2, 3)")
+    verify = VerifyOrderTotalsDbQuery(mock_clients["service_db_pool"])
+
+    batch = await verify(after_order_id=0, batch_size=2, fix=False)
+    assert batch.last_order_id == 2
+    assert [(row.order_id, row.expected_items_count) for row in batch.drift] == [(2, 3)]
+    batch = await verify(after_order_id=0, batch_size=2, fix=True)
+    assert len(batch.drift) == 1
+    batch = await verify(after_order_id=2, batch_size=2, fix=True)
+    assert batch.last_order_id == 3
+    assert [(row.order_id, row.expected_items_count) for row in batch.drift] == [(3, 0)]
+
+    batch = await verify(after_order_id=0, batch_size=10, fix=False)
+    assert batch.drift == []
+    assert (await verify(after_order_id=3, batch_size=10, fix=False)).last_order_id is None
+    summary = await SelectOrderSummaryDbQuery(mock_clients["service_db_pool"])(2)
+    assert (summary.items_count, summary.total_amount) == (3, Decimal("3.00"))
+
+
+@pytest.mark.anyio
+async def test_catalog_import_defers_order_totals(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+    tmp_path: Path,
+) -> None:
+    """Загрузка каталога не блокирует заказы, их итоги пересчитывает задача."""
+    pool = mock_clients["service_db_pool"]
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=10, price=Decimal("2.00")))
+    for order_id in (1, 2, 3):
+        await store_db_query.create_order(OrderSchema(id=order_id, client_id=1))
+        await AddItemToOrderDbQuery(pool)(order_id=order_id, product_id=1, quantity=order_id)
+    products = tmp_path / "products.csv"
+    products.write_text("id,name,quantity,price,category_id\n1,product,4,5.00,\n")
+    conninfo = str(settings.service_db.url)
+
+    # Заказ заблокирован другой транзакцией: пересчёт в транзакции загрузки ждал бы её
+    with psycopg.connect(conninfo) as conn:
+        conn.execute("SELECT 1 FROM customer_order WHERE id = 2 FOR UPDATE")
+        assert import_file(f"{conninfo}?options=-c%20lock_timeout%3D1000", "product", products).rows == 1
+    order_summary = SelectOrderSummaryDbQuery(pool)
+    assert (await order_summary(2)).total_amount == Decimal("4.00")  # type: ignore
+
+    service_settings.orders.order_totals_verify_batch_size = 2
+    await recalculate_stale_order_totals(pool)
+    for order_id in (1, 2, 3):
+        assert (await order_summary(order_id)).total_amount == Decimal("5.00") * order_id  # type: ignore
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute("SELECT COUNT(*) AS count FROM order_totals_stale_product")
+        assert (await cursor.fetchone())["count"] == 0  # type: ignore
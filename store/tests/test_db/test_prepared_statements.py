@@ -0,0 +1,58 @@
+from typing import Any
+
+import pytest
+
+from common.service_db.lifetime import setup_service_db, stop_service_db
+
+from configuration.app_settings.service_db_settings import ConnectionMode
+from configuration.settings import Settings
+from store.db.service_db.queries.add_item_to_order import AddItemToOrderDbQuery
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+
+SQL_PREPARED_STATEMENTS = (
+    "SELECT COUNT(*), "
+    "COUNT(*) FILTER (WHERE statement LIKE '%%FROM product%%') "
+    "FROM pg_prepared_statements"
+)
+
+
+@pytest.mark.anyio
+async def test_direct_mode_prepares_statements(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Новое соединение ничего не выполняет, запросы подготавливаются при выполнении."""
+    service_settings.service_db.connection_mode = ConnectionMode.DIRECT
+    service_settings.service_db.pool_min_size = 1
+    service_settings.service_db.pool_max_size = 1
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=10))
+
+    pool = await setup_service_db()
+    try:
+        async with pool.connection() as conn:
+            cursor = await conn.execute(SQL_PREPARED_STATEMENTS, prepare=False)
+            assert await cursor.fetchone() == (0, 0)
+
+        query = AddItemToOrderDbQuery(pool)
+        await query(order_id=1, product_id=1, quantity=1)
+        async with pool.connection() as conn:
+            cursor = await conn.execute(SQL_PREPARED_STATEMENTS, prepare=False)
+            prepared, product_statements = await cursor.fetchone()  # type: ignore
+        assert product_statements
+
+        result = await query(order_id=1, product_id=1, quantity=2)
+        assert result.order_quantity == 3
+        async with pool.connection() as conn:
+            cursor = await conn.execute(SQL_PREPARED_STATEMENTS, prepare=False)
+            assert await cursor.fetchone() == (prepared, product_statements)
+    finally:
+        await stop_service_db(pool)
+    assert await store_db_query.get_product_quantity(1) == 7
@@ -0,0 +1,122 @@
+import asyncio
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+from common.service_redis.cache import ReadThroughCache
+from common.service_redis.client import ServiceRedis
+
+from store.db.service_db.queries.select_product_info import (
+    ProductInfo,
+    SelectProductInfoDbQuery,
+)
+from store.tests.db_queries import ProductSchema, StoreTestDbQuery
+
+PREFIX = "STORE://test_product"
+
+
+@pytest.mark.anyio
+async def test_single_flight(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Одновременные промахи загружают товар из БД один раз."""
+    await store_db_query.create_product(ProductSchema(id=1, quantity=5, price=Decimal("9.99")))
+    redis = ServiceRedis(mock_clients["service_redis_pool"].connection_pool)
+    db_query = SelectProductInfoDbQuery(mock_clients["service_db_pool"])
+    cache: ReadThroughCache[ProductInfo] = ReadThroughCache(PREFIX, ProductInfo, ttl=60, missing_ttl=10)
+    loads = 0
+
+    async def load() -> ProductInfo | None:  # noqa: WPS430
+        nonlocal loads
+        loads += 1
+        return await db_query(1)
+
+    products = await asyncio.gather(*(cache.get(redis, "1", load) for _ in range(10)))
+    assert loads == 1
+    assert {product.quantity for product in products} == {5}  # type: ignore
+
+    await store_db_query.create_product(ProductSchema(id=2))
+    assert (await cache.get(redis, "1", load)).quantity == 5  # type: ignore
+    assert loads == 1
+    assert await cache.get(redis, "3", lambda: db_query(3)) is None
+
+
+@pytest.mark.anyio
+async def test_early_refresh(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+) -> None:
+    """Значение обновляется до истечения, если beta делает раннее обновление неизбежным."""
+    redis = ServiceRedis(mock_clients["service_redis_pool"].connection_pool)
+    cache: ReadThroughCache[int] = ReadThroughCache(PREFIX, int, ttl=60, missing_ttl=10, beta=0)
+    loaded = iter(range(10))
+
+    async def load() -> int:  # noqa: WPS430
+        await asyncio.sleep(0.01)
+        return next(loaded)
+
+    assert await cache.get(redis, "1", load) == 0
+    assert await cache.get(redis, "1", load) == 0
+    cache.beta = 1e6
+    assert await cache.get(redis, "1", load) == 1
+
+
+@pytest.mark.anyio
+async def test_invalidate_during_load(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+) -> None:
+    """Значение, загруженное до удаления из кеша, не записывается в кеш."""
+    redis = ServiceRedis(mock_clients["service_redis_pool"].connection_pool)
+    cache: ReadThroughCache[int] = ReadThroughCache(PREFIX, int, ttl=60, missing_ttl=10)
+    loading = asyncio.Event()
+    loaded = asyncio.Event()
+
+    async def load_stale() -> int:  # noqa: WPS430
+        loading.set()
+        await loaded.wait()
+        return 1
+
+    async def load() -> int:  # noqa: WPS430
+        return 2
+
+    stale = asyncio.create_task(cache.get(redis, "1", load_stale))
+    await loading.wait()
+    await cache.invalidate(redis, ["1"])
+    loaded.set()
+    assert await stale == 1
+    assert await cache.get(redis, "1", load) == 2
+
+
+@pytest.mark.anyio
+async def test_invalidate_from_other_process(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+) -> None:
+    """Значение, загруженное до удаления из кеша в другом процессе, не записывается в кеш."""
+    redis = ServiceRedis(mock_clients["service_redis_pool"].connection_pool)
+    cache: ReadThroughCache[int] = ReadThroughCache(PREFIX, int, ttl=60, missing_ttl=10)
+    other_cache: ReadThroughCache[int] = ReadThroughCache(PREFIX, int, ttl=60, missing_ttl=10)
+    loading = asyncio.Event()
+    loaded = asyncio.Event()
+
+    async def load_stale() -> int:  # noqa: WPS430
+        loading.set()
+        await loaded.wait()
+        return 1
+
+    async def load() -> int:  # noqa: WPS430
+        return 2
+
+    stale = asyncio.create_task(cache.get(redis, "1", load_stale))
+    await loading.wait()
+    await other_cache.invalidate(redis, ["1"])
+    loaded.set()
+    assert await stale == 1
+    assert await redis.get(cache.get_name("1")) is None
+    assert await cache.get(redis, "1", load) == 2
+    assert await other_cache.get(redis, "1", load_stale) == 2
@@ -0,0 +1,105 @@
+from typing import Any, AsyncGenerator
+
+import pytest
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool
+
+from common.service_db import instrumentation
+from common.service_db.instrumentation import InstrumentedAsyncCursor, QueryObserver
+
+from configuration.settings import Settings
+from store.db.service_db.queries.select_order_item import SelectOrderItemDbQuery
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+
+
+class RecordingQueryObserver(QueryObserver):
+    """Получатель измерений запросов для тестов."""
+
+    def __init__(self) -> None:
+        self.executions: list[tuple[str, int]] = []
+        self.acquires: list[str] = []
+
+    def observe_execution(self, query_name: str, duration: float, rows: int) -> None:
+        """
+        Сохранить выполнение запроса.
+
+        :param query_name: Имя запроса.
+        :param duration: Время выполнения.
+        :param rows: Количество строк.
+        """
+        self.executions.append((query_name, rows))
+
+    def observe_acquire(self, query_name: str, wait: float) -> None:
+        """
+        Сохранить ожидание соединения.
+
+        :param query_name: Имя класса запроса.
+        :param wait: Время ожидания.
+        """
+        self.acquires.append(query_name)
+
+
+@pytest.fixture
+async def instrumented_pool(
+    store_db_query: StoreTestDbQuery,
+    service_settings: Settings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[tuple[AsyncConnectionPool, RecordingQueryObserver], None]:
+    """
+    Пул с измерением запросов к тестовой БД.
+
+    :yields: пул и получатель измерений.
+    """
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1))
+    observer = RecordingQueryObserver()
+    monkeypatch.setattr(instrumentation, "query_observer", observer)
+    pool = AsyncConnectionPool(
+        conninfo=str(service_settings.service_db.url),
+        kwargs={"cursor_factory": InstrumentedAsyncCursor},
+        open=False,
+    )
+    await pool.open(wait=True)
+    yield pool, observer
+    await pool.close()
+
+
+@pytest.mark.anyio
+async def test_query_observed(
+    instrumented_pool: tuple[AsyncConnectionPool, RecordingQueryObserver],
+) -> None:
+    """Время выполнения и строки учитываются по имени запроса, ожидание - по классу."""
+    pool, observer = instrumented_pool
+
+    await SelectOrderItemDbQuery(pool)(order_id=1, product_id=1)
+
+    assert observer.executions == [("select_order_item", 1)]
+    assert observer.acquires == ["SelectOrderItemDbQuery"]
+
+
+@pytest.mark.anyio
+async def test_slow_query_logged_with_plan(
+    instrumented_pool: tuple[AsyncConnectionPool, RecordingQueryObserver],
+    service_settings: Settings,
+) -> None:
+    """Медленный запрос логируется со скрытыми параметрами и планом."""
+    pool, _ = instrumented_pool
+    service_settings.service_db.slow_query_threshold = 1e-9
+    service_settings.service_db.slow_query_explain_rate = 1
+    messages: list[str] = []
+    handler_id = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        await SelectOrderItemDbQuery(pool)(order_id=1, product_id=1)
+    finally:
+        logger.remove(handler_id)
+
+    slow_messages = [message for message in messages if "select_order_item" in message]
+    assert len(slow_messages) == 1
+    assert "{'order_id': '***', 'product_id': '***'}" in slow_messages[0]
+    assert "Execution Time" in slow_messages[0]
@@ -0,0 +1,47 @@
+import pytest
+
+from common.db.keyset import KeysetPage
+from common.service_db.query_registry import SQL_PATH, service_db_queries
+
+from store.db.service_db.queries.add_item_to_order import (
+    QUERY_ADD_ITEM_TO_ORDER,
+    AddItemToOrderResult,
+)
+from store.db.service_db.queries.select_category_products import (
+    QUERY_SELECT_CATEGORY_PRODUCTS,
+)
+
+
+def test_registry_loads_sql_files() -> None:
+    """Реестр содержит все sql-файлы сервиса и возвращает один объект на запрос."""
+    assert set(service_db_queries.sources) == {
+        sql_file.stem for sql_file in SQL_PATH.glob("*.sql")
+    }
+    assert (
+        service_db_queries.get("add_item_to_order", AddItemToOrderResult)
+        is QUERY_ADD_ITEM_TO_ORDER
+    )
+    with pytest.raises(KeyError):
+        service_db_queries.get("unknown")
+
+
+def test_compiled_query_validates_rows() -> None:
+    """Скомпилированный запрос валидирует строки результата."""
+    row = {"product_id": 1, "order_quantity": 2}
+
+    assert QUERY_ADD_ITEM_TO_ORDER.validate(row) == AddItemToOrderResult(**row)
+    assert QUERY_ADD_ITEM_TO_ORDER.validate_many([row, row]) == [
+        AddItemToOrderResult(**row),
+    ] * 2
+
+
+def test_template_query_format() -> None:
+    """Собранный из шаблона запрос учитывается под именем шаблона."""
+    page = KeysetPage(("id",), (1,))
+    query = QUERY_SELECT_CATEGORY_PRODUCTS.format(
+        keyset=page.predicate,
+        keyset_order=page.order_by,
+    )
+
+    assert '("id") > (%(keyset_0)s)' in query
+    assert service_db_queries.names[query] == "select_category_products"
@@ -0,0 +1,103 @@
+from typing import Any, AsyncGenerator
+
+import pytest
+from psycopg_pool import AsyncConnectionPool
+
+from common.service_db.base_service_db_queries import BaseServiceDbQuery
+from common.service_db.replicas import Replica, ReplicaRouter
+
+from configuration.settings import Settings
+
+
+class IsReplicaDbQuery(BaseServiceDbQuery):
+    """Запрос, выполнен ли он на соединении реплики."""
+
+    async def __call__(self) -> bool:
+        """
+        Проверить имя приложения соединения, на котором выполнен запрос.
+
+        :return: True, если запрос выполнен на соединении реплики.
+        """
+        async with self.cursor() as cursor:
+            await cursor.execute(
+                "SELECT current_setting('application_name') = 'replica' AS is_replica",
+            )
+            return (await cursor.fetchone())["is_replica"]  # type: ignore
+
+
+class ReadOnlyIsReplicaDbQuery(IsReplicaDbQuery):
+    """Запрос на чтение, выполнен ли он на соединении реплики."""
+
+    read_only = True
+
+
+@pytest.fixture
+async def replica_router(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+) -> AsyncGenerator[ReplicaRouter, None]:
+    """
+    Маршрутизатор с репликой, которой служит тестовая БД.
+
+    :yields: маршрутизатор запросов на чтение.
+    """
+    pool = AsyncConnectionPool(
+        conninfo=str(service_settings.service_db.url),
+        kwargs={"application_name": "replica"},
+        open=False,
+    )
+    await pool.open(wait=True)
+    router = ReplicaRouter(
+        [Replica(name="replica", pool=pool)],
+        max_lag=1,
+        probe_interval=60,
+    )
+    await router.start()
+    yield router
+    await router.close()
+
+
+@pytest.mark.anyio
+async def test_read_only_query_uses_replica(
+    mock_clients: dict[str, Any],
+    replica_router: ReplicaRouter,
+) -> None:
+    """Запросы на чтение выполняются на реплике, остальные на primary."""
+    primary = mock_clients["service_db_pool"]
+
+    assert replica_router.replicas[0].available
+    assert await ReadOnlyIsReplicaDbQuery(primary, replica_router)()
+    assert not await IsReplicaDbQuery(primary, replica_router)()
+    assert not await ReadOnlyIsReplicaDbQuery(primary)()
+    assert replica_router.replicas[0].outstanding == 0
+
+
+@pytest.mark.anyio
+async def test_lagging_replica_out_of_rotation(
+    mock_clients: dict[str, Any],
+    replica_router: ReplicaRouter,
+) -> None:
+    """Отстающая реплика выводится из ротации, чтение уходит на primary."""
+    replica_router.max_lag = -1
+    await replica_router.probe()
+
+    assert not replica_router.replicas[0].available
+    assert replica_router.pick() is None
+    assert not await ReadOnlyIsReplicaDbQuery(
+        mock_clients["service_db_pool"],
+        replica_router,
+    )()
+
+    replica_router.max_lag = 1
+    await replica_router.probe()
+    assert replica_router.replicas[0].available
+
+
+def test_pick_least_outstanding_replica() -> None:
+    """Выбирается доступная реплика с наименьшим числом запросов."""
+    busy = Replica(name="busy", pool=None, outstanding=3, available=True)  # type: ignore
+    idle = Replica(name="idle", pool=None, outstanding=1, available=True)  # type: ignore
+    down = Replica(name="down", pool=None, available=False)  # type: ignore
+    router = ReplicaRouter([busy, idle, down], max_lag=1, probe_interval=1)
+
+    assert router.pick() is idle
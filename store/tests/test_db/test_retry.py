@@ -0,0 +1,68 @@
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from psycopg import OperationalError
+from psycopg.errors import DeadlockDetected, SerializationFailure, UniqueViolation
+
+from common.db.retry import RetryBudget, RetryPolicy
+
+from store.db.service_db.queries.add_item_to_order import (
+    AddItemToOrderDbQuery,
+    AddItemToOrderResult,
+)
+from store.web.exceptions import OrderNotFoundError
+
+FAST_POLICY = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+@pytest.mark.anyio
+async def test_retry_serialization_failure() -> None:
+    """Serialization failure и deadlock повторяются до успешной попытки."""
+    func = AsyncMock(side_effect=[SerializationFailure(), DeadlockDetected(), "ok"])
+
+    assert await FAST_POLICY.call(func) == "ok"
+    assert func.await_count == 3
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("policy", "error", "await_count"),
+    [
+        (FAST_POLICY, SerializationFailure(), 3),
+        (FAST_POLICY, UniqueViolation(), 1),
+        (FAST_POLICY, OrderNotFoundError(), 1),
+        (RetryPolicy(base_delay=0, max_delay=0, retry_connection_errors=False), OperationalError(), 1),
+        (RetryPolicy(base_delay=1, max_delay=1, deadline=0), SerializationFailure(), 1),
+        (RetryPolicy(base_delay=0, max_delay=0, budget=RetryBudget(0, 1)), SerializationFailure(), 2),
+    ],
+)
+async def test_retry_gives_up(
+    policy: RetryPolicy,
+    error: Exception,
+    await_count: int,
+) -> None:
+    """Ошибка не повторяется, если она постоянная или исчерпаны попытки, время или бюджет."""
+    func = AsyncMock(side_effect=error)
+
+    with pytest.raises(type(error)):
+        await policy.call(func)
+    assert func.await_count == await_count
+
+
+@pytest.mark.anyio
+async def test_add_item_transaction_retried(mock_clients: dict[str, Any]) -> None:
+    """Транзакция добавления товара повторяется после deadlock."""
+    result = {"product_id": 1, "order_quantity": 1}
+    with (
+        patch.object(AddItemToOrderDbQuery, "retry_policy", FAST_POLICY),
+        patch.object(
+            AddItemToOrderDbQuery,
+            "_add_item_transaction",
+            AsyncMock(side_effect=[DeadlockDetected(), result]),
+        ) as transaction,
+    ):
+        query = AddItemToOrderDbQuery(mock_clients["service_db_pool"])
+
+        assert await query(order_id=1, product_id=1, quantity=1) == AddItemToOrderResult(**result)
+    assert transaction.await_count == 2
@@ -0,0 +1,102 @@
+import asyncio
+from typing import Any, AsyncGenerator
+
+import pytest
+from pytest_mock import MockerFixture
+
+from common.service_db.pool import PoolSizeController, ServiceDbPool
+
+from configuration.settings import Settings
+from store import metrics
+from store.web.lifetime import _monitor_service_db_pool, export_service_db_pool_stats
+
+
+@pytest.fixture
+async def service_db_pool(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+) -> AsyncGenerator[ServiceDbPool, None]:
+    """
+    Пул из одного соединения к тестовой БД.
+
+    :yields: пул соединений.
+    """
+    pool = ServiceDbPool(
+        conninfo=str(service_settings.service_db.url),
+        min_size=1,
+        max_size=1,
+        open=False,
+    )
+    await pool.open(wait=True)
+    yield pool
+    await pool.close()
+
+
+async def _wait_for_busy_connection(pool: ServiceDbPool) -> None:
+    async with pool.connection():
+        waiter = asyncio.create_task(pool.getconn())
+        await asyncio.sleep(0.05)
+        export_service_db_pool_stats(pool)
+    await pool.putconn(await waiter)
+
+
+@pytest.mark.anyio
+async def test_pool_reports_wait_and_stats(service_db_pool: ServiceDbPool) -> None:
+    """Пул сообщает время ожидания и возраст соединений, статистика уходит в метрики."""
+    waits: list[tuple[float, float]] = []
+    service_db_pool.on_getconn = lambda wait, age: waits.append((wait, age))
+
+    await _wait_for_busy_connection(service_db_pool)
+
+    assert len(waits) == 2
+    assert waits[1][0] >= 0.05
+    assert waits[1][1] >= waits[1][0]
+    assert metrics.registry.get_sample_value("service_db_pool_requests_waiting") == 1
+    assert metrics.registry.get_sample_value("service_db_pool_connections_in_use") == 1
+
+
+@pytest.mark.anyio
+async def test_pool_size_controller(service_db_pool: ServiceDbPool) -> None:
+    """Пул растёт при ожидании соединений и уменьшается без нагрузки в своих границах."""
+    controller = PoolSizeController(
+        service_db_pool,
+        lower=1,
+        upper=2,
+        grow_wait_ms=10,
+        shrink_usage=1,
+    )
+
+    for _ in range(2):
+        await _wait_for_busy_connection(service_db_pool)
+        await controller.adjust()
+    assert service_db_pool.max_size == 2
+
+    assert await controller.adjust() == 1
+    assert await controller.adjust() == 1
+    assert service_db_pool.max_size == 1
+
+
+@pytest.mark.anyio
+async def test_pool_monitor_survives_errors(
+    service_db_pool: ServiceDbPool,
+    service_settings: Settings,
+    mocker: MockerFixture,
+) -> None:
+    """Ошибка выгрузки статистики или изменения размера пула не останавливает мониторинг."""
+    service_settings.service_db.pool_stats_interval = 0.01
+    service_settings.service_db.pool_adaptive = True
+    export = mocker.patch(
+        "store.web.lifetime.export_service_db_pool_stats",
+        side_effect=RuntimeError,
+    )
+    adjust = mocker.patch.object(PoolSizeController, "adjust", side_effect=RuntimeError)
+
+    monitor = asyncio.create_task(_monitor_service_db_pool(service_db_pool))
+    while adjust.call_count < 2:
+        assert not monitor.done()
+        await asyncio.sleep(0.01)
+    assert export.call_count >= 2
+
+    monitor.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await monitor
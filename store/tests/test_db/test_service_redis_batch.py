@@ -0,0 +1,77 @@
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from redis.exceptions import ResponseError
+
+from common.service_redis.client import ServiceRedis
+
+from configuration.settings import Settings
+
+
+@pytest.mark.anyio
+async def test_batch(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+) -> None:
+    """Результаты команд пакета доступны после его выполнения."""
+    redis = ServiceRedis(mock_clients["service_redis_pool"].connection_pool)
+
+    async with redis.batch(chunk_size=2) as batch:
+        created = batch.set("a", 1, ex=60)
+        batch.hset("h", {"x": 1, "y": 2})
+        missing = batch.get("b")
+        fields = batch.hmget("h", ["x", "z"])
+        with pytest.raises(RuntimeError):
+            created.result  # noqa: WPS428
+        assert len(batch) == 4
+    assert created.result is True
+    assert missing.result is None
+    assert fields.result == ["1", None]
+
+    batch = redis.batch(transaction=True)
+    current = batch.get("a")
+    deleted = batch.delete("a", "h")
+    await batch.execute()
+    assert (current.result, deleted.result) == ("1", 2)
+
+    with pytest.raises(ResponseError):
+        async with redis.batch() as batch:
+            batch.set("a", "x")
+            batch.hget("a", "x")
+
+
+@pytest.mark.anyio
+async def test_bulk_helpers(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+) -> None:
+    """mget, mset и hmget разбивают большие наборы ключей на части."""
+    service_settings.service_redis.batch_chunk_size = 3
+    redis = ServiceRedis(mock_clients["service_redis_pool"].connection_pool)
+    assert redis.batch().chunk_size == 3
+    assert redis.batch(chunk_size=5).chunk_size == 5
+    keys = [f"key:{index}" for index in range(10)]
+
+    await redis.mset({key: index for index, key in enumerate(keys[:5])})
+    await redis.mset({key: index for index, key in enumerate(keys[5:], start=5)}, ex=None)
+    assert await redis.mget([*keys, "missing"]) == [*map(str, range(10)), None]
+
+    await redis.hset("hash", mapping={key: 1 for key in keys[::2]})
+    assert await redis.hmget("hash", keys) == ["1", None] * 5
+
+
+@pytest.mark.anyio
+async def test_batch_chunk_size(
+    client: AsyncClient,
+    mock_clients: dict[str, Any],
+) -> None:
+    """Пакет не создаётся с пустым пайплайном, пустой пакет выполняется."""
+    redis = ServiceRedis(mock_clients["service_redis_pool"].connection_pool)
+    with pytest.raises(ValueError):
+        redis.batch(chunk_size=0)
+
+    for transaction in (True, False):
+        async with redis.batch(transaction=transaction) as batch:
+            assert not len(batch)
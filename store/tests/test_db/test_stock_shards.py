@@ -0,0 +1,142 @@
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from configuration.app_settings.service_db_settings import AddItemEngine
+from configuration.settings import Settings
+from store.db.service_db.queries.add_item_to_order import AddItemToOrderDbQuery
+from store.db.service_db.queries.rebalance_stock_shards import (
+    RebalanceStockShardsDbQuery,
+)
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+from store.tasks.stock_shards import rebalance_stock_shards
+from store.web.exceptions import OrderCheckViolationError
+
+
+@pytest.mark.anyio
+async def test_add_item_sharded(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Товар списывается из шардов, остаток сохраняется при перебалансировке."""
+    service_settings.service_db.add_item_engine = AddItemEngine.SHARDED
+    pool = mock_clients["service_db_pool"]
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=10))
+
+    rebalanced = await RebalanceStockShardsDbQuery(pool)(product_id=1, shard_count=3)
+    assert rebalanced
+    assert (rebalanced.quantity, rebalanced.shard_count) == (10, 3)
+    assert await store_db_query.get_product_quantity(1) == 0
+
+    query = AddItemToOrderDbQuery(pool)
+    for _ in range(4):
+        result = await query(order_id=1, product_id=1, quantity=2)
+    assert result.order_quantity == 8
+
+    # В каждом шарде осталось меньше 2 единиц товара, списание идёт из нескольких шардов
+    result = await query(order_id=1, product_id=1, quantity=2)
+    assert result.order_quantity == 10
+
+    with pytest.raises(OrderCheckViolationError):
+        await query(order_id=1, product_id=1, quantity=1)
+
+    unsharded = await RebalanceStockShardsDbQuery(pool)(product_id=1, shard_count=0)
+    assert unsharded
+    assert (unsharded.quantity, unsharded.shard_count) == (0, 0)
+    assert await store_db_query.get_product_quantity(1) == 0
+
+
+@pytest.mark.anyio
+async def test_add_item_sharded_from_product_and_shards(
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Списание, которое не покрывает ни один шард, берёт остаток продукта и нескольких шардов."""
+    service_settings.service_db.add_item_engine = AddItemEngine.SHARDED
+    pool = mock_clients["service_db_pool"]
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=6))
+    await RebalanceStockShardsDbQuery(pool)(product_id=1, shard_count=3)
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute("UPDATE product SET quantity = 1 WHERE id = 1")
+
+    query = AddItemToOrderDbQuery(pool)
+    with pytest.raises(OrderCheckViolationError):
+        await query(order_id=1, product_id=1, quantity=8)
+    result = await query(order_id=1, product_id=1, quantity=7)
+    assert result.order_quantity == 7
+
+    unsharded = await RebalanceStockShardsDbQuery(pool)(product_id=1, shard_count=0)
+    assert unsharded
+    assert unsharded.quantity == 0
+
+
+@pytest.mark.anyio
+async def test_rebalance_requires_sharded_engine(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Остаток распределяется по шардам, только если его читает способ добавления sharded."""
+    service_settings.service_db.add_item_engine = AddItemEngine.TRANSACTION
+    service_settings.orders.flash_sale_product_ids = [2]
+    await store_db_query.create_product(ProductSchema(id=1, quantity=10))
+    url = fastapi_app.url_path_for("rebalance_product_stock_shards", product_id=1)
+
+    response = await client.post(url, json={"shard_count": 3})
+    assert response.status_code == status.HTTP_409_CONFLICT
+    response = await client.post(url, json={"shard_count": 257})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    pool = mock_clients["service_db_pool"]
+    await rebalance_stock_shards.original_func(1, 3, service_db_pool=pool)
+    assert await store_db_query.get_product_quantity(1) == 10
+
+    service_settings.service_db.add_item_engine = AddItemEngine.SHARDED
+    await rebalance_stock_shards.original_func(2, 3, service_db_pool=pool)
+    response = await client.post(
+        fastapi_app.url_path_for("rebalance_product_stock_shards", product_id=2),
+        json={"shard_count": 3},
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    await rebalance_stock_shards.original_func(1, 3, service_db_pool=pool)
+    assert await store_db_query.get_product_quantity(1) == 0
+
+
+@pytest.mark.anyio
+async def test_add_items_batch_rejects_sharded_product(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    mock_clients: dict[str, Any],
+    service_settings: Settings,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Товар с шардами остатка не добавляется пакетом, остальные товары пакета не списываются."""
+    service_settings.service_db.add_item_engine = AddItemEngine.SHARDED
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=10))
+    await store_db_query.create_product(ProductSchema(id=2, quantity=10))
+    await RebalanceStockShardsDbQuery(mock_clients["service_db_pool"])(product_id=2, shard_count=2)
+
+    response = await client.post(
+        fastapi_app.url_path_for("add_order_items", order_id=1),
+        json={"items": [{"product_id": 1, "quantity": 1}, {"product_id": 2, "quantity": 1}]},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert await store_db_query.get_product_quantity(1) == 10
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from configuration.settings import settings
+from store.services.categories import category_tree_cache
+from store.tests.db_queries import CategorySchema, ProductSchema, StoreTestDbQuery
+
+
+async def wait_for(condition, timeout: float = 5) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.anyio
+async def test_get_category_products(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Товары поддерева категории отдаются страницами по after_id."""
+    for category_id, parent_id in ((1, None), (2, 1), (3, None)):
+        await store_db_query.create_category(CategorySchema(id=category_id, parent_id=parent_id))
+    for product_id, category_id in ((1, 1), (2, 2), (3, 3), (4, 2), (5, None)):
+        await store_db_query.create_product(ProductSchema(id=product_id, category_id=category_id))
+    url = fastapi_app.url_path_for("get_category_products", category_id=1)
+
+    response = await client.get(url, params={"page_size": 2})
+    assert response.status_code == status.HTTP_200_OK
+    first_page = response.json()
+    assert [product["id"] for product in first_page["results"]] == [1, 2]
+    assert first_page["previous"] is None
+
+    response = await client.get(first_page["next"])
+    second_page = response.json()
+    assert [product["id"] for product in second_page["results"]] == [4]
+    assert second_page["next"] is None
+
+    response = await client.get(second_page["previous"])
+    assert response.json()["results"] == first_page["results"]
+    assert response.json()["previous"] is None
+
+    response = await client.get(url, params={"cursor": second_page["previous"][-10:]})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = await client.get(
+        fastapi_app.url_path_for("get_category_products", category_id=10),
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.anyio
+async def test_get_category_products_cache_invalidation(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Кеш поддеревьев очищается при изменении категорий."""
+    assert category_tree_cache.listening
+    for category_id in (1, 2):
+        await store_db_query.create_category(CategorySchema(id=category_id))
+    await store_db_query.create_product(ProductSchema(id=1, category_id=2))
+    url = fastapi_app.url_path_for("get_category_products", category_id=1)
+
+    response = await client.get(url)
+    assert response.json()["results"] == []
+
+    async with store_db_query.cursor() as cursor:
+        await cursor.execute("UPDATE category SET parent_id = 1 WHERE id = 2")
+    await wait_for(lambda: not category_tree_cache._descendants)  # noqa: WPS437
+
+    response = await client.get(url)
+    assert [product["id"] for product in response.json()["results"]] == [1]
+
+
+@pytest.mark.anyio
+async def test_get_category_products_cache_bounded(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Несуществующие категории не кешируются, размер кеша ограничен."""
+    category_tree_cache._descendants.maxsize = 2  # noqa: WPS437
+    for category_id in (1, 2, 3):
+        await store_db_query.create_category(CategorySchema(id=category_id))
+    try:
+        for category_id in range(10, 20):
+            response = await client.get(
+                fastapi_app.url_path_for("get_category_products", category_id=category_id),
+            )
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not category_tree_cache._descendants  # noqa: WPS437
+
+        for category_id in (1, 2, 3):
+            response = await client.get(
+                fastapi_app.url_path_for("get_category_products", category_id=category_id),
+            )
+            assert response.status_code == status.HTTP_200_OK
+        assert len(category_tree_cache._descendants) == 2  # noqa: WPS437
+    finally:
+        category_tree_cache._descendants.maxsize = settings.catalog.category_cache_maxsize  # noqa: WPS437
@@ -0,0 +1,36 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+
+
+@pytest.mark.anyio
+async def test_get_order(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Итоги заказа учитывают добавленные товары."""
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=5, price=Decimal("9.99")))
+    await client.post(
+        fastapi_app.url_path_for("add_order_item", order_id=1),
+        json={"product_id": 1, "quantity": 3},
+    )
+
+    response = await client.get(fastapi_app.url_path_for("get_order", order_id=1))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"order_id": 1, "items_count": 3, "total_amount": "29.97"}
+
+    response = await client.get(fastapi_app.url_path_for("get_order", order_id=2))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
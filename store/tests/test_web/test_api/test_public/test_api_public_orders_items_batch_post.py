@@ -0,0 +1,93 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+
+
+@pytest.fixture()
+async def order_with_products(store_db_query: StoreTestDbQuery) -> int:
+    """
+    Заказ и товары для тестов.
+
+    :return: идентификатор заказа.
+    """
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=10))
+    await store_db_query.create_product(ProductSchema(id=2, quantity=1))
+    return 1
+
+
+@pytest.mark.anyio
+async def test_add_order_items(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_products: int,
+) -> None:
+    """Все товары добавляются в заказ одним запросом, дубли суммируются."""
+    url = fastapi_app.url_path_for("add_order_items", order_id=order_with_products)
+    response = await client.post(
+        url,
+        json={
+            "items": [
+                {"product_id": 2, "quantity": 1},
+                {"product_id": 1, "quantity": 2},
+                {"product_id": 1, "quantity": 3},
+            ],
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "order_id": 1,
+        "items": [
+            {"product_id": 2, "order_quantity": 1},
+            {"product_id": 1, "order_quantity": 5},
+        ],
+    }
+    assert await store_db_query.get_product_quantity(1) == 5
+    assert await store_db_query.get_product_quantity(2) == 0
+
+
+@pytest.mark.anyio
+async def test_add_order_items_not_enough_product(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_products: int,
+) -> None:
+    """Если одного из товаров не хватает, не добавляется ни один."""
+    url = fastapi_app.url_path_for("add_order_items", order_id=order_with_products)
+    response = await client.post(
+        url,
+        json={
+            "items": [
+                {"product_id": 1, "quantity": 1},
+                {"product_id": 2, "quantity": 2},
+            ],
+        },
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert await store_db_query.get_product_quantity(1) == 10
+
+
+@pytest.mark.anyio
+async def test_add_order_items_order_not_found(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    order_with_products: int,
+) -> None:
+    """Добавление товаров в несуществующий заказ."""
+    url = fastapi_app.url_path_for("add_order_items", order_id=100)
+    response = await client.post(
+        url,
+        json={"items": [{"product_id": 1, "quantity": 1}]},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,228 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from redis.exceptions import ConnectionError as RedisConnectionError
+from starlette import status
+
+from configuration.app_settings.service_db_settings import AddItemEngine
+from configuration.settings import Settings
+from store.services.flash_sale import FlashSaleInventory
+from store.services.idempotency import IdempotencyService
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+
+
+@pytest.fixture(params=list(AddItemEngine))
+def add_item_engine(
+    request: pytest.FixtureRequest,
+    service_settings: Settings,
+) -> AddItemEngine:
+    """
+    Способ выполнения добавления товара в заказ.
+
+    :return: способ выполнения.
+    """
+    service_settings.service_db.add_item_engine = request.param
+    return request.param
+
+
+@pytest.fixture()
+async def order_with_product(store_db_query: StoreTestDbQuery) -> int:
+    """
+    Заказ и товар для тестов.
+
+    :return: идентификатор заказа.
+    """
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(ProductSchema(id=1, quantity=3))
+    return 1
+
+
+@pytest.mark.anyio
+async def test_add_order_item(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_product: int,
+    add_item_engine: AddItemEngine,
+) -> None:
+    """Товар добавляется в заказ, повторное добавление увеличивает количество."""
+    url = fastapi_app.url_path_for("add_order_item", order_id=order_with_product)
+    response = await client.post(url, json={"product_id": 1, "quantity": 1})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["order_quantity"] == 1
+
+    response = await client.post(url, json={"product_id": 1, "quantity": 2})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["order_quantity"] == 3
+    assert await store_db_query.get_product_quantity(1) == 0
+
+
+@pytest.mark.anyio
+async def test_add_order_item_not_enough_product(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_product: int,
+    add_item_engine: AddItemEngine,
+) -> None:
+    """Добавление товара, которого недостаточно на складе."""
+    url = fastapi_app.url_path_for("add_order_item", order_id=order_with_product)
+    response = await client.post(url, json={"product_id": 1, "quantity": 4})
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert await store_db_query.get_product_quantity(1) == 3
+
+
+@pytest.mark.anyio
+async def test_add_order_item_order_not_found(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_product: int,
+    add_item_engine: AddItemEngine,
+) -> None:
+    """Добавление товара в несуществующий заказ не списывает остаток."""
+    url = fastapi_app.url_path_for("add_order_item", order_id=100)
+    response = await client.post(url, json={"product_id": 1, "quantity": 1})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert await store_db_query.get_product_quantity(1) == 3
+
+
+@pytest.mark.anyio
+async def test_add_order_item_flash_sale_redis_unavailable(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_product: int,
+    service_settings: Settings,
+    mocker: MockerFixture,
+) -> None:
+    """Товар распродажи не списывается из Postgres, если Redis недоступен."""
+    service_settings.orders.flash_sale_product_ids = {1}
+    reserve = mocker.patch.object(
+        FlashSaleInventory,
+        "reserve",
+        side_effect=RedisConnectionError,
+    )
+    url = fastapi_app.url_path_for("add_order_item", order_id=order_with_product)
+    response = await client.post(url, json={"product_id": 1, "quantity": 2})
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert await store_db_query.get_product_quantity(1) == 3
+    reserve.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_add_order_item_flash_sale(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_product: int,
+    service_settings: Settings,
+) -> None:
+    """Товар распродажи резервируется в Redis без списания остатка в Postgres."""
+    service_settings.orders.flash_sale_product_ids = {1}
+    url = fastapi_app.url_path_for("add_order_item", order_id=order_with_product)
+    response = await client.post(url, json={"product_id": 1, "quantity": 2})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["order_quantity"] == 2
+
+    response = await client.post(url, json={"product_id": 1, "quantity": 2})
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert await store_db_query.get_product_quantity(1) == 3
+
+
+@pytest.mark.anyio
+async def test_add_order_item_idempotency_key(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_product: int,
+) -> None:
+    """Повтор запроса с тем же Idempotency-Key не списывает остаток повторно."""
+    url = fastapi_app.url_path_for("add_order_item", order_id=order_with_product)
+    headers = {"Idempotency-Key": "retry-1"}
+    response = await client.post(
+        url,
+        json={"product_id": 1, "quantity": 1},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    replayed = await client.post(
+        url,
+        json={"product_id": 1, "quantity": 1},
+        headers=headers,
+    )
+    assert replayed.status_code == status.HTTP_201_CREATED
+    assert replayed.headers["Idempotent-Replayed"] == "true"
+    assert replayed.json() == response.json()
+    assert await store_db_query.get_product_quantity(1) == 2
+
+    reused = await client.post(
+        url,
+        json={"product_id": 1, "quantity": 2},
+        headers=headers,
+    )
+    assert reused.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert await store_db_query.get_product_quantity(1) == 2
+
+
+@pytest.mark.anyio
+async def test_add_order_item_idempotency_key_concurrent(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_product: int,
+) -> None:
+    """Одновременные запросы с одним Idempotency-Key выполняются один раз."""
+    url = fastapi_app.url_path_for("add_order_item", order_id=order_with_product)
+    responses = await asyncio.gather(
+        *[
+            client.post(
+                url,
+                json={"product_id": 1, "quantity": 1},
+                headers={"Idempotency-Key": "retry-2"},
+            )
+            for _ in range(3)
+        ],
+    )
+    assert [response.json()["order_quantity"] for response in responses] == [1, 1, 1]
+    assert await store_db_query.get_product_quantity(1) == 2
+
+
+@pytest.mark.anyio
+async def test_add_order_item_idempotency_key_in_progress(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+    order_with_product: int,
+    service_settings: Settings,
+    mocker: MockerFixture,
+) -> None:
+    """Повтор, не дождавшийся первого запроса, получает ошибку, остаток не списывается."""
+    service_settings.orders.idempotency_wait_timeout = 0.1
+    mocker.patch.object(IdempotencyService, "complete")
+    url = fastapi_app.url_path_for("add_order_item", order_id=order_with_product)
+    headers = {"Idempotency-Key": "retry-3"}
+    response = await client.post(
+        url,
+        json={"product_id": 1, "quantity": 1},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = await client.post(
+        url,
+        json={"product_id": 1, "quantity": 1},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert await store_db_query.get_product_quantity(1) == 2
@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from store.tests.db_queries import (
+    ClientSchema,
+    OrderSchema,
+    ProductSchema,
+    StoreTestDbQuery,
+)
+
+
+@pytest.mark.anyio
+async def test_get_product(
+    client: AsyncClient,
+    fastapi_app: FastAPI,
+    store_db_query: StoreTestDbQuery,
+) -> None:
+    """Остаток товара в кеше обновляется после добавления товара в заказ."""
+    await store_db_query.create_client(ClientSchema(id=1))
+    await store_db_query.create_order(OrderSchema(id=1, client_id=1))
+    await store_db_query.create_product(
+        ProductSchema(id=1, quantity=5, price=Decimal("9.99"), name="first"),
+    )
+
+    response = await client.get(fastapi_app.url_path_for("get_product", product_id=1))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "id": 1,
+        "name": "first",
+        "quantity": 5,
+        "price": "9.99",
+        "category_id": None,
+    }
+
+    await client.post(
+        fastapi_app.url_path_for("add_order_item", order_id=1),
+        json={"product_id": 1, "quantity": 3},
+    )
+    response = await client.get(fastapi_app.url_path_for("get_product", product_id=1))
+    assert response.json()["quantity"] == 2
+
+    await client.post(
+        fastapi_app.url_path_for("add_order_items", order_id=1),
+        json={"items": [{"product_id": 1, "quantity": 2}]},
+    )
+    response = await client.get(fastapi_app.url_path_for("get_product", product_id=1))
+    assert response.json()["quantity"] == 0
+
+    response = await client.get(fastapi_app.url_path_for("get_product", product_id=2))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,71 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from common.db.keyset import KeysetPage
+from common.errors.exceptions import InvalidCursorError
+from common.fastapi.paginator import decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip() -> None:
+    """Курсор восстанавливает позицию страницы."""
+    page = KeysetPage(("price", "id"), ("1.50", 3), reverse=True)
+
+    assert decode_cursor(encode_cursor(page), ("price", "id")) == page
+
+
+@pytest.mark.parametrize(
+    "cursor_value",
+    [
+        Decimal("1.50"),
+        datetime(2025, 10, 16, 12, 30, 0, 5, tzinfo=timezone.utc),
+        datetime(2025, 10, 16, 12, 30),
+        date(2025, 10, 16),
+        UUID("12345678-1234-5678-1234-567812345678"),
+        None,
+        True,
+        1.5,
+    ],
+)
+def test_cursor_value_types(cursor_value: object) -> None:
+    """Значения позиции раскодируются с исходным типом."""
+    page = KeysetPage(("sort_key", "id"), (cursor_value, 3))
+
+    position = decode_cursor(encode_cursor(page), ("sort_key", "id")).position
+    assert position == (cursor_value, 3)
+    assert type(position[0]) is type(cursor_value)  # type: ignore
+
+
+def test_cursor_unsupported_type() -> None:
+    """Значение позиции неизвестного типа не кодируется в курсор."""
+    with pytest.raises(TypeError):
+        encode_cursor(KeysetPage(("id",), (object(),)))
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "garbage",
+        encode_cursor(KeysetPage(("id",), (3,))).replace(".", "x."),
+        encode_cursor(KeysetPage(("price",), (3,))),
+    ],
+)
+def test_cursor_rejected(cursor: str) -> None:
+    """Поврежденный, подделанный или выданный для другой сортировки курсор отклоняется."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, ("id",))
+
+
+def test_keyset_predicate() -> None:
+    """Условие страницы сравнивает колонки сортировки с позицией."""
+    page = KeysetPage(("product.price", "product.id"), ("1.50", 3), reverse=True)
+
+    assert page.predicate.as_string() == (
+        '("product"."price", "product"."id") < (%(keyset_0)s, %(keyset_1)s)'
+    )
+    assert page.order_by.as_string() == '"product"."price" DESC, "product"."id" DESC'
+    assert page.params == {"keyset_0": "1.50", "keyset_1": 3}
+    assert KeysetPage(("id",)).predicate.as_string() == "TRUE"
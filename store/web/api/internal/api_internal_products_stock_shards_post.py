@@ -0,0 +1,47 @@
+from fastapi import Path
+from pydantic import BaseModel, Field, NonNegativeInt
+from starlette import status
+
+from store.tasks.stock_shards import is_stock_sharding_allowed, rebalance_stock_shards
+from store.web.api.internal.router import internal_router
+from store.web.exceptions import StockShardingUnavailableError
+
+# Шарды нумеруются SMALLINT и создаются под блокировкой строки товара
+MAX_SHARD_COUNT = 256
+
+
+class RebalanceStockShardsRequest(BaseModel):
+    """Тело запроса перебалансировки шардов остатка товара."""
+
+    shard_count: NonNegativeInt = Field(
+        ...,
+        title="Количество шардов (0 - отключить шардирование)",
+        le=MAX_SHARD_COUNT,
+    )
+
+
+@internal_router.post(
+    "/products/{product_id}/stock-shards",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def rebalance_product_stock_shards(
+    request_body: RebalanceStockShardsRequest,
+    product_id: NonNegativeInt = Path(..., title="Идентификатор товара"),
+) -> None:
+    """
+    Запустить перебалансировку шардов остатка товара.
+
+    Внутренняя ручка. Перебалансировка выполняется в taskiq.
+    Распределить остаток по шардам можно только при способе добавления sharded
+    и не для товаров распродажи.
+
+    :param request_body: Данные запроса (тело запроса).
+    :param product_id: Идентификатор товара.
+    :raises StockShardingUnavailableError: Если шардирование остатка недоступно.
+    """
+    if not is_stock_sharding_allowed(product_id, request_body.shard_count):
+        raise StockShardingUnavailableError
+    await rebalance_stock_shards.kiq(
+        product_id=product_id,
+        shard_count=request_body.shard_count,
+    )
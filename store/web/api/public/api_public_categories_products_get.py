@@ -0,0 +1,73 @@
+from fastapi import Depends, Path, Query
+from pydantic import BaseModel, Field, NonNegativeInt
+from starlette import status
+
+from common.fastapi.paginator import CursorPagination
+
+from configuration.settings import settings
+from store.db.service_db.queries.select_category_products import CategoryProduct
+from store.services.categories import CategoryProductsService
+from store.web.api.public.router import public_router
+
+
+class CategoryProductsPagination(CursorPagination):
+    """Keyset-пагинация товаров категории по идентификатору товара."""
+
+    ordering = ("id",)
+    default_page_size = settings.catalog.products_page_size
+    max_page_size = settings.catalog.products_max_page_size
+
+
+class CategoryProductsResponse(BaseModel):
+    """Модель ответа со страницей товаров категории."""
+
+    count: NonNegativeInt | None = Field(None, title="Не считается в keyset-пагинации")
+    next: str | None = Field(None, title="Ссылка на следующую страницу")  # noqa: WPS125
+    previous: str | None = Field(None, title="Ссылка на предыдущую страницу")
+    results: list[CategoryProduct] = Field(..., title="Товары")
+
+
+@public_router.get(
+    "/categories/{category_id}/products",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Товары категории и её подкатегорий.",
+            "model": CategoryProductsResponse,
+        },
+    },
+)
+async def get_category_products(
+    category_id: NonNegativeInt = Path(..., title="Идентификатор категории"),
+    page_size: int | None = Query(  # noqa: WPS110 - читается пагинатором
+        None,
+        ge=1,
+        title="Количество товаров на странице",
+    ),
+    cursor: str | None = Query(  # noqa: WPS110 - читается пагинатором
+        None,
+        title="Курсор страницы из ссылок next/previous",
+    ),
+    pagination: CategoryProductsPagination = Depends(),
+    category_products: CategoryProductsService = Depends(),
+) -> CategoryProductsResponse:
+    """
+    Метод получения товаров категории и всех её подкатегорий.
+
+    Метод публичный. Товары отдаются по возрастанию идентификатора страницами:
+    ссылки next/previous содержат подписанный курсор с позицией страницы,
+    поэтому стоимость страницы не зависит от глубины листания.
+    :param category_id: Идентификатор категории.
+    :param page_size: Количество товаров на странице.
+    :param cursor: Курсор страницы.
+    :param pagination: Пагинатор.
+    :param category_products: Сервис товаров категории.
+    :returns: Возвращает CategoryProductsResponse
+    """
+    products = await category_products(
+        category_id,
+        pagination.keyset,  # type: ignore
+        pagination.limit,
+    )
+    return CategoryProductsResponse.model_validate(
+        pagination.get_paginated_response(pagination.paginate_queryset(products)),
+    )
@@ -0,0 +1,42 @@
+from fastapi import Depends, Path
+from pydantic import NonNegativeInt
+from starlette import status
+
+from store.db.service_db.queries.select_order_summary import OrderSummary
+from store.services.orders import OrderSummaryService
+from store.web.api.public.router import public_router
+
+
+@public_router.get(
+    "/orders/{order_id}",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Итоги заказа.",
+            "model": OrderSummary,
+            "content": {
+                "application/json": {
+                    "example": {
+                        "order_id": 1,
+                        "items_count": 3,
+                        "total_amount": "29.97",
+                    },
+                },
+            },
+        },
+    },
+)
+async def get_order(
+    order_id: NonNegativeInt = Path(..., title="Идентификатор заказа"),
+    order_summary: OrderSummaryService = Depends(),
+) -> OrderSummary:
+    """
+    Метод получения итогов заказа.
+
+    Метод публичный. В идеале требует авторизации пользователя (должна проходить проверка).
+    Количество единиц товара и сумма заказа хранятся в заказе и обновляются
+    в транзакции, изменяющей состав заказа, поэтому запрос читает одну строку заказа.
+    :param order_id: Идентификатор заказа.
+    :param order_summary: Сервис итогов заказа.
+    :returns: Возвращает OrderSummary
+    """
+    return await order_summary(order_id)
@@ -0,0 +1,124 @@
+from fastapi import Depends, Path
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field, NonNegativeInt
+from starlette import status
+
+from common.service_redis.client import ServiceRedis
+
+from configuration.settings import settings
+from store.db.service_db.queries.add_items_to_order import AddItemsToOrderDbQuery
+from store.services.products import invalidate_products
+from store.web.api.public.api_public_orders_items_post import AddOrderItemRequest
+from store.web.api.public.router import public_router
+from store.web.exceptions import ProductNotBatchableError
+
+MAX_BATCH_ITEMS = 100
+
+
+class AddOrderItemsRequest(BaseModel):
+    """Тело запроса при пакетном добавлении товаров в заказ."""
+
+    items: list[AddOrderItemRequest] = Field(
+        ...,
+        title="Добавляемые товары",
+        min_length=1,
+        max_length=MAX_BATCH_ITEMS,
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {
+                    "items": [
+                        {"product_id": 1, "quantity": 1},
+                        {"product_id": 2, "quantity": 3},
+                    ],
+                },
+            ],
+        },
+    )
+
+
+class AddOrderItemsResponseItem(BaseModel):
+    """Результат добавления одного товара в заказ."""
+
+    product_id: NonNegativeInt = Field(..., title="Идентификатор товара")
+    order_quantity: NonNegativeInt = Field(
+        ...,
+        title="Новое количество товара в заказе",
+    )
+
+
+class AddOrderItemsResponse(BaseModel):
+    """Модель ответа при пакетном добавлении товаров в заказ."""
+
+    order_id: NonNegativeInt = Field(..., title="Идентификатор заказа")
+    items: list[AddOrderItemsResponseItem] = Field(
+        ...,
+        title="Результаты по товарам",
+    )
+
+
+@public_router.post(
+    "/orders/{order_id}/items/batch",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Товары добавлены в заказ.",
+            "model": AddOrderItemsResponse,
+            "content": {
+                "application/json": {
+                    "example": {
+                        "order_id": 1,
+                        "items": [
+                            {"product_id": 1, "order_quantity": 1},
+                            {"product_id": 2, "order_quantity": 5},
+                        ],
+                    },
+                },
+            },
+        },
+    },
+)
+async def add_order_items(
+    request_body: AddOrderItemsRequest,
+    order_id: NonNegativeInt = Path(..., title="Идентификатор заказа"),
+    order_db_query: AddItemsToOrderDbQuery = Depends(),
+    redis: ServiceRedis = Depends(),
+) -> AddOrderItemsResponse:
+    """
+    Метод пакетного добавления товаров в заказ.
+
+    Все товары добавляются одной транзакцией: либо добавлены все позиции, либо ни одной.
+    Повторяющиеся в запросе товары суммируются и возвращаются одной позицией.
+    Если какого-либо товара нет в наличии в нужном количестве, выбрасывается ошибка.
+    Если заказ не найден, выбрасывается ошибка.
+    Товары распродажи резервируются в Redis и добавляются только отдельным запросом:
+    списание их остатка в Postgres мимо резервов продало бы больше, чем есть.
+    :param order_id: Идентификатор заказа.
+    :param request_body: Данные запроса (тело запроса).
+    :param order_db_query: Объект запроса к БД.
+    :param redis: Клиент Redis для удаления товаров из кеша.
+    :raises ProductNotBatchableError: Если в запросе есть товар распродажи.
+    :returns: Возвращает AddOrderItemsResponse
+    """
+    items: dict[int, int] = {}
+    for item in request_body.items:
+        items[item.product_id] = items.get(item.product_id, 0) + item.quantity
+    if not items.keys().isdisjoint(settings.orders.flash_sale_product_ids):
+        raise ProductNotBatchableError
+
+    results = await order_db_query(order_id=order_id, items=items)
+    await invalidate_products(redis, items.keys())
+    logger.info(
+        f"Добавлены товары ID: {list(items.keys())} в заказ ID: {order_id}.",
+    )
+    return AddOrderItemsResponse(
+        order_id=order_id,
+        items=[
+            AddOrderItemsResponseItem(
+                product_id=result.product_id,
+                order_quantity=result.order_quantity,
+            )
+            for result in results
+        ],
+    )
@@ -1,10 +1,18 @@
-from fastapi import Depends, Path
+from contextlib import suppress
+
+from fastapi import Depends, Header, Path
 from loguru import logger
 from pydantic import BaseModel, ConfigDict, Field, NonNegativeInt
+from redis.exceptions import RedisError
 from starlette import status
 from starlette.responses import Response
 
-from store.db.service_db.queries.add_item_to_order import AddItemToOrderDbQuery
+from store.services.idempotency import (
+    IdempotencyService,
+    StoredResponse,
+    get_fingerprint,
+)
+from store.services.order_items import AddItemToOrderService
 from store.web.api.public.router import public_router
 
 
@@ -72,7 +80,14 @@ async def add_order_item(
     response: Response,
     request_body: AddOrderItemRequest,
     order_id: NonNegativeInt = Path(..., title="Идентификатор заказа"),
-    order_db_query: AddItemToOrderDbQuery = Depends(),
+    idempotency_key: str | None = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        title="Ключ идемпотентности",
+    ),
+    add_item_service: AddItemToOrderService = Depends(),
+    idempotency: IdempotencyService = Depends(),
 ) -> AddOrderItemResponse:
     """
     Метод добавления товара в заказ.
@@ -82,31 +97,68 @@ async def add_order_item(
     При этом мы проверяем наличие товара. И выбрасываем ошибку, если товара нет в наличии.
     Так же проверяется наличие целостности базы данных.(Если заказ не найден, то выбрасывается ошибка).
     (В реальных условиях проверка целостности не нужна, так как и товар и заказ уже будут в наличии).
+    Остаток товаров распродажи резервируется в Redis и переносится в Postgres пачками.
+    Повтор запроса с тем же заголовком Idempotency-Key возвращает сохранённый ответ
+    без повторного добавления товара, одновременный повтор ждёт завершения первого запроса.
     :param response: Response.
     :param order_id: Идентификатор заказа.
     :param request_body: Данные запроса (тело запроса).
-    :param order_db_query: Объект запроса к БД.
+    :param idempotency_key: Ключ идемпотентности.
+    :param add_item_service: Сервис добавления товара в заказ.
+    :param idempotency: Сервис ключей идемпотентности.
     :returns: Возвращает AddOrderItemResponse
     """
-    result_add_item = await order_db_query(
-        order_id=order_id,
-        product_id=request_body.product_id,
-        quantity=request_body.quantity,
-    )
+    idempotency_scope = f"add_order_item:{order_id}"
+    fingerprint = get_fingerprint(request_body.model_dump_json())
+    if idempotency_key:
+        try:
+            stored_response = await idempotency.start(
+                idempotency_scope,
+                idempotency_key,
+                fingerprint,
+            )
+        except RedisError:
+            logger.warning("Redis недоступен, Idempotency-Key не проверяется.")
+            idempotency_key = None
+        else:
+            if stored_response:
+                response.status_code = stored_response.status_code
+                response.headers["Idempotent-Replayed"] = "true"
+                return AddOrderItemResponse.model_validate(stored_response.body)
+
+    try:
+        result_add_item = await add_item_service(
+            order_id=order_id,
+            product_id=request_body.product_id,
+            quantity=request_body.quantity,
+        )
+    except Exception:
+        if idempotency_key:
+            with suppress(RedisError):
+                await idempotency.release(idempotency_scope, idempotency_key)
+        raise
     logger.info(
         f"Добавлен товар ID: {result_add_item.product_id} в заказ ID: {order_id}. "
         f"Количество в заказе: {result_add_item.order_quantity}",
     )
     if result_add_item.order_quantity == request_body.quantity:
         response.status_code = status.HTTP_201_CREATED
-        return AddOrderItemResponse(
-            order_id=order_id,
-            product_id=result_add_item.product_id,
-            order_quantity=result_add_item.order_quantity,
-        )
-    response.status_code = status.HTTP_200_OK
-    return AddOrderItemResponse(
+    else:
+        response.status_code = status.HTTP_200_OK
+    add_item_response = AddOrderItemResponse(
         order_id=order_id,
         product_id=result_add_item.product_id,
         order_quantity=result_add_item.order_quantity,
     )
+    if idempotency_key:
+        with suppress(RedisError):
+            await idempotency.complete(
+                idempotency_scope,
+                idempotency_key,
+                fingerprint,
+                StoredResponse(
+                    status_code=response.status_code,
+                    body=add_item_response.model_dump(),
+                ),
+            )
+    return add_item_response
@@ -0,0 +1,43 @@
+from fastapi import Depends, Path
+from pydantic import NonNegativeInt
+from starlette import status
+
+from store.db.service_db.queries.select_product_info import ProductInfo
+from store.services.products import ProductService
+from store.web.api.public.router import public_router
+
+
+@public_router.get(
+    "/products/{product_id}",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Товар с остатком на складе.",
+            "model": ProductInfo,
+            "content": {
+                "application/json": {
+                    "example": {
+                        "id": 1,
+                        "name": "product",
+                        "quantity": 5,
+                        "price": "9.99",
+                        "category_id": 1,
+                    },
+                },
+            },
+        },
+    },
+)
+async def get_product(
+    product_id: NonNegativeInt = Path(..., title="Идентификатор товара"),
+    product_service: ProductService = Depends(),
+) -> ProductInfo:
+    """
+    Метод получения товара с остатком на складе.
+
+    Метод публичный. Товар читается через кеш в Redis: остаток может отставать
+    от Postgres не дольше времени жизни товара в кеше.
+    :param product_id: Идентификатор товара.
+    :param product_service: Сервис товаров.
+    :returns: Возвращает ProductInfo
+    """
+    return await product_service(product_id)
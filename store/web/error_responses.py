@@ -6,6 +6,11 @@ PARAMS_VALIDATION_ERR_CODE = 6
 PARAMS_MISSING_ERR_CODE = 7
 PARAMS_NOT_FOUND_ERR_CODE = 4
 PARAMS_CHECK_VIOLATION_ERR_CODE = 5
+IDEMPOTENCY_KEY_IN_PROGRESS_ERR_CODE = 8
+IDEMPOTENCY_KEY_REUSED_ERR_CODE = 9
+FLASH_SALE_UNAVAILABLE_ERR_CODE = 10
+PRODUCT_NOT_BATCHABLE_ERR_CODE = 11
+STOCK_SHARDING_UNAVAILABLE_ERR_CODE = 12
 
 order_not_found = ErrorResponse(
     body=ErrResponseBody(
@@ -24,3 +29,67 @@ order_check_violation = ErrorResponse(
     ),
     status_code=status.HTTP_409_CONFLICT,
 )
+
+idempotency_key_in_progress = ErrorResponse(
+    body=ErrResponseBody(
+        message="Запрос с таким Idempotency-Key ещё выполняется.",
+        error_code=IDEMPOTENCY_KEY_IN_PROGRESS_ERR_CODE,
+        verbose_message="Запрос с таким Idempotency-Key ещё выполняется.",
+    ),
+    status_code=status.HTTP_409_CONFLICT,
+)
+
+idempotency_key_reused = ErrorResponse(
+    body=ErrResponseBody(
+        message="Idempotency-Key уже использован с другим запросом.",
+        error_code=IDEMPOTENCY_KEY_REUSED_ERR_CODE,
+        verbose_message="Idempotency-Key уже использован с другим запросом.",
+    ),
+    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+)
+
+category_not_found = ErrorResponse(
+    body=ErrResponseBody(
+        message="Категория не найдена.",
+        error_code=PARAMS_NOT_FOUND_ERR_CODE,
+        verbose_message="Категория не найдена.",
+    ),
+    status_code=status.HTTP_404_NOT_FOUND,
+)
+
+product_not_found = ErrorResponse(
+    body=ErrResponseBody(
+        message="Товар не найден.",
+        error_code=PARAMS_NOT_FOUND_ERR_CODE,
+        verbose_message="Товар не найден.",
+    ),
+    status_code=status.HTTP_404_NOT_FOUND,
+)
+
+flash_sale_unavailable = ErrorResponse(
+    body=ErrResponseBody(
+        message="Товар распродажи временно недоступен, повторите запрос позже.",
+        error_code=FLASH_SALE_UNAVAILABLE_ERR_CODE,
+        verbose_message="Остатки товаров распродажи недоступны.",
+    ),
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+)
+
+product_not_batchable = ErrorResponse(
+    body=ErrResponseBody(
+        message="Товар нельзя добавить пакетом, добавьте его отдельным запросом.",
+        error_code=PRODUCT_NOT_BATCHABLE_ERR_CODE,
+        verbose_message="Остаток товара хранится в шардах или резервируется в Redis.",
+    ),
+    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+)
+
+stock_sharding_unavailable = ErrorResponse(
+    body=ErrResponseBody(
+        message="Шардирование остатка товара недоступно.",
+        error_code=STOCK_SHARDING_UNAVAILABLE_ERR_CODE,
+        verbose_message="Шардирование остатка доступно только при способе добавления sharded "
+        "и не для товаров распродажи.",
+    ),
+    status_code=status.HTTP_409_CONFLICT,
+)
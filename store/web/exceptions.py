@@ -5,8 +5,15 @@ from common.errors.schema import ErrorResponse, ErrResponseBody
 
 from store.web.error_responses import (  # noqa: WPS235
     PARAMS_VALIDATION_ERR_CODE,
+    category_not_found,
+    flash_sale_unavailable,
+    idempotency_key_in_progress,
+    idempotency_key_reused,
     order_check_violation,
     order_not_found,
+    product_not_batchable,
+    product_not_found,
+    stock_sharding_unavailable,
 )
 
 
@@ -16,12 +23,54 @@ class OrderNotFoundError(ServiceError):
     response_data: ErrorResponse = order_not_found
 
 
+class CategoryNotFoundError(ServiceError):
+    """Категория не найдена."""
+
+    response_data: ErrorResponse = category_not_found
+
+
+class ProductNotFoundError(ServiceError):
+    """Товар не найден."""
+
+    response_data: ErrorResponse = product_not_found
+
+
 class OrderCheckViolationError(ServiceError):
     """Ошибка консистентности продукта в заказе."""
 
     response_data: ErrorResponse = order_check_violation
 
 
+class FlashSaleUnavailableError(ServiceError):
+    """Остатки товаров распродажи недоступны."""
+
+    response_data: ErrorResponse = flash_sale_unavailable
+
+
+class ProductNotBatchableError(ServiceError):
+    """Товар нельзя добавить в заказ пакетом."""
+
+    response_data: ErrorResponse = product_not_batchable
+
+
+class StockShardingUnavailableError(ServiceError):
+    """Шардирование остатка товара недоступно."""
+
+    response_data: ErrorResponse = stock_sharding_unavailable
+
+
+class IdempotencyKeyInProgressError(ServiceError):
+    """Запрос с тем же ключом идемпотентности ещё выполняется."""
+
+    response_data: ErrorResponse = idempotency_key_in_progress
+
+
+class IdempotencyKeyReusedError(ServiceError):
+    """Ключ идемпотентности использован с другим телом запроса."""
+
+    response_data: ErrorResponse = idempotency_key_reused
+
+
 class ParameterValidationError(ServiceError):
     """Несоответствие параметров условиям валидации."""
 
@@ -1,20 +1,32 @@
+import asyncio
 import sys
+from contextlib import suppress
 
 import psycopg_pool
 from fastapi import FastAPI, Request, Response
 from fastapi.encoders import jsonable_encoder
 from loguru import logger
+from redis.exceptions import RedisError
 from starlette import status
 from starlette.responses import JSONResponse
 
 from common.errors.exceptions import ServiceError
 from common.locale.localization import locale_gettext
 from common.logging.log_models import LogData
+from common.service_db.instrumentation import set_query_observer
+from common.service_db.pool import PoolSizeController, ServiceDbPool
+from common.service_redis.client import ServiceRedis
 from common.taskiq.lifetime import setup_taskiq, stop_taskiq
 
 from configuration.clients import WebClientsState
 from configuration.settings import settings
 from store import metrics
+from store.db.service_db.queries.select_products_quantity import (
+    SelectProductsQuantityDbQuery,
+)
+from store.services.categories import category_tree_cache
+from store.services.flash_sale import FlashSaleInventory
+from store.services.order_items import seed_flash_sale_stock
 
 
 def register_startup_event(app: FastAPI) -> None:
@@ -22,11 +34,15 @@ def register_startup_event(app: FastAPI) -> None:
     Вызов функция для старта приложения.
 
     Настраивается телеметрия, клиенты и taskiq при необходимости.
+    Остатки товаров распродажи загружаются в Redis.
+    Запускается выгрузка статистики пула и запросов БД в метрики и адаптивный размер пула.
+    Запускается подписка на изменения категорий для кеша поддеревьев категорий.
 
     :param app: the fastAPI application.
     """
 
     async def _startup() -> None:  # noqa: WPS430
+        set_query_observer(metrics.QueryMetricsObserver())
         web_clients_state: WebClientsState = await WebClientsState.clients_startup()
         app.state.clients = web_clients_state
         app.state.log_data = LogData(
@@ -36,10 +52,78 @@ def register_startup_event(app: FastAPI) -> None:
             device_id="",
         )
         await setup_taskiq()
+        await _seed_flash_sale_stock(web_clients_state)
+        app.state.service_db_pool_monitor = asyncio.create_task(
+            _monitor_service_db_pool(web_clients_state.service_db_pool),
+        )
+        await category_tree_cache.start(str(settings.service_db.url))
 
     app.add_event_handler("startup", _startup)
 
 
+async def _seed_flash_sale_stock(web_clients_state: WebClientsState) -> None:
+    if not settings.orders.flash_sale_product_ids:
+        return
+    try:
+        await seed_flash_sale_stock(
+            FlashSaleInventory(ServiceRedis(web_clients_state.service_redis_pool)),
+            SelectProductsQuantityDbQuery(web_clients_state.service_db_pool),
+            list(settings.orders.flash_sale_product_ids),
+        )
+    except RedisError:
+        logger.warning(
+            "Остатки товаров распродажи не загружены в Redis, "
+            "они будут загружены при первом резерве.",
+        )
+
+
+async def _monitor_service_db_pool(pool: psycopg_pool.AsyncConnectionPool) -> None:
+    if isinstance(pool, ServiceDbPool):
+        pool.on_getconn = _observe_service_db_getconn
+    controller = None
+    if settings.service_db.pool_adaptive:
+        controller = PoolSizeController(
+            pool,
+            lower=settings.service_db.pool_min_size,
+            upper=settings.service_db.pool_adaptive_max_size,
+            grow_wait_ms=settings.service_db.pool_adaptive_grow_wait_ms,
+            shrink_usage=settings.service_db.pool_adaptive_shrink_usage,
+        )
+    while True:  # noqa: WPS457
+        try:
+            export_service_db_pool_stats(pool)
+        except Exception:
+            logger.exception("Статистика пула БД не выгружена в метрики.")
+        await asyncio.sleep(settings.service_db.pool_stats_interval)
+        if controller is None:
+            continue
+        try:
+            await controller.adjust()
+        except Exception:
+            logger.exception("Размер пула БД не изменён.")
+
+
+def _observe_service_db_getconn(wait: float, age: float) -> None:
+    metrics.service_db_pool_wait_seconds.observe(wait)
+    metrics.service_db_pool_connection_age_seconds.observe(age)
+
+
+def export_service_db_pool_stats(pool: psycopg_pool.AsyncConnectionPool) -> None:
+    """
+    Выгрузить текущее состояние пула БД в метрики.
+
+    :param pool: Пул соединений к БД сервиса.
+    """
+    stats = pool.get_stats()
+    pool_size = stats.get("pool_size", 0)
+    metrics.service_db_pool_size.set(pool_size)
+    metrics.service_db_pool_max_size.set(pool.max_size)
+    metrics.service_db_pool_connections_in_use.set(
+        pool_size - stats.get("pool_available", 0),
+    )
+    metrics.service_db_pool_requests_waiting.set(stats.get("requests_waiting", 0))
+
+
 def register_shutdown_event(app: FastAPI) -> None:
     """
     Выполняет действия, необходимые для завершения приложения.
@@ -48,6 +132,10 @@ def register_shutdown_event(app: FastAPI) -> None:
     """
 
     async def _shutdown() -> None:  # noqa: WPS430
+        app.state.service_db_pool_monitor.cancel()
+        with suppress(asyncio.CancelledError):
+            await app.state.service_db_pool_monitor
+        await category_tree_cache.close()
         await app.state.clients.clients_shutdown()
         await stop_taskiq()
 